@@ -0,0 +1,65 @@
+"""
+MCP 도구 호출 벤치마크
+
+도구 등록부를 거치는 전체 경로(인자 처리, 실행기 분리, 응답 생성)를 측정한다
+    simple: MCP.call_tool("encrypt"/"decrypt", ...)
+    package: SumerianMCPServer().mcp.call_tool("encrypt"/"decrypt", ...)
+"""
+import asyncio
+
+from harness import Case, case_name
+import impls
+
+KEY = "benchmark_key"
+
+OPERATIONS = ("call_encrypt", "call_decrypt")
+
+
+def _raise_for_error(result):
+    """도구 호출이 오류를 반환하면 예외 발생"""
+    if isinstance(result, dict) and "error" in result:
+        raise RuntimeError(result["error"])
+    if getattr(result, "isError", False):
+        raise RuntimeError(result.content[0].text)
+
+
+def _setup(impl, operation, size):
+    """케이스 준비 함수 (서버 생성과 이벤트 루프 준비는 측정에서 제외)"""
+
+    def setup(workdir, stack):
+        module = impls.load(impl)
+        loop = asyncio.new_event_loop()
+        stack.callback(loop.close)
+        text = impls.payload(size)
+
+        if impl == "simple":
+            server = module.MCP()
+            stack.callback(server.close)
+            call = server.call_tool
+            if operation == "call_encrypt":
+                arguments = {"text": text, "key": KEY}
+            else:
+                arguments = {"text": module.encrypt_password(text, KEY), "key": KEY}
+        else:
+            server = module.SumerianMCPServer()
+            stack.callback(server.close)
+            call = server.mcp.call_tool
+            if operation == "call_encrypt":
+                arguments = {"password": text, "key": KEY}
+            else:
+                arguments = {"encrypted_text": module.encrypt_password(text, KEY), "key": KEY}
+
+        tool = operation.removeprefix("call_")
+        return lambda: _raise_for_error(loop.run_until_complete(call(tool, arguments)))
+
+    return setup
+
+
+def cases(sizes):
+    """구현 × 도구 × 평문 크기 케이스 목록"""
+    return [
+        Case(case_name(impl, operation, size), "dispatch", impl, operation, size, _setup(impl, operation, size))
+        for impl in ("simple", "package")
+        for operation in OPERATIONS
+        for size in sizes
+    ]
@@ -0,0 +1,85 @@
+"""
+파일 도구 벤치마크
+
+패키지의 encrypt_file/decrypt_file(스트림 형식과 컨테이너 형식), 컨테이너 범위 복호화,
+단일 파일 서버의 stream_file(encrypt_stream/decrypt_stream)을 측정한다
+루트 스크립트에는 파일 도구가 없다
+"""
+import importlib
+import os
+from functools import partial
+
+from harness import Case, case_name
+import impls
+
+KEY = "benchmark_key"
+
+# 범위 복호화 케이스가 파일 가운데에서 읽는 바이트 수
+RANGE_LENGTH = 4096
+
+OPERATIONS = {
+    "package": ("encrypt_file", "decrypt_file", "encrypt_container", "decrypt_container", "decrypt_range"),
+    "simple": ("encrypt_stream", "decrypt_stream"),
+}
+
+
+def _write_source(workdir, size):
+    """size 바이트의 무작위 원본 파일 경로"""
+    path = os.path.join(workdir, "source.bin")
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining:
+            block = os.urandom(min(remaining, 1024 * 1024))
+            f.write(block)
+            remaining -= len(block)
+    return path
+
+
+def _setup_package(operation, size):
+    """패키지 파일 도구 케이스 준비 함수"""
+
+    def setup(workdir, stack):
+        impls.load("package")
+        files = importlib.import_module("sumerian_mcp.files")
+        source = _write_source(workdir, size)
+        encrypted = os.path.join(workdir, "source.bin.sumerian")
+        output = os.path.join(workdir, "output.bin")
+        container = operation.endswith("_container") or operation == "decrypt_range"
+        if operation.startswith("encrypt_"):
+            return partial(files.encrypt_file, source, KEY, encrypted, container=container)
+
+        files.encrypt_file(source, KEY, encrypted, container=container)
+        if operation == "decrypt_range":
+            decrypt_range = importlib.import_module("sumerian_mcp.container").decrypt_range
+            return partial(decrypt_range, encrypted, KEY, size // 2, RANGE_LENGTH)
+        return partial(files.decrypt_file, encrypted, KEY, output)
+
+    return setup
+
+
+def _setup_simple(operation, size):
+    """단일 파일 서버 스트림 도구 케이스 준비 함수"""
+
+    def setup(workdir, stack):
+        module = impls.load("simple")
+        source = _write_source(workdir, size)
+        encrypted = os.path.join(workdir, "source.bin.sumerian")
+        output = os.path.join(workdir, "output.bin")
+        if operation == "encrypt_stream":
+            return partial(module.stream_file, module.encrypt_stream, source, encrypted, KEY)
+        module.stream_file(module.encrypt_stream, source, encrypted, KEY)
+        return partial(module.stream_file, module.decrypt_stream, encrypted, output, KEY)
+
+    return setup
+
+
+def cases(sizes):
+    """구현 × 파일 도구 × 파일 크기 케이스 목록"""
+    result = []
+    for impl, setup in (("package", _setup_package), ("simple", _setup_simple)):
+        for operation in OPERATIONS[impl]:
+            for size in sizes:
+                nbytes = min(RANGE_LENGTH, size - size // 2) if operation == "decrypt_range" else None
+                result.append(Case(case_name(impl, operation, size), "files", impl, operation, size,
+                                   setup(operation, size), nbytes))
+    return result
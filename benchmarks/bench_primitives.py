@@ -0,0 +1,58 @@
+"""
+암호화 기본 함수 벤치마크
+
+세 구현(root, simple, package)의 encrypt/decrypt_aes, encrypt/decrypt_sumerian,
+encrypt/decrypt_password를 같은 평문 크기로 측정한다
+"""
+from harness import Case, case_name, quiet
+import impls
+
+KEY = "benchmark_key"
+
+OPERATIONS = (
+    "encrypt_aes",
+    "decrypt_aes",
+    "encrypt_sumerian",
+    "decrypt_sumerian",
+    "encrypt_password",
+    "decrypt_password",
+)
+
+
+def _setup(impl, operation, size):
+    """케이스 준비 함수 (평문/암호문 생성은 측정에서 제외)"""
+
+    def setup(workdir, stack):
+        module = impls.load(impl)
+        if impl == "root":
+            # 루트 스크립트의 decrypt_aes는 복호화 과정을 모두 출력한다
+            stack.enter_context(quiet())
+        func = getattr(module, operation)
+        text = impls.payload(size)
+        if operation == "encrypt_sumerian":
+            return lambda: func(text)
+        if operation == "decrypt_sumerian":
+            encoded = module.encrypt_sumerian(text)
+            return lambda: func(encoded)
+        if operation.startswith("encrypt_"):
+            return lambda: func(text, KEY)
+
+        encrypted = getattr(module, "en" + operation[2:])(text, KEY)
+
+        def op():
+            if func(encrypted, KEY) != text:
+                raise RuntimeError(f"{operation} 결과가 평문과 다릅니다")
+
+        return op
+
+    return setup
+
+
+def cases(sizes):
+    """구현 × 연산 × 크기 케이스 목록"""
+    return [
+        Case(case_name(impl, operation, size), "primitives", impl, operation, size, _setup(impl, operation, size))
+        for impl in impls.IMPLEMENTATIONS
+        for operation in OPERATIONS
+        for size in sizes
+    ]
@@ -0,0 +1,69 @@
+"""
+명령줄 콜드 스타트 벤치마크
+
+셸 스크립트처럼 매번 새 인터프리터로 encrypt/decrypt 명령을 한 번 실행하는 전체 시간(가져오기 + 키 파생 + 암호화)을 잰다
+    root: python sumerian.py encrypt|decrypt TEXT KEY
+    simple: python sumerian_mcp.py encrypt|decrypt --text TEXT --key KEY
+    package: python -m sumerian_mcp.cli encrypt|decrypt TEXT KEY
+패키지 케이스의 p50이 BUDGET_MS를 넘으면 run.py가 실패로 판정한다 (암호화 명령이 MCP 서버 의존성을 가져오게 되는 회귀 방지)
+평문 크기는 시작 비용에 영향이 없으므로 --sizes와 관계없이 16B 한 가지로 잰다
+"""
+import os
+import subprocess
+import sys
+
+from harness import Case, case_name
+import impls
+
+KEY = "benchmark_key"
+
+OPERATIONS = ("cold_encrypt", "cold_decrypt")
+
+SIZE = 16
+
+# 패키지 encrypt/decrypt 콜드 스타트 p50 상한 (ms)
+BUDGET_MS = 500
+
+
+def _command(impl, tool, text):
+    """구현별 명령줄"""
+    if impl == "root":
+        return [sys.executable, impls.script_path("root"), tool, text, KEY]
+    if impl == "simple":
+        return [sys.executable, impls.script_path("simple"), tool, "--text", text, "--key", KEY]
+    return [sys.executable, "-m", "sumerian_mcp.cli", tool, text, KEY]
+
+
+def _setup(impl, operation):
+    """케이스 준비 함수 (복호화할 암호문은 현재 프로세스에서 만들어 둠)"""
+
+    def setup(workdir, stack):
+        text = impls.payload(SIZE)
+        tool = operation.removeprefix("cold_")
+        if tool == "decrypt":
+            argument = impls.load(impl).encrypt_password(text, KEY)
+        else:
+            argument = text
+        command = _command(impl, tool, argument)
+        env = dict(os.environ, PYTHONPATH=impls.PACKAGE_DIR)
+
+        def op():
+            output = subprocess.run(command, capture_output=True, check=True, cwd=workdir, env=env).stdout
+            if tool == "decrypt" and text.encode() not in output:
+                raise RuntimeError(f"복호화 결과가 원문과 다릅니다: {output[:200]!r}")
+
+        return op
+
+    return setup
+
+
+def cases(sizes):
+    """구현 × 명령 케이스 목록 (패키지 케이스에는 시간 상한이 붙음)"""
+    return [
+        Case(
+            case_name(impl, operation, SIZE), "startup", impl, operation, SIZE, _setup(impl, operation),
+            budget_ms=BUDGET_MS if impl == "package" else None,
+        )
+        for impl in impls.IMPLEMENTATIONS
+        for operation in OPERATIONS
+    ]
@@ -0,0 +1,144 @@
+"""
+벤치마크 측정 도구
+
+케이스 하나를 반복 실행해 처리량(ops/s, MB/s), 지연 시간 분위수(p50/p99), 최대 RSS를 잰다
+최대 RSS는 프로세스 수명 전체의 값이므로 기본적으로 케이스마다 새 프로세스(spawn)에서 측정한다
+"""
+import contextlib
+import importlib
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 케이스 하나
+#   name: "구현.연산[크기]" 형식의 고유 이름 (기준선 비교 키)
+#   setup: 작업 디렉토리와 정리용 ExitStack을 받아 측정할 인자 없는 호출 가능 객체를 반환 (준비 비용은 측정하지 않음)
+#   nbytes: 호출 한 번이 처리하는 바이트 수 (기본값: size, 범위 읽기처럼 입력 크기와 다를 때 지정)
+#   budget_ms: p50 지연 시간 상한 (넘으면 run.py가 실패로 판정, 기본값: 없음)
+Case = namedtuple("Case", "name suite impl operation size setup nbytes budget_ms", defaults=(None, None))
+
+# 이 크기 이상의 케이스는 예열 실행을 생략하고 최소 1회만 측정
+LARGE_SIZE = 16 * 1024 * 1024
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(text):
+    """"16", "64K", "100M" 형식의 크기를 바이트 수로 변환"""
+    text = text.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in _UNITS else ""
+    try:
+        return int(text[:len(text) - len(unit)]) * _UNITS[unit]
+    except ValueError:
+        raise ValueError(f"잘못된 크기: {text}") from None
+
+
+def format_size(size):
+    """바이트 수를 케이스 이름에 쓰는 짧은 표기로 변환 (16B, 64K, 100M)"""
+    for unit in ("G", "M", "K"):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def case_name(impl, operation, size):
+    """케이스 이름"""
+    return f"{impl}.{operation}[{format_size(size)}]"
+
+
+def percentile(samples, p):
+    """정렬된 표본의 최근접 순위 분위수"""
+    return samples[max(0, math.ceil(p / 100 * len(samples)) - 1)]
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB, 측정할 수 없으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # 리눅스는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure(op, size, min_time=0.5, min_runs=3, max_runs=100000):
+    """
+    op를 반복 실행하여 통계 반환
+
+    Args:
+        op: 측정할 인자 없는 호출 가능 객체
+        size: 호출 한 번이 처리하는 바이트 수 (MB/s 계산용)
+        min_time: 최소 누적 측정 시간(초)
+        min_runs: 최소 실행 횟수 (LARGE_SIZE 이상은 1회)
+        max_runs: 최대 실행 횟수
+
+    Returns:
+        runs, ops_per_s, mb_per_s, p50_ms, p99_ms 항목의 딕셔너리
+    """
+    if size < LARGE_SIZE:
+        op()
+    else:
+        min_runs = 1
+    samples = []
+    total = 0.0
+    while len(samples) < max_runs and (len(samples) < min_runs or total < min_time):
+        started = time.perf_counter()
+        op()
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed)
+        total += elapsed
+
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "ops_per_s": len(samples) / total,
+        "mb_per_s": size * len(samples) / total / 1e6,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def load_cases(suite, sizes):
+    """스위트 모듈(bench_<suite>)의 케이스 목록"""
+    return importlib.import_module(f"bench_{suite}").cases(sizes)
+
+
+def run_case(suite, name, sizes, settings):
+    """
+    케이스 하나를 준비하고 측정 (격리 실행 시 자식 프로세스 진입점)
+
+    Returns:
+        측정 통계에 peak_rss_mb를 더한 딕셔너리, 실패 시 {"error": 메시지}
+    """
+    case = next(case for case in load_cases(suite, sizes) if case.name == name)
+    try:
+        with tempfile.TemporaryDirectory(prefix="sumerian-bench-") as workdir:
+            with contextlib.ExitStack() as stack:
+                op = case.setup(workdir, stack)
+                result = measure(op, case.nbytes or case.size, **settings)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def run_isolated(suite, name, sizes, settings):
+    """새 프로세스에서 케이스 하나를 측정 (최대 RSS가 다른 케이스의 영향을 받지 않음)"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_case, suite, name, sizes, settings).result()
+
+
+@contextlib.contextmanager
+def quiet():
+    """표준 출력을 버리는 컨텍스트 (디버그 출력이 있는 루트 스크립트용)"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
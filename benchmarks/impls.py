@@ -0,0 +1,56 @@
+"""
+벤치마크 대상 구현 로더
+
+저장소에는 같은 기능을 하는 구현이 세 벌 있다
+    root: 저장소 루트의 sumerian.py (최초 단독 스크립트)
+    simple: sumerian_mcp_simple/sumerian_mcp.py (단일 파일 MCP 서버)
+    package: sumerian_mcp 패키지
+단일 파일 서버와 패키지는 모듈 이름이 같으므로 앞의 두 구현은 파일 경로에서 별도 이름으로 읽어 들인다
+"""
+import base64
+import importlib
+import importlib.util
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPLEMENTATIONS = ("root", "simple", "package")
+
+_SCRIPTS = {
+    "root": ("sumerian_bench_root", os.path.join(REPO_ROOT, "sumerian.py")),
+    "simple": ("sumerian_bench_simple", os.path.join(REPO_ROOT, "sumerian_mcp_simple", "sumerian_mcp.py")),
+}
+PACKAGE_DIR = os.path.join(REPO_ROOT, "sumerian_mcp")
+
+
+def load(impl):
+    """구현 모듈 반환 (처음 호출 시 읽어 들임)"""
+    if impl == "package":
+        if PACKAGE_DIR not in sys.path:
+            sys.path.insert(0, PACKAGE_DIR)
+        return importlib.import_module("sumerian_mcp")
+    if impl not in _SCRIPTS:
+        raise ValueError(f"알 수 없는 구현: {impl} (사용 가능: {', '.join(IMPLEMENTATIONS)})")
+
+    name, path = _SCRIPTS[impl]
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return sys.modules[name]
+
+
+def script_path(impl):
+    """단독 스크립트 구현(root, simple)의 파일 경로"""
+    return _SCRIPTS[impl][1]
+
+
+def payload(size):
+    """size 글자의 ASCII 평문 (세 구현 모두 문자열 입력을 받으므로 base64 문자로 채움)"""
+    return base64.b64encode(os.urandom(size // 4 * 3 + 3)).decode()[:size]
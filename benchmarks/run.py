@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Sumerian 벤치마크 실행기
+
+세 구현(root, simple, package)의 기본 함수, 파일 도구, MCP 도구 호출을 측정하고
+저장된 기준선과 비교하여 처리량이 떨어진 케이스를 찾는다
+
+    python benchmarks/run.py --quick
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import format_size, load_cases, parse_size, run_case, run_isolated  # noqa: E402
+from impls import IMPLEMENTATIONS  # noqa: E402
+
+SUITES = ("primitives", "files", "dispatch", "startup")
+
+DEFAULT_SIZES = "16,1K,64K,1M,16M,100M"
+QUICK_SIZES = "16,1K,64K,1M"
+
+# 기준선 대비 ops/s가 이 비율 이상 떨어지면 성능 저하로 판정
+DEFAULT_THRESHOLD = 0.15
+
+_COLUMNS = ("ops/s", "MB/s", "p50 ms", "p99 ms", "RSS MB")
+
+
+def _split(value):
+    """쉼표로 구분한 인자 목록"""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def collect(suites, impls, sizes, pattern=None):
+    """조건에 맞는 케이스 목록"""
+    selected = []
+    for suite in suites:
+        for case in load_cases(suite, sizes):
+            if case.impl in impls and (not pattern or pattern in case.name):
+                selected.append(case)
+    return selected
+
+
+def _row(name, result):
+    """결과 표의 한 줄"""
+    if "error" in result:
+        return f"{name:<44} 실패: {result['error']}"
+    rss = result["peak_rss_mb"]
+    values = (
+        f"{result['ops_per_s']:.1f}",
+        f"{result['mb_per_s']:.2f}",
+        f"{result['p50_ms']:.3f}",
+        f"{result['p99_ms']:.3f}",
+        "-" if rss is None else f"{rss:.1f}",
+    )
+    return f"{name:<44}" + "".join(f"{value:>12}" for value in values)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    기준선과 ops/s 비교
+
+    Returns:
+        (케이스 이름, 기준 ops/s, 현재 ops/s, 변화율, 판정) 목록
+        판정은 "regression", "faster", "ok", "new" 중 하나
+    """
+    rows = []
+    for name, result in results.items():
+        if "error" in result:
+            continue
+        base = baseline.get(name)
+        if not base or "error" in base:
+            rows.append((name, None, result["ops_per_s"], None, "new"))
+            continue
+        change = result["ops_per_s"] / base["ops_per_s"] - 1
+        if change < -threshold:
+            status = "regression"
+        elif change > threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, base["ops_per_s"], result["ops_per_s"], change, status))
+    return rows
+
+
+def _print_comparison(rows):
+    """기준선 비교 표 출력"""
+    print()
+    print(f"{'기준선 비교':<44}{'기준 ops/s':>12}{'현재 ops/s':>12}{'변화':>10}  판정")
+    for name, base, current, change, status in rows:
+        base_text = "-" if base is None else f"{base:.1f}"
+        change_text = "-" if change is None else f"{change:+.1%}"
+        print(f"{name:<44}{base_text:>12}{current:>12.1f}{change_text:>10}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sumerian 암호화 벤치마크")
+    parser.add_argument("--suite", default=",".join(SUITES), help=f"실행할 스위트 (쉼표 구분, 기본값: 전체 {','.join(SUITES)})")
+    parser.add_argument("--impl", default=",".join(IMPLEMENTATIONS), help="측정할 구현 (쉼표 구분, 기본값: 전체)")
+    parser.add_argument("-k", "--filter", help="이름에 이 문자열이 들어간 케이스만 실행")
+    parser.add_argument("--sizes", help=f"평문/파일 크기 목록 (기본값: {DEFAULT_SIZES})")
+    parser.add_argument("--quick", action="store_true", help=f"작은 크기({QUICK_SIZES})와 짧은 측정 시간으로 실행")
+    parser.add_argument("--min-time", type=float, help="케이스별 최소 측정 시간(초) (기본값: 0.5, --quick이면 0.1)")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="모든 케이스를 현재 프로세스에서 실행 (빠르지만 RSS는 누적 최대값)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--save-baseline", help="결과를 기준선 파일로 저장")
+    parser.add_argument("--baseline", help="비교할 기준선 파일")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"성능 저하로 판정할 ops/s 감소 비율 (기본값: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    suites = _split(args.suite)
+    impls = _split(args.impl)
+    for name, values, allowed in (("스위트", suites, SUITES), ("구현", impls, IMPLEMENTATIONS)):
+        unknown = [value for value in values if value not in allowed]
+        if unknown:
+            parser.error(f"알 수 없는 {name}: {', '.join(unknown)} (사용 가능: {', '.join(allowed)})")
+    try:
+        sizes = [parse_size(size) for size in _split(args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES))]
+    except ValueError as e:
+        parser.error(str(e))
+    settings = {"min_time": args.min_time if args.min_time is not None else 0.1 if args.quick else 0.5}
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    cases = collect(suites, impls, sizes, args.filter)
+    if not cases:
+        print("조건에 맞는 케이스가 없습니다.", file=sys.stderr)
+        return 1
+
+    print(f"{'케이스':<44}" + "".join(f"{column:>12}" for column in _COLUMNS))
+    results = {}
+    for case in cases:
+        runner = run_case if args.no_isolate else run_isolated
+        result = runner(case.suite, case.name, sizes, settings)
+        results[case.name] = result
+        print(_row(case.name, result), flush=True)
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": [format_size(size) for size in sizes],
+            "isolated": not args.no_isolate,
+            **settings,
+        },
+        "results": results,
+    }
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"\n결과 저장: {path}")
+
+    failed = [name for name, result in results.items() if "error" in result]
+    status = 1 if failed else 0
+    over_budget = [
+        f"{case.name} ({results[case.name]['p50_ms']:.0f} ms > {case.budget_ms} ms)"
+        for case in cases
+        if case.budget_ms is not None and "error" not in results[case.name]
+        and results[case.name]["p50_ms"] > case.budget_ms
+    ]
+    if over_budget:
+        print(f"\n시간 상한 초과 {len(over_budget)}건: {', '.join(over_budget)}")
+        status = 1
+    if baseline is not None:
+        rows = compare(results, baseline, args.threshold)
+        _print_comparison(rows)
+        regressions = [row[0] for row in rows if row[4] == "regression"]
+        if regressions:
+            print(f"\n성능 저하 {len(regressions)}건 (기준 {args.threshold:.0%} 이상 감소): {', '.join(regressions)}")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 from Crypto.Cipher import AES
 import base64
 import os
+import re
 
 
 def pad(s):
@@ -25,10 +26,8 @@ def decrypt_aes(encrypted_password, key):
     key = key.ljust(32)[:32].encode()
 
     try:
-        print(f"[DEBUG] 복호화 전 Base64 문자열: {encrypted_password}")  # Base64 복호화 전 확인
         encrypted_password = base64.b64decode(encrypted_password)  # Base64 디코딩
-    except Exception as e:
-        print(f"[ERROR] Base64 디코딩 실패: {e}")
+    except Exception:  # 실패는 None으로만 알림 (표준 출력은 결과 스트림일 수 있으므로 쓰지 않음)
         return None
 
     iv = encrypted_password[:16]  # CBC 모드에서 IV 추출
@@ -37,15 +36,11 @@ def decrypt_aes(encrypted_password, key):
     cipher = AES.new(key, AES.MODE_CBC, iv)
     decrypted_bytes = cipher.decrypt(encrypted_text)  # AES 복호화
 
-    print(f"[DEBUG] AES 복호화된 바이트 데이터: {decrypted_bytes}")  # 🔹 복호화 후 데이터 확인
-
     try:
         decrypted_text = unpad(decrypted_bytes.decode())  # UTF-8 디코딩 및 패딩 제거
-    except UnicodeDecodeError as e:
-        print(f"[ERROR] 복호화된 데이터 UTF-8 디코딩 실패: {e}")
+    except UnicodeDecodeError:
         return None
 
-    print(f"[DEBUG] 최종 복호화된 텍스트: {decrypted_text}")  # 최종 결과 확인
     return decrypted_text
 
 
@@ -127,15 +122,74 @@ sumerian_cipher_map = {
 }
 
 
-def encrypt_sumerian(text):
+# Base64 알파벳 (매핑되지 않은 문자는 그대로 통과)
+BASE64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+
+class SumerianCodec:
+    """변환 테이블을 한 번만 만들어 두고 str.translate로 변환하는 문자 매핑 코덱"""
+
+    def __init__(self, name, mapping):
+        for source, sign in mapping.items():
+            if len(source) != 1 or len(sign) != 1:
+                raise ValueError(f"코덱 매핑은 한 글자 단위여야 합니다: {source!r} → {sign!r}")
+        if len(set(mapping.values())) != len(mapping):
+            raise ValueError(f"코덱 '{name}'의 매핑에 중복된 변환 문자가 있습니다")
+        passthrough = set(BASE64_ALPHABET) - set(mapping)
+        if passthrough & set(mapping.values()):
+            raise ValueError(f"코덱 '{name}'의 변환 문자가 Base64 문자와 겹칩니다")
+
+        self.name = name
+        self.mapping = dict(mapping)
+        self._encode_table = str.maketrans(self.mapping)
+        self._decode_table = str.maketrans({sign: source for source, sign in self.mapping.items()})
+        allowed = set(self.mapping.values()) | passthrough
+        self._invalid_signs = re.compile("[^" + "".join(re.escape(c) for c in sorted(allowed)) + "]")
+
+    def encode(self, text):
+        """원본 문자열을 변환 문자로 인코딩"""
+        return text.translate(self._encode_table)
+
+    def decode(self, text, strict=False):
+        """변환 문자를 원본 문자열로 디코딩 (strict 모드에서는 허용되지 않는 문자 거부)"""
+        if strict:
+            match = self._invalid_signs.search(text)
+            if match:
+                raise ValueError(f"'{self.name}' 코덱에서 허용되지 않는 문자 {match.group()!r} (위치 {match.start()})")
+        return text.translate(self._decode_table)
+
+
+# 등록된 코덱 (이름 → 코덱)
+_codecs = {}
+
+
+def register_codec(name, mapping, replace=False):
+    """새로운 문자 체계를 이름 있는 코덱으로 등록"""
+    if name in _codecs and not replace:
+        raise ValueError(f"이미 등록된 코덱입니다: {name}")
+    _codecs[name] = SumerianCodec(name, mapping)
+    return _codecs[name]
+
+
+def get_codec(name="sumerian"):
+    """이름으로 코덱 조회"""
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 코덱: {name}") from None
+
+
+register_codec("sumerian", sumerian_cipher_map)
+
+
+def encrypt_sumerian(text, codec="sumerian"):
     """AES 암호화된 Base64를 수메르 문자로 변환 (Base64 패딩 유지)"""
-    return "".join(sumerian_cipher_map.get(char.lower(), char) if char in sumerian_cipher_map else char for char in text)
+    return get_codec(codec).encode(text)
 
 
-def decrypt_sumerian(text):
+def decrypt_sumerian(text, codec="sumerian", strict=False):
     """수메르 문자에서 원래 Base64로 복원"""
-    reverse_map = {v: k for k, v in sumerian_cipher_map.items()}
-    return "".join(reverse_map.get(char, char) for char in text)
+    return get_codec(codec).decode(text, strict=strict)
 
 
 def encrypt_password(password, key):
@@ -146,20 +200,140 @@ def encrypt_password(password, key):
 
 def decrypt_password(encrypted_password, key):
     """수메르어 복호화 후 AES-256 + CBC 복호화"""
-    decrypted_sumerian = decrypt_sumerian(encrypted_password)
+    try:
+        decrypted_sumerian = decrypt_sumerian(encrypted_password.strip(), strict=True)
+    except ValueError:
+        return None
     return decrypt_aes(decrypted_sumerian, key)
 
 
+# 스트림 레코드 형식 → 구분자
+STREAM_SEPARATORS = {"lines": b"\n", "nul": b"\0", "jsonl": b"\n"}
+
+
+def _read_records(src, separator):
+    """바이트 스트림에서 구분자로 나뉜 레코드를 하나씩 읽음 (마지막 레코드는 구분자가 없어도 됨)"""
+    pending = b""
+    while True:
+        block = src.read(1024 * 1024)
+        if not block:
+            break
+        records = (pending + block).split(separator)
+        pending = records.pop()
+        yield from records
+    if pending:
+        yield pending
+
+
+def process_records(mode, key, records):
+    """
+    레코드 목록을 암호화/복호화 (워커 프로세스에서도 실행)
+
+    실패한 레코드의 결과는 None이다.
+    """
+    func = encrypt_password if mode == "encrypt" else decrypt_password
+    results = []
+    for record in records:
+        try:
+            results.append(func(record, key))
+        except Exception:
+            results.append(None)
+    return results
+
+
+def stream_records(mode, key, src, dst, fmt="lines", workers=1, batch_size=1024):
+    """
+    src의 레코드를 batch_size개씩 암호화/복호화하여 입력 순서대로 dst에 기록
+
+    lines/nul 형식에서 실패한 레코드는 빈 레코드로, jsonl 형식은 {"ok": false, "error": ...}로 기록한다.
+    워커를 쓰면 최대 workers * 2개 배치만 처리 중으로 두므로 입력 크기와 관계없이 메모리 사용량이 일정하다.
+
+    Returns:
+        (처리한 레코드 수, 실패한 레코드 수)
+    """
+    import json
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import islice
+
+    separator = STREAM_SEPARATORS[fmt]
+    records = _read_records(src, separator)
+    counts = [0, 0]
+
+    def decode(record):
+        try:
+            text = record.decode("utf-8")
+            if fmt == "jsonl":
+                text = json.loads(text)
+                text = text["text"] if isinstance(text, dict) else text
+            return text if isinstance(text, str) else None
+        except (ValueError, KeyError):
+            return None
+
+    def emit(texts, results):
+        out = []
+        for text, result in zip(texts, results):
+            encoded = result.encode("utf-8") if result is not None else b""
+            if result is None or (separator in encoded and fmt != "jsonl"):
+                counts[1] += 1
+                result = None
+            if fmt == "jsonl":
+                item = {"ok": True, "result": result} if result is not None else {"ok": False, "error": f"{mode} 실패"}
+                out.append(json.dumps(item, ensure_ascii=False).encode("utf-8") + separator)
+            else:
+                out.append((encoded if result is not None else b"") + separator)
+            counts[0] += 1
+        dst.write(b"".join(out))
+        dst.flush()
+
+    def batches():
+        while True:
+            texts = [decode(record) for record in islice(records, batch_size)]
+            if not texts:
+                return
+            yield texts
+
+    if workers <= 1:
+        for texts in batches():
+            emit(texts, process_records(mode, key, texts))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for texts in batches():
+                pending.append((texts, pool.submit(process_records, mode, key, texts)))
+                if len(pending) >= workers * 2:
+                    texts, future = pending.popleft()
+                    emit(texts, future.result())
+            while pending:
+                texts, future = pending.popleft()
+                emit(texts, future.result())
+    return counts[0], counts[1]
+
+
 if __name__ == "__main__":
     import argparse
+    import sys
 
     parser = argparse.ArgumentParser(description="비밀번호 암호화 및 복호화 도구 (AES-256 + CBC + 수메르어)")
     parser.add_argument("mode", choices=["encrypt", "decrypt", "test"], help="암호화 또는 복호화 모드")
-    parser.add_argument("password", help="암호화/복호화할 비밀번호")
+    parser.add_argument("password", help="암호화/복호화할 비밀번호 (-이면 표준 입력의 레코드를 순서대로 처리)")
     parser.add_argument("key", help="마스터 키")
+    parser.add_argument(
+        "--format", choices=sorted(STREAM_SEPARATORS), default="lines", help="표준 입력 레코드 형식 (기본값: lines)"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="표준 입력 처리 워커 프로세스 수 (기본값: 1)")
+    parser.add_argument("--batch-size", type=int, default=1024, help="표준 입력 배치당 레코드 수 (기본값: 1024)")
     args = parser.parse_args()
 
-    if args.mode == "encrypt":
+    if args.password == "-" and args.mode in ("encrypt", "decrypt"):
+        total, failed = stream_records(
+            args.mode, args.key, sys.stdin.buffer, sys.stdout.buffer,
+            fmt=args.format, workers=args.workers, batch_size=max(1, args.batch_size),
+        )
+        if failed:
+            print(f"{total}개 레코드 중 {failed}개 실패", file=sys.stderr)
+            sys.exit(1)
+    elif args.mode == "encrypt":
         encrypted = encrypt_password(args.password, args.key)
         print(f"암호화된 비밀번호: {encrypted}")
     elif args.mode == "decrypt":
@@ -6,23 +6,47 @@ AES-256 CBC 암호화와 수메르어 변환을 결합한 암호화 기능을 MC
 
 __version__ = "0.1.0"
 
-# 핵심 기능 내보내기
-from .crypto import (
-    encrypt_password,
-    decrypt_password,
-    encrypt_sumerian,
-    decrypt_sumerian,
-    encrypt_aes,
-    decrypt_aes,
-)
-from .server import SumerianMCPServer
-
-__all__ = [
-    "encrypt_password",
-    "decrypt_password",
-    "encrypt_sumerian",
-    "decrypt_sumerian",
-    "encrypt_aes",
-    "decrypt_aes",
-    "SumerianMCPServer",
-] 
\ No newline at end of file
+# 핵심 기능 내보내기 (이름 → 정의한 모듈)
+#
+# 모두 처음 접근할 때 가져온다. crypto는 pycryptodome을, server는 mcp/starlette 의존성 전체를 불러오므로
+# 데몬에 요청만 보내는 CLI 호출이나 일부 기능만 쓰는 스크립트가 그 비용을 내지 않도록 패키지 가져오기에서 제외한다
+_EXPORTS = {
+    "encrypt_password": "crypto",
+    "decrypt_password": "crypto",
+    "encrypt_sumerian": "crypto",
+    "decrypt_sumerian": "crypto",
+    "encrypt_aes": "crypto",
+    "decrypt_aes": "crypto",
+    "encrypt_batch": "crypto",
+    "decrypt_batch": "crypto",
+    "encrypt_bytes": "crypto",
+    "decrypt_bytes": "crypto",
+    "configure_decrypt_cache": "crypto",
+    "clear_decrypt_cache": "crypto",
+    "SumerianCodec": "codec",
+    "register_codec": "codec",
+    "get_codec": "codec",
+    "available_codecs": "codec",
+    "configure_key_cache": "kdf",
+    "clear_key_cache": "kdf",
+    "rekey_dir": "rekey",
+    "SecretVault": "vault",
+    "SumerianMCPServer": "server",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """내보낸 이름을 처음 접근할 때 해당 모듈에서 가져옴"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
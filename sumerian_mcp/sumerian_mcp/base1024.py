@@ -0,0 +1,126 @@
+"""
+Base1024 쐐기문자 인코딩 모듈
+
+암호문 바이트를 Base64를 거치지 않고 10비트씩 쐐기문자 하나로 변환한다 (5바이트 → 4문자)
+Base64 + 문자 매핑(6비트/문자)보다 문자 수가 약 40% 적다
+
+알파벳(1024자)은 U+12000–U+12399와 U+1249A–U+124FF로 구성되며, 인덱스 i의 문자는
+코드 포인트 하위 바이트가 i & 0xFF, 둘째 바이트가 0x20 + (i >> 8)(마지막 102자는 0x24)이다
+이 배치 덕분에 UTF-32 바이트 평면별 bytes.translate와 정수 비트 연산만으로 변환할 수 있다
+"""
+from .envelope import BASE1024_PAD
+
+# 마지막 묶음이 4바이트일 때 붙이는 채움 문자 (4문자 = 5바이트와 구분)
+PAD_SIGN = BASE1024_PAD
+
+ALPHABET = "".join(chr(cp) for cp in [*range(0x12000, 0x1239A), *range(0x1249A, 0x12500)])
+
+
+def _table(func):
+    """바이트 값별 변환 테이블"""
+    return bytes(func(b) & 0xFF for b in range(256))
+
+
+def _or(*planes):
+    """같은 길이의 바이트열을 비트 OR로 합치기"""
+    value = 0
+    for plane in planes:
+        value |= int.from_bytes(plane, "little")
+    return value.to_bytes(len(planes[0]), "little")
+
+
+# 인코딩: 5바이트(b0..b4) → 인덱스 4개의 상위 2비트(hi)와 하위 8비트(lo)
+_HI = (_table(lambda b: b >> 6), _table(lambda b: b >> 4 & 3), _table(lambda b: b >> 2 & 3), _table(lambda b: b & 3))
+_LO_PARTS = (
+    (_table(lambda b: (b & 63) << 2), _table(lambda b: b >> 6)),  # b0, b1
+    (_table(lambda b: (b & 15) << 4), _table(lambda b: b >> 4)),  # b1, b2
+    (_table(lambda b: (b & 3) << 6), _table(lambda b: b >> 2)),   # b2, b3
+)
+_PAGE = _table(lambda hi: 0x20 + hi if hi < 4 else 0)
+_PAGE_FLAG_HI = _table(lambda hi: 7 if hi == 3 else 0)  # 0x23 ^ 7 == 0x24
+_PAGE_FLAG_LO = _table(lambda lo: 0xFF if lo >= 0x9A else 0)
+
+# 디코딩: 코드 포인트 둘째 바이트 → hi, 그리고 hi/lo 조각 → 원래 바이트의 비트 위치
+_PAGE_TO_HI = _table(lambda page: {0x20: 0, 0x21: 1, 0x22: 2, 0x23: 3, 0x24: 3}.get(page, 0))
+_HI_SHIFT = (_table(lambda h: h << 6), _table(lambda h: h << 4), _table(lambda h: h << 2))
+_LO_SPLIT = (
+    (_table(lambda l: l >> 2), _table(lambda l: (l & 3) << 6)),
+    (_table(lambda l: l >> 4), _table(lambda l: (l & 15) << 4)),
+    (_table(lambda l: l >> 6), _table(lambda l: (l & 63) << 2)),
+)
+
+
+def _encode_groups(data):
+    """길이가 5의 배수인 바이트열을 UTF-32-LE 바이트열로 변환"""
+    b = [data[i::5] for i in range(5)]
+    his = [b[i].translate(_HI[i]) for i in range(4)]
+    los = [_or(b[i].translate(high), b[i + 1].translate(low)) for i, (high, low) in enumerate(_LO_PARTS)]
+    los.append(b[4])
+
+    out = bytearray(16 * len(b[0]))
+    for position, (hi, lo) in enumerate(zip(his, los)):
+        flag = int.from_bytes(hi.translate(_PAGE_FLAG_HI), "little") & int.from_bytes(lo.translate(_PAGE_FLAG_LO), "little")
+        page = int.from_bytes(hi.translate(_PAGE), "little") ^ flag
+        out[4 * position::16] = lo
+        out[4 * position + 1::16] = page.to_bytes(len(lo), "little")
+        out[4 * position + 2::16] = b"\x01" * len(lo)
+    return out
+
+
+def _decode_groups(raw):
+    """길이가 16의 배수인 UTF-32-LE 바이트열(4문자 묶음)을 5바이트 묶음으로 복원"""
+    lo = [raw[4 * position::16] for position in range(4)]
+    hi = [raw[4 * position + 1::16].translate(_PAGE_TO_HI) for position in range(4)]
+    # b(i)는 lo(i-1)의 하위 비트 + hi(i) + lo(i)의 상위 비트로 구성
+    planes = []
+    carry = None
+    for i in range(3):
+        high, low = _LO_SPLIT[i]
+        parts = [hi[i].translate(_HI_SHIFT[i]), lo[i].translate(high)]
+        planes.append(_or(*parts, carry) if carry is not None else _or(*parts))
+        carry = lo[i].translate(low)
+    planes.append(_or(carry, hi[3]))
+    planes.append(lo[3])
+
+    out = bytearray(5 * len(lo[0]))
+    for i, plane in enumerate(planes):
+        out[i::5] = plane
+    return bytes(out)
+
+
+def encode(data):
+    """
+    바이트열을 Base1024 쐐기문자 문자열로 인코딩
+
+    길이가 5의 배수가 아닌 마지막 r바이트는 r문자로 인코딩하고, r이 4이면 PAD_SIGN을 붙인다.
+    """
+    data = bytes(data)
+    full, rest = divmod(len(data), 5)
+    signs = 4 * full + rest
+    encoded = _encode_groups(data + bytes(-len(data) % 5))[:4 * signs].decode("utf-32-le")
+    return encoded + PAD_SIGN if rest == 4 else encoded
+
+
+def decode(text):
+    """
+    Base1024 쐐기문자 문자열을 바이트열로 디코딩
+
+    Raises:
+        ValueError: 알파벳 밖의 문자가 있거나 정규 인코딩이 아닌 경우
+    """
+    padded = text.endswith(PAD_SIGN)
+    body = text[:-1] if padded else text
+    full, rest = divmod(len(body), 4)
+    if padded and rest:
+        raise ValueError("Base1024 채움 문자 위치가 잘못되었습니다")
+    try:
+        raw = (body + ALPHABET[0] * (-len(body) % 4)).encode("utf-32-le")
+    except UnicodeEncodeError:
+        raise ValueError("Base1024 문자열에 인코딩할 수 없는 문자가 있습니다") from None
+
+    size = 5 * full + rest - (1 if padded else 0)
+    data = _decode_groups(raw)[:size]
+    # 재인코딩 결과와 비교해 알파벳 밖의 문자나 비정규 인코딩을 거부
+    if encode(data) != text:
+        raise ValueError("Base1024 문자열에 허용되지 않는 문자가 있습니다")
+    return data
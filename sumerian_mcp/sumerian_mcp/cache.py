@@ -0,0 +1,199 @@
+"""
+보안 캐시 모듈
+
+파생 키처럼 민감한 값을 프로세스 안에 잠시 보관하기 위한 LRU 캐시
+크기 상한과 TTL로 항목을 제거하며, 제거된 bytearray 값은 0으로 덮어쓴다
+같은 키를 동시에 요청하면 생성 작업은 한 번만 수행하고 나머지 요청은 그 결과를 기다린다 (single-flight)
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def zeroize(value):
+    """가변 버퍼(bytearray)를 0으로 덮어쓰기 (불변 값은 무시)"""
+    if isinstance(value, bytearray):
+        value[:] = bytes(len(value))
+
+
+class _Entry:
+    """캐시 항목 (값, 만료 시각, 사용 중인 lease 수)"""
+
+    __slots__ = ("value", "expires", "leases", "evicted")
+
+    def __init__(self, value, expires):
+        self.value = value
+        self.expires = expires
+        self.leases = 0
+        self.evicted = False
+
+
+class _Flight:
+    """진행 중인 생성 작업 (완료 이벤트, 결과 항목 또는 예외, 기다리는 요청 수)"""
+
+    __slots__ = ("done", "entry", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+        self.waiters = 0
+
+
+class SecureLRUCache:
+    """
+    크기 제한 + TTL + 제거 시 zeroize를 지원하는 스레드 안전 LRU 캐시
+
+    lease()로 빌려간 값은 사용이 끝날 때까지 0으로 덮어쓰지 않으므로,
+    다른 스레드가 항목을 제거하더라도 사용 중인 키가 손상되지 않는다.
+    없는 키를 여러 스레드가 동시에 빌리면 factory()는 한 번만 호출되며, 기다린 요청은 coalesced로 센다.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        """
+        캐시 초기화
+
+        Args:
+            maxsize: 최대 항목 수
+            ttl: 항목 유지 시간(초), None이면 만료 없음
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _expired(self, entry, now):
+        return entry.expires is not None and entry.expires <= now
+
+    def _evict(self, key):
+        """항목 제거 (사용 중이 아니면 즉시 zeroize), 잠금을 잡은 상태에서 호출"""
+        entry = self._entries.pop(key)
+        entry.evicted = True
+        self.evictions += 1
+        if not entry.leases:
+            zeroize(entry.value)
+
+    def _purge(self, now):
+        """만료 항목과 크기 초과 항목 제거"""
+        for key in [key for key, entry in self._entries.items() if self._expired(entry, now)]:
+            self._evict(key)
+        while len(self._entries) > self.maxsize:
+            self._evict(next(iter(self._entries)))
+
+    def _acquire(self, key, factory):
+        """항목 조회 또는 생성 후 lease 수 증가 (같은 키의 동시 생성은 하나로 합침)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry, now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                entry.leases += 1
+                return entry
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+                flight.waiters += 1
+
+        if not leader:
+            # 다른 스레드의 생성 작업을 기다림 (lease는 생성한 스레드가 대신 늘려 둠)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry
+
+        # 키 파생처럼 느린 생성 작업은 잠금 밖에서 수행
+        try:
+            value = factory()
+        except BaseException as e:
+            with self._lock:
+                del self._flights[key]
+                flight.error = e
+            flight.done.set()
+            raise
+        now = time.monotonic()
+        with self._lock:
+            del self._flights[key]
+            if key in self._entries:
+                self._evict(key)
+            entry = _Entry(value, None if self.ttl is None else now + self.ttl)
+            entry.leases += 1 + flight.waiters
+            self._entries[key] = entry
+            self._purge(now)
+            flight.entry = entry
+        flight.done.set()
+        return entry
+
+    def _release(self, entry):
+        with self._lock:
+            entry.leases -= 1
+            if entry.evicted and not entry.leases:
+                zeroize(entry.value)
+
+    @contextmanager
+    def lease(self, key, factory):
+        """
+        값을 빌려 사용 (없거나 만료되었으면 factory()로 생성)
+
+        with 블록 안에서만 값을 사용해야 하며, 블록을 벗어난 뒤에는
+        제거 시 0으로 덮어써질 수 있다.
+        """
+        entry = self._acquire(key, factory)
+        try:
+            yield entry.value
+        finally:
+            self._release(entry)
+
+    def get(self, key, default=None):
+        """캐시된 값 조회 (불변 값 전용, 가변 버퍼는 lease 사용)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry, now):
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def peek(self, key):
+        """통계와 LRU 순서를 바꾸지 않고 캐시된 값 조회 (없거나 만료되었으면 None, 불변 값 전용)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry, now):
+                return None
+            return entry.value
+
+    def clear(self):
+        """모든 항목 제거 및 zeroize"""
+        with self._lock:
+            for key in list(self._entries):
+                self._evict(key)
+
+    def stats(self):
+        """캐시 상태 (size, maxsize, ttl, hits, misses, coalesced, evictions)"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -1,15 +1,82 @@
 """
 CLI 모듈 - 명령줄 인터페이스를 통해 Sumerian MCP 서버 실행
+
+셸 스크립트에서 encrypt/decrypt를 수천 번 호출하는 경우 실행 시간 대부분이 모듈 가져오기이므로,
+MCP 서버(mcp/starlette), 부하 테스트, 실행기, 프로파일러, 디렉토리 처리 모듈은 해당 명령을 실행할 때 가져온다
+이 때문에 실행기 종류(--cpu-executor)와 부하 테스트 전송(--transport)은 argparse choices 대신 실행 시 검사한다
+encrypt/decrypt/test는 데몬(sumerian-mcp daemon)이 실행 중이면 요청만 보내므로 암호 라이브러리(crypto)도 그때 가져온다
 """
 import argparse
-from .server import SumerianMCPServer
-from .crypto import encrypt_password, decrypt_password
+import os
+import sys
+from .envelope import COMPRESSIONS, DEFAULT_COMPRESSION, DEFAULT_ENCODING, DEFAULT_MODE, ENCODINGS, MODES
+from .kdf import DEFAULT_KDF, KDF_NAMES
+
+
+def _add_encrypt_options(parser):
+    """암호화 명령 공통 옵션 (키 파생 함수, 텍스트 인코딩, 암호화 모드, 압축)"""
+    parser.add_argument(
+        "--kdf", 
+        choices=sorted(KDF_NAMES), 
+        default=DEFAULT_KDF, 
+        help=f"키 파생 함수 (기본값: {DEFAULT_KDF})"
+    )
+    parser.add_argument(
+        "--encoding", 
+        choices=sorted(ENCODINGS), 
+        default=DEFAULT_ENCODING, 
+        help=f"텍스트 인코딩, base1024는 출력 문자 수가 약 40%% 적음 (기본값: {DEFAULT_ENCODING})"
+    )
+    parser.add_argument(
+        "--mode", 
+        choices=list(MODES), 
+        default=DEFAULT_MODE, 
+        help=f"암호화 모드, gcm/chacha20-poly1305는 인증 암호화, siv는 같은 평문이면 같은 암호문이 되는 결정적 인증 암호화 (기본값: {DEFAULT_MODE})"
+    )
+    parser.add_argument(
+        "--compression", 
+        choices=["auto", *COMPRESSIONS], 
+        default=DEFAULT_COMPRESSION, 
+        help=f"암호화 전 압축, 잘 압축되지 않는 입력은 건너뜀, zstd는 zstandard 모듈 필요, auto는 zstd 또는 zlib (기본값: {DEFAULT_COMPRESSION})"
+    )
+
+
+def _add_key_options(parser):
+    """암호화 키 인자 (위치 인자 또는 환경 변수 이름)"""
+    parser.add_argument("key", nargs="?", help="암호화 키 (프로세스 목록에 드러나지 않게 하려면 --key-env 사용)")
+    parser.add_argument("--key-env", metavar="VAR", help="암호화 키를 읽을 환경 변수 이름")
 
 
 def main():
     """수메르 암호화 MCP 서버 또는 직접 암호화/복호화 명령 실행"""
     parser = argparse.ArgumentParser(
-        description="수메르 암호화 시스템 (AES-256 + CBC + 수메르어) - MCP 서버 또는 직접 암호화/복호화"
+        description="수메르 암호화 시스템 (AES-256 + GCM/CBC + 수메르어) - MCP 서버 또는 직접 암호화/복호화"
+    )
+    
+    # 프로파일링 옵션 (서브커맨드 앞에 지정)
+    parser.add_argument(
+        "--profile", 
+        metavar="DIR", 
+        help="cProfile/tracemalloc 결과를 DIR에 기록 (server는 도구 호출마다, 그 외 명령은 명령 전체)"
+    )
+    parser.add_argument(
+        "--profile-sample", 
+        type=float, 
+        default=1.0, 
+        help="프로파일할 호출 비율 0~1 (기본값: 1.0)"
+    )
+    parser.add_argument(
+        "--profile-min-ms", 
+        type=float, 
+        default=0.0, 
+        help="이보다 빨리 끝난 호출은 기록하지 않음 (기본값: 0)"
+    )
+    
+    # 데몬 사용 여부 (서브커맨드 앞에 지정)
+    parser.add_argument(
+        "--no-daemon", 
+        action="store_true", 
+        help="실행 중인 데몬을 쓰지 않고 현재 프로세스에서 처리 (환경 변수 SUMERIAN_NO_DAEMON=1과 같음)"
     )
     
     # 서브커맨드 설정
@@ -39,31 +106,306 @@ def main():
         default="Sumerian Encryption", 
         help="MCP 서버 이름 (기본값: Sumerian Encryption)"
     )
+    server_parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=1, 
+        help="일괄 처리 도구에 사용할 워커 프로세스 수 (기본값: 1)"
+    )
+    server_parser.add_argument(
+        "--cpu-executor", 
+        default="thread", 
+        help="암호화 연산을 실행할 실행기 thread/process/inline (기본값: thread)"
+    )
+    server_parser.add_argument(
+        "--cpu-workers", 
+        type=int, 
+        default=None, 
+        help="CPU 실행기 크기 (기본값: CPU 코어 수)"
+    )
+    server_parser.add_argument(
+        "--io-workers", 
+        type=int, 
+        default=4, 
+        help="파일 입출력 스레드 수 (기본값: 4)"
+    )
+    server_parser.add_argument(
+        "--cpu-limit", 
+        type=int, 
+        default=None, 
+        help="CPU 실행기 동시 실행 상한 (기본값: --cpu-workers)"
+    )
+    server_parser.add_argument(
+        "--io-limit", 
+        type=int, 
+        default=None, 
+        help="I/O 실행기 동시 실행 상한 (기본값: --io-workers)"
+    )
+    server_parser.add_argument(
+        "--no-metrics", 
+        action="store_true", 
+        help="도구 호출 지표(stats 도구, SSE의 /metrics) 기록 끄기"
+    )
+    server_parser.add_argument(
+        "--decrypt-cache", 
+        action="store_true", 
+        help="decrypt 도구의 복호화 결과 캐시 사용 (같은 암호문/키 반복 호출과 동시 호출을 한 번만 처리)"
+    )
+    server_parser.add_argument(
+        "--decrypt-cache-size", 
+        type=int, 
+        default=None, 
+        help="복호화 결과 캐시 최대 항목 수 (기본값: 256)"
+    )
+    server_parser.add_argument(
+        "--decrypt-cache-ttl", 
+        type=float, 
+        default=None, 
+        help="복호화 결과 캐시 유지 시간(초) (기본값: 300)"
+    )
+    server_parser.add_argument(
+        "--vault", 
+        metavar="PATH", 
+        help="비밀 저장소(SQLite) 경로, 지정하면 vault_* 도구와 vault:// 자원 제공"
+    )
     
     # 직접 암호화 명령
     encrypt_parser = subparsers.add_parser("encrypt", help="직접 암호화 실행")
     encrypt_parser.add_argument("password", help="암호화할 비밀번호")
     encrypt_parser.add_argument("key", help="암호화 키")
+    _add_encrypt_options(encrypt_parser)
     
     # 직접 복호화 명령
     decrypt_parser = subparsers.add_parser("decrypt", help="직접 복호화 실행")
     decrypt_parser.add_argument("encrypted_text", help="암호화된 텍스트")
     decrypt_parser.add_argument("key", help="복호화 키")
     
+    # 디렉토리 암호화/복호화 명령
+    for command, help_text in (("encrypt_dir", "디렉토리 트리 일괄 암호화"), ("decrypt_dir", "디렉토리 트리 일괄 복호화")):
+        dir_parser = subparsers.add_parser(command, help=help_text)
+        dir_parser.add_argument("src_dir", help="입력 디렉토리")
+        dir_parser.add_argument("out_dir", help="출력 디렉토리")
+        dir_parser.add_argument("key", help="암호화 키")
+        dir_parser.add_argument(
+            "--workers", 
+            type=int, 
+            default=os.cpu_count() or 1, 
+            help="워커 프로세스 수 (기본값: CPU 코어 수)"
+        )
+        if command == "encrypt_dir":
+            _add_encrypt_options(dir_parser)
+    
+    # 표준 입력 레코드 스트림 명령
+    stream_parser = subparsers.add_parser(
+        "stream", 
+        help="표준 입력의 레코드(줄, NUL 구분, JSONL)를 암호화/복호화해 순서대로 표준 출력에 기록"
+    )
+    stream_parser.add_argument("operation", choices=["encrypt", "decrypt"], help="작업")
+    _add_key_options(stream_parser)
+    stream_parser.add_argument(
+        "--format", 
+        default="lines", 
+        help="레코드 형식 lines/nul/jsonl (기본값: lines)"
+    )
+    stream_parser.add_argument("-0", "--null", action="store_true", help="--format nul과 같음")
+    stream_parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=1, 
+        help="워커 프로세스 수 (기본값: 1, 현재 프로세스에서 처리)"
+    )
+    stream_parser.add_argument(
+        "--batch-size", 
+        type=int, 
+        default=1024, 
+        help="배치당 레코드 수, 대화형 파이프에서는 1 (기본값: 1024)"
+    )
+    stream_parser.add_argument("--quiet", action="store_true", help="표준 오류에 처리 요약을 출력하지 않음")
+    _add_encrypt_options(stream_parser)
+    
+    # 컨테이너 범위 복호화 명령
+    range_parser = subparsers.add_parser("decrypt_range", help="컨테이너 파일의 일부 범위만 복호화")
+    range_parser.add_argument("filepath", help="컨테이너 파일 경로")
+    range_parser.add_argument("key", help="복호화 키")
+    range_parser.add_argument("--offset", type=int, default=0, help="시작 위치 (음수이면 끝에서부터, 기본값: 0)")
+    range_parser.add_argument("--length", type=int, default=None, help="읽을 바이트 수 (기본값: 끝까지)")
+    
+    # 부하 테스트 명령
+    load_parser = subparsers.add_parser("loadtest", help="로컬 서버를 띄워 SSE/HTTP 전송 부하 테스트")
+    load_parser.add_argument(
+        "--transport", 
+        default="sse", 
+        help="sse: 패키지 MCP SSE 서버, http: 단일 파일 서버의 /tools API (기본값: sse)"
+    )
+    load_parser.add_argument("--url", help="이미 실행 중인 서버 주소 (없으면 로컬 서버를 띄움, sse는 .../sse)")
+    load_parser.add_argument("--server-script", help="http 전송으로 로컬 서버를 띄울 단일 파일 서버 스크립트 경로")
+    load_parser.add_argument(
+        "--server-arg", 
+        action="append", 
+        default=[], 
+        help="로컬 서버에 넘길 인자 (여러 번 지정 가능, 예: --server-arg=--cpu-executor=process)"
+    )
+    load_parser.add_argument("--mix", help="호출 비율 (기본값: encrypt=5,decrypt=4,encrypt_file=1)")
+    load_parser.add_argument(
+        "--concurrency", 
+        default="1,2,4,8,16,32", 
+        help="동시 실행 수 목록, 값마다 한 단계씩 측정 (기본값: 1,2,4,8,16,32)"
+    )
+    load_parser.add_argument("--rate", help="목표 요청률(req/s) 목록, 주면 --concurrency 대신 open loop로 측정")
+    load_parser.add_argument("--duration", type=float, default=5.0, help="단계별 측정 시간(초) (기본값: 5)")
+    load_parser.add_argument("--warmup", type=float, default=1.0, help="측정 전 예열 시간(초) (기본값: 1)")
+    load_parser.add_argument("--payload-size", type=int, default=64, help="encrypt/decrypt 평문 크기 (기본값: 64)")
+    load_parser.add_argument("--file-size", type=int, default=64 * 1024, help="파일 도구 원본 크기 (기본값: 65536)")
+    load_parser.add_argument("--sessions", type=int, default=4, help="SSE 세션 수 (기본값: 4)")
+    load_parser.add_argument(
+        "--max-in-flight", 
+        type=int, 
+        default=1000, 
+        help="요청률 모드에서 처리 중인 호출 상한, 넘으면 보내지 않고 미전송으로 집계 (기본값: 1000)"
+    )
+    load_parser.add_argument("--seed", type=int, default=None, help="연산 선택 난수 시드")
+    load_parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    
+    # 데몬 명령
+    daemon_parser = subparsers.add_parser(
+        "daemon", 
+        help="파생 키를 캐시하는 상주 프로세스를 유닉스 소켓으로 실행 (encrypt/decrypt 반복 호출 가속)"
+    )
+    daemon_parser.add_argument(
+        "action", 
+        nargs="?", 
+        default="run", 
+        choices=["run", "status", "stop"], 
+        help="run: 포그라운드 실행, status: 상태 출력, stop: 종료 요청 (기본값: run)"
+    )
+    daemon_parser.add_argument("--socket", help="소켓 경로 (기본값: $SUMERIAN_DAEMON_SOCKET 또는 사용자별 런타임 경로)")
+    daemon_parser.add_argument("--detach", action="store_true", help="백그라운드로 시작하고 준비되면 PID 출력")
+    daemon_parser.add_argument(
+        "--idle-timeout", 
+        type=float, 
+        default=None, 
+        help="이 시간(초) 동안 요청이 없으면 종료 (기본값: 종료하지 않음)"
+    )
+    daemon_parser.add_argument("--key-ttl", type=float, default=None, help="파생 키 캐시 유지 시간(초) (기본값: 600)")
+    daemon_parser.add_argument("--max-keys", type=int, default=None, help="파생 키 캐시 최대 항목 수 (기본값: 64)")
+    
+    # 비밀 저장소 명령
+    vault_parser = subparsers.add_parser("vault", help="이름과 태그로 색인된 로컬 암호화 비밀 저장소 관리")
+    vault_parser.add_argument(
+        "--vault", 
+        metavar="PATH", 
+        help="저장소 경로 (기본값: $SUMERIAN_VAULT 또는 ~/.local/share/sumerian-mcp/vault.db)"
+    )
+    vault_actions = vault_parser.add_subparsers(dest="vault_action", help="저장소 작업")
+    filter_parser = argparse.ArgumentParser(add_help=False)
+    filter_parser.add_argument("--tag", help="이 태그가 붙은 항목만")
+    filter_parser.add_argument("--prefix", help="이름이 이 문자열로 시작하는 항목만")
+    
+    put_parser = vault_actions.add_parser("put", help="비밀을 암호화해 저장")
+    put_parser.add_argument("name", help="항목 이름")
+    _add_key_options(put_parser)
+    put_parser.add_argument("--secret", help="저장할 비밀 (없으면 표준 입력에서 읽고 끝의 줄바꿈 하나를 제거)")
+    put_parser.add_argument("--tag", action="append", default=[], dest="tags", help="태그 (여러 번 지정 가능)")
+    put_parser.add_argument("--no-overwrite", action="store_true", help="같은 이름이 있으면 실패")
+    _add_encrypt_options(put_parser)
+    get_parser = vault_actions.add_parser("get", help="항목 하나를 복호화해 출력")
+    get_parser.add_argument("name", help="항목 이름")
+    _add_key_options(get_parser)
+    vault_actions.add_parser("list", parents=[filter_parser], help="항목 정보 목록 (JSON, 복호화하지 않음)")
+    delete_parser = vault_actions.add_parser("delete", help="항목 삭제")
+    delete_parser.add_argument("name", help="항목 이름")
+    import_parser = vault_actions.add_parser(
+        "import", help="JSONL 항목 가져오기 (평문 \"secret\" 항목은 키로 암호화)"
+    )
+    _add_key_options(import_parser)
+    import_parser.add_argument("--input", "-i", default="-", help="JSONL 파일 (기본값: 표준 입력)")
+    import_parser.add_argument("--no-overwrite", action="store_true", help="같은 이름이 있는 항목은 건너뜀")
+    _add_encrypt_options(import_parser)
+    export_parser = vault_actions.add_parser(
+        "export", parents=[filter_parser], help="항목을 암호문 그대로 JSONL로 내보내기"
+    )
+    export_parser.add_argument("--output", "-o", default="-", help="출력 파일 (기본값: 표준 출력)")
+    
+    # 키 교체 명령
+    rekey_parser = subparsers.add_parser(
+        "rekey", 
+        help="디렉토리/파일/저장소의 암호문을 새 키로 다시 암호화 (원자적 교체, 중단되면 이어서 처리)"
+    )
+    rekey_parser.add_argument("path", help="암호화된 디렉토리(.sumerian 파일 전체), 파일 하나 또는 --vault이면 저장소 경로")
+    rekey_parser.add_argument("old_key", nargs="?", help="이전 키 (프로세스 목록에 드러나지 않게 하려면 --old-key-env 사용)")
+    rekey_parser.add_argument("new_key", nargs="?", help="새 키 (프로세스 목록에 드러나지 않게 하려면 --new-key-env 사용)")
+    rekey_parser.add_argument("--old-key-env", metavar="VAR", help="이전 키를 읽을 환경 변수 이름")
+    rekey_parser.add_argument("--new-key-env", metavar="VAR", help="새 키를 읽을 환경 변수 이름")
+    rekey_parser.add_argument("--vault", action="store_true", help="path를 비밀 저장소로 처리")
+    rekey_parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=os.cpu_count() or 1, 
+        help="워커 프로세스 수 (기본값: CPU 코어 수)"
+    )
+    rekey_parser.add_argument("--restart", action="store_true", help="남아 있는 체크포인트를 무시하고 처음부터")
+    _add_encrypt_options(rekey_parser)
+    
     # 테스트 명령
     test_parser = subparsers.add_parser("test", help="암호화 및 복호화 테스트")
     test_parser.add_argument("password", help="테스트할 비밀번호")
     test_parser.add_argument("key", help="테스트 키")
+    _add_encrypt_options(test_parser)
     
     args = parser.parse_args()
     
-    # 명령에 따라 실행
+    if args.profile and args.command not in (None, "server"):
+        # 서버 외 명령은 명령 실행 전체를 한 번의 호출로 프로파일
+        from .profiling import ToolProfiler
+        profiler = ToolProfiler(
+            args.profile, enabled=True, sample_rate=args.profile_sample, min_duration=args.profile_min_ms / 1000
+        )
+        with profiler.profile(args.command, _command_size(args)) as session:
+            if session is not None:
+                return session.run(_run_command, args, parser)
+    _run_command(args, parser)
+
+
+def _command_size(args):
+    """프로파일 파일 이름에 쓸 입력 크기 (텍스트 길이 또는 입력 파일 크기)"""
+    for name in ("password", "encrypted_text"):
+        if getattr(args, name, None) is not None:
+            return len(getattr(args, name).encode("utf-8"))
+    filepath = getattr(args, "filepath", None)
+    if filepath and os.path.isfile(filepath):
+        return os.path.getsize(filepath)
+    return 0
+
+
+def _run_command(args, parser):
+    """명령에 따라 실행"""
     if args.command == "server":
         # MCP 서버 실행
-        server = SumerianMCPServer(name=args.name)
+        from .offload import Offloader
+        from .profiling import DEFAULT_PROFILE_DIR, ToolProfiler
+        from .server import SumerianMCPServer
+        try:
+            offload = Offloader(
+                cpu_kind=args.cpu_executor, cpu_workers=args.cpu_workers, io_workers=args.io_workers,
+                cpu_limit=args.cpu_limit, io_limit=args.io_limit,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        profiler = ToolProfiler(
+            args.profile or DEFAULT_PROFILE_DIR, enabled=bool(args.profile),
+            sample_rate=args.profile_sample, min_duration=args.profile_min_ms / 1000,
+        )
+        if args.decrypt_cache:
+            from .crypto import configure_decrypt_cache
+            configure_decrypt_cache(maxsize=args.decrypt_cache_size, ttl=args.decrypt_cache_ttl)
+        server = SumerianMCPServer(
+            name=args.name, workers=args.workers, offload=offload, metrics=not args.no_metrics, profiler=profiler,
+            decrypt_cache=args.decrypt_cache, vault=args.vault,
+        )
         
         if args.transport == "stdio":
-            print(f"Sumerian MCP 서버를 stdio 모드로 실행합니다...")
+            # stdout은 MCP 프로토콜 채널이므로 안내 메시지는 stderr로 출력
+            print(f"Sumerian MCP 서버를 stdio 모드로 실행합니다...", file=sys.stderr)
             server.run_stdio()
         elif args.transport == "sse":
             print(f"Sumerian MCP 서버를 SSE 모드로 실행합니다 (http://{args.host}:{args.port})...")
@@ -71,35 +413,328 @@ def main():
     
     elif args.command == "encrypt":
         # 직접 암호화
-        encrypted = encrypt_password(args.password, args.key)
+        encrypted = _encrypt(args)
         print(f"암호화된 비밀번호: {encrypted}")
     
     elif args.command == "decrypt":
         # 직접 복호화
-        decrypted = decrypt_password(args.encrypted_text, args.key)
+        decrypted = _decrypt(args, args.encrypted_text)
         if decrypted:
             print(f"복호화된 비밀번호: {decrypted}")
         else:
             print("복호화 실패: 키가 잘못되었거나 암호화된 데이터가 손상되었습니다.")
     
+    elif args.command in ("encrypt_dir", "decrypt_dir"):
+        # 디렉토리 일괄 처리
+        from .files import encrypt_dir, decrypt_dir
+        if args.command == "encrypt_dir":
+            report = encrypt_dir(
+                args.src_dir, args.out_dir, args.key,
+                workers=args.workers, kdf=args.kdf, encoding=args.encoding, mode=args.mode,
+                compression=args.compression,
+            )
+        else:
+            report = decrypt_dir(args.src_dir, args.out_dir, args.key, workers=args.workers)
+        print(
+            f"{report['files']}개 파일, {report['bytes'] / (1024 * 1024):.1f} MB 처리 "
+            f"({report['seconds']:.2f}초, {report['mb_per_s']:.1f} MB/s)"
+        )
+        print(f"매니페스트: {report['manifest']}")
+        for error in report["errors"]:
+            print(f"❌ {error['path']}: {error['error']}")
+        if report["errors"]:
+            sys.exit(1)
+    
+    elif args.command == "stream":
+        # 레코드 스트림 처리
+        from .stream import process_stream
+        key = os.environ.get(args.key_env) if args.key_env else args.key
+        if key is None:
+            parser.error("암호화 키를 지정하세요 (key 인자 또는 --key-env)")
+        
+        def report_error(index, message):
+            print(f"{index}번째 레코드: {message}", file=sys.stderr)
+        
+        try:
+            report = process_stream(
+                sys.stdin.buffer, sys.stdout.buffer, args.operation, key,
+                fmt="nul" if args.null else args.format, workers=args.workers, batch_size=args.batch_size,
+                on_error=report_error, kdf=args.kdf, encoding=args.encoding, mode=args.mode,
+                compression=args.compression,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        if not args.quiet:
+            print(
+                f"{report.records}개 레코드 처리, 실패 {report.failed}개 "
+                f"({report.seconds:.2f}초, {report.records / (report.seconds or 1e-9):.0f} 레코드/초)",
+                file=sys.stderr,
+            )
+        if report.failed:
+            sys.exit(1)
+    
+    elif args.command == "decrypt_range":
+        # 범위 복호화 결과를 그대로 stdout에 기록
+        from .container import decrypt_range
+        try:
+            data = decrypt_range(args.filepath, args.key, args.offset, args.length)
+        except (OSError, ValueError) as e:
+            print(f"범위 복호화 실패: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.stdout.buffer.write(data)
+        sys.stdout.flush()
+    
+    elif args.command == "loadtest":
+        # 부하 테스트
+        import asyncio
+        import json
+        from .loadtest import DEFAULT_MIX, format_level, format_report, run_loadtest
+        try:
+            levels = [float(value) if args.rate else int(value) for value in (args.rate or args.concurrency).split(",")]
+            report = asyncio.run(run_loadtest(
+                transport=args.transport, url=args.url, mix=args.mix or DEFAULT_MIX,
+                concurrency=levels, rates=levels if args.rate else None,
+                duration=args.duration, warmup=args.warmup,
+                payload_size=args.payload_size, file_size=args.file_size,
+                sessions=args.sessions, max_in_flight=args.max_in_flight,
+                server_script=args.server_script, server_args=args.server_arg, seed=args.seed,
+                progress=lambda result: print(format_level(result), flush=True),
+            ))
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"부하 테스트 실패: {e}", file=sys.stderr)
+            sys.exit(1)
+        print()
+        print(format_report(report))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"\n결과 저장: {args.json}")
+    
     elif args.command == "test":
         # 테스트 모드
         print("테스트 모드")
-        encrypted = encrypt_password(args.password, args.key)
+        encrypted = _encrypt(args)
         print(f"암호화된 비밀번호: {encrypted}")
         
         # 테스트 목적으로 바로 복호화 검증
         print("\n암호화 검증:")
-        decrypted = decrypt_password(encrypted, args.key)
+        decrypted = _decrypt(args, encrypted)
         if decrypted == args.password:
             print(f"✅ 검증 성공: '{args.password}' → '{decrypted}'")
         else:
             print(f"❌ 검증 실패: '{args.password}' → '{decrypted}'")
     
+    elif args.command == "daemon":
+        _run_daemon(args, parser)
+    
+    elif args.command == "vault":
+        _run_vault(args, parser)
+    
+    elif args.command == "rekey":
+        _run_rekey(args, parser)
+    
     else:
         # 명령어가 없을 경우 도움말 표시
         parser.print_help()
 
 
+def _daemon_call(args, op, **fields):
+    """
+    실행 중인 데몬에 요청하고 결과 반환
+
+    데몬을 쓰지 않거나 연결할 수 없으면 (False, None)을 반환해 호출자가 직접 처리하게 한다.
+    데몬이 요청을 거부하면 오류를 출력하고 종료 코드 1로 끝낸다. 프로파일링 중에는 데몬이 아니라 이 프로세스의 처리 과정을 측정해야 하므로 데몬을 쓰지 않는다.
+
+    Returns:
+        (데몬이 처리했는지, 결과)
+    """
+    from .daemon import DaemonUnavailable, daemon_enabled, request
+    if args.no_daemon or args.profile or not daemon_enabled():
+        return False, None
+    try:
+        response = request(op, **fields)
+    except DaemonUnavailable:
+        return False, None
+    if not response.get("ok"):
+        print(f"오류: {response.get('error')}", file=sys.stderr)
+        sys.exit(1)
+    return True, response["result"]
+
+
+def _encrypt(args):
+    """args.password를 데몬 또는 현재 프로세스에서 암호화"""
+    options = {"kdf": args.kdf, "encoding": args.encoding, "mode": args.mode, "compression": args.compression}
+    handled, encrypted = _daemon_call(args, "encrypt", password=args.password, key=args.key, **options)
+    if not handled:
+        from .crypto import encrypt_password
+        encrypted = encrypt_password(args.password, args.key, **options)
+    return encrypted
+
+
+def _decrypt(args, encrypted_text):
+    """암호화된 텍스트를 데몬 또는 현재 프로세스에서 복호화 (실패하면 None)"""
+    handled, decrypted = _daemon_call(args, "decrypt", encrypted_text=encrypted_text, key=args.key)
+    if not handled:
+        from .crypto import decrypt_password
+        decrypted = decrypt_password(encrypted_text, args.key)
+    return decrypted
+
+
+def _run_vault(args, parser):
+    """비밀 저장소 명령 실행"""
+    import json
+    from .vault import SecretVault
+    if args.vault_action is None:
+        parser.error("저장소 작업을 지정하세요 (put, get, list, delete, import, export)")
+    key = None
+    if "key" in args:
+        key = os.environ.get(args.key_env) if args.key_env else args.key
+        if key is None and args.vault_action in ("put", "get"):
+            parser.error("암호화 키를 지정하세요 (key 인자 또는 --key-env)")
+    
+    with SecretVault(args.vault) as vault:
+        try:
+            if args.vault_action == "put":
+                secret = args.secret
+                if secret is None:
+                    secret = sys.stdin.read()
+                    secret = secret[:-1] if secret.endswith("\n") else secret
+                info = vault.put(
+                    args.name, secret, key, tags=args.tags, overwrite=not args.no_overwrite,
+                    kdf=args.kdf, encoding=args.encoding, mode=args.mode, compression=args.compression,
+                )
+                print(json.dumps(info, ensure_ascii=False))
+            elif args.vault_action == "get":
+                print(vault.get(args.name, key))
+            elif args.vault_action == "list":
+                for info in vault.list(tag=args.tag, prefix=args.prefix):
+                    print(json.dumps(info, ensure_ascii=False))
+            elif args.vault_action == "delete":
+                if not vault.delete(args.name):
+                    raise KeyError(args.name)
+            elif args.vault_action == "import":
+                options = {"kdf": args.kdf, "encoding": args.encoding, "mode": args.mode, "compression": args.compression}
+                if args.input == "-":
+                    report = vault.import_jsonl(sys.stdin, key, not args.no_overwrite, **options)
+                else:
+                    with open(args.input, encoding="utf-8") as f:
+                        report = vault.import_jsonl(f, key, not args.no_overwrite, **options)
+                print(f"{report['imported']}개 가져옴, {report['skipped']}개 건너뜀, 오류 {len(report['errors'])}개", file=sys.stderr)
+                for error in report["errors"]:
+                    print(f"{error['index']}번째 줄: {error['error']}", file=sys.stderr)
+                if report["errors"]:
+                    sys.exit(1)
+            elif args.vault_action == "export":
+                if args.output == "-":
+                    count = vault.export_jsonl(sys.stdout, args.tag, args.prefix)
+                else:
+                    with open(args.output, "w", encoding="utf-8") as f:
+                        count = vault.export_jsonl(f, args.tag, args.prefix)
+                print(f"{count}개 내보냄", file=sys.stderr)
+        except KeyError as e:
+            print(f"없는 항목입니다: {e.args[0]}", file=sys.stderr)
+            sys.exit(1)
+        except (OSError, ValueError) as e:
+            print(f"저장소 오류: {e}", file=sys.stderr)
+            sys.exit(1)
+
+
+def _run_rekey(args, parser):
+    """키 교체 명령 실행"""
+    old_key = os.environ.get(args.old_key_env) if args.old_key_env else args.old_key
+    new_key = os.environ.get(args.new_key_env) if args.new_key_env else args.new_key
+    if old_key is None or new_key is None:
+        parser.error("이전 키와 새 키를 지정하세요 (인자 또는 --old-key-env/--new-key-env)")
+    options = {"kdf": args.kdf, "encoding": args.encoding, "mode": args.mode, "compression": args.compression}
+    
+    try:
+        if args.vault:
+            from .vault import SecretVault
+            with SecretVault(args.path) as vault:
+                report = vault.rekey(old_key, new_key, workers=args.workers, restart=args.restart, **options)
+            if report["resumed_after"]:
+                print(f"이어서 처리: {report['resumed_after']} 다음부터")
+            print(f"{report['entries']}개 항목 교체, {report['skipped']}개 건너뜀 ({report['seconds']:.2f}초)")
+            errors = [(error["name"], error["error"]) for error in report["errors"]]
+        elif os.path.isdir(args.path):
+            from .rekey import rekey_dir
+            report = rekey_dir(args.path, old_key, new_key, workers=args.workers, restart=args.restart, **options)
+            if report["resumed"]:
+                print(f"이어서 처리: 체크포인트의 {report['resumed']}개 파일 제외")
+            print(
+                f"{report['files']}개 파일 교체, {report['skipped']}개 건너뜀, "
+                f"{report['bytes'] / (1024 * 1024):.1f} MB ({report['seconds']:.2f}초, {report['mb_per_s']:.1f} MB/s)"
+            )
+            if report["beside"]:
+                print(f"이전 키를 확인할 수 없는 형식이라 원본 옆에 기록 (새 키로 확인한 뒤 원본을 교체하세요): "
+                      f"{', '.join(report['beside'])}")
+            errors = [(error["path"], error["error"]) for error in report["errors"]]
+        else:
+            from .rekey import rekey_file, rekey_output_path
+            output = rekey_output_path(args.path)
+            size = rekey_file(args.path, old_key, new_key, **options)
+            if output == args.path:
+                print(f"{args.path}: {size} 바이트 교체")
+            else:
+                print(f"{output}: {size} 바이트 기록 (이전 키를 확인할 수 없는 형식이라 원본은 그대로 둠)")
+            errors = []
+    except (OSError, ValueError) as e:
+        print(f"키 교체 실패: {e}", file=sys.stderr)
+        sys.exit(1)
+    for name, error in errors:
+        print(f"❌ {name}: {error}")
+    if errors:
+        sys.exit(1)
+
+
+def _run_daemon(args, parser):
+    """daemon 명령 (run/status/stop)"""
+    from .daemon import DaemonUnavailable, SumerianDaemon, default_socket_path, request, start_detached
+    path = args.socket or default_socket_path()
+    
+    if args.action == "run":
+        if args.idle_timeout is not None and args.idle_timeout <= 0:
+            parser.error("--idle-timeout은 0보다 커야 합니다")
+        if args.detach:
+            options = []
+            for flag, value in (("--idle-timeout", args.idle_timeout), ("--key-ttl", args.key_ttl),
+                                ("--max-keys", args.max_keys)):
+                if value is not None:
+                    options += [flag, str(value)]
+            try:
+                pid = start_detached(path, options)
+            except RuntimeError as e:
+                print(f"오류: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"데몬을 시작했습니다 (PID {pid}, 소켓 {path})")
+            return
+        daemon = SumerianDaemon(path, idle_timeout=args.idle_timeout, key_ttl=args.key_ttl, max_keys=args.max_keys)
+        try:
+            daemon.bind()
+        except RuntimeError as e:
+            print(f"오류: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"데몬을 실행합니다 (소켓 {path})...", file=sys.stderr)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    try:
+        response = request("stats" if args.action == "status" else "shutdown", path)
+    except DaemonUnavailable:
+        print(f"실행 중인 데몬이 없습니다: {path}", file=sys.stderr)
+        sys.exit(1)
+    if args.action == "stop":
+        print("데몬을 종료했습니다")
+        return
+    stats = response["result"]
+    cache = stats["key_cache"]
+    print(f"PID {stats['pid']}, 실행 시간 {stats['uptime_seconds']:.0f}초, 소켓 {path}")
+    print(f"요청 {stats['requests']}건 (오류 {stats['errors']}건), 연결 {stats['connections']}건")
+    print(f"키 캐시: {cache['size']}/{cache['maxsize']}개, 적중 {cache['hits']}건, 실패 {cache['misses']}건")
+
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+문자 체계 코덱 모듈
+
+Base64 문자열과 수메르 쐐기문자(또는 등록된 다른 문자 체계) 사이의 변환을 담당
+정방향/역방향 변환 테이블은 코덱 생성 시 한 번만 만들고 str.translate로 변환한다
+"""
+import re
+
+from .envelope import RESERVED_SIGNS
+
+# Base64 알파벳 (매핑되지 않은 문자는 그대로 통과)
+BASE64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+# 수메르어 변환 매핑 (알파벳 + 숫자 + 특수문자 → 수메르어)
+sumerian_cipher_map = {
+    # 알파벳 소문자
+    "a": "𒀀",
+    "b": "𒁀",
+    "c": "𒍝",
+    "d": "𒁕",
+    "e": "𒂊",
+    "f": "𒆠",
+    "g": "𒂅",
+    "h": "𒄭",
+    "i": "𒄿",
+    "j": "𒋡",
+    "k": "𒆪",
+    "l": "𒇷",
+    "m": "𒈬",
+    "n": "𒉈",
+    "o": "𒌷",
+    "p": "𒉿",
+    "q": "𒍪",
+    "r": "𒊏",
+    "s": "𒊭",
+    "t": "𒋾",
+    "u": "𒌋",
+    "v": "𒅈",
+    "w": "𒂗",
+    "x": "𒐊",
+    "y": "𒅆",
+    "z": "𒍣",
+    # 숫자
+    "0": "𒀹",
+    "1": "𒁹",
+    "2": "𒀻",
+    "3": "𒀼",
+    "4": "𒌝",
+    "5": "𒉽",
+    "6": "𒐖",
+    "7": "𒐗",
+    "8": "𒐘",
+    "9": "𒐙",
+    # Base64 특수문자
+    "+": "𒃻",
+    "/": "𒁺",
+    "=": "𒈦",
+    # 공백 및 추가 특수문자
+    " ": "𒌃",
+    ".": "𒁇",
+    ",": "𒄑",
+    "!": "𒄠",
+    "?": "𒅎",
+    "@": "𒀭",
+    "#": "𒂔",
+    "$": "𒌨",
+    "%": "𒊬",
+    "^": "𒅖",
+    "&": "𒀝",
+    "*": "𒀯",
+    "(": "𒐏",
+    ")": "𒐐",
+    "-": "𒁲",
+    "_": "𒀞",
+    "[": "𒌍",
+    "]": "𒌌",
+    "{": "𒍢",
+    "}": "𒍤",
+    "|": "𒌒",
+    "\\": "𒍦",
+    ":": "𒌓",
+    ";": "𒌇",
+    '"': "𒋰",
+    "'": "𒋫",
+    "<": "𒉺",
+    ">": "𒊒",
+    "`": "𒋛",
+    "~": "𒀊",
+}
+
+
+class SumerianCodec:
+    """
+    문자 매핑 기반 코덱
+
+    매핑에 없는 Base64 문자는 그대로 통과시키며, strict 모드에서는
+    코덱이 만들어낼 수 없는 문자가 섞여 있으면 ValueError를 발생시킨다.
+    """
+
+    def __init__(self, name, mapping):
+        """
+        코덱 초기화 및 매핑 검증
+
+        Args:
+            name: 코덱 이름
+            mapping: 원본 문자 → 변환 문자 딕셔너리 (모두 한 글자)
+        """
+        for source, sign in mapping.items():
+            if len(source) != 1 or len(sign) != 1:
+                raise ValueError(f"코덱 매핑은 한 글자 단위여야 합니다: {source!r} → {sign!r}")
+        if len(set(mapping.values())) != len(mapping):
+            raise ValueError(f"코덱 '{name}'의 매핑에 중복된 변환 문자가 있습니다")
+
+        reserved = RESERVED_SIGNS & set(mapping.values())
+        if reserved:
+            raise ValueError(f"코덱 '{name}'의 변환 문자에 예약된 표식 문자가 있습니다: {sorted(reserved)}")
+
+        passthrough = set(BASE64_ALPHABET) - set(mapping)
+        clashes = passthrough & set(mapping.values())
+        if clashes:
+            raise ValueError(f"코덱 '{name}'의 변환 문자가 Base64 문자와 겹칩니다: {sorted(clashes)}")
+
+        self.name = name
+        self.mapping = dict(mapping)
+        self._encode_table = str.maketrans(self.mapping)
+        self._decode_table = str.maketrans({sign: source for source, sign in self.mapping.items()})
+        self._invalid_plain = self._compile_invalid(set(self.mapping) | passthrough)
+        self._invalid_signs = self._compile_invalid(set(self.mapping.values()) | passthrough)
+
+    @staticmethod
+    def _compile_invalid(allowed):
+        """허용 문자 집합 밖의 문자를 찾는 정규식 생성"""
+        return re.compile("[^" + "".join(re.escape(c) for c in sorted(allowed)) + "]")
+
+    def _check(self, pattern, text):
+        """strict 모드 검증"""
+        match = pattern.search(text)
+        if match:
+            raise ValueError(
+                f"'{self.name}' 코덱에서 허용되지 않는 문자 {match.group()!r} (위치 {match.start()})"
+            )
+
+    def encode(self, text, strict=False):
+        """원본 문자열을 변환 문자로 인코딩"""
+        if strict:
+            self._check(self._invalid_plain, text)
+        return text.translate(self._encode_table)
+
+    def decode(self, text, strict=False):
+        """변환 문자를 원본 문자열로 디코딩"""
+        if strict:
+            self._check(self._invalid_signs, text)
+        return text.translate(self._decode_table)
+
+    def __repr__(self):
+        return f"SumerianCodec(name={self.name!r}, size={len(self.mapping)})"
+
+
+# 등록된 코덱 (이름 → 코덱)
+_codecs = {}
+
+
+def register_codec(name, mapping, replace=False):
+    """
+    새로운 문자 체계를 이름 있는 코덱으로 등록
+
+    Args:
+        name: 코덱 이름
+        mapping: 원본 문자 → 변환 문자 딕셔너리
+        replace: 같은 이름의 코덱이 있을 때 덮어쓸지 여부
+
+    Returns:
+        등록된 SumerianCodec
+    """
+    if name in _codecs and not replace:
+        raise ValueError(f"이미 등록된 코덱입니다: {name}")
+    codec = SumerianCodec(name, mapping)
+    _codecs[name] = codec
+    return codec
+
+
+def get_codec(codec="sumerian"):
+    """이름(또는 코덱 객체)으로 코덱 조회"""
+    if isinstance(codec, SumerianCodec):
+        return codec
+    try:
+        return _codecs[codec]
+    except KeyError:
+        raise ValueError(f"알 수 없는 코덱: {codec}") from None
+
+
+def available_codecs():
+    """등록된 코덱 이름 목록"""
+    return sorted(_codecs)
+
+
+DEFAULT_CODEC = register_codec("sumerian", sumerian_cipher_map)
@@ -0,0 +1,259 @@
+"""
+압축 단계 모듈
+
+암호화 전에 평문을 압축해 암호문을 줄인다. 쐐기문자 텍스트는 입력보다 몇 배 길어지므로
+JSON, 로그, 설정 파일처럼 잘 압축되는 데이터는 압축 후 암호화하면 결과와 도구 응답이 크게 줄어든다.
+사용한 알고리즘은 봉투 헤더 flags의 COMPRESSION_MASK 비트에 기록한다.
+
+압축하기 전에 입력 표본(앞, 가운데, 끝)을 가장 빠른 zlib 수준으로 압축해 보고, 이미 압축되었거나
+무작위에 가까운 데이터(이미지, 압축 파일, 암호문)는 압축하지 않는다.
+
+압축된 길이는 평문 내용에 따라 달라지므로, 공격자가 고른 데이터와 비밀이 한 평문에 섞이는 경우(CRIME/BREACH 유형)
+암호문 길이로 비밀이 드러날 수 있다. 그래서 기본값은 압축하지 않음("none")이다.
+"""
+import lzma
+import zlib
+
+from .envelope import COMPRESSION_MASK, COMPRESSION_SHIFT, COMPRESSIONS
+
+try:
+    import zstandard
+except ImportError:  # zstd는 선택 의존성 (pip install "sumerian_mcp[zstd]")
+    zstandard = None
+
+COMPRESSION_NONE = COMPRESSIONS["none"]
+COMPRESSION_ZLIB = COMPRESSIONS["zlib"]
+COMPRESSION_LZMA = COMPRESSIONS["lzma"]
+COMPRESSION_ZSTD = COMPRESSIONS["zstd"]
+
+# 이보다 짧은 입력은 압축 헤더 비용이 절약보다 큼
+MIN_COMPRESS_SIZE = 128
+
+# 표본 하나의 크기와, 표본 압축 결과가 이 비율 이상이면 압축하지 않음
+PROBE_SIZE = 4096
+PROBE_RATIO = 0.9
+
+# 메모리에서 한 번에 해제할 때 허용하는 최대 크기 (압축 폭탄 방지)
+MAX_DECOMPRESSED_SIZE = 256 * 1024 * 1024
+
+# 스트림 해제기가 한 번에 내놓는 최대 크기 (작은 블록이 크게 풀려도 메모리 사용량은 이 크기로 제한)
+STREAM_MAX_OUTPUT = 1024 * 1024
+
+# zstd 해제 객체는 출력 크기 제한이 없으므로 입력을 이만큼씩 넣음
+# (zstd 블록은 헤더 3바이트 + 1바이트로 최대 128KB까지 풀리므로 한 번의 출력은 약 1MB 이하)
+_ZSTD_FEED_SIZE = 32
+
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+
+def available_compressions():
+    """이 환경에서 사용할 수 있는 압축 이름 목록"""
+    return [name for name, cid in COMPRESSIONS.items() if cid != COMPRESSION_ZSTD or zstandard is not None]
+
+
+def compression_id(name):
+    """
+    압축 이름 → 헤더 식별자 ("auto"는 zstd, 없으면 zlib)
+
+    Raises:
+        ValueError: 알 수 없는 이름이거나 zstandard 모듈이 없는데 zstd를 고른 경우
+    """
+    if name == "auto":
+        return COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_ZLIB
+    if name not in COMPRESSIONS:
+        raise ValueError(f"알 수 없는 압축: {name} (사용 가능: auto, {', '.join(available_compressions())})")
+    cid = COMPRESSIONS[name]
+    _require(cid)
+    return cid
+
+
+def header_compression(flags):
+    """헤더 flags에서 압축 식별자 추출"""
+    return (flags & COMPRESSION_MASK) >> COMPRESSION_SHIFT
+
+
+def compression_flags(cid):
+    """압축 식별자 → 헤더 flags 비트"""
+    return cid << COMPRESSION_SHIFT
+
+
+def _require(cid):
+    """zstd 암호문을 zstandard 모듈 없이 다루려는 경우 ValueError"""
+    if cid == COMPRESSION_ZSTD and zstandard is None:
+        raise ValueError("zstd 압축에는 zstandard 모듈이 필요합니다 (pip install zstandard)")
+
+
+def worth_compressing(data):
+    """
+    입력 표본을 빠르게 압축해 보고 압축할 가치가 있는지 판단
+
+    긴 입력은 앞, 가운데, 끝에서 PROBE_SIZE씩 뽑아 전체를 압축하지 않고도 판단한다.
+    """
+    data = memoryview(data).cast("B")
+    if len(data) < MIN_COMPRESS_SIZE:
+        return False
+    if len(data) <= 3 * PROBE_SIZE:
+        sample = bytes(data)
+    else:
+        middle = (len(data) - PROBE_SIZE) // 2
+        sample = bytes(data[:PROBE_SIZE]) + bytes(data[middle:middle + PROBE_SIZE]) + bytes(data[-PROBE_SIZE:])
+    return len(zlib.compress(sample, 1)) < len(sample) * PROBE_RATIO
+
+
+def select_compression(data, name):
+    """이름으로 고른 압축 식별자, 표본 검사에서 압축할 가치가 없으면 COMPRESSION_NONE"""
+    cid = compression_id(name)
+    if cid == COMPRESSION_NONE or not worth_compressing(data):
+        return COMPRESSION_NONE
+    return cid
+
+
+def compress(cid, data):
+    """데이터 전체를 압축"""
+    if cid == COMPRESSION_ZLIB:
+        return zlib.compress(data, _ZLIB_LEVEL)
+    if cid == COMPRESSION_LZMA:
+        return lzma.compress(data)
+    if cid == COMPRESSION_ZSTD:
+        _require(cid)
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    return bytes(data)
+
+
+def decompress(cid, data, max_size=MAX_DECOMPRESSED_SIZE):
+    """
+    데이터 전체를 압축 해제 (결과가 max_size를 넘으면 중단)
+
+    Raises:
+        ValueError: 압축 데이터가 손상되었거나 잘렸거나 max_size를 넘는 경우
+    """
+    try:
+        if cid == COMPRESSION_ZLIB:
+            decompressor = zlib.decompressobj()
+            out = decompressor.decompress(data, max_size)
+            complete = decompressor.eof and not decompressor.unconsumed_tail
+        elif cid == COMPRESSION_LZMA:
+            decompressor = lzma.LZMADecompressor()
+            out = decompressor.decompress(data, max_length=max_size)
+            complete = decompressor.eof
+        elif cid == COMPRESSION_ZSTD:
+            _require(cid)
+            out = zstandard.ZstdDecompressor().decompress(data, max_output_size=max_size)
+            complete = True
+        else:
+            return bytes(data)
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError(f"압축 해제 실패: {e}") from e
+    except Exception as e:
+        if zstandard is not None and isinstance(e, zstandard.ZstdError):
+            raise ValueError(f"압축 해제 실패: {e}") from e
+        raise
+    if not complete:
+        raise ValueError(f"압축 데이터가 잘렸거나 압축 해제 크기 제한({max_size}바이트)을 넘습니다")
+    return out
+
+
+class _Passthrough:
+    """압축하지 않는 경우의 압축기/해제기"""
+
+    eof = True
+
+    def compress(self, data):
+        return data
+
+    def chunks(self, data):
+        if data:
+            yield data
+
+    def flush(self):
+        return b""
+
+
+class _StreamDecompressor:
+    """
+    zlib/lzma/zstd 스트림 해제기를 같은 모양(chunks, eof)으로 감싸고 오류를 ValueError로 바꿈
+
+    chunks(data)는 data를 해제한 결과를 STREAM_MAX_OUTPUT 이하의 조각으로 나눠 내놓는다.
+    """
+
+    def __init__(self, decompressor, max_output=STREAM_MAX_OUTPUT):
+        self._decompressor = decompressor
+        self.max_output = max_output
+
+    @property
+    def eof(self):
+        return self._decompressor.eof
+
+    def chunks(self, data):
+        if self._decompressor.eof:
+            if data:
+                raise ValueError("압축 데이터 뒤에 남은 데이터가 있습니다")
+            return
+        try:
+            yield from self._chunks(data)
+        except (zlib.error, lzma.LZMAError) as e:
+            raise ValueError(f"압축 해제 실패: {e}") from e
+        except Exception as e:
+            if zstandard is not None and isinstance(e, zstandard.ZstdError):
+                raise ValueError(f"압축 해제 실패: {e}") from e
+            raise
+        if getattr(self._decompressor, "unused_data", b""):
+            raise ValueError("압축 데이터 뒤에 남은 데이터가 있습니다")
+
+
+class _ZlibStream(_StreamDecompressor):
+    def _chunks(self, data):
+        decompressor = self._decompressor
+        yield decompressor.decompress(data, self.max_output)
+        while decompressor.unconsumed_tail and not decompressor.eof:
+            yield decompressor.decompress(decompressor.unconsumed_tail, self.max_output)
+
+
+class _LzmaStream(_StreamDecompressor):
+    def _chunks(self, data):
+        decompressor = self._decompressor
+        yield decompressor.decompress(data, max_length=self.max_output)
+        while not decompressor.eof and not decompressor.needs_input:
+            yield decompressor.decompress(b"", max_length=self.max_output)
+
+
+class _ZstdStream(_StreamDecompressor):
+    def _chunks(self, data):
+        decompressor = self._decompressor
+        view = memoryview(data)
+        for start in range(0, len(view), _ZSTD_FEED_SIZE):
+            if decompressor.eof:
+                raise ValueError("압축 데이터 뒤에 남은 데이터가 있습니다")
+            out = decompressor.decompress(view[start:start + _ZSTD_FEED_SIZE])
+            if out:
+                yield out
+
+
+def compressor(cid):
+    """스트림 압축기 (compress(data), flush())"""
+    if cid == COMPRESSION_ZLIB:
+        return zlib.compressobj(_ZLIB_LEVEL)
+    if cid == COMPRESSION_LZMA:
+        return lzma.LZMACompressor()
+    if cid == COMPRESSION_ZSTD:
+        _require(cid)
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compressobj()
+    return _Passthrough()
+
+
+def decompressor(cid):
+    """
+    스트림 해제기 (chunks(data)로 해제한 조각들, 끝까지 읽었는지 eof)
+
+    해제 결과를 STREAM_MAX_OUTPUT 이하의 조각으로 나눠 바로 기록하므로, 작은 블록이 크게 풀리는
+    압축 폭탄도 메모리 사용량은 조각 하나 크기로 제한된다. 손상된 압축 데이터는 ValueError이다.
+    """
+    if cid == COMPRESSION_ZLIB:
+        return _ZlibStream(zlib.decompressobj())
+    if cid == COMPRESSION_LZMA:
+        return _LzmaStream(lzma.LZMADecompressor())
+    if cid == COMPRESSION_ZSTD:
+        _require(cid)
+        return _ZstdStream(zstandard.ZstdDecompressor().decompressobj())
+    return _Passthrough()
@@ -0,0 +1,263 @@
+"""
+임의 접근 컨테이너 모듈
+
+큰 파일을 고정 크기 청크마다 독립적으로 암호화하고 끝에 오프셋 색인을 붙인 바이너리 형식
+필요한 범위의 청크만 메모리 매핑으로 읽어 복호화하므로 범위 읽기 비용은 파일 크기가 아닌 범위 크기에 비례한다
+
+형식:
+    magic(𒑳 UTF-8, 4) 헤더(24) 키 확인 값(8) chunk_size(uint32)
+    청크 × N: nonce + 암호문 + 태그 (연관 데이터: 앞부분 40바이트 + 청크 번호(uint64) + 마지막 여부(1))
+    색인: 청크 시작 오프셋(uint64) × N
+    꼬리: 평문 크기(uint64) 청크 수(uint64) magic(4)
+"""
+import mmap
+import os
+import struct
+from contextlib import ExitStack
+
+from .envelope import CONTAINER_MARKER, FLAG_KCV, HEADER_SIZE, KCV_SIZE, VERSION, Header, pack_header, parse_header
+from .kdf import DEFAULT_KDF, check_key, derived_key, encryption_key, kdf_params, key_check_value
+from .modes import DEFAULT_MODE, is_aead, is_deterministic, mode_id, overhead, seal_into, sealed_size, unseal_into
+
+MAGIC = CONTAINER_MARKER.encode("utf-8")
+
+# 기본 청크 크기 (평문 기준)
+CONTAINER_CHUNK_SIZE = 64 * 1024
+
+# 허용하는 최대 청크 크기 (인증 전에 읽는 값이 읽기 버퍼 크기를 정하므로 제한)
+MAX_CONTAINER_CHUNK_SIZE = 64 * 1024 * 1024
+
+_CHUNK_SIZE = struct.Struct(">I")
+_CHUNK_AAD = struct.Struct(">QB")
+_OFFSET = struct.Struct(">Q")
+_FOOTER = struct.Struct(">QQ4s")
+PREFIX_SIZE = len(MAGIC) + HEADER_SIZE + KCV_SIZE + _CHUNK_SIZE.size
+
+
+def is_container(src):
+    """바이너리 스트림이 컨테이너 형식인지 확인 (읽기 위치는 유지)"""
+    position = src.tell()
+    magic = src.read(len(MAGIC))
+    src.seek(position)
+    return magic == MAGIC
+
+
+def _read_full(src, view):
+    """view를 가득 채울 때까지(또는 EOF까지) 스트림에서 직접 읽고 읽은 바이트 수 반환"""
+    filled = 0
+    while filled < len(view):
+        n = src.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+def encrypt_container(src, dst, key, chunk_size=CONTAINER_CHUNK_SIZE, kdf=DEFAULT_KDF, mode=DEFAULT_MODE):
+    """
+    바이너리 스트림을 임의 접근 컨테이너로 암호화
+
+    Args:
+        src: 평문을 읽을 바이너리 스트림
+        dst: 컨테이너를 기록할 바이너리 스트림
+        key: 암호화 키
+        chunk_size: 청크 하나의 평문 바이트 수
+        kdf: 키 파생 함수 이름
+        mode: 암호화 모드 ("gcm", "chacha20-poly1305" 또는 결정적 "siv")
+
+    Returns:
+        읽은 평문 바이트 수
+    """
+    if not 0 < chunk_size <= MAX_CONTAINER_CHUNK_SIZE:
+        raise ValueError(f"chunk_size는 1 이상 {MAX_CONTAINER_CHUNK_SIZE} 이하여야 합니다")
+    mode = mode_id(mode)
+    if not is_aead(mode):
+        raise ValueError("컨테이너는 AEAD 모드(gcm, chacha20-poly1305, siv)만 지원합니다")
+    kdf_id, params = kdf_params(kdf)
+
+    with encryption_key(key, kdf_id, params, is_deterministic(mode)) as (salt, key_bytes):
+        header = pack_header(Header(VERSION, FLAG_KCV, kdf_id, mode, params, salt))
+        prefix = MAGIC + header + key_check_value(key_bytes) + _CHUNK_SIZE.pack(chunk_size)
+        dst.write(prefix)
+        offsets = []
+        position = len(prefix)
+        total = 0
+        # 평문은 두 버퍼에 번갈아 읽어 들이고(마지막 청크 여부 확인용 한 청크 앞서 읽기),
+        # 암호문은 재사용하는 출력 버퍼에 바로 암호화해 복사를 없앤다
+        buffers = [memoryview(bytearray(chunk_size)), memoryview(bytearray(chunk_size))]
+        sealed = memoryview(bytearray(sealed_size(mode, chunk_size)))
+        size = _read_full(src, buffers[0])
+        while True:
+            following = _read_full(src, buffers[1]) if size == chunk_size else 0
+            final = not following
+            aad = prefix + _CHUNK_AAD.pack(len(offsets), final)
+            written = seal_into(mode, key_bytes, buffers[0][:size], sealed, aad=aad)
+            dst.write(sealed[:written])
+            offsets.append(position)
+            position += written
+            total += size
+            if final:
+                break
+            buffers.reverse()
+            size = following
+
+    dst.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+    dst.write(_FOOTER.pack(total, len(offsets), MAGIC))
+    return total
+
+
+class ContainerReader:
+    """
+    컨테이너를 메모리 매핑으로 열어 청크 단위로 복호화하는 읽기 객체
+
+    열 때 키 확인 값을 검사하므로 잘못된 키는 본문을 읽기 전에 거부된다.
+    """
+
+    def __init__(self, src, key):
+        """
+        Args:
+            src: 컨테이너 파일의 바이너리 스트림 (fileno 필요)
+            key: 복호화 키
+
+        Raises:
+            ValueError: 컨테이너 형식이 아니거나 키가 일치하지 않는 경우
+        """
+        self._stack = ExitStack()
+        try:
+            self._open(src, key)
+        except BaseException:
+            self._stack.close()
+            raise
+
+    def _open(self, src, key):
+        """매핑, 앞부분/꼬리 해석, 키 확인"""
+        file_size = os.fstat(src.fileno()).st_size
+        if file_size < PREFIX_SIZE + _FOOTER.size:
+            raise ValueError("컨테이너가 너무 짧습니다")
+        self._map = self._stack.enter_context(mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ))
+        self._view = memoryview(self._map)
+        self._stack.callback(self._view.release)
+        data = self._map
+
+        self._prefix = data[:PREFIX_SIZE]
+        if not self._prefix.startswith(MAGIC):
+            raise ValueError("컨테이너 형식이 아닙니다")
+        header = parse_header(self._prefix[len(MAGIC):])
+        if not header.flags & FLAG_KCV or not is_aead(header.mode):
+            raise ValueError("지원하지 않는 컨테이너 헤더입니다")
+        (self.chunk_size,) = _CHUNK_SIZE.unpack_from(self._prefix, PREFIX_SIZE - _CHUNK_SIZE.size)
+        if not 0 < self.chunk_size <= MAX_CONTAINER_CHUNK_SIZE:
+            raise ValueError(f"컨테이너 청크 크기가 허용 범위를 벗어났습니다: {self.chunk_size}")
+
+        # 청크 길이는 평문 크기와 청크 크기로 정해지므로 꼬리의 값이 실제 파일 크기와 맞는지 확인
+        self.size, self.chunk_count, magic = _FOOTER.unpack_from(data, file_size - _FOOTER.size)
+        self._index = file_size - _FOOTER.size - _OFFSET.size * self.chunk_count
+        if magic != MAGIC or self._index < PREFIX_SIZE \
+                or self.chunk_count != max(1, -(-self.size // self.chunk_size)) \
+                or self._index - PREFIX_SIZE != self.size + self.chunk_count * overhead(header.mode):
+            raise ValueError("컨테이너 색인이 손상되었습니다")
+
+        self._mode = header.mode
+        self._key_bytes = self._stack.enter_context(derived_key(key, header.salt, header.kdf, header.params))
+        check_key(self._key_bytes, self._prefix[len(MAGIC) + HEADER_SIZE:len(MAGIC) + HEADER_SIZE + KCV_SIZE])
+
+    def _offset(self, number):
+        """청크 시작 오프셋 (마지막 다음은 색인 시작, 색인의 오프셋이 청크 영역 밖이면 ValueError)"""
+        if number == self.chunk_count:
+            return self._index
+        (offset,) = _OFFSET.unpack_from(self._map, self._index + _OFFSET.size * number)
+        if not PREFIX_SIZE <= offset <= self._index:
+            raise ValueError("컨테이너 색인이 손상되었습니다")
+        return offset
+
+    def chunk_into(self, number, out):
+        """
+        청크 하나를 매핑된 파일에서 out 버퍼로 바로 복호화
+
+        Returns:
+            기록한 평문 바이트 수
+
+        Raises:
+            ValueError: 청크 번호가 범위를 벗어났거나 태그 검증 또는 길이 확인에 실패한 경우
+        """
+        if not 0 <= number < self.chunk_count:
+            raise ValueError(f"청크 번호가 범위를 벗어났습니다: {number}")
+        start, end = self._offset(number), self._offset(number + 1)
+        if not PREFIX_SIZE <= start <= end <= self._index:
+            raise ValueError("컨테이너 색인이 손상되었습니다")
+        final = number == self.chunk_count - 1
+        expected = self.size - self.chunk_size * number if final else self.chunk_size
+        if end - start != expected + overhead(self._mode):
+            raise ValueError("컨테이너 청크 길이가 올바르지 않습니다")
+        aad = self._prefix + _CHUNK_AAD.pack(number, final)
+        with self._view[start:end] as body:
+            return unseal_into(self._mode, self._key_bytes, body, out, aad=aad)
+
+    def chunk(self, number):
+        """청크 하나를 복호화한 bytearray"""
+        out = bytearray(self.chunk_size)
+        del out[self.chunk_into(number, out):]
+        return out
+
+    def read(self, offset, length=None):
+        """
+        평문의 [offset, offset + length) 범위를 해당 청크만 복호화해 반환 (bytearray)
+
+        offset이 음수이면 끝에서부터 센다. length가 None이면 끝까지 읽는다.
+        """
+        if offset < 0:
+            offset = max(0, self.size + offset)
+        end = self.size if length is None else min(self.size, offset + max(0, length))
+        if offset >= end:
+            return bytearray()
+        first, last = offset // self.chunk_size, (end - 1) // self.chunk_size
+        out = bytearray((last - first + 1) * self.chunk_size)
+        view = memoryview(out)
+        for number in range(first, last + 1):
+            self.chunk_into(number, view[(number - first) * self.chunk_size:])
+        view.release()
+        start = offset - first * self.chunk_size
+        del out[start + end - offset:]
+        del out[:start]
+        return out
+
+    def close(self):
+        """매핑과 파생 키 임대 해제"""
+        self._stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def decrypt_container(src, dst, key):
+    """
+    컨테이너 전체를 청크 순서대로 복호화하여 기록
+
+    Returns:
+        기록한 평문 바이트 수
+    """
+    with ContainerReader(src, key) as reader:
+        buffer = memoryview(bytearray(reader.chunk_size))
+        for number in range(reader.chunk_count):
+            dst.write(buffer[:reader.chunk_into(number, buffer)])
+        return reader.size
+
+
+def decrypt_range(filepath, key, offset, length=None):
+    """
+    컨테이너 파일에서 평문 일부만 복호화
+
+    Args:
+        filepath: 컨테이너 파일 경로
+        key: 복호화 키
+        offset: 평문 시작 위치 (음수이면 끝에서부터)
+        length: 읽을 바이트 수 (None이면 끝까지)
+
+    Returns:
+        복호화된 바이트열 (bytearray)
+    """
+    with open(filepath, "rb") as src, ContainerReader(src, key) as reader:
+        return reader.read(offset, length)
@@ -1,150 +1,502 @@
 """
 Sumerian Encryption - 수메르어 암호화 시스템 핵심 모듈
-AES-256 CBC와 수메르어 문자 변환을 결합한 암호화 시스템
+AES-256(GCM, ChaCha20-Poly1305 또는 CBC)과 수메르어 문자 변환을 결합한 암호화 시스템
+키는 PBKDF2/scrypt로 파생하며 솔트, KDF 파라미터, 모드, 압축 알고리즘은 암호문 헤더에 기록된다
 """
 from Crypto.Cipher import AES
 import base64
+import hashlib
+import hmac
 import os
 
+from .cache import SecureLRUCache
+from .codec import SumerianCodec, get_codec, register_codec, sumerian_cipher_map
+from . import base1024
+from .compression import (
+    COMPRESSION_NONE,
+    compress,
+    compression_flags,
+    compression_id,
+    decompress,
+    header_compression,
+    worth_compressing,
+)
+from .envelope import (
+    DEFAULT_COMPRESSION,
+    DEFAULT_ENCODING,
+    ENCODINGS,
+    FLAG_KCV,
+    HEADER_SIZE,
+    KCV_SIZE,
+    VERSION,
+    Header,
+    header_size,
+    pack_header,
+    parse_header,
+    split_marker,
+)
+from .kdf import (
+    DEFAULT_KDF,
+    DETERMINISTIC_SALT,
+    check_key,
+    derived_key,
+    encryption_key,
+    kdf_params,
+    key_cached,
+    key_check_value,
+)
+from .modes import (
+    DEFAULT_MODE,
+    MODES,
+    is_aead,
+    mode_id,
+    overhead,
+    pad_bytes,
+    seal_into,
+    sealed_size,
+    unpad_bytes,
+    is_deterministic,
+    unseal,
+    unseal_into,
+)
+
 
 def pad(s):
-    """AES 블록 크기(16바이트)에 맞게 패딩 추가"""
-    return s + (16 - len(s) % 16) * chr(16 - len(s) % 16)
+    """AES 블록 크기(16바이트)에 맞게 패딩 추가 (문자 수가 아닌 UTF-8 바이트 수 기준)"""
+    n = 16 - len(s.encode("utf-8")) % 16
+    return s + n * chr(n)
 
 
 def unpad(s):
-    """AES 패딩 제거"""
+    """AES 패딩 제거 (패딩 문자는 모두 1바이트이므로 문자 수 = 바이트 수)"""
     return s[: -ord(s[-1])]
 
 
-def encrypt_aes(password, key):
-    """AES-256 CBC 모드로 암호화"""
-    key = key.ljust(32)[:32].encode()
-    iv = os.urandom(16)  # 랜덤 IV 생성 (CBC 모드)
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    encrypted = cipher.encrypt(pad(password).encode())  # PKCS7 패딩 적용
-    return base64.b64encode(iv + encrypted).decode()  # Base64 변환
+def prepare_key(key):
+    """기존(버전 1) 형식용: 암호화 키 문자열을 32바이트로 잘라 AES-256 키 바이트로 변환"""
+    return key.ljust(32)[:32].encode()
 
 
-def decrypt_aes(encrypted_password, key):
-    """AES-256 CBC 모드로 복호화"""
-    key = key.ljust(32)[:32].encode()
+# 헤더 + 키 확인 값을 담는 암호문 앞부분의 텍스트 길이 (인코딩 단위 경계로 올림)
+_PREFIX_CHARS = {
+    "base64": 4 * -(-(HEADER_SIZE + KCV_SIZE) // 3),
+    "base1024": 4 * -(-(HEADER_SIZE + KCV_SIZE) // 5),
+}
 
-    try:
-        encrypted_password = base64.b64decode(encrypted_password)  # Base64 디코딩
-    except Exception as e:
+
+def encrypted_size(size, mode=DEFAULT_MODE):
+    """평문 size바이트를 encrypt_bytes로 암호화한 봉투 길이 (출력 버퍼 할당용)"""
+    return HEADER_SIZE + KCV_SIZE + sealed_size(mode_id(mode), size)
+
+
+def decrypted_size(data):
+    """encrypt_bytes 봉투를 복호화한 평문의 최대 길이 (AEAD 모드는 정확한 길이)"""
+    data = memoryview(data).cast("B")
+    header = parse_header(data)
+    size = len(data) - header_size(header) - overhead(header.mode)
+    return max(0, size if is_aead(header.mode) else size + 15)
+
+
+def _seal_into(data, key_bytes, salt, kdf_id, params, mode, out, flags=FLAG_KCV):
+    """파생 키로 암호화해 out에 헤더 + 키 확인 값 + nonce(IV) + 암호문(+ 태그)을 기록하고 길이 반환"""
+    data, out = memoryview(data).cast("B"), memoryview(out).cast("B")
+    header = pack_header(Header(VERSION, flags, kdf_id, mode, params, salt)) + key_check_value(key_bytes)
+    if len(out) < len(header) + sealed_size(mode, len(data)):
+        raise ValueError("출력 버퍼가 너무 작습니다")
+    out[:len(header)] = header
+    return len(header) + seal_into(mode, key_bytes, data, out[len(header):], aad=header)
+
+
+def _seal(password, key_bytes, salt, kdf_id, params, mode, compression=COMPRESSION_NONE):
+    """
+    문자열을 UTF-8 바이트로 암호화한 봉투 바이트 반환
+
+    compression(압축 식별자)이 있으면 표본 검사를 통과하고 실제로 줄어드는 경우에만 압축하고 헤더에 기록한다.
+    """
+    data = password.encode()
+    flags = FLAG_KCV
+    if compression != COMPRESSION_NONE and worth_compressing(data):
+        packed = compress(compression, data)
+        if len(packed) < len(data):
+            data, flags = packed, flags | compression_flags(compression)
+    out = bytearray(HEADER_SIZE + KCV_SIZE + sealed_size(mode, len(data)))
+    _seal_into(data, key_bytes, salt, kdf_id, params, mode, out, flags)
+    return out
+
+
+def encrypt_bytes(data, key, kdf=DEFAULT_KDF, mode=DEFAULT_MODE, out=None):
+    """
+    바이트 버퍼를 텍스트 변환 없이 버전 2 봉투(헤더 + 키 확인 값 + nonce + 암호문 + 태그)로 암호화
+
+    입력은 버퍼 프로토콜을 지원하는 모든 객체(bytes, bytearray, memoryview, mmap 등)이며
+    평문을 복사하지 않고 out 버퍼에 바로 암호화한다. 패딩(CBC)은 바이트 단위 PKCS7이다.
+
+    Args:
+        data: 평문 버퍼
+        key: 암호화 키
+        kdf: 키 파생 함수 이름
+        mode: 암호화 모드 ("gcm", "chacha20-poly1305", "cbc" 또는 결정적 "siv")
+        out: 결과를 기록할 쓰기 가능한 버퍼 (encrypted_size(len(data), mode) 이상)
+
+    Returns:
+        out이 없으면 봉투 bytearray, 있으면 out에 기록한 바이트 수
+    """
+    kdf_id, params = kdf_params(kdf)
+    mode = mode_id(mode)
+    with encryption_key(key, kdf_id, params, is_deterministic(mode)) as (salt, key_bytes):
+        if out is not None:
+            return _seal_into(data, key_bytes, salt, kdf_id, params, mode, out)
+        sealed = bytearray(HEADER_SIZE + KCV_SIZE + sealed_size(mode, memoryview(data).nbytes))
+        _seal_into(data, key_bytes, salt, kdf_id, params, mode, sealed)
+        return sealed
+
+
+def decrypt_bytes(data, key, out=None):
+    """
+    encrypt_bytes 봉투 버퍼를 복호화
+
+    Args:
+        data: 봉투 버퍼 (bytes, bytearray, memoryview, mmap 등)
+        key: 복호화 키
+        out: 평문을 기록할 쓰기 가능한 버퍼 (decrypted_size(data) 이상, 압축된 봉투는 압축 해제한 길이 이상)
+
+    Returns:
+        out이 없으면 평문 bytearray, 있으면 out에 기록한 바이트 수
+
+    Raises:
+        ValueError: 헤더가 잘못되었거나 키 확인, 태그/패딩 검증, 압축 해제에 실패한 경우
+    """
+    data = memoryview(data).cast("B")
+    header = parse_header(data)
+    start = header_size(header)
+    aad = bytes(data[:start])
+    with derived_key(key, header.salt, header.kdf, header.params) as key_bytes:
+        # 키 확인 값이 있으면 본문을 건드리기 전에 키부터 확인
+        if header.flags & FLAG_KCV:
+            check_key(key_bytes, aad[HEADER_SIZE:])
+        compression = header_compression(header.flags)
+        if compression == COMPRESSION_NONE:
+            if out is None:
+                return unseal(header.mode, key_bytes, data[start:], aad=aad)
+            return unseal_into(header.mode, key_bytes, data[start:], out, aad=aad)
+        plain = bytearray(decompress(compression, unseal(header.mode, key_bytes, data[start:], aad=aad)))
+    if out is None:
+        return plain
+    out = memoryview(out).cast("B")
+    if len(out) < len(plain):
+        raise ValueError("출력 버퍼가 너무 작습니다")
+    out[:len(plain)] = plain
+    return len(plain)
+
+
+def _decrypt_cbc(data, key_bytes):
+    """IV + CBC 암호문 바이트를 복호화 (실패 시 None)"""
+    if len(data) < 32 or len(data) % 16:
         return None
 
-    iv = encrypted_password[:16]  # CBC 모드에서 IV 추출
-    encrypted_text = encrypted_password[16:]  # 실제 암호문
+    iv = data[:16]  # CBC 모드에서 IV 추출
+    encrypted_text = data[16:]  # 실제 암호문
 
-    cipher = AES.new(key, AES.MODE_CBC, iv)
+    cipher = AES.new(key_bytes, AES.MODE_CBC, iv)
     decrypted_bytes = cipher.decrypt(encrypted_text)  # AES 복호화
 
     try:
-        decrypted_text = unpad(decrypted_bytes.decode())  # UTF-8 디코딩 및 패딩 제거
-    except UnicodeDecodeError:
+        decrypted_text = unpad_bytes(decrypted_bytes).decode()  # 바이트 단위 패딩 제거 및 UTF-8 디코딩
+    except ValueError:  # 잘못된 패딩 또는 UnicodeDecodeError
         return None
 
     return decrypted_text
 
 
-# 수메르어 변환 매핑 (알파벳 + 숫자 + 특수문자 → 수메르어)
-sumerian_cipher_map = {
-    # 알파벳 소문자
-    "a": "𒀀",
-    "b": "𒁀",
-    "c": "𒍝",
-    "d": "𒁕",
-    "e": "𒂊",
-    "f": "𒆠",
-    "g": "𒂅",
-    "h": "𒄭",
-    "i": "𒄿",
-    "j": "𒋡",
-    "k": "𒆪",
-    "l": "𒇷",
-    "m": "𒈬",
-    "n": "𒉈",
-    "o": "𒌷",
-    "p": "𒉿",
-    "q": "𒍪",
-    "r": "𒊏",
-    "s": "𒊭",
-    "t": "𒋾",
-    "u": "𒌋",
-    "v": "𒅈",
-    "w": "𒂗",
-    "x": "𒐊",
-    "y": "𒅆",
-    "z": "𒍣",
-    # 숫자
-    "0": "𒀹",
-    "1": "𒁹",
-    "2": "𒀻",
-    "3": "𒀼",
-    "4": "𒌝",
-    "5": "𒉽",
-    "6": "𒐖",
-    "7": "𒐗",
-    "8": "𒐘",
-    "9": "𒐙",
-    # Base64 특수문자
-    "+": "𒃻",
-    "/": "𒁺",
-    "=": "𒈦",
-    # 공백 및 추가 특수문자
-    " ": "𒌃",
-    ".": "𒁇",
-    ",": "𒄑",
-    "!": "𒄠",
-    "?": "𒅎",
-    "@": "𒀭",
-    "#": "𒂔",
-    "$": "𒌨",
-    "%": "𒊬",
-    "^": "𒅖",
-    "&": "𒀝",
-    "*": "𒀯",
-    "(": "𒐏",
-    ")": "𒐐",
-    "-": "𒁲",
-    "_": "𒀞",
-    "[": "𒌍",
-    "]": "𒌌",
-    "{": "𒍢",
-    "}": "𒍤",
-    "|": "𒌒",
-    "\\": "𒍦",
-    ":": "𒌓",
-    ";": "𒌇",
-    '"': "𒋰",
-    "'": "𒋫",
-    "<": "𒉺",
-    ">": "𒊒",
-    "`": "𒋛",
-    "~": "𒀊",
-}
+def _open(data, key):
+    """
+    버전 2 봉투를 헤더의 KDF/모드 설정으로 복호화
+
+    Raises:
+        ValueError: 헤더가 잘못되었거나 키 확인, 태그/패딩 검증, UTF-8 디코딩에 실패한 경우
+    """
+    return decrypt_bytes(data, key).decode()
+
+
+def _decode_prefix(encoding, body, codec):
+    """암호문 앞부분(헤더 + 키 확인 값)만 디코딩 (해석할 수 없으면 ValueError)"""
+    prefix = body[:_PREFIX_CHARS[encoding]]
+    if encoding == "base1024":
+        return base1024.decode(prefix)
+    return base64.b64decode(codec.decode(prefix, strict=True), validate=True)
+
+
+def _key_mismatch(encoding, body, codec, key):
+    """
+    암호문 앞부분만 디코딩해 헤더의 키 확인 값으로 잘못된 키인지 판별
+
+    본문 길이와 관계없이 일정한 비용으로 동작한다. 키 확인 값이 없거나 앞부분을
+    해석할 수 없으면 False를 반환해 전체 복호화 단계에서 판단하도록 한다.
+    """
+    if len(body) <= _PREFIX_CHARS[encoding]:
+        return False
+    try:
+        data = _decode_prefix(encoding, body, codec)
+        header = parse_header(data)
+        if not header.flags & FLAG_KCV:
+            return False
+        with derived_key(key, header.salt, header.kdf, header.params) as key_bytes:
+            check_key(key_bytes, data[HEADER_SIZE:HEADER_SIZE + KCV_SIZE])
+    except ValueError:
+        return True
+    return False
+
+
+def encryption_key_ready(key, kdf=DEFAULT_KDF, mode=DEFAULT_MODE):
+    """
+    이 키로 암호화할 때 키 파생 없이 캐시된 키를 바로 쓸 수 있는지
+
+    잘못된 KDF/모드 이름은 파생 전에 실패하므로 True를 반환한다.
+    """
+    try:
+        kdf_id, params = kdf_params(kdf)
+        deterministic = is_deterministic(mode_id(mode))
+    except ValueError:
+        return True
+    return key_cached(key, kdf_id, params, DETERMINISTIC_SALT if deterministic else None)
+
+
+def decryption_key_ready(encrypted_password, key, codec="sumerian"):
+    """
+    암호문 앞부분의 헤더만 해석해 키 파생 없이 바로 복호화할 수 있는지
+
+    기존 형식이나 헤더를 해석할 수 없는 암호문은 키 파생 없이 끝나므로 True를 반환한다.
+    """
+    encoding, body = split_marker(encrypted_password.strip())
+    if not encoding:
+        return True
+    try:
+        header = parse_header(_decode_prefix(encoding, body, get_codec(codec)))
+    except ValueError:
+        return True
+    return key_cached(key, header.kdf, header.params, header.salt)
+
 
+def encrypt_aes(password, key, kdf=DEFAULT_KDF, mode=DEFAULT_MODE):
+    """
+    AES-256으로 암호화
 
-def encrypt_sumerian(text):
+    키는 kdf("pbkdf2" 또는 "scrypt")로 파생하며, mode는 "gcm"(기본값), "chacha20-poly1305", "cbc" 중 하나다.
+    결과는 Base64(헤더 + nonce + 암호문 + 태그)이다.
+    """
+    kdf_id, params = kdf_params(kdf)
+    mode = mode_id(mode)
+    with encryption_key(key, kdf_id, params, is_deterministic(mode)) as (salt, key_bytes):
+        return base64.b64encode(_seal(password, key_bytes, salt, kdf_id, params, mode)).decode()  # Base64 변환
+
+
+def decrypt_aes(encrypted_password, key):
+    """AES-256 복호화 (헤더가 있으면 헤더의 KDF/모드, 없으면 기존 CBC 형식)"""
+    try:
+        data = base64.b64decode(encrypted_password)  # Base64 디코딩
+    except Exception as e:
+        return None
+
+    if data[:1] == bytes([VERSION]):
+        try:
+            decrypted = _open(data, key)
+        except ValueError:
+            decrypted = None
+        if decrypted is not None:
+            return decrypted
+    return _decrypt_cbc(data, prepare_key(key))
+
+
+def armor(sealed, codec, encoding=DEFAULT_ENCODING):
+    """
+    봉투 바이트를 표식이 붙은 텍스트로 변환
+
+    Args:
+        sealed: 헤더 + IV + 암호문 바이트
+        codec: 코덱 객체 (base64 인코딩에서만 사용)
+        encoding: "base64"(Base64 + 코덱 문자 매핑) 또는 "base1024"(바이트 → 쐐기문자 직접 변환)
+    """
+    if encoding == "base1024":
+        return ENCODINGS[encoding] + base1024.encode(sealed)
+    if encoding == "base64":
+        return ENCODINGS[encoding] + codec.encode(base64.b64encode(sealed).decode())
+    raise ValueError(f"알 수 없는 인코딩: {encoding} (사용 가능: {', '.join(ENCODINGS)})")
+
+
+def encrypt_sumerian(text, codec="sumerian"):
     """AES 암호화된 Base64를 수메르 문자로 변환"""
-    return "".join(sumerian_cipher_map.get(char.lower(), char) if char in sumerian_cipher_map else char for char in text)
+    return get_codec(codec).encode(text)
 
 
-def decrypt_sumerian(text):
+def decrypt_sumerian(text, codec="sumerian", strict=False):
     """수메르 문자에서 원래 Base64로 복원"""
-    reverse_map = {v: k for k, v in sumerian_cipher_map.items()}
-    return "".join(reverse_map.get(char, char) for char in text)
+    return get_codec(codec).decode(text, strict=strict)
+
+
+def encrypt_password(password, key, codec="sumerian", kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING, mode=DEFAULT_MODE,
+                     compression=DEFAULT_COMPRESSION):
+    """
+    AES-256으로 암호화 후 수메르어 변환 (버전 2 표식 포함)
+
+    mode는 인증 암호화 "gcm"(기본값), "chacha20-poly1305" 또는 "cbc"이다.
+    결정적 모드 "siv"(AES-SIV)는 같은 키와 평문이면 항상 같은 결과를 만들므로 암호문을 그대로 색인해
+    복호화 없이 같은 값을 찾거나 중복을 제거할 수 있다 (대신 같은 값인지는 드러난다).
+    encoding="base1024"이면 Base64를 거치지 않고 10비트당 쐐기문자 하나로 변환해
+    출력 문자 수를 약 40% 줄인다 (코덱 매핑은 사용하지 않음).
+    compression("zlib", "lzma", "zstd" 또는 "auto")을 지정하면 암호화 전에 평문을 압축한다.
+    표본 검사에서 잘 압축되지 않거나 압축 결과가 더 길면 압축하지 않는다.
+    압축된 길이는 평문 내용을 드러낼 수 있으므로 공격자가 고른 데이터와 비밀을 함께 암호화할 때는 쓰지 않는다.
+    """
+    kdf_id, params = kdf_params(kdf)
+    mode = mode_id(mode)
+    compression = compression_id(compression)
+    with encryption_key(key, kdf_id, params, is_deterministic(mode)) as (salt, key_bytes):
+        sealed = _seal(password, key_bytes, salt, kdf_id, params, mode, compression)
+    return armor(sealed, get_codec(codec), encoding)
+
+
+# 복호화 결과 캐시 (프로세스 단위, 기본값은 꺼짐)
+#
+# 같은 자격 증명을 반복해서 복호화하는 경우 코덱 매핑, Base64, AES 처리를 생략한다
+# 캐시 키는 (코덱 객체, 암호문의 SHA-256, 키 지문)이며 (코덱을 교체하면 이전 결과는 적중하지 않음) 키 지문은 프로세스마다 새로 만든 비밀 값으로 계산한
+# HMAC-SHA256이므로 캐시에는 키 문자열이 남지 않는다. 평문은 UTF-8 bytearray로 보관해 제거할 때 0으로 덮어쓴다
+_decrypt_cache = SecureLRUCache(maxsize=256, ttl=300)
+_decrypt_cache_enabled = False
+_fingerprint_secret = os.urandom(32)
+
+
+def configure_decrypt_cache(enabled=None, maxsize=None, ttl=None):
+    """복호화 결과 캐시 사용 여부, 최대 항목 수, 유지 시간(초) 변경"""
+    global _decrypt_cache_enabled
+    if enabled is not None:
+        _decrypt_cache_enabled = bool(enabled)
+    if maxsize is not None:
+        _decrypt_cache.maxsize = maxsize
+    if ttl is not None:
+        _decrypt_cache.ttl = ttl
+
+
+def clear_decrypt_cache():
+    """캐시된 복호화 결과를 모두 제거하고 0으로 덮어쓰기"""
+    _decrypt_cache.clear()
+
+
+def decrypt_cache_stats():
+    """복호화 결과 캐시 상태 (enabled와 SecureLRUCache.stats() 항목)"""
+    return dict(_decrypt_cache.stats(), enabled=_decrypt_cache_enabled)
+
+
+def _decrypt_cache_key(encrypted_password, key, codec):
+    """(코덱 객체, 암호문 다이제스트, 키 지문)"""
+    digest = hashlib.sha256(encrypted_password.encode("utf-8")).digest()
+    fingerprint = hmac.new(_fingerprint_secret, key.encode("utf-8"), "sha256").digest()
+    return codec, digest, fingerprint
+
+
+def decrypt_password(encrypted_password, key, codec="sumerian", cache=None):
+    """
+    수메르어 복호화 후 AES-256 복호화 (모드는 헤더에서 판별)
+
+    cache가 True이면 복호화 결과 캐시를 사용한다 (None이면 configure_decrypt_cache()의 설정을 따름).
+    같은 암호문과 키를 동시에 복호화하면 한 번만 처리하고 나머지는 결과를 기다린다.
+    """
+    codec = get_codec(codec)
+    if not (_decrypt_cache_enabled if cache is None else cache):
+        return _decrypt_password(encrypted_password, key, codec)
+
+    def compute():
+        plaintext = _decrypt_password(encrypted_password, key, codec)
+        # 실패(None)도 캐시하므로 잘못된 키의 반복 요청도 다시 처리하지 않음
+        return None if plaintext is None else bytearray(plaintext.encode("utf-8"))
+
+    with _decrypt_cache.lease(_decrypt_cache_key(encrypted_password.strip(), key, codec), compute) as plaintext:
+        return None if plaintext is None else plaintext.decode("utf-8")
+
+
+def _decrypt_password(encrypted_password, key, codec):
+    """
+    표식 유무에 따라 버전 2(KDF) 또는 기존 형식으로 복호화
+
+    Returns:
+        복호화된 문자열, 키가 잘못되었거나 데이터가 손상된 경우 None
+    """
+    encoding, body = split_marker(encrypted_password.strip())
+    if encoding and _key_mismatch(encoding, body, codec, key):
+        return None
+    try:
+        if encoding == "base1024":
+            data = base1024.decode(body)
+        else:
+            data = base64.b64decode(codec.decode(body, strict=True), validate=True)
+    except ValueError:
+        return None
+    if encoding:
+        try:
+            return _open(data, key)
+        except ValueError:
+            return None
+    return _decrypt_cbc(data, prepare_key(key))
+
+
+def encrypt_batch(passwords, key, codec="sumerian", kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING, mode=DEFAULT_MODE,
+                  compression=DEFAULT_COMPRESSION):
+    """
+    여러 문자열을 같은 키로 일괄 암호화
+
+    키 파생과 코덱 조회는 배치당 한 번만 수행한다.
+
+    Args:
+        passwords: 암호화할 문자열 목록
+        key: 암호화 키
+        codec: 코덱 이름
+        kdf: 키 파생 함수 이름 ("pbkdf2" 또는 "scrypt")
+        encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+        mode: 암호화 모드 ("gcm", "chacha20-poly1305", "cbc" 또는 결정적 "siv")
+        compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 항목마다 표본 검사)
+
+    Returns:
+        항목별 결과 목록 ({"ok": True, "result": ...} 또는 {"ok": False, "error": ...})
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"알 수 없는 인코딩: {encoding} (사용 가능: {', '.join(ENCODINGS)})")
+    kdf_id, params = kdf_params(kdf)
+    mode = mode_id(mode)
+    compression = compression_id(compression)
+    codec = get_codec(codec)
+    results = []
+    with encryption_key(key, kdf_id, params, is_deterministic(mode)) as (salt, key_bytes):
+        for password in passwords:
+            try:
+                sealed = _seal(password, key_bytes, salt, kdf_id, params, mode, compression)
+                encrypted = armor(sealed, codec, encoding)
+                results.append({"ok": True, "result": encrypted})
+            except Exception as e:
+                results.append({"ok": False, "error": f"암호화 오류: {str(e)}"})
+    return results
 
 
-def encrypt_password(password, key):
-    """AES-256 + CBC로 암호화 후 수메르어 변환"""
-    encrypted_aes = encrypt_aes(password, key)
-    return encrypt_sumerian(encrypted_aes)
+def decrypt_batch(encrypted_passwords, key, codec="sumerian"):
+    """
+    여러 암호문을 같은 키로 일괄 복호화
 
+    Args:
+        encrypted_passwords: 수메르어 암호문 목록
+        key: 복호화 키
+        codec: 코덱 이름
 
-def decrypt_password(encrypted_password, key):
-    """수메르어 복호화 후 AES-256 + CBC 복호화"""
-    decrypted_sumerian = decrypt_sumerian(encrypted_password)
-    return decrypt_aes(decrypted_sumerian, key) 
\ No newline at end of file
+    Returns:
+        항목별 결과 목록 ({"ok": True, "result": ...} 또는 {"ok": False, "error": ...})
+    """
+    codec = get_codec(codec)
+    results = []
+    for encrypted_password in encrypted_passwords:
+        try:
+            decrypted = _decrypt_password(encrypted_password, key, codec)
+        except Exception as e:
+            results.append({"ok": False, "error": f"복호화 오류: {str(e)}"})
+            continue
+        if decrypted is None:
+            results.append({"ok": False, "error": "복호화 실패: 키가 잘못되었거나 암호화된 데이터가 손상되었습니다."})
+        else:
+            results.append({"ok": True, "result": decrypted})
+    return results 
\ No newline at end of file
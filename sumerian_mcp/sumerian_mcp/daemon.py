@@ -0,0 +1,396 @@
+"""
+로컬 암호화 데몬 모듈
+
+파생 키 캐시를 유지하는 상주 프로세스를 유닉스 도메인 소켓으로 제공한다
+CLI의 encrypt/decrypt/test 명령은 데몬이 실행 중이면 요청만 보내고 (키 파생, 암호 라이브러리 가져오기 생략),
+연결할 수 없으면 현재 프로세스에서 직접 처리한다
+
+프로토콜은 한 줄에 JSON 하나씩 주고받는 요청/응답이며 한 연결에서 여러 요청을 보낼 수 있다
+    요청: {"op": "encrypt", "password": ..., "key": ..., "kdf": ..., "encoding": ..., "mode": ..., "compression": ...}
+          {"op": "decrypt", "encrypted_text": ..., "key": ...}
+          {"op": "ping"}, {"op": "stats"}, {"op": "shutdown"}
+    응답: {"ok": true, "result": ...} 또는 {"ok": false, "error": ...}
+
+요청에 키가 담기므로 소켓 파일은 소유자만 접근할 수 있게(0600) 만들고, 가능하면 접속한 프로세스의 UID도 확인한다
+클라이언트도 연결 전에 소켓의 소유자와 권한을, 연결 후에는 데몬 프로세스의 UID를 확인해
+다른 사용자가 만든 소켓에는 키를 보내지 않는다 (확인에 실패하면 현재 프로세스에서 직접 처리)
+이 모듈의 클라이언트 부분은 표준 라이브러리만 쓰므로 가져오는 비용이 작다
+"""
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+SOCKET_ENV = "SUMERIAN_DAEMON_SOCKET"
+
+# 1이면 CLI가 데몬을 쓰지 않음
+DISABLE_ENV = "SUMERIAN_NO_DAEMON"
+
+# 클라이언트 연결 제한 시간(초), 데몬이 없을 때 오래 기다리지 않도록 짧게
+CONNECT_TIMEOUT = 1.0
+
+# 응답 제한 시간(초), 캐시되지 않은 scrypt 파생도 끝날 수 있게 넉넉히
+RESPONSE_TIMEOUT = 60.0
+
+# 요청 한 줄의 최대 크기
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+
+class DaemonUnavailable(Exception):
+    """데몬에 연결할 수 없거나 연결이 끊김 (호출자는 직접 처리로 대체)"""
+
+
+def _fallback_dir():
+    """XDG_RUNTIME_DIR이 없을 때 소켓을 두는 임시 디렉토리 안의 사용자 전용(0700) 디렉토리"""
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"sumerian-mcp-{uid}")
+
+
+def default_socket_path():
+    """
+    데몬 소켓 경로
+
+    SUMERIAN_DAEMON_SOCKET 환경 변수, $XDG_RUNTIME_DIR/sumerian-mcp.sock, 임시 디렉토리의 사용자 전용 디렉토리 순
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "sumerian-mcp.sock")
+    return os.path.join(_fallback_dir(), "sumerian-mcp.sock")
+
+
+def _owned_privately(st):
+    """현재 사용자 소유이고 그룹/다른 사용자 권한 비트가 없는지"""
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return False
+    return not stat.S_IMODE(st.st_mode) & 0o077
+
+
+def check_socket(path):
+    """
+    연결하기 전에 소켓 파일이 현재 사용자 전용인지 확인 (기본 임시 경로이면 그 디렉토리도 확인)
+
+    Raises:
+        DaemonUnavailable: 소켓이 없거나 소유자/권한이 안전하지 않은 경우
+    """
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        raise DaemonUnavailable(f"데몬에 연결할 수 없습니다: {path} ({e})") from None
+    if not stat.S_ISSOCK(st.st_mode) or not _owned_privately(st):
+        raise DaemonUnavailable(f"소켓의 소유자나 권한이 안전하지 않아 연결하지 않습니다: {path}")
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory == _fallback_dir():
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode) or not _owned_privately(st):
+            raise DaemonUnavailable(f"소켓 디렉토리의 소유자나 권한이 안전하지 않아 연결하지 않습니다: {directory}")
+
+
+def _ensure_private_dir(directory):
+    """
+    소켓 디렉토리를 0700으로 만들고 (이미 있으면) 현재 사용자 전용인지 확인
+
+    Raises:
+        RuntimeError: 디렉토리가 아니거나 다른 사용자 소유이거나 그룹/다른 사용자 권한이 있는 경우
+    """
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or not _owned_privately(st):
+        raise RuntimeError(f"소켓 디렉토리의 소유자나 권한이 안전하지 않습니다: {directory}")
+
+
+class DaemonClient:
+    """데몬 연결 하나 (여러 요청을 순서대로 보낼 수 있음)"""
+
+    def __init__(self, path=None, connect_timeout=CONNECT_TIMEOUT, timeout=RESPONSE_TIMEOUT):
+        """
+        Raises:
+            DaemonUnavailable: 소켓이 없거나 연결이 거부된 경우, 소켓이나 데몬 프로세스가 다른 사용자 소유인 경우
+        """
+        self.path = path or default_socket_path()
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailable("이 플랫폼은 유닉스 도메인 소켓을 지원하지 않습니다")
+        check_socket(self.path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(connect_timeout)
+            self._sock.connect(self.path)
+            self._sock.settimeout(timeout)
+            uid = _peer_uid(self._sock)
+        except OSError as e:
+            self._sock.close()
+            raise DaemonUnavailable(f"데몬에 연결할 수 없습니다: {self.path} ({e})") from None
+        if uid is not None and hasattr(os, "getuid") and uid != os.getuid():
+            self._sock.close()
+            raise DaemonUnavailable(f"다른 사용자(UID {uid})의 프로세스가 소켓을 열고 있어 연결하지 않습니다: {self.path}")
+        self._reader = self._sock.makefile("rb")
+
+    def request(self, op, **fields):
+        """
+        요청을 보내고 응답 딕셔너리 반환
+
+        Raises:
+            DaemonUnavailable: 연결이 끊긴 경우
+        """
+        message = json.dumps(dict(fields, op=op), ensure_ascii=False).encode("utf-8") + b"\n"
+        try:
+            self._sock.sendall(message)
+            line = self._reader.readline()
+        except OSError as e:
+            raise DaemonUnavailable(f"데몬 연결이 끊겼습니다 ({e})") from None
+        if not line:
+            raise DaemonUnavailable("데몬이 응답 없이 연결을 닫았습니다")
+        return json.loads(line)
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def request(op, path=None, **fields):
+    """연결 하나로 요청 하나를 보내고 응답 반환 (DaemonUnavailable은 그대로 전달)"""
+    with DaemonClient(path) as client:
+        return client.request(op, **fields)
+
+
+def daemon_enabled():
+    """CLI가 데몬을 써도 되는지 (SUMERIAN_NO_DAEMON=1이면 사용하지 않음)"""
+    return os.environ.get(DISABLE_ENV, "") not in ("1", "true", "yes")
+
+
+def _peer_uid(conn):
+    """연결 상대 프로세스의 UID (리눅스 SO_PEERCRED, 확인할 수 없으면 None)"""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+class SumerianDaemon:
+    """
+    유닉스 도메인 소켓 암호화 데몬
+
+    연결마다 스레드 하나가 요청을 처리한다. 파생 키는 kdf 모듈의 SecureLRUCache에 남아 있으므로
+    같은 키의 반복 요청은 키 파생 없이 처리되며, 유지 시간이 지나거나 데몬이 종료되면 0으로 덮어쓴다.
+    """
+
+    def __init__(self, path=None, idle_timeout=None, key_ttl=None, max_keys=None):
+        """
+        Args:
+            path: 소켓 경로 (기본값: default_socket_path())
+            idle_timeout: 이 시간(초) 동안 요청이 없으면 종료 (None이면 계속 실행)
+            key_ttl: 파생 키 캐시 유지 시간(초)
+            max_keys: 파생 키 캐시 최대 항목 수
+        """
+        # 첫 요청이 암호 라이브러리 가져오기 비용을 내지 않도록 미리 가져옴
+        from . import crypto  # noqa: F401
+        from .kdf import configure_key_cache
+
+        self.path = path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        configure_key_cache(maxsize=max_keys, ttl=key_ttl)
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self._last_activity = time.monotonic()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._sock = None
+
+    def bind(self):
+        """
+        소켓 생성 (소유자 전용 권한)
+
+        Raises:
+            RuntimeError: 같은 경로에서 다른 데몬이 이미 실행 중이거나, 경로에 현재 사용자의 소켓이 아닌 파일이 있거나,
+                기본 임시 디렉토리가 안전하지 않은 경우
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if directory == _fallback_dir():
+            _ensure_private_dir(directory)
+        else:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.lexists(self.path):
+            # 소켓이 아니거나 다른 사용자의 파일은 지우지 않음 (--socket 오타로 일반 파일을 지우지 않도록)
+            st = os.lstat(self.path)
+            if not stat.S_ISSOCK(st.st_mode) or (hasattr(os, "getuid") and st.st_uid != os.getuid()):
+                raise RuntimeError(f"소켓 경로에 현재 사용자의 소켓이 아닌 파일이 있습니다: {self.path}")
+            try:
+                request("ping", self.path)
+            except DaemonUnavailable:
+                # 비정상 종료로 남은 소켓 파일
+                os.unlink(self.path)
+            else:
+                raise RuntimeError(f"데몬이 이미 실행 중입니다: {self.path}")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+        finally:
+            os.umask(umask)
+        sock.listen(64)
+        sock.settimeout(0.5)
+        self._sock = sock
+
+    def serve_forever(self):
+        """종료 요청, 유휴 시간 초과, KeyboardInterrupt까지 연결 처리"""
+        if self._sock is None:
+            self.bind()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn, _ = self._sock.accept()
+                except socket.timeout:
+                    if self.idle_timeout and time.monotonic() - self._last_activity > self.idle_timeout:
+                        break
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        """serve_forever() 종료 요청"""
+        self._stopping.set()
+
+    def close(self):
+        """소켓 정리와 파생 키 캐시 zeroize"""
+        from .kdf import clear_key_cache
+
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+        clear_key_cache()
+
+    def _handle(self, conn):
+        """연결 하나의 요청 처리"""
+        with self._lock:
+            self.connections += 1
+        with conn:
+            uid = _peer_uid(conn)
+            if uid is not None and hasattr(os, "getuid") and uid != os.getuid():
+                return
+            reader = conn.makefile("rb")
+            while True:
+                line = reader.readline(MAX_REQUEST_SIZE + 1)
+                if not line:
+                    return
+                self._last_activity = time.monotonic()
+                if len(line) > MAX_REQUEST_SIZE:
+                    # 나머지를 읽지 않았으므로 이 연결의 요청 경계는 더 이상 알 수 없음
+                    self._count(error=True)
+                    error = {"ok": False, "error": f"요청이 너무 큽니다 (최대 {MAX_REQUEST_SIZE}바이트)"}
+                    conn.sendall(json.dumps(error, ensure_ascii=False).encode("utf-8") + b"\n")
+                    return
+                response = self.dispatch(line)
+                try:
+                    conn.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                except OSError:
+                    return
+                if response.get("result") == "shutdown":
+                    self.shutdown()
+                    return
+
+    def dispatch(self, line):
+        """요청 한 줄을 처리하고 응답 딕셔너리 반환"""
+        from .crypto import decrypt_password, encrypt_password
+        from .envelope import DEFAULT_COMPRESSION, DEFAULT_ENCODING, DEFAULT_MODE
+        from .kdf import DEFAULT_KDF, key_cache_stats
+
+        self._count()
+        try:
+            message = json.loads(line)
+            op = message.get("op")
+            if op == "encrypt":
+                result = encrypt_password(
+                    message["password"], message["key"], kdf=message.get("kdf") or DEFAULT_KDF,
+                    encoding=message.get("encoding") or DEFAULT_ENCODING, mode=message.get("mode") or DEFAULT_MODE,
+                    compression=message.get("compression") or DEFAULT_COMPRESSION,
+                )
+            elif op == "decrypt":
+                result = decrypt_password(message["encrypted_text"], message["key"])
+            elif op == "ping":
+                result = {"pid": os.getpid(), "uptime_seconds": time.time() - self.started}
+            elif op == "stats":
+                result = {
+                    "pid": os.getpid(),
+                    "uptime_seconds": time.time() - self.started,
+                    "requests": self.requests,
+                    "errors": self.errors,
+                    "connections": self.connections,
+                    "key_cache": key_cache_stats(),
+                }
+            elif op == "shutdown":
+                result = "shutdown"
+            else:
+                raise ValueError(f"알 수 없는 요청: {op}")
+        except (KeyError, TypeError, AttributeError) as e:
+            self._count(error=True)
+            return {"ok": False, "error": f"잘못된 요청: {e}"}
+        except ValueError as e:
+            self._count(error=True)
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, "result": result}
+
+    def _count(self, error=False):
+        """요청/오류 수 증가"""
+        with self._lock:
+            if error:
+                self.errors += 1
+            else:
+                self.requests += 1
+
+
+def start_detached(path=None, args=(), timeout=10.0):
+    """
+    데몬을 백그라운드 프로세스로 시작하고 요청을 받을 수 있을 때까지 대기
+
+    Args:
+        path: 소켓 경로
+        args: daemon run 명령에 더 넘길 인자 (예: ["--idle-timeout", "600"])
+        timeout: 준비될 때까지 기다릴 시간(초)
+
+    Returns:
+        데몬 프로세스 PID
+    """
+    import subprocess
+
+    path = path or default_socket_path()
+    command = [sys.executable, "-m", "sumerian_mcp.cli", "daemon", "run", "--socket", path, *args]
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_dir, env.get("PYTHONPATH")]))
+    process = subprocess.Popen(
+        command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True, env=env,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"데몬이 시작하지 못했습니다 (종료 코드 {process.returncode})")
+        try:
+            return request("ping", path)["result"]["pid"]
+        except DaemonUnavailable:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"데몬이 {timeout}초 안에 준비되지 않았습니다: {path}")
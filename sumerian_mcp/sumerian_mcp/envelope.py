@@ -0,0 +1,91 @@
+"""
+암호문 봉투(envelope) 형식 모듈
+
+버전 2 암호문은 표식 문자 뒤에 (헤더 + IV + 암호문)을 텍스트로 인코딩해 붙인 형태다
+    𒑱: Base64로 변환한 뒤 코덱으로 문자 매핑
+    𒑰: Base1024로 바이트를 직접 쐐기문자로 변환
+표식이 없는 암호문은 키 문자열을 32바이트로 잘라 쓰던 기존 형식으로 처리한다
+
+헤더 (24바이트, Base64 3바이트 경계에 맞춤):
+    version(1) flags(1) kdf(1) mode(1) kdf_params(4) salt(16)
+flags에 FLAG_KCV가 있으면 헤더 뒤에 키 확인 값(8바이트)이 이어진다
+flags의 COMPRESSION_MASK 비트는 암호화 전에 평문을 압축한 알고리즘이다 (0이면 압축하지 않음)
+"""
+import struct
+from collections import namedtuple
+
+# 버전 2 암호문 앞에 붙는 표식 (쐐기문자 구두점, 어떤 코덱 매핑에도 쓰이지 않음)
+ENVELOPE_MARKER = "\U00012471"  # 𒑱 (Base64 + 코덱)
+BASE1024_MARKER = "\U00012470"  # 𒑰 (Base1024)
+BASE1024_PAD = "\U00012472"  # 𒑲 (Base1024 채움 문자)
+CONTAINER_MARKER = "\U00012473"  # 𒑳 (임의 접근 컨테이너, 바이너리 파일의 매직 바이트)
+RESERVED_SIGNS = frozenset((ENVELOPE_MARKER, BASE1024_MARKER, BASE1024_PAD, CONTAINER_MARKER))
+
+# 텍스트 인코딩 이름 → 표식
+ENCODINGS = {"base64": ENVELOPE_MARKER, "base1024": BASE1024_MARKER}
+DEFAULT_ENCODING = "base64"
+
+VERSION = 2
+
+# 암호화 모드
+MODE_CBC = 1
+MODE_GCM = 2
+MODE_CHACHA20_POLY1305 = 3
+MODE_SIV = 4  # 결정적 AES-SIV (같은 키와 평문이면 같은 암호문)
+_MODES = frozenset((MODE_CBC, MODE_GCM, MODE_CHACHA20_POLY1305, MODE_SIV))
+
+# 모드 이름 → 헤더 식별자 (암호 라이브러리 없이 CLI 옵션을 만들 수 있도록 여기에 둠)
+MODES = {"cbc": MODE_CBC, "gcm": MODE_GCM, "chacha20-poly1305": MODE_CHACHA20_POLY1305, "siv": MODE_SIV}
+DEFAULT_MODE = "gcm"
+
+_HEADER = struct.Struct(">BBBB4s16s")
+HEADER_SIZE = _HEADER.size
+
+# 헤더 플래그
+FLAG_KCV = 0x01
+COMPRESSION_MASK = 0x06  # 압축 알고리즘 식별자 (flags의 1~2번 비트)
+COMPRESSION_SHIFT = 1
+
+# 압축 이름 → 헤더 식별자 ("auto"는 사용할 수 있는 가장 좋은 알고리즘, 압축 모듈에서 고름)
+COMPRESSIONS = {"none": 0, "zlib": 1, "lzma": 2, "zstd": 3}
+DEFAULT_COMPRESSION = "none"
+
+# 키 확인 값(KCV) 길이
+KCV_SIZE = 8
+
+Header = namedtuple("Header", "version flags kdf mode params salt")
+
+
+def pack_header(header):
+    """헤더를 바이트로 직렬화"""
+    return _HEADER.pack(*header)
+
+
+def parse_header(data):
+    """
+    바이트 앞부분에서 헤더 해석
+
+    Raises:
+        ValueError: 길이가 부족하거나 지원하지 않는 버전/모드인 경우
+    """
+    if len(data) < HEADER_SIZE:
+        raise ValueError("암호문 헤더가 너무 짧습니다")
+    header = Header(*_HEADER.unpack_from(data))
+    if header.version != VERSION:
+        raise ValueError(f"지원하지 않는 암호문 버전: {header.version}")
+    if header.mode not in _MODES:
+        raise ValueError(f"지원하지 않는 암호화 모드: {header.mode}")
+    return header
+
+
+def header_size(header):
+    """헤더와 확장 필드(키 확인 값)를 합친 길이"""
+    return HEADER_SIZE + (KCV_SIZE if header.flags & FLAG_KCV else 0)
+
+
+def split_marker(text):
+    """표식 문자 분리: (인코딩 이름 또는 기존 형식이면 None, 표식을 제외한 본문)"""
+    for encoding, marker in ENCODINGS.items():
+        if text.startswith(marker):
+            return encoding, text[len(marker):]
+    return None, text
@@ -0,0 +1,528 @@
+"""
+파일/디렉토리 암호화 모듈
+
+파일은 고정 크기 블록 단위로 스트리밍 암호화하여 메모리 사용량을 일정하게 유지하고,
+디렉토리 트리는 큰 파일부터 워커 풀에 분배해 일괄 처리한 뒤 매니페스트를 기록한다
+"""
+import base64
+import codecs
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from . import base1024
+from .codec import get_codec
+from .compression import (
+    COMPRESSION_NONE,
+    compression_flags,
+    compression_id,
+    compressor,
+    decompressor,
+    header_compression,
+    worth_compressing,
+)
+from .container import decrypt_container, encrypt_container, is_container
+from .crypto import prepare_key
+from .envelope import (
+    DEFAULT_COMPRESSION,
+    DEFAULT_ENCODING,
+    ENCODINGS,
+    FLAG_KCV,
+    HEADER_SIZE,
+    MODE_CBC,
+    VERSION,
+    Header,
+    header_size,
+    pack_header,
+    parse_header,
+    split_marker,
+)
+from .kdf import DEFAULT_KDF, check_key, derived_key, encryption_key, kdf_params, key_check_value
+from .modes import DEFAULT_MODE, TAG_SIZE, is_aead, is_deterministic, mode_id, new_cipher, nonce_size, pad_bytes, unpad_bytes
+
+# 스트리밍 블록 크기: AES 블록(16)과 Base64 그룹(3)의 공배수
+STREAM_CHUNK_SIZE = 48 * 1365  # 65520 bytes
+
+# 암호화 파일 확장자 및 디렉토리 매니페스트 파일 이름
+ENCRYPTED_SUFFIX = ".sumerian"
+MANIFEST_NAME = "manifest.json"
+
+# 작은 파일을 하나의 워커 작업으로 묶는 기준
+TASK_MAX_BYTES = 4 * 1024 * 1024
+TASK_MAX_FILES = 256
+
+# 암호문 파일에서 무시할 공백 바이트 (UTF-8 연속 바이트와 겹치지 않음)
+_WHITESPACE = b" \t\r\n"
+
+
+def encrypt_stream(src, dst, key, chunk_size=STREAM_CHUNK_SIZE, codec="sumerian", kdf=DEFAULT_KDF,
+                   encoding=DEFAULT_ENCODING, mode=DEFAULT_MODE, compression=DEFAULT_COMPRESSION):
+    """
+    바이너리 스트림을 블록 단위로 암호화하여 수메르어 UTF-8 바이트로 기록
+
+    출력 형식은 encrypt_password와 동일(표식 + 헤더 + nonce + 암호문 + 태그의 텍스트 인코딩)하다.
+    compression을 지정하면 첫 블록을 표본 검사해 잘 압축되는 입력만 블록 단위로 압축하며 암호화한다.
+
+    Args:
+        src: 평문을 읽을 바이너리 스트림
+        dst: 암호문을 기록할 바이너리 스트림
+        key: 암호화 키
+        chunk_size: 한 번에 읽을 바이트 수 (48의 배수)
+        codec: 코덱 이름
+        kdf: 키 파생 함수 이름
+        encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+        mode: 암호화 모드 ("gcm", "chacha20-poly1305", "cbc" 또는 평문 전체를 메모리에 모아 암호화하는 결정적 "siv")
+        compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto")
+
+    Returns:
+        읽은 평문 바이트 수
+    """
+    if chunk_size % 48:
+        raise ValueError("chunk_size는 48의 배수여야 합니다")
+    if encoding not in ENCODINGS:
+        raise ValueError(f"알 수 없는 인코딩: {encoding} (사용 가능: {', '.join(ENCODINGS)})")
+    codec = get_codec(codec)
+    group = 5 if encoding == "base1024" else 3  # 텍스트 인코딩 단위(바이트)
+    kdf_id, params = kdf_params(kdf)
+    mode = mode_id(mode)
+    deterministic = is_deterministic(mode)
+    compression = compression_id(compression)
+    # 압축 여부는 헤더에 기록되므로 첫 블록을 먼저 읽어 표본 검사
+    first = src.read(chunk_size) if compression != COMPRESSION_NONE else None
+    if first is not None and not worth_compressing(first):
+        compression = COMPRESSION_NONE
+    flags = FLAG_KCV | compression_flags(compression)
+    packer = compressor(compression)
+    with encryption_key(key, kdf_id, params, deterministic) as (salt, key_bytes):
+        header = pack_header(Header(VERSION, flags, kdf_id, mode, params, salt)) + key_check_value(key_bytes)
+        nonce = os.urandom(nonce_size(mode))
+        cipher = new_cipher(mode, key_bytes, nonce, aad=header)
+    dst.write(ENCODINGS[encoding].encode("utf-8"))
+    pending = header + nonce  # 인코딩 단위 경계에 맞지 않아 남은 바이트
+    total = 0
+    plaintext = bytearray()  # 결정적 모드(siv)는 평문 전체로 합성 IV를 만들므로 끝까지 모은다
+    carry = b""  # CBC에서 AES 블록 경계에 맞지 않아 남은 압축 바이트
+
+    while True:
+        chunk = first if first is not None else src.read(chunk_size)
+        first = None
+        total += len(chunk)
+        final = len(chunk) < chunk_size
+        if compression != COMPRESSION_NONE:
+            chunk = packer.compress(chunk) + (packer.flush() if final else b"")
+        if deterministic:
+            plaintext += chunk
+            encrypted = b""
+            if final:
+                ciphertext, tag = cipher.encrypt_and_digest(plaintext)
+                plaintext[:] = bytes(len(plaintext))
+                encrypted = ciphertext + tag
+        elif not final:
+            if not is_aead(mode):
+                # 압축 결과는 AES 블록 경계에 맞지 않으므로 남은 바이트를 다음 블록으로 넘긴다
+                chunk = carry + chunk
+                cut = len(chunk) - len(chunk) % 16
+                chunk, carry = chunk[:cut], chunk[cut:]
+            encrypted = cipher.encrypt(chunk)
+        elif is_aead(mode):
+            encrypted = cipher.encrypt(chunk) + cipher.digest()
+        else:
+            encrypted = cipher.encrypt(pad_bytes(carry + chunk))
+        data = pending + encrypted
+        cut = len(data) if final else len(data) - len(data) % group
+        pending = data[cut:]
+        if encoding == "base1024":
+            text = base1024.encode(data[:cut])
+        else:
+            text = codec.encode(base64.b64encode(data[:cut]).decode("ascii"))
+        dst.write(text.encode("utf-8"))
+        if final:
+            return total
+
+
+def decrypt_stream(src, dst, key, chunk_size=STREAM_CHUNK_SIZE, codec="sumerian"):
+    """
+    수메르어 암호문 스트림을 블록 단위로 복호화하여 바이너리로 기록
+
+    블록 경계에 걸친 UTF-8 코드 포인트는 증분 디코더가 이어 붙인다.
+    표식으로 텍스트 인코딩(Base64/Base1024)을 판별하고, 표식이 있으면 헤더의 KDF 설정으로,
+    없으면 기존 형식으로 키를 준비한다.
+
+    Args:
+        src: 암호문을 읽을 바이너리 스트림
+        dst: 평문을 기록할 바이너리 스트림
+        key: 복호화 키
+        chunk_size: 한 번에 읽을 바이트 수
+        codec: 코덱 이름
+
+    Returns:
+        기록한 평문 바이트 수
+
+    Raises:
+        ValueError: 키가 잘못되었거나 암호화된 데이터가 손상된 경우
+    """
+    codec = get_codec(codec)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    detected = False  # 첫 문자를 읽기 전까지는 형식을 알 수 없음
+    encoding = None
+    cipher = None
+    text_pending = ""
+    raw = b""
+    total = 0
+
+    while True:
+        block = src.read(chunk_size)
+        final = not block
+        text = decoder.decode(block.translate(None, _WHITESPACE), final=final)
+        if not detected and text:
+            detected = True
+            encoding, text = split_marker(text)
+
+        if encoding == "base1024":
+            # 채움 문자가 다음 블록에 올 수 있으므로 마지막 4문자 묶음은 최종 단계까지 남겨 둔다
+            segment = text_pending + text
+            signs = len(segment) - segment.endswith(base1024.PAD_SIGN)
+            cut = len(segment) if final else max(signs - 1, 0) // 4 * 4
+            raw += base1024.decode(segment[:cut])
+        else:
+            segment = text_pending + codec.decode(text, strict=True)
+            cut = len(segment) if final else len(segment) - len(segment) % 4
+            raw += base64.b64decode(segment[:cut], validate=True)
+        text_pending = segment[cut:]
+
+        if cipher is None:
+            opened = _open_stream(raw, key, versioned=encoding is not None)
+            if opened is None:
+                if final:
+                    raise ValueError("암호문이 너무 짧습니다")
+                continue
+            cipher, mode, prefix, compression = opened
+            unpacker = decompressor(compression)
+            raw = raw[prefix:]
+
+        if final:
+            if is_deterministic(mode):
+                if len(raw) < TAG_SIZE:
+                    raise ValueError("암호문이 너무 짧습니다")
+                plain = cipher.decrypt_and_verify(raw[:-TAG_SIZE], raw[-TAG_SIZE:])
+            elif is_aead(mode):
+                if len(raw) < TAG_SIZE:
+                    raise ValueError("암호문이 너무 짧습니다")
+                plain = cipher.decrypt(raw[:-TAG_SIZE])
+                cipher.verify(raw[-TAG_SIZE:])  # 태그가 맞지 않으면 ValueError
+            else:
+                if not raw or len(raw) % 16:
+                    raise ValueError("암호문 길이가 AES 블록 크기의 배수가 아닙니다")
+                plain = unpad_bytes(cipher.decrypt(raw))
+            for piece in unpacker.chunks(plain):
+                dst.write(piece)
+                total += len(piece)
+            if not unpacker.eof:
+                raise ValueError("압축 데이터가 잘렸습니다")
+            return total
+
+        # 태그/패딩 검증을 위해 마지막 16바이트 이상은 최종 단계까지 남겨 둔다 (siv는 전체를 남김)
+        if is_deterministic(mode):
+            n = 0
+        else:
+            n = len(raw) - TAG_SIZE if is_aead(mode) else (len(raw) // 16 - 1) * 16
+        if n > 0:
+            for piece in unpacker.chunks(cipher.decrypt(raw[:n])):
+                dst.write(piece)
+                total += len(piece)
+            raw = raw[n:]
+
+
+def _open_stream(raw, key, versioned):
+    """
+    스트림 앞부분(헤더 + 키 확인 값 + nonce/IV)으로 복호화 객체 생성
+
+    Returns:
+        (암호 객체, 모드, 앞부분 길이, 압축 식별자), 바이트가 아직 부족하면 None
+
+    Raises:
+        ValueError: 헤더가 잘못되었거나 키 확인 값이 일치하지 않는 경우 (본문을 읽기 전)
+    """
+    if not versioned:
+        if len(raw) < 16:
+            return None
+        return new_cipher(MODE_CBC, prepare_key(key), raw[:16]), MODE_CBC, 16, COMPRESSION_NONE
+
+    if len(raw) < HEADER_SIZE:
+        return None
+    header = parse_header(raw)
+    start = header_size(header)
+    prefix = start + nonce_size(header.mode)
+    if len(raw) < prefix:
+        return None
+    with derived_key(key, header.salt, header.kdf, header.params) as key_bytes:
+        if header.flags & FLAG_KCV:
+            check_key(key_bytes, raw[HEADER_SIZE:start])
+        cipher = new_cipher(header.mode, key_bytes, raw[start:prefix], aad=raw[:start])
+    return cipher, header.mode, prefix, header_compression(header.flags)
+
+
+def _decrypt_any(src, dst, key):
+    """앞부분의 매직 바이트로 컨테이너와 텍스트 암호문을 구분해 복호화"""
+    if is_container(src):
+        return decrypt_container(src, dst, key)
+    return decrypt_stream(src, dst, key)
+
+
+def _stream_file(stream_func, filepath, output_filepath, key, durable=False):
+    """
+    결과를 임시 파일에 기록한 뒤 성공 시에만 출력 경로로 교체
+
+    durable이면 교체 전에 임시 파일을 디스크에 동기화해, 원본을 덮어쓰는 경우(키 교체) 전원이 나가도
+    이전 파일이나 완성된 새 파일 중 하나가 남게 한다.
+    """
+    tmp_filepath = output_filepath + ".part"
+    try:
+        with open(filepath, "rb") as src, open(tmp_filepath, "wb") as dst:
+            size = stream_func(src, dst, key)
+            if durable:
+                dst.flush()
+                os.fsync(dst.fileno())
+        os.replace(tmp_filepath, output_filepath)
+        return size
+    except BaseException:
+        if os.path.exists(tmp_filepath):
+            os.remove(tmp_filepath)
+        raise
+
+
+def encrypt_file(filepath, key, output_filepath=None, kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING, mode=DEFAULT_MODE,
+                 container=False, compression=DEFAULT_COMPRESSION):
+    """
+    파일을 스트리밍 암호화
+
+    container가 True이면 텍스트 대신 범위 복호화(decrypt_range)가 가능한 바이너리 컨테이너로 기록하며,
+    이때 encoding은 사용하지 않는다. 컨테이너는 블록 위치로 바로 찾아가야 하므로 압축하지 않는다.
+
+    Args:
+        filepath: 원본 파일 경로
+        key: 암호화 키
+        output_filepath: 출력 경로 (기본값: 원본 경로 + .sumerian)
+        kdf: 키 파생 함수 이름
+        encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+        mode: 암호화 모드 ("gcm", "chacha20-poly1305" 또는 "cbc", 컨테이너는 AEAD 모드와 결정적 "siv"만)
+        container: 임의 접근 컨테이너 형식으로 기록할지 여부
+        compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 텍스트 형식만)
+
+    Returns:
+        (출력 경로, 평문 바이트 수)
+
+    Raises:
+        ValueError: 컨테이너 형식에 압축을 지정한 경우
+    """
+    output_filepath = output_filepath or filepath + ENCRYPTED_SUFFIX
+    if container:
+        if compression_id(compression) != COMPRESSION_NONE:
+            raise ValueError("컨테이너 형식은 압축을 지원하지 않습니다")
+        stream_func = partial(encrypt_container, kdf=kdf, mode=mode)
+    else:
+        stream_func = partial(encrypt_stream, kdf=kdf, encoding=encoding, mode=mode, compression=compression)
+    return output_filepath, _stream_file(stream_func, filepath, output_filepath, key)
+
+
+def decrypt_file(filepath, key, output_filepath=None):
+    """
+    암호화된 파일(텍스트 또는 컨테이너 형식)을 스트리밍 복호화
+
+    Args:
+        filepath: 암호화된 파일 경로
+        key: 복호화 키
+        output_filepath: 출력 경로 (기본값: .sumerian 확장자 제거, 없으면 + .decrypted)
+
+    Returns:
+        (출력 경로, 평문 바이트 수)
+    """
+    if not output_filepath:
+        if filepath.endswith(ENCRYPTED_SUFFIX):
+            output_filepath = filepath[:-len(ENCRYPTED_SUFFIX)]
+        else:
+            output_filepath = filepath + ".decrypted"
+    return output_filepath, _stream_file(_decrypt_any, filepath, output_filepath, key)
+
+
+def _scan_tree(root, exclude=None):
+    """디렉토리 트리의 일반 파일을 (상대 경로, 크기) 목록으로 수집 (exclude 디렉토리 제외)"""
+    exclude = os.path.abspath(exclude) if exclude else None
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if os.path.abspath(os.path.join(dirpath, d)) != exclude)
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if os.path.isfile(path) and not os.path.islink(path):
+                rel = os.path.relpath(path, root).replace(os.sep, "/")
+                entries.append((rel, os.path.getsize(path)))
+    return entries
+
+
+def _schedule(entries):
+    """
+    큰 파일부터 워커 작업으로 배치
+
+    큰 파일은 단독 작업으로, 작은 파일은 TASK_MAX_BYTES/TASK_MAX_FILES 한도까지
+    묶어서 파일마다 발생하는 작업 전달 비용을 줄인다.
+    """
+    tasks = []
+    group = []
+    group_bytes = 0
+    for entry in sorted(entries, key=lambda item: item[1], reverse=True):
+        group.append(entry)
+        group_bytes += entry[1]
+        if group_bytes >= TASK_MAX_BYTES or len(group) >= TASK_MAX_FILES:
+            tasks.append(group)
+            group = []
+            group_bytes = 0
+    if group:
+        tasks.append(group)
+    return tasks
+
+
+def _safe_join(root, rel):
+    """매니페스트의 상대 경로가 root 밖을 가리키지 않는지 확인 후 결합"""
+    parts = rel.split("/")
+    if rel.startswith("/") or any(part in ("", ".", "..") for part in parts):
+        raise ValueError(f"허용되지 않는 경로: {rel}")
+    return os.path.join(root, *parts)
+
+
+def _process_group(operation, src_root, dst_root, key, group, options=None):
+    """
+    워커 작업 하나(파일 묶음)를 처리
+
+    options는 암호화 스트림에 전달할 추가 인자(kdf, encoding, mode, compression)이다.
+
+    group의 항목은 암호화면 (상대 경로, 크기), 복호화면 매니페스트에 기록된 암호문 이름을 더한
+    (상대 경로, 크기, 암호문 상대 경로)이다.
+
+    Returns:
+        파일별 결과 목록 ({"path", "size", "output"} 또는 "error" 포함)
+    """
+    results = []
+    for entry in group:
+        rel, size = entry[:2]
+        if operation == "encrypt":
+            source, output = rel, rel + ENCRYPTED_SUFFIX
+            stream_func = partial(encrypt_stream, **(options or {}))
+        else:
+            source, output = entry[2], rel
+            stream_func = _decrypt_any
+        try:
+            output_path = _safe_join(dst_root, output)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            written = _stream_file(stream_func, _safe_join(src_root, source), output_path, key)
+            if operation == "decrypt" and written != size:
+                raise ValueError(f"크기 불일치: 매니페스트 {size} 바이트, 복호화 결과 {written} 바이트")
+            results.append({"path": rel, "size": written, "output": output})
+        except Exception as e:
+            results.append({"path": rel, "size": size, "output": output, "error": str(e)})
+    return results
+
+
+def _run_tasks(operation, src_root, dst_root, key, entries, workers, options=None):
+    """작업을 워커 풀(또는 현재 프로세스)에서 실행하고 파일별 결과 수집"""
+    tasks = _schedule(entries)
+    if workers <= 1 or len(tasks) <= 1:
+        return [
+            result for group in tasks
+            for result in _process_group(operation, src_root, dst_root, key, group, options)
+        ]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_process_group, operation, src_root, dst_root, key, group, options) for group in tasks]
+        return [result for future in futures for result in future.result()]
+
+
+def _report(results, started, manifest_path):
+    """디렉토리 처리 결과 요약 (전체 MB/s 포함)"""
+    elapsed = time.perf_counter() - started
+    succeeded = [result for result in results if "error" not in result]
+    total_bytes = sum(result["size"] for result in succeeded)
+    return {
+        "files": len(succeeded),
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "mb_per_s": total_bytes / (elapsed or float("inf")) / (1024 * 1024),
+        "manifest": manifest_path,
+        "errors": [{"path": result["path"], "error": result["error"]} for result in results if "error" in result],
+    }
+
+
+def encrypt_dir(src_dir, out_dir, key, workers=1, kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING, mode=DEFAULT_MODE,
+                compression=DEFAULT_COMPRESSION):
+    """
+    디렉토리 트리를 재귀적으로 암호화하고 매니페스트 기록
+
+    각 파일은 out_dir 아래 같은 상대 경로에 .sumerian 확장자로 저장되며,
+    out_dir/manifest.json에 원본 경로, 크기, 출력 이름이 기록된다.
+
+    Args:
+        src_dir: 원본 디렉토리
+        out_dir: 출력 디렉토리
+        key: 암호화 키
+        workers: 워커 프로세스 수
+        kdf: 키 파생 함수 이름
+        encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+        mode: 암호화 모드 ("gcm", "chacha20-poly1305" 또는 "cbc")
+        compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 파일마다 표본 검사)
+
+    Returns:
+        처리 요약 (files, bytes, seconds, mb_per_s, manifest, errors)
+    """
+    started = time.perf_counter()
+    compression_id(compression)  # 잘못된 이름은 파일마다 오류로 남기지 않고 바로 알림
+    entries = _scan_tree(src_dir, exclude=out_dir)
+    options = {"kdf": kdf, "encoding": encoding, "mode": mode, "compression": compression}
+    results = _run_tasks("encrypt", src_dir, out_dir, key, entries, workers, options)
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = {
+        "version": 1,
+        "created": datetime.now().isoformat(),
+        "source_root": os.path.abspath(src_dir),
+        "files": sorted(
+            ({"path": result["path"], "size": result["size"], "output": result["output"]}
+             for result in results if "error" not in result),
+            key=lambda item: item["path"],
+        ),
+    }
+    tmp_path = manifest_path + ".part"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    return _report(results, started, manifest_path)
+
+
+def decrypt_dir(src_dir, out_dir, key, workers=1):
+    """
+    encrypt_dir로 암호화된 디렉토리를 매니페스트 기준으로 복호화
+
+    Args:
+        src_dir: 암호화된 디렉토리 (manifest.json 포함)
+        out_dir: 복호화 결과를 기록할 디렉토리
+        key: 복호화 키
+        workers: 워커 프로세스 수
+
+    Returns:
+        처리 요약 (files, bytes, seconds, mb_per_s, manifest, errors)
+    """
+    started = time.perf_counter()
+    manifest_path = os.path.join(src_dir, MANIFEST_NAME)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    # 암호문 이름은 매니페스트에 기록된 output을 쓰고, output이 없는 매니페스트만 기본 확장자로 추정
+    entries = [
+        (item["path"], item["size"], item.get("output") or item["path"] + ENCRYPTED_SUFFIX)
+        for item in manifest["files"]
+    ]
+    results = _run_tasks("decrypt", src_dir, out_dir, key, entries, workers)
+    return _report(results, started, manifest_path)
@@ -0,0 +1,188 @@
+"""
+키 파생(KDF) 모듈
+
+키 문자열과 솔트로부터 PBKDF2-HMAC-SHA256 또는 scrypt로 AES-256 키를 파생한다
+파생 비용이 크므로 (키, KDF, 파라미터, 솔트) 단위로 SecureLRUCache에 보관해
+같은 키는 프로세스당 한 번만 파생한다
+"""
+import hashlib
+import hmac
+import os
+import struct
+from contextlib import contextmanager
+
+from .cache import SecureLRUCache
+from .envelope import KCV_SIZE
+
+# 헤더에 기록되는 KDF 식별자
+KDF_PBKDF2 = 1
+KDF_SCRYPT = 2
+
+KDF_NAMES = {"pbkdf2": KDF_PBKDF2, "scrypt": KDF_SCRYPT}
+DEFAULT_KDF = "pbkdf2"
+
+# 기본 파라미터
+PBKDF2_ITERATIONS = 200_000
+SCRYPT_LOG2_N = 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# 헤더의 파라미터는 인증 전에 읽으므로 이 범위를 넘으면 파생하지 않고 거부 (조작된 헤더로 CPU/메모리 고갈 방지)
+MAX_PBKDF2_ITERATIONS = 4 * PBKDF2_ITERATIONS
+MAX_SCRYPT_LOG2_N = 20
+MAX_SCRYPT_R = 16
+MAX_SCRYPT_P = 16
+MAX_SCRYPT_MEMORY = 1 << 30
+
+SALT_SIZE = 16
+KEY_SIZE = 32
+
+# 결정적 모드(SIV)의 고정 솔트
+#
+# 같은 키가 프로세스와 관계없이 같은 파생 키가 되어야 하므로 솔트를 고정한다. 키에서 솔트를 만들면 헤더에 키의
+# 빠른 해시가 드러나 KDF 비용 없이 키를 추측할 수 있으므로 키와 무관한 상수를 쓴다
+DETERMINISTIC_SALT = hashlib.sha256(b"sumerian-mcp deterministic salt").digest()[:SALT_SIZE]
+
+# 파생 키 캐시 (프로세스 단위)
+_key_cache = SecureLRUCache(maxsize=64, ttl=600)
+
+
+def kdf_params(kdf=DEFAULT_KDF, iterations=PBKDF2_ITERATIONS, log2_n=SCRYPT_LOG2_N, r=SCRYPT_R, p=SCRYPT_P):
+    """
+    KDF 이름과 파라미터를 헤더용 (KDF 식별자, 4바이트 파라미터)로 변환
+
+    PBKDF2는 반복 횟수(uint32), scrypt는 (log2 N, r, p, 0)을 기록한다.
+    """
+    if kdf not in KDF_NAMES:
+        raise ValueError(f"알 수 없는 KDF: {kdf} (사용 가능: {', '.join(KDF_NAMES)})")
+    if kdf == "pbkdf2":
+        return KDF_PBKDF2, struct.pack(">I", iterations)
+    return KDF_SCRYPT, bytes((log2_n, r, p, 0))
+
+
+def validate_kdf_params(kdf_id, params):
+    """
+    헤더의 KDF 식별자와 파라미터가 허용 범위인지 확인
+
+    Raises:
+        ValueError: 알 수 없는 KDF이거나 파라미터가 범위를 벗어난 경우
+    """
+    if kdf_id == KDF_PBKDF2:
+        (iterations,) = struct.unpack(">I", params)
+        if not 1 <= iterations <= MAX_PBKDF2_ITERATIONS:
+            raise ValueError(f"PBKDF2 반복 횟수가 허용 범위(1~{MAX_PBKDF2_ITERATIONS})를 벗어났습니다: {iterations}")
+    elif kdf_id == KDF_SCRYPT:
+        log2_n, r, p, _ = params
+        if not (1 <= log2_n <= MAX_SCRYPT_LOG2_N and 1 <= r <= MAX_SCRYPT_R and 1 <= p <= MAX_SCRYPT_P) \
+                or 128 * r << log2_n > MAX_SCRYPT_MEMORY:
+            raise ValueError(f"scrypt 파라미터가 허용 범위를 벗어났습니다: log2 N={log2_n}, r={r}, p={p}")
+    else:
+        raise ValueError(f"알 수 없는 KDF 식별자: {kdf_id}")
+
+
+def derive_key(key, salt, kdf_id, params):
+    """
+    캐시를 거치지 않고 키 파생
+
+    Args:
+        key: 키 문자열
+        salt: 솔트 바이트
+        kdf_id: KDF 식별자
+        params: 4바이트 KDF 파라미터
+
+    Returns:
+        32바이트 파생 키 (bytearray)
+    """
+    secret = key.encode("utf-8")
+    if kdf_id == KDF_PBKDF2:
+        (iterations,) = struct.unpack(">I", params)
+        derived = hashlib.pbkdf2_hmac("sha256", secret, salt, iterations, KEY_SIZE)
+    elif kdf_id == KDF_SCRYPT:
+        log2_n, r, p, _ = params
+        n = 1 << log2_n
+        derived = hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + (1 << 20), dklen=KEY_SIZE)
+    else:
+        raise ValueError(f"알 수 없는 KDF 식별자: {kdf_id}")
+    return bytearray(derived)
+
+
+def key_check_value(key_bytes):
+    """
+    파생 키의 키 확인 값 (HMAC-SHA256(파생 키, 고정 문자열)의 앞 8바이트)
+
+    헤더에 기록해 두면 본문을 복호화하지 않고도 잘못된 키를 거부할 수 있다.
+    """
+    return hmac.new(key_bytes, b"sumerian-mcp key check", "sha256").digest()[:KCV_SIZE]
+
+
+def check_key(key_bytes, kcv):
+    """키 확인 값 비교 (일치하지 않으면 ValueError)"""
+    if not hmac.compare_digest(key_check_value(key_bytes), kcv):
+        raise ValueError("키가 일치하지 않습니다 (키 확인 값 불일치)")
+
+
+def key_cached(key, kdf_id, params, salt=None):
+    """
+    파생 키가 캐시에 있어 파생 없이 바로 쓸 수 있는지 확인 (캐시 통계는 바꾸지 않음)
+
+    salt가 None이면 암호화용으로 재사용 중인 솔트와 그 솔트의 파생 키를 확인한다.
+    """
+    if salt is None:
+        salt = _key_cache.peek(("salt", key, kdf_id, bytes(params)))
+        if salt is None:
+            return False
+    return _key_cache.peek(("key", key, kdf_id, bytes(params), bytes(salt))) is not None
+
+
+@contextmanager
+def derived_key(key, salt, kdf_id, params):
+    """
+    복호화용: 헤더의 솔트로 파생한 키를 캐시에서 빌려 사용
+
+    Raises:
+        ValueError: 파라미터가 허용 범위를 벗어난 경우 (파생하기 전에 거부)
+    """
+    validate_kdf_params(kdf_id, params)
+    cache_key = ("key", key, kdf_id, bytes(params), bytes(salt))
+    with _key_cache.lease(cache_key, lambda: derive_key(key, salt, kdf_id, params)) as key_bytes:
+        yield key_bytes
+
+
+@contextmanager
+def encryption_key(key, kdf_id, params, deterministic=False):
+    """
+    암호화용: 프로세스에서 이 키에 사용할 솔트와 파생 키를 빌려 사용
+
+    같은 키로 반복 암호화할 때 캐시가 적중하도록 솔트를 항목 유지 시간 동안 재사용한다.
+    IV는 매번 새로 생성하므로 암호문은 호출마다 달라진다.
+    deterministic이면 DETERMINISTIC_SALT를 사용한다 (결정적 모드용).
+
+    Yields:
+        (솔트, 파생 키)
+    """
+    if deterministic:
+        with derived_key(key, DETERMINISTIC_SALT, kdf_id, params) as key_bytes:
+            yield DETERMINISTIC_SALT, key_bytes
+        return
+    salt_key = ("salt", key, kdf_id, bytes(params))
+    with _key_cache.lease(salt_key, lambda: os.urandom(SALT_SIZE)) as salt:
+        with derived_key(key, salt, kdf_id, params) as key_bytes:
+            yield salt, key_bytes
+
+
+def configure_key_cache(maxsize=None, ttl=None):
+    """파생 키 캐시의 최대 항목 수/유지 시간(초) 변경"""
+    if maxsize is not None:
+        _key_cache.maxsize = maxsize
+    if ttl is not None:
+        _key_cache.ttl = ttl
+
+
+def clear_key_cache():
+    """캐시된 파생 키를 모두 제거하고 0으로 덮어쓰기"""
+    _key_cache.clear()
+
+
+def key_cache_stats():
+    """파생 키 캐시 상태"""
+    return _key_cache.stats()
@@ -0,0 +1,539 @@
+"""
+부하 테스트 모듈
+
+SSE 전송(SumerianMCPServer.run_sse)이나 HTTP 전송(단일 파일 서버의 /tools/{tool_id})에
+암호화/복호화/파일 도구 호출을 정해진 비율로 섞어 보내고 처리량, 지연 시간 분포, 오류율을 잰다
+동시 실행 수(closed loop) 또는 목표 요청률(open loop)을 여러 단계로 올리며 측정하면 포화 곡선을 얻을 수 있다
+
+요청률 모드의 지연 시간은 예정된 도착 시각부터 잰다 (서버가 밀리면 대기 시간도 지연에 포함)
+"""
+import asyncio
+import contextlib
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import count
+
+TRANSPORTS = ("sse", "http")
+
+OPERATIONS = ("encrypt", "decrypt", "encrypt_file", "decrypt_file")
+
+DEFAULT_MIX = "encrypt=5,decrypt=4,encrypt_file=1"
+
+# 지연 시간 히스토그램 구간 상한 (ms)
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# 오류 메시지 예시를 연산별로 몇 개까지 보관할지
+_ERROR_SAMPLES = 3
+
+KEY = "loadtest_key"
+
+
+def parse_mix(text):
+    """
+    "encrypt=5,decrypt=4,encrypt_file=1" 형식의 호출 비율 해석
+
+    Returns:
+        연산 이름 → 가중치 딕셔너리
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"알 수 없는 연산: {name} (사용 가능: {', '.join(OPERATIONS)})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"잘못된 가중치: {item}") from None
+        if mix[name] < 0:
+            raise ValueError(f"가중치는 0 이상이어야 합니다: {item}")
+    mix = {name: weight for name, weight in mix.items() if weight}
+    if not mix:
+        raise ValueError("호출 비율이 비어 있습니다")
+    return mix
+
+
+class LatencyHistogram:
+    """지연 시간 표본과 구간별 분포"""
+
+    def __init__(self):
+        self.samples = []
+
+    def record(self, seconds):
+        """표본 하나 추가"""
+        self.samples.append(seconds)
+
+    def percentile(self, p):
+        """최근접 순위 분위수 (ms, 표본이 없으면 None)"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[max(0, -(-len(ordered) * p // 100) - 1)] * 1000
+
+    def buckets(self):
+        """(구간 상한 ms 또는 None(무한대), 표본 수) 목록"""
+        counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for seconds in self.samples:
+            ms = seconds * 1000
+            index = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if ms <= bound), len(HISTOGRAM_BOUNDS_MS))
+            counts[index] += 1
+        return list(zip(HISTOGRAM_BOUNDS_MS + (None,), counts))
+
+    def summary(self):
+        """p50/p90/p99/최대 지연 시간과 히스토그램"""
+        return {
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": max(self.samples) * 1000 if self.samples else None,
+            "histogram": [{"le_ms": bound, "count": n} for bound, n in self.buckets()],
+        }
+
+
+class LevelStats:
+    """부하 단계 하나의 연산별 호출 수, 오류 수, 지연 시간"""
+
+    def __init__(self):
+        self.calls = {}
+        self.errors = {}
+        self.error_samples = {}
+        self.latency = {}
+        self.total = LatencyHistogram()
+        self.dropped = 0
+
+    def record(self, operation, seconds, error=None):
+        """호출 결과 하나 기록"""
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        self.latency.setdefault(operation, LatencyHistogram()).record(seconds)
+        self.total.record(seconds)
+        if error is not None:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+            samples = self.error_samples.setdefault(operation, [])
+            if len(samples) < _ERROR_SAMPLES and error not in samples:
+                samples.append(error)
+
+    def report(self, level_name, level, elapsed):
+        """단계 결과 딕셔너리"""
+        calls = sum(self.calls.values())
+        errors = sum(self.errors.values())
+        operations = {}
+        for operation in sorted(self.calls):
+            summary = self.latency[operation].summary()
+            summary.update(
+                calls=self.calls[operation],
+                errors=self.errors.get(operation, 0),
+                error_rate=self.errors.get(operation, 0) / self.calls[operation],
+                error_samples=self.error_samples.get(operation, []),
+            )
+            operations[operation] = summary
+        result = {
+            level_name: level,
+            "seconds": elapsed,
+            "calls": calls,
+            "errors": errors,
+            "dropped": self.dropped,
+            "error_rate": errors / calls if calls else 0.0,
+            "throughput": calls / elapsed if elapsed else 0.0,
+            "operations": operations,
+        }
+        result.update(self.total.summary())
+        return result
+
+
+class SSETarget:
+    """MCP SSE 전송으로 도구를 호출하는 대상 (세션 여러 개에 호출을 번갈아 배분)"""
+
+    transport = "sse"
+
+    def __init__(self, url, sessions=4):
+        self.url = url
+        self.session_count = max(1, sessions)
+        self._sessions = []
+        self._next = count()
+        self._stack = contextlib.AsyncExitStack()
+
+    async def __aenter__(self):
+        from mcp import ClientSession
+        from mcp.client.sse import sse_client
+
+        try:
+            for _ in range(self.session_count):
+                read, write = await self._stack.enter_async_context(sse_client(self.url))
+                session = await self._stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
+                self._sessions.append(session)
+        except BaseException:
+            await self._stack.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._stack.aclose()
+
+    @staticmethod
+    def arguments(operation, context, output=None):
+        """연산별 패키지 MCP 도구 인자"""
+        if operation == "encrypt":
+            return {"password": context["payload"], "key": KEY}
+        if operation == "decrypt":
+            return {"encrypted_text": context["encrypted"], "key": KEY}
+        source = context["source"] if operation == "encrypt_file" else context["encrypted_file"]
+        return {"filepath": source, "key": KEY, "output": output}
+
+    async def call(self, tool, arguments):
+        """
+        도구 호출
+
+        Returns:
+            (결과 텍스트, 오류 메시지 또는 None)
+        """
+        session = self._sessions[next(self._next) % len(self._sessions)]
+        result = await session.call_tool(tool, arguments)
+        text = result.content[0].text if result.content else ""
+        return text, text if result.isError else None
+
+
+class HTTPTarget:
+    """단일 파일 서버의 HTTP API(/tools/{tool_id})로 도구를 호출하는 대상"""
+
+    transport = "http"
+
+    def __init__(self, url, connections=100):
+        self.url = url.rstrip("/")
+        self.connections = connections
+        self._client = None
+
+    async def __aenter__(self):
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.connections, max_keepalive_connections=self.connections)
+        self._client = httpx.AsyncClient(base_url=self.url, limits=limits, timeout=60)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+
+    @staticmethod
+    def arguments(operation, context, output=None):
+        """연산별 HTTP API 인자"""
+        if operation == "encrypt":
+            return {"text": context["payload"], "key": KEY, "echo_original": False}
+        if operation == "decrypt":
+            return {"text": context["encrypted"], "key": KEY}
+        source = context["source"] if operation == "encrypt_file" else context["encrypted_file"]
+        return {"filepath": source, "key": KEY, "output": output}
+
+    async def call(self, tool, arguments):
+        """
+        도구 호출
+
+        Returns:
+            (암호문 또는 응답 본문, 오류 메시지 또는 None)
+        """
+        response = await self._client.post(f"/tools/{tool}", json=arguments)
+        try:
+            body = response.json()
+        except ValueError:
+            return response.text, f"HTTP {response.status_code}: JSON이 아닌 응답"
+        if response.status_code != 200 or "error" in body:
+            return body, f"HTTP {response.status_code}: {body.get('error', '')}"
+        return body.get("encrypted", body), None
+
+
+class LoadGenerator:
+    """대상 서버에 호출 비율대로 도구 호출을 보내고 단계별 결과를 모으는 객체"""
+
+    def __init__(self, target, mix, workdir, payload_size=64, file_size=64 * 1024, seed=None):
+        """
+        Args:
+            target: SSETarget 또는 HTTPTarget (열린 상태)
+            mix: parse_mix()가 반환한 호출 비율
+            workdir: 파일 도구용 원본/출력 파일을 둘 디렉토리 (서버와 같은 파일 시스템)
+            payload_size: encrypt/decrypt 평문 크기(글자)
+            file_size: 파일 도구 원본 크기(바이트)
+            seed: 연산 선택 난수 시드
+        """
+        self.target = target
+        self.operations = list(mix)
+        self.weights = list(mix.values())
+        self.workdir = workdir
+        self.payload_size = payload_size
+        self.file_size = file_size
+        self._random = random.Random(seed)
+        self._outputs = count()
+        self.context = {}
+
+    async def prepare(self):
+        """평문, 원본 파일, 복호화용 암호문과 암호화 파일을 대상 서버로 미리 만든다"""
+        self.context["payload"] = "x" * self.payload_size
+        source = os.path.join(self.workdir, "source.bin")
+        with open(source, "wb") as f:
+            f.write(os.urandom(self.file_size))
+        self.context["source"] = source
+
+        encrypted, error = await self.target.call("encrypt", self.target.arguments("encrypt", self.context))
+        if error:
+            raise RuntimeError(f"준비 단계 암호화 실패: {error}")
+        self.context["encrypted"] = encrypted
+
+        encrypted_file = os.path.join(self.workdir, "source.bin.sumerian")
+        _, error = await self.target.call("encrypt_file", self.target.arguments("encrypt_file", self.context, encrypted_file))
+        if error:
+            raise RuntimeError(f"준비 단계 파일 암호화 실패: {error}")
+        self.context["encrypted_file"] = encrypted_file
+
+    async def _call(self, operation, started, stats):
+        """연산 하나를 호출하고 started부터의 지연 시간 기록"""
+        output = None
+        if operation.endswith("_file"):
+            output = os.path.join(self.workdir, f"out-{next(self._outputs)}")
+        try:
+            _, error = await self.target.call(operation, self.target.arguments(operation, self.context, output))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        if stats is not None:
+            stats.record(operation, time.perf_counter() - started, error)
+        if output:
+            with contextlib.suppress(OSError):
+                os.remove(output)
+
+    def _choose(self):
+        """가중치에 따라 연산 하나 선택"""
+        return self._random.choices(self.operations, self.weights)[0]
+
+    async def run_concurrency(self, concurrency, duration, stats=None):
+        """
+        동시 실행 수를 고정한 closed loop 부하 (각 작업자가 응답을 받으면 바로 다음 호출)
+
+        Returns:
+            실제 측정 시간(초)
+        """
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self._call(self._choose(), time.perf_counter(), stats)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+    async def run_rate(self, rate, duration, stats=None, max_in_flight=1000):
+        """
+        목표 요청률의 open loop 부하 (응답을 기다리지 않고 일정 간격으로 호출)
+
+        처리 중인 호출이 max_in_flight에 이르면 새 호출을 보내지 않고 dropped로 센다.
+
+        Returns:
+            실제 측정 시간(초)
+        """
+        started = time.perf_counter()
+        interval = 1 / rate
+        tasks = set()
+        for n in range(max(1, int(rate * duration))):
+            scheduled = started + n * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tasks) >= max_in_flight:
+                if stats is not None:
+                    stats.dropped += 1
+                continue
+            task = asyncio.ensure_future(self._call(self._choose(), scheduled, stats))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+
+def _free_port():
+    """비어 있는 로컬 TCP 포트"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_port(process, port, timeout=30):
+    """서버 프로세스가 포트를 열 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 프로세스가 종료되었습니다 (종료 코드 {process.returncode})")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        return
+    raise RuntimeError(f"서버가 {timeout}초 안에 시작되지 않았습니다")
+
+
+def server_command(transport, port, server_script=None, server_args=()):
+    """로컬 서버 실행 명령 (sse: 패키지 SSE 서버, http: 단일 파일 서버 스크립트)"""
+    if transport == "sse":
+        return [sys.executable, "-m", "sumerian_mcp.cli", "server", "--transport", "sse",
+                "--host", "127.0.0.1", "--port", str(port), *server_args]
+    if not server_script:
+        raise ValueError("http 전송으로 서버를 직접 띄우려면 단일 파일 서버 스크립트 경로(server_script)가 필요합니다")
+    return [sys.executable, server_script, "--server", "--host", "127.0.0.1", "--port", str(port),
+            "--no-access-log", *server_args]
+
+
+@contextlib.asynccontextmanager
+async def local_server(transport, server_script=None, server_args=()):
+    """로컬 서버를 자식 프로세스로 실행하고 접속 URL을 넘겨주는 컨텍스트"""
+    port = _free_port()
+    env = dict(os.environ)
+    # 설치하지 않은 소스 트리에서도 자식 프로세스가 패키지를 찾도록 경로 추가
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        server_command(transport, port, server_script, server_args),
+        stdout=subprocess.DEVNULL, stderr=log, env=env,
+    )
+    try:
+        try:
+            await _wait_for_port(process, port)
+        except RuntimeError as e:
+            log.seek(0)
+            output = log.read().decode(errors="replace").strip().splitlines()[-5:]
+            raise RuntimeError("\n".join([str(e), *output])) from None
+        yield f"http://127.0.0.1:{port}/sse" if transport == "sse" else f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        log.close()
+
+
+def _make_target(transport, url, sessions):
+    """전송별 호출 대상"""
+    if transport == "sse":
+        return SSETarget(url, sessions=sessions)
+    if transport == "http":
+        return HTTPTarget(url)
+    raise ValueError(f"알 수 없는 전송: {transport} (사용 가능: {', '.join(TRANSPORTS)})")
+
+
+async def run_loadtest(transport="sse", url=None, mix=DEFAULT_MIX, concurrency=(1,), rates=None, duration=10.0,
+                       warmup=1.0, payload_size=64, file_size=64 * 1024, sessions=4, max_in_flight=1000,
+                       server_script=None, server_args=(), seed=None, progress=None):
+    """
+    부하 테스트 실행
+
+    url이 없으면 로컬 서버를 자식 프로세스로 띄워 측정한 뒤 종료한다.
+    concurrency(또는 rates)의 값마다 duration초씩 단계별로 측정하므로 여러 값을 주면 포화 곡선이 된다.
+
+    Args:
+        transport: "sse" 또는 "http"
+        url: 이미 실행 중인 서버 주소 (sse는 .../sse 엔드포인트)
+        mix: 호출 비율 문자열 또는 딕셔너리
+        concurrency: 동시 실행 수 목록 (rates가 없을 때)
+        rates: 목표 요청률(req/s) 목록 (주면 open loop로 측정)
+        duration: 단계별 측정 시간(초)
+        warmup: 첫 단계 전에 기록 없이 부하를 주는 시간(초)
+        sessions: SSE 세션 수
+        max_in_flight: 요청률 모드의 동시 처리 중 호출 상한
+        server_script: http 전송으로 로컬 서버를 띄울 때 쓸 단일 파일 서버 스크립트
+        server_args: 로컬 서버에 넘길 추가 인자
+        progress: 단계가 끝날 때마다 결과 딕셔너리로 호출할 함수
+
+    Returns:
+        설정(config)과 단계별 결과(levels) 딕셔너리
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"알 수 없는 전송: {transport} (사용 가능: {', '.join(TRANSPORTS)})")
+    mix = parse_mix(mix) if isinstance(mix, str) else dict(mix)
+    level_name, levels = ("rate", list(rates)) if rates else ("concurrency", list(concurrency))
+    config = {
+        "transport": transport, "url": url, "mix": mix, level_name: levels, "duration": duration,
+        "payload_size": payload_size, "file_size": file_size,
+    }
+
+    async with contextlib.AsyncExitStack() as stack:
+        if url is None:
+            url = await stack.enter_async_context(local_server(transport, server_script, server_args))
+            config["server"] = "local"
+        config["url"] = url
+        workdir = tempfile.mkdtemp(prefix="sumerian-loadtest-")
+        stack.callback(shutil.rmtree, workdir, True)
+        target = await stack.enter_async_context(_make_target(transport, url, sessions))
+
+        generator = LoadGenerator(target, mix, workdir, payload_size, file_size, seed)
+        await generator.prepare()
+        if warmup > 0:
+            await generator.run_concurrency(levels[0] if not rates else 1, warmup)
+
+        results = []
+        for level in levels:
+            stats = LevelStats()
+            if rates:
+                elapsed = await generator.run_rate(level, duration, stats, max_in_flight)
+            else:
+                elapsed = await generator.run_concurrency(level, duration, stats)
+            result = stats.report(level_name, level, elapsed)
+            results.append(result)
+            if progress:
+                progress(result)
+
+    return {"config": config, "levels": results}
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def format_level(result):
+    """단계 결과 한 줄"""
+    level_name = "rate" if "rate" in result else "concurrency"
+    return (
+        f"{level_name}={result[level_name]:<6} {result['throughput']:9.1f} req/s  "
+        f"p50 {_ms(result['p50_ms'])} ms  p99 {_ms(result['p99_ms'])} ms  "
+        f"오류 {result['errors']}/{result['calls']} ({result['error_rate']:.1%})"
+        + (f"  미전송 {result['dropped']}" if result["dropped"] else "")
+    )
+
+
+def format_report(report):
+    """포화 곡선 표와 마지막 단계의 연산별 지연 시간 분포 텍스트"""
+    levels = report["levels"]
+    level_name = "rate" if "rate" in report["config"] else "concurrency"
+    lines = ["포화 곡선", f"{level_name:>12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'오류율':>9}"]
+    best = max(levels, key=lambda result: result["throughput"])
+    for result in levels:
+        marker = "  ← 최대 처리량" if result is best and len(levels) > 1 else ""
+        lines.append(
+            f"{result[level_name]:>12}{result['throughput']:>10.1f}{_ms(result['p50_ms']):>10}"
+            f"{_ms(result['p99_ms']):>10}{result['error_rate']:>9.1%}{marker}"
+        )
+
+    last = levels[-1]
+    lines += ["", f"연산별 결과 ({level_name}={last[level_name]})"]
+    for operation, summary in last["operations"].items():
+        lines.append(
+            f"  {operation:<13} 호출 {summary['calls']:>7}  오류 {summary['errors']:>5} ({summary['error_rate']:.1%})  "
+            f"p50 {_ms(summary['p50_ms'])}  p90 {_ms(summary['p90_ms'])}  p99 {_ms(summary['p99_ms'])}  "
+            f"최대 {_ms(summary['max_ms'])} ms"
+        )
+        for error in summary["error_samples"]:
+            lines.append(f"      오류 예: {error}")
+
+    lines += ["", "지연 시간 분포"]
+    total = max(1, last["calls"])
+    for bucket in last["histogram"]:
+        label = f"≤ {bucket['le_ms']} ms" if bucket["le_ms"] is not None else f"> {HISTOGRAM_BOUNDS_MS[-1]} ms"
+        bar = "█" * round(40 * bucket["count"] / total)
+        lines.append(f"  {label:>11} {bucket['count']:>8} {bar}")
+    return "\n".join(lines)
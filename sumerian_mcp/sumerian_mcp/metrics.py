@@ -0,0 +1,219 @@
+"""
+도구 호출 지표 모듈
+
+도구별 호출 수, 오류 수, 처리 중 호출 수, 입력/출력 바이트 수, 지연 시간 히스토그램을 모은다
+지연 시간은 입력 크기 구간(size 레이블)별로 나눠 기록하므로 어느 도구가 어느 크기에서 느린지 볼 수 있다
+지표는 stats MCP 도구(JSON)와 SSE 서버의 /metrics 경로(Prometheus 텍스트 형식)로 노출된다
+
+갱신은 이벤트 루프 스레드에서만 일어나므로 잠금을 쓰지 않으며, 비활성화하면 호출마다 속성 하나만 확인한다
+"""
+import time
+
+# 지연 시간 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 입력 크기 구간 (상한 바이트, 레이블)
+SIZE_CLASSES = ((1024, "le_1k"), (64 * 1024, "le_64k"), (1024 * 1024, "le_1m"))
+LARGE_SIZE_CLASS = "gt_1m"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def payload_size(value):
+    """
+    도구 인자나 결과에 담긴 문자열/바이트열의 UTF-8 바이트 수
+
+    dict, list, tuple은 재귀로 합산하고 content/text 속성이 있는 객체(CallToolResult, TextContent)는 그 속성을 센다.
+    ASCII 문자열은 인코딩 없이 길이를 쓴다.
+    """
+    if isinstance(value, str):
+        return len(value) if value.isascii() else len(value.encode("utf-8", "surrogatepass"))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return memoryview(value).nbytes
+    if isinstance(value, dict):
+        return sum(payload_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    for name in ("content", "text"):
+        if hasattr(value, name):
+            return payload_size(getattr(value, name))
+    return 0
+
+
+def size_class(size):
+    """입력 바이트 수의 크기 구간 레이블"""
+    for limit, label in SIZE_CLASSES:
+        if size <= limit:
+            return label
+    return LARGE_SIZE_CLASS
+
+
+class _Histogram:
+    """누적하지 않은 구간별 개수, 합계, 개수"""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size):
+        self.counts = [0] * (size + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class _ToolStats:
+    """도구 하나의 지표"""
+
+    __slots__ = ("calls", "errors", "in_flight", "input_bytes", "output_bytes", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.latency = {}
+
+
+class ToolMetrics:
+    """
+    도구 호출 지표 모음
+
+    begin()이 반환한 토큰을 호출이 끝난 뒤 end()에 넘긴다. 비활성화 상태에서 begin()은 None을 반환한다.
+    """
+
+    def __init__(self, enabled=True, buckets=LATENCY_BUCKETS):
+        """
+        Args:
+            enabled: False이면 아무것도 기록하지 않음
+            buckets: 지연 시간 히스토그램 구간 상한(초) 목록
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._tools = {}
+        self._started = time.time()
+
+    def begin(self, tool, arguments=None):
+        """
+        호출 시작 기록
+
+        Returns:
+            end()에 넘길 토큰 (비활성화 상태이면 None)
+        """
+        if not self.enabled:
+            return None
+        stats = self._tools.get(tool)
+        if stats is None:
+            stats = self._tools[tool] = _ToolStats()
+        size = payload_size(arguments) if arguments else 0
+        stats.calls += 1
+        stats.in_flight += 1
+        stats.input_bytes += size
+        return stats, size, time.perf_counter()
+
+    def end(self, token, result=None, error=False):
+        """
+        호출 종료 기록
+
+        Args:
+            token: begin()이 반환한 토큰
+            result: 도구 결과 (출력 바이트 수 계산용)
+            error: 호출이 실패했는지 여부
+        """
+        if token is None:
+            return
+        stats, size, started = token
+        elapsed = time.perf_counter() - started
+        stats.in_flight -= 1
+        if error:
+            stats.errors += 1
+        if result is not None:
+            stats.output_bytes += payload_size(result)
+
+        label = size_class(size)
+        histogram = stats.latency.get(label)
+        if histogram is None:
+            histogram = stats.latency[label] = _Histogram(len(self.buckets))
+        index = 0
+        for bound in self.buckets:
+            if elapsed <= bound:
+                break
+            index += 1
+        histogram.counts[index] += 1
+        histogram.sum += elapsed
+        histogram.count += 1
+
+    def _quantile(self, counts, total, q):
+        """히스토그램 구간으로 추정한 분위수 상한(ms, 마지막 구간을 넘으면 None)"""
+        target = q * total
+        cumulative = 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            if n and cumulative >= target:
+                return bound * 1000
+        return None
+
+    def snapshot(self):
+        """
+        도구별 지표 딕셔너리 (stats 도구 응답)
+
+        지연 시간 분위수는 히스토그램 구간 상한으로 추정한 값이다.
+        """
+        tools = {}
+        for name, stats in sorted(self._tools.items()):
+            latency = {}
+            for label, histogram in sorted(stats.latency.items()):
+                latency[label] = {
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count * 1000,
+                    "p50_ms": self._quantile(histogram.counts, histogram.count, 0.5),
+                    "p99_ms": self._quantile(histogram.counts, histogram.count, 0.99),
+                    "buckets": dict(zip([str(bound) for bound in self.buckets] + ["+Inf"], histogram.counts)),
+                }
+            tools[name] = {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "in_flight": stats.in_flight,
+                "input_bytes": stats.input_bytes,
+                "output_bytes": stats.output_bytes,
+                "latency": latency,
+            }
+        return {"enabled": self.enabled, "uptime_seconds": time.time() - self._started, "tools": tools}
+
+    def render_prometheus(self, prefix="sumerian"):
+        """Prometheus 텍스트 형식 (/metrics 응답)"""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(samples)
+
+        tools = sorted(self._tools.items())
+        for name, attribute, kind, help_text in (
+            ("tool_calls_total", "calls", "counter", "Tool calls started"),
+            ("tool_errors_total", "errors", "counter", "Tool calls that failed"),
+            ("tool_in_flight", "in_flight", "gauge", "Tool calls currently running"),
+            ("tool_input_bytes_total", "input_bytes", "counter", "UTF-8 bytes of tool arguments"),
+            ("tool_output_bytes_total", "output_bytes", "counter", "UTF-8 bytes of tool results"),
+        ):
+            family(name, kind, help_text, [
+                f'{prefix}_{name}{{tool="{tool}"}} {getattr(stats, attribute)}' for tool, stats in tools
+            ])
+
+        samples = []
+        for tool, stats in tools:
+            for label, histogram in sorted(stats.latency.items()):
+                labels = f'tool="{tool}",size="{label}"'
+                cumulative = 0
+                for bound, n in zip(self.buckets, histogram.counts):
+                    cumulative += n
+                    samples.append(f'{prefix}_tool_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                samples.append(f'{prefix}_tool_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                samples.append(f"{prefix}_tool_duration_seconds_sum{{{labels}}} {histogram.sum}")
+                samples.append(f"{prefix}_tool_duration_seconds_count{{{labels}}} {histogram.count}")
+        family("tool_duration_seconds", "histogram", "Tool call latency by input size class", samples)
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """모든 지표 초기화 (처리 중인 호출의 토큰은 초기화 전 객체에 기록됨)"""
+        self._tools = {}
+        self._started = time.time()
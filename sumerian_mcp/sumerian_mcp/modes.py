@@ -0,0 +1,223 @@
+"""
+암호화 모드 모듈
+
+CBC와 AEAD 모드(AES-256-GCM, ChaCha20-Poly1305, AES-SIV)의 암호화/복호화를 담당
+AEAD 모드는 패딩 없이 한 번에 암호화와 인증을 수행하며, 봉투 헤더를 연관 데이터로 함께 인증하므로
+키가 틀리거나 헤더/암호문이 변조되면 태그 검증에서 거부된다
+
+AES-SIV(RFC 5297)는 nonce 없이 평문과 연관 데이터로 합성 IV를 만드는 결정적 모드다
+같은 키와 평문이면 암호문이 같으므로 암호문을 색인해 복호화 없이 같은 값을 찾거나 중복을 제거할 수 있지만,
+같은 값인지는 드러난다. 평문 전체를 받아야 태그를 계산할 수 있어 스트리밍하지 않는다
+"""
+import hmac
+import os
+
+from Crypto.Cipher import AES
+
+from .envelope import DEFAULT_MODE, MODE_CBC, MODE_CHACHA20_POLY1305, MODE_GCM, MODE_SIV, MODES
+
+TAG_SIZE = 16
+_NONCE_SIZES = {MODE_CBC: 16, MODE_GCM: 12, MODE_CHACHA20_POLY1305: 12, MODE_SIV: 0}
+
+
+def pad_bytes(data):
+    """바이트 단위 PKCS7 패딩 추가"""
+    n = 16 - len(data) % 16
+    return data + bytes([n]) * n
+
+
+def unpad_bytes(data):
+    """바이트 단위 PKCS7 패딩 검증 및 제거 (잘못된 패딩이면 ValueError)"""
+    n = data[-1] if data else 0
+    if not 1 <= n <= 16 or data[-n:] != bytes([n]) * n:
+        raise ValueError("잘못된 패딩")
+    return data[:-n]
+
+
+def mode_id(mode):
+    """모드 이름을 헤더 식별자로 변환"""
+    try:
+        return MODES[mode]
+    except KeyError:
+        raise ValueError(f"알 수 없는 암호화 모드: {mode} (사용 가능: {', '.join(MODES)})") from None
+
+
+def is_aead(mode):
+    """인증 태그를 사용하는 모드인지 여부"""
+    return mode != MODE_CBC
+
+
+def is_deterministic(mode):
+    """같은 키와 평문에서 항상 같은 암호문을 만드는 모드인지 여부 (스트리밍 불가)"""
+    return mode == MODE_SIV
+
+
+def nonce_size(mode):
+    """모드별 IV/nonce 길이"""
+    return _NONCE_SIZES[mode]
+
+
+def overhead(mode):
+    """평문 외에 추가되는 최소 바이트 수 (nonce + 태그 또는 패딩 블록)"""
+    return nonce_size(mode) + (TAG_SIZE if is_aead(mode) else 16)
+
+
+def _siv_key(key_bytes):
+    """파생 키(32바이트)를 AES-256-SIV 키(S2V용 + CTR용 64바이트)로 확장"""
+    return bytearray(hmac.new(key_bytes, b"sumerian-mcp aes-siv", "sha512").digest())
+
+
+def new_cipher(mode, key_bytes, nonce, aad=b""):
+    """
+    모드별 암호 객체 생성
+
+    AEAD 모드에서는 aad(봉투 헤더)를 연관 데이터로 등록한다.
+    반환된 객체는 encrypt/decrypt를 여러 번 호출해 스트리밍할 수 있다 (SIV는 encrypt_and_digest만 가능).
+    """
+    if mode == MODE_CBC:
+        return AES.new(key_bytes, AES.MODE_CBC, nonce)
+    if mode == MODE_SIV:
+        siv_key = _siv_key(key_bytes)
+        try:
+            cipher = AES.new(siv_key, AES.MODE_SIV)
+        finally:
+            siv_key[:] = bytes(len(siv_key))
+    elif mode == MODE_GCM:
+        cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=nonce)
+    elif mode == MODE_CHACHA20_POLY1305:
+        # ChaCha20/Poly1305/BLAKE2s 모듈은 기본 모드(gcm)에서 필요 없으므로 처음 쓸 때 가져옴
+        from Crypto.Cipher import ChaCha20_Poly1305
+        cipher = ChaCha20_Poly1305.new(key=key_bytes, nonce=nonce)
+    else:
+        raise ValueError(f"알 수 없는 암호화 모드 식별자: {mode}")
+    cipher.update(aad)
+    return cipher
+
+
+def sealed_size(mode, size):
+    """평문 size바이트를 seal했을 때의 길이"""
+    if is_aead(mode):
+        return nonce_size(mode) + size + TAG_SIZE
+    return nonce_size(mode) + (size // 16 + 1) * 16
+
+
+def _view(buffer):
+    """버퍼 프로토콜 객체(bytes, bytearray, memoryview, mmap 등)를 바이트 단위 memoryview로 변환"""
+    return memoryview(buffer).cast("B")
+
+
+def seal_into(mode, key_bytes, data, out, aad=b""):
+    """
+    평문 버퍼를 복사 없이 암호화해 out 버퍼 앞부분에 기록
+
+    CBC는 마지막 불완전 블록(16바이트 미만)에만 PKCS7 패딩을 붙여 따로 암호화한다.
+
+    Args:
+        data: 평문 버퍼
+        out: 쓰기 가능한 출력 버퍼 (sealed_size(mode, len(data)) 이상)
+
+    Returns:
+        기록한 바이트 수 (CBC: IV + 암호문, AEAD: nonce + 암호문 + 태그)
+    """
+    with _view(data) as data, _view(out) as out:
+        return _seal_view(mode, key_bytes, data, out, aad)
+
+
+def _seal_view(mode, key_bytes, data, out, aad):
+    """seal_into 본체 (바이트 단위 memoryview)"""
+    size = sealed_size(mode, len(data))
+    if len(out) < size:
+        raise ValueError("출력 버퍼가 너무 작습니다")
+    start = nonce_size(mode)
+    nonce = os.urandom(start)
+    out[:start] = nonce
+    cipher = new_cipher(mode, key_bytes, nonce, aad)
+    if is_deterministic(mode):
+        end = start + len(data)
+        out[end:size] = cipher.encrypt_and_digest(data, output=out[start:end])[1]
+    elif is_aead(mode):
+        end = start + len(data)
+        cipher.encrypt(data, output=out[start:end])
+        out[end:size] = cipher.digest()
+    else:
+        full = len(data) - len(data) % 16
+        cipher.encrypt(data[:full], output=out[start:start + full])
+        cipher.encrypt(pad_bytes(bytes(data[full:])), output=out[start + full:size])
+    return size
+
+
+def unseal_into(mode, key_bytes, body, out, aad=b""):
+    """
+    seal 결과 버퍼를 복사 없이 복호화해 out 버퍼 앞부분에 기록
+
+    AEAD 태그 검증에 실패하면 out에 기록한 내용을 0으로 지운다.
+
+    Returns:
+        기록한 평문 바이트 수
+
+    Raises:
+        ValueError: 길이가 맞지 않거나, 출력 버퍼가 작거나, 태그/패딩 검증에 실패한 경우
+    """
+    with _view(body) as body, _view(out) as out:
+        return _unseal_view(mode, key_bytes, body, out, aad)
+
+
+def _unseal_view(mode, key_bytes, body, out, aad):
+    """unseal_into 본체 (바이트 단위 memoryview)"""
+    start = nonce_size(mode)
+    if len(body) < overhead(mode):
+        raise ValueError("암호문이 너무 짧습니다")
+    cipher = new_cipher(mode, key_bytes, bytes(body[:start]), aad)
+    if is_aead(mode):
+        size = len(body) - start - TAG_SIZE
+        if len(out) < size:
+            raise ValueError("출력 버퍼가 너무 작습니다")
+        try:
+            if is_deterministic(mode):
+                cipher.decrypt_and_verify(body[start:start + size], bytes(body[-TAG_SIZE:]), output=out[:size])
+            else:
+                cipher.decrypt(body[start:start + size], output=out[:size])
+                cipher.verify(bytes(body[-TAG_SIZE:]))
+        except ValueError:
+            out[:size] = bytes(size)
+            raise
+        return size
+
+    if (len(body) - start) % 16:
+        raise ValueError("암호문 길이가 AES 블록 크기의 배수가 아닙니다")
+    full = len(body) - start - 16  # 패딩이 들어 있는 마지막 블록 앞까지
+    if len(out) < full:
+        raise ValueError("출력 버퍼가 너무 작습니다")
+    cipher.decrypt(body[start:start + full], output=out[:full])
+    last = unpad_bytes(cipher.decrypt(bytes(body[-16:])))
+    if len(out) < full + len(last):
+        raise ValueError("출력 버퍼가 너무 작습니다")
+    out[full:full + len(last)] = last
+    return full + len(last)
+
+
+def seal(mode, key_bytes, plaintext, aad=b""):
+    """
+    평문 바이트를 한 번에 암호화
+
+    Returns:
+        CBC: IV + PKCS7 패딩된 암호문, AEAD: nonce + 암호문 + 태그 (bytearray)
+    """
+    out = bytearray(sealed_size(mode, len(_view(plaintext))))
+    seal_into(mode, key_bytes, plaintext, out, aad)
+    return out
+
+
+def unseal(mode, key_bytes, body, aad=b""):
+    """
+    seal 결과를 복호화
+
+    Returns:
+        평문 (bytearray)
+
+    Raises:
+        ValueError: 길이가 맞지 않거나, 태그/패딩 검증에 실패한 경우
+    """
+    out = bytearray(max(0, len(_view(body)) - overhead(mode) + 16))
+    del out[unseal_into(mode, key_bytes, body, out, aad):]
+    return out
@@ -0,0 +1,178 @@
+"""
+비동기 작업 분리(offload) 모듈
+
+MCP 도구의 블로킹 작업(AES 연산, 파일 입출력)을 이벤트 루프 밖의 실행기로 넘긴다
+CPU 작업은 스레드 또는 프로세스 실행기, 파일 입출력은 I/O 스레드 실행기에서 처리하며
+실행기마다 동시 실행 상한을 두어 큰 작업이 몰려도 대기열에서 순서를 기다리게 한다
+작은 요청은 실행기를 거치는 비용이 연산보다 크므로 이벤트 루프에서 바로 처리한다
+단, 키 파생(PBKDF2/scrypt)은 입력 크기와 관계없이 느리므로 파생 키가 캐시에 있을 때만 바로 처리한다
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from .profiling import active_session, profiled_call
+
+# CPU 실행기 종류
+EXECUTOR_KINDS = ("thread", "process", "inline")
+
+# 이 크기(바이트) 미만의 CPU 작업은 이벤트 루프에서 바로 처리
+INLINE_MAX_BYTES = 16 * 1024
+
+
+class OffloadExecutor:
+    """
+    동시 실행 상한이 있는 실행기 하나
+
+    실행기는 첫 작업 시 생성하며, 상한을 넘는 작업은 세마포어에서 대기한다.
+    """
+
+    def __init__(self, name, kind="thread", workers=None, limit=None):
+        """
+        Args:
+            name: 통계에 표시할 이름
+            kind: "thread", "process" 또는 "inline"(실행기 없이 호출한 곳에서 실행)
+            workers: 실행기의 스레드/프로세스 수 (기본값: CPU 코어 수)
+            limit: 동시에 실행기에 넘길 작업 수 상한 (기본값: workers)
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"알 수 없는 실행기 종류: {kind} (사용 가능: {', '.join(EXECUTOR_KINDS)})")
+        self.name = name
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.limit = limit or self.workers
+        self._executor = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "inline": 0, "in_flight": 0, "waiting": 0}
+
+    def _get_executor(self):
+        """실행기 지연 생성"""
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix=f"sumerian-{self.name}"
+                    )
+            return self._executor
+
+    def _semaphore(self):
+        """현재 이벤트 루프용 세마포어 (asyncio 세마포어는 루프에 묶이므로 루프별로 생성)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for closed in [other for other in self._semaphores if other.is_closed()]:
+                del self._semaphores[closed]
+            if loop not in self._semaphores:
+                self._semaphores[loop] = asyncio.Semaphore(self.limit)
+            return self._semaphores[loop]
+
+    def _count(self, name, delta=1):
+        """통계 항목 증감"""
+        with self._lock:
+            self._stats[name] += delta
+
+    async def run(self, func, *args, inline=False, **kwargs):
+        """
+        func(*args, **kwargs)를 실행기에서 실행하고 결과 반환
+
+        inline이 True이거나 종류가 "inline"이면 이벤트 루프에서 바로 실행한다.
+        프로파일 세션이 진행 중이면 작업이 실행되는 스레드/프로세스에서 cProfile로 감싸 실행한다.
+        """
+        session = active_session()
+        if inline or self.kind == "inline":
+            self._count("inline")
+            if session is not None:
+                return session.run(func, *args, **kwargs)
+            return func(*args, **kwargs)
+
+        semaphore = self._semaphore()
+        self._count("waiting")
+        try:
+            await semaphore.acquire()
+        finally:
+            self._count("waiting", -1)
+        self._count("submitted")
+        self._count("in_flight")
+        try:
+            loop = asyncio.get_running_loop()
+            if session is None:
+                result = await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+            else:
+                outcome = await loop.run_in_executor(self._get_executor(), partial(profiled_call, func, args, kwargs))
+                result = session.merge(outcome)
+        except BaseException:
+            self._count("failed")
+            raise
+        finally:
+            self._count("in_flight", -1)
+            semaphore.release()
+        self._count("completed")
+        return result
+
+    def stats(self):
+        """실행기 설정과 작업 수 통계"""
+        with self._lock:
+            return dict(self._stats, kind=self.kind, workers=self.workers, limit=self.limit)
+
+    def close(self):
+        """실행기 종료"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+class Offloader:
+    """
+    CPU 실행기와 I/O 실행기 묶음
+
+    cpu()는 AES/인코딩 연산처럼 CPU를 쓰는 작업을, io()는 파일 스트리밍처럼
+    블로킹 입출력이 섞인 작업을 실행한다. 프로세스 실행기에는 모듈 수준 함수만 넘길 수 있다.
+    """
+
+    def __init__(self, cpu_kind="thread", cpu_workers=None, io_workers=None, cpu_limit=None, io_limit=None,
+                 inline_max_bytes=INLINE_MAX_BYTES):
+        """
+        Args:
+            cpu_kind: CPU 실행기 종류 ("thread", "process" 또는 "inline")
+            cpu_workers: CPU 실행기 크기 (기본값: CPU 코어 수)
+            io_workers: I/O 스레드 수 (기본값: 4)
+            cpu_limit: CPU 실행기 동시 실행 상한 (기본값: cpu_workers)
+            io_limit: I/O 실행기 동시 실행 상한 (기본값: io_workers)
+            inline_max_bytes: 이 크기 미만의 CPU 작업은 이벤트 루프에서 바로 처리
+        """
+        self.cpu_executor = OffloadExecutor("cpu", cpu_kind, cpu_workers, cpu_limit)
+        self.io_executor = OffloadExecutor("io", "thread", io_workers or 4, io_limit)
+        self.inline_max_bytes = inline_max_bytes
+
+    async def cpu(self, func, *args, size=None, ready=None, **kwargs):
+        """
+        CPU 작업 실행
+
+        Args:
+            size: 처리할 데이터 크기(바이트), inline_max_bytes 미만이면 이벤트 루프에서 바로 실행
+            ready: 크기가 작을 때 호출해 키 파생 없이 끝나는지 확인하는 함수, False이면 실행기로 넘김
+        """
+        inline = size is not None and size < self.inline_max_bytes and (ready is None or ready())
+        return await self.cpu_executor.run(func, *args, inline=inline, **kwargs)
+
+    async def io(self, func, *args, **kwargs):
+        """블로킹 입출력 작업 실행"""
+        return await self.io_executor.run(func, *args, **kwargs)
+
+    def stats(self):
+        """실행기별 통계"""
+        return {
+            "cpu": self.cpu_executor.stats(),
+            "io": self.io_executor.stats(),
+            "inline_max_bytes": self.inline_max_bytes,
+        }
+
+    def close(self):
+        """모든 실행기 종료"""
+        self.cpu_executor.close()
+        self.io_executor.close()
@@ -0,0 +1,195 @@
+"""
+병렬 암호화 엔진 모듈
+
+대량의 암호화/복호화 작업을 프로세스 풀의 여러 코어에 나누어 처리
+큰 페이로드는 공유 메모리에 한 번만 기록하고 워커에는 위치 정보만 전달한다
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .codec import get_codec
+from .crypto import encrypt_batch, decrypt_batch
+from .envelope import DEFAULT_COMPRESSION, DEFAULT_ENCODING
+from .kdf import DEFAULT_KDF
+from .modes import DEFAULT_MODE
+
+_OPERATIONS = {
+    "encrypt": encrypt_batch,
+    "decrypt": decrypt_batch,
+}
+
+
+def _run_chunk(operation, key, codec, payload, options=None):
+    """
+    워커 프로세스에서 청크 하나를 처리
+
+    Args:
+        operation: "encrypt" 또는 "decrypt"
+        key: 암호화 키
+        codec: 코덱 객체
+        payload: 문자열 목록 또는 ("shm", 공유 메모리 이름, [(시작, 끝), ...])
+        options: 일괄 처리 함수에 전달할 추가 인자 (kdf, encoding, mode, compression)
+
+    Returns:
+        (워커 PID, 항목별 결과 목록, 처리한 바이트 수, 소요 시간)
+    """
+    started = time.perf_counter()
+    if isinstance(payload, tuple) and payload[0] == "shm":
+        _, name, spans = payload
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            buffer = shm.buf
+            items = [str(buffer[start:end], "utf-8") for start, end in spans]
+            del buffer
+        finally:
+            shm.close()
+        nbytes = spans[-1][1] - spans[0][0] if spans else 0
+    else:
+        items = payload
+        nbytes = sum(len(item.encode("utf-8")) for item in items)
+
+    results = _OPERATIONS[operation](items, key, codec, **(options or {}))
+    return os.getpid(), results, nbytes, time.perf_counter() - started
+
+
+class ParallelCryptoEngine:
+    """
+    프로세스 풀 기반 일괄 암호화 엔진
+
+    항목을 chunk_size 단위로 묶어 워커에 분배하고, 전체 페이로드가
+    shm_threshold 바이트 이상이면 공유 메모리로 전달한다.
+    결과는 encrypt_batch/decrypt_batch와 같은 형식으로 입력 순서대로 반환한다.
+    """
+
+    def __init__(self, workers=None, chunk_size=256, shm_threshold=1 << 20):
+        """
+        엔진 초기화 (프로세스 풀은 첫 작업 시 생성)
+
+        Args:
+            workers: 워커 프로세스 수 (기본값: CPU 코어 수)
+            chunk_size: 워커 작업 하나에 담을 항목 수
+            shm_threshold: 공유 메모리 전달을 사용할 최소 페이로드 크기(바이트)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.shm_threshold = shm_threshold
+        self._pool = None
+        self._lock = threading.Lock()
+        self._worker_stats = {}
+
+    def _get_pool(self):
+        """프로세스 풀 지연 생성"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def encrypt_batch(self, passwords, key, codec="sumerian", kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING,
+                      mode=DEFAULT_MODE, compression=DEFAULT_COMPRESSION):
+        """여러 문자열을 병렬로 일괄 암호화"""
+        options = {"kdf": kdf, "encoding": encoding, "mode": mode, "compression": compression}
+        return self._run("encrypt", passwords, key, codec, options)
+
+    def decrypt_batch(self, encrypted_passwords, key, codec="sumerian"):
+        """여러 암호문을 병렬로 일괄 복호화"""
+        return self._run("decrypt", encrypted_passwords, key, codec)
+
+    def _run(self, operation, items, key, codec, options=None):
+        """
+        청크 분할, 워커 분배 및 결과 수집
+
+        문자열이 아닌 항목은 워커에 보내지 않고 항목별 오류로 돌려주므로
+        배치 크기나 전달 경로(공유 메모리 여부)와 관계없이 결과 형식이 같다.
+        """
+        items = list(items)
+        codec = get_codec(codec)
+        invalid = {index for index, item in enumerate(items) if not isinstance(item, str)}
+        if invalid:
+            valid = iter(self._run(operation, [item for item in items if isinstance(item, str)], key, codec, options))
+            label = "암호화 오류" if operation == "encrypt" else "복호화 오류"
+            return [
+                {"ok": False, "error": f"{label}: 문자열이 아닌 항목입니다 ({type(item).__name__})"}
+                if index in invalid else next(valid)
+                for index, item in enumerate(items)
+            ]
+        if self.workers <= 1 or len(items) <= self.chunk_size:
+            # 작은 배치는 프로세스 간 전달 비용이 더 크므로 현재 프로세스에서 처리
+            pid, results, nbytes, elapsed = _run_chunk(operation, key, codec, items, options)
+            self._record(pid, len(items), nbytes, elapsed)
+            return results
+
+        encoded = [item.encode("utf-8") for item in items]
+        total = sum(len(item) for item in encoded)
+        bounds = range(0, len(items), self.chunk_size)
+        shm = None
+        try:
+            if total >= self.shm_threshold:
+                shm = shared_memory.SharedMemory(create=True, size=total)
+                shm.buf[:total] = b"".join(encoded)
+                spans = []
+                offset = 0
+                for item in encoded:
+                    spans.append((offset, offset + len(item)))
+                    offset += len(item)
+                payloads = [("shm", shm.name, spans[i:i + self.chunk_size]) for i in bounds]
+            else:
+                payloads = [items[i:i + self.chunk_size] for i in bounds]
+            del encoded
+
+            pool = self._get_pool()
+            futures = [pool.submit(_run_chunk, operation, key, codec, payload, options) for payload in payloads]
+            results = []
+            for future in futures:
+                pid, chunk_results, nbytes, elapsed = future.result()
+                self._record(pid, len(chunk_results), nbytes, elapsed)
+                results.extend(chunk_results)
+            return results
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    def _record(self, pid, items, nbytes, elapsed):
+        """워커별 처리량 누적"""
+        with self._lock:
+            stats = self._worker_stats.setdefault(pid, {"tasks": 0, "items": 0, "bytes": 0, "seconds": 0.0})
+            stats["tasks"] += 1
+            stats["items"] += items
+            stats["bytes"] += nbytes
+            stats["seconds"] += elapsed
+
+    def stats(self):
+        """
+        워커별 처리량 보고
+
+        Returns:
+            {"workers": 워커 수, "per_worker": {PID: {...}}, "total": {...}}
+            각 항목은 tasks, items, bytes, seconds, items_per_s, mb_per_s 포함
+        """
+        with self._lock:
+            per_worker = {pid: dict(stats) for pid, stats in self._worker_stats.items()}
+        total = {"tasks": 0, "items": 0, "bytes": 0, "seconds": 0.0}
+        for stats in per_worker.values():
+            for name in total:
+                total[name] += stats[name]
+        for stats in list(per_worker.values()) + [total]:
+            seconds = stats["seconds"] or float("inf")
+            stats["items_per_s"] = stats["items"] / seconds
+            stats["mb_per_s"] = stats["bytes"] / seconds / (1024 * 1024)
+        return {"workers": self.workers, "per_worker": per_worker, "total": total}
+
+    def close(self):
+        """프로세스 풀 종료"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,266 @@
+"""
+도구 호출 프로파일링 모듈
+
+표본으로 뽑힌 도구 호출마다 cProfile 통계와 tracemalloc 스냅숏을 모아 디렉토리에 기록한다
+파일 이름에는 도구 이름, 입력 크기, 소요 시간이 들어간다 (예: 20250101-120000-00001-decrypt_file-1048576B-842ms.prof)
+
+도구의 실제 연산은 Offloader의 실행기(스레드/프로세스)에서 돌기 때문에, 호출 중인 세션을 컨텍스트 변수에 두고
+실행기로 넘기는 함수를 profiled_call()로 감싸 작업이 실행되는 곳에서 cProfile을 켠다
+이벤트 루프 자체는 프로파일하지 않으므로 동시에 처리 중인 다른 호출이 통계에 섞이지 않는다
+tracemalloc은 프로세스 전체에 하나뿐이라 한 번에 한 세션만 메모리를 추적하며, 프로세스 실행기 작업의 메모리는 잡히지 않는다
+"""
+import contextvars
+import cProfile
+import json
+import os
+import pstats
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from itertools import count
+
+from .metrics import payload_size
+
+DEFAULT_PROFILE_DIR = os.path.join(tempfile.gettempdir(), "sumerian-profiles")
+
+# 요약 JSON에 넣을 함수/할당 위치 수
+TOP_ENTRIES = 20
+
+_SESSION = contextvars.ContextVar("sumerian_profile_session", default=None)
+
+# tracemalloc은 프로세스 전역이므로 메모리 추적은 한 세션씩
+_MEMORY_LOCK = threading.Lock()
+
+
+def active_session():
+    """현재 컨텍스트에서 진행 중인 프로파일 세션 (없으면 None)"""
+    return _SESSION.get()
+
+
+def invocation_size(arguments):
+    """
+    파일 이름에 쓸 도구 호출 입력 크기
+
+    filepath 인자가 있는 파일 도구는 파일 크기, 그 외에는 인자 문자열의 UTF-8 바이트 수
+    """
+    filepath = arguments.get("filepath") if isinstance(arguments, dict) else None
+    if isinstance(filepath, str) and os.path.isfile(filepath):
+        return os.path.getsize(filepath)
+    return payload_size(arguments)
+
+
+class _StatsHolder:
+    """pstats.Stats가 읽을 수 있는 통계 딕셔너리 포장"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def profiled_call(func, args, kwargs):
+    """
+    func(*args, **kwargs)를 cProfile로 실행 (실행기 작업자에서 실행되는 모듈 수준 함수)
+
+    Returns:
+        (결과, 예외 또는 None, cProfile 통계 딕셔너리)
+    """
+    profile = cProfile.Profile()
+    result = error = None
+    try:
+        result = profile.runcall(func, *args, **kwargs)
+    except BaseException as e:
+        error = e
+    profile.create_stats()
+    return result, error, profile.stats
+
+
+class ProfileSession:
+    """도구 호출 하나의 프로파일 수집 상태"""
+
+    def __init__(self, tool, size, memory=True):
+        self.tool = tool
+        self.size = size
+        self.created = time.time()
+        self.duration = None
+        self.calls = 0
+        self.stats = None
+        self.memory = None
+        self._tracing = False
+        self._was_tracing = False
+        if memory and _MEMORY_LOCK.acquire(blocking=False):
+            self._tracing = True
+            self._was_tracing = tracemalloc.is_tracing()
+            if self._was_tracing:
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+        self._started = time.perf_counter()
+
+    def merge(self, outcome):
+        """profiled_call()의 반환값을 통계에 합치고 원래 결과를 반환 (예외는 다시 발생)"""
+        result, error, stats = outcome
+        self.calls += 1
+        if self.stats is None:
+            self.stats = pstats.Stats(_StatsHolder(stats))
+        else:
+            self.stats.add(_StatsHolder(stats))
+        if error is not None:
+            raise error
+        return result
+
+    def run(self, func, *args, **kwargs):
+        """현재 스레드에서 func를 프로파일하며 실행"""
+        return self.merge(profiled_call(func, args, kwargs))
+
+    def finish(self):
+        """소요 시간 확정과 메모리 스냅숏 수집"""
+        self.duration = time.perf_counter() - self._started
+        if self._tracing:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if not self._was_tracing:
+                tracemalloc.stop()
+            _MEMORY_LOCK.release()
+            self._tracing = False
+            self.memory = (snapshot, peak)
+
+
+class ToolProfiler:
+    """
+    표본 추출 방식의 도구 호출 프로파일러
+
+    sample_rate 비율의 호출만 프로파일하고, min_duration초보다 빨리 끝난 호출은 기록하지 않는다.
+    서버 실행 중에 configure()로 켜고 끌 수 있다.
+    """
+
+    def __init__(self, directory=DEFAULT_PROFILE_DIR, enabled=False, sample_rate=1.0, min_duration=0.0, memory=True):
+        """
+        Args:
+            directory: 프로파일 파일을 기록할 디렉토리
+            enabled: 프로파일링 여부
+            sample_rate: 프로파일할 호출 비율 (0~1)
+            min_duration: 이보다 빨리 끝난 호출(초)은 기록하지 않음
+            memory: tracemalloc 스냅숏 수집 여부
+        """
+        self.directory = directory
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.min_duration = 0.0
+        self.memory = memory
+        self._sequence = count(1)
+        self._random = random.Random()
+        self._counts = {"sampled": 0, "written": 0, "skipped_fast": 0}
+        self.configure(enabled=enabled, sample_rate=sample_rate, min_duration=min_duration)
+
+    def configure(self, enabled=None, sample_rate=None, min_duration=None, directory=None, memory=None):
+        """
+        설정 변경 (None인 항목은 유지)
+
+        Returns:
+            변경 후 설정과 통계
+        """
+        if sample_rate is not None:
+            if not 0 <= sample_rate <= 1:
+                raise ValueError("sample_rate는 0 이상 1 이하여야 합니다")
+            self.sample_rate = sample_rate
+        if min_duration is not None:
+            if min_duration < 0:
+                raise ValueError("min_duration은 0 이상이어야 합니다")
+            self.min_duration = min_duration
+        if directory:
+            self.directory = directory
+        if memory is not None:
+            self.memory = memory
+        if enabled is not None:
+            self.enabled = enabled
+        return self.settings()
+
+    def settings(self):
+        """현재 설정과 표본/기록 수"""
+        return dict(
+            self._counts, enabled=self.enabled, directory=self.directory, sample_rate=self.sample_rate,
+            min_duration=self.min_duration, memory=self.memory,
+        )
+
+    def sample(self, tool, size):
+        """이번 호출을 프로파일할지 정해 세션 생성 (하지 않으면 None)"""
+        if not self.enabled or self._random.random() >= self.sample_rate:
+            return None
+        self._counts["sampled"] += 1
+        return ProfileSession(tool, size, memory=self.memory)
+
+    @contextmanager
+    def profile(self, tool, size):
+        """
+        도구 호출 하나를 감싸는 컨텍스트 (표본으로 뽑히지 않으면 None을 넘김)
+
+        안에서 실행기로 넘기는 작업은 Offloader가 세션을 찾아 프로파일한다.
+        """
+        session = self.sample(tool, size)
+        if session is None:
+            yield None
+            return
+        token = _SESSION.set(session)
+        try:
+            yield session
+        finally:
+            _SESSION.reset(token)
+            session.finish()
+            self.write(session)
+
+    def write(self, session):
+        """
+        세션을 .prof(pstats), .tracemalloc, .json(요약) 파일로 기록
+
+        Returns:
+            기록한 파일 이름의 공통 경로 (min_duration보다 빨랐으면 None)
+        """
+        if session.duration < self.min_duration:
+            self._counts["skipped_fast"] += 1
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(session.created))
+        tool = "".join(c if c.isalnum() or c in "-_" else "_" for c in session.tool)
+        base = os.path.join(
+            self.directory,
+            f"{stamp}-{next(self._sequence):05d}-{tool}-{session.size}B-{round(session.duration * 1000)}ms",
+        )
+
+        summary = {
+            "tool": session.tool,
+            "size": session.size,
+            "duration_ms": session.duration * 1000,
+            "started": session.created,
+            "profiled_calls": session.calls,
+        }
+        if session.stats is not None:
+            session.stats.dump_stats(base + ".prof")
+            entries = sorted(session.stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+            summary["top_cumulative"] = [
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "ncalls": ncalls,
+                    "tottime": tottime,
+                    "cumtime": cumtime,
+                }
+                for (filename, line, name), (_, ncalls, tottime, cumtime, _) in entries[:TOP_ENTRIES]
+            ]
+        if session.memory is not None:
+            snapshot, peak = session.memory
+            snapshot.dump(base + ".tracemalloc")
+            summary["memory"] = {
+                "peak_bytes": peak,
+                "top_allocations": [
+                    {"location": str(stat.traceback), "size": stat.size, "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:TOP_ENTRIES]
+                ],
+            }
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        self._counts["written"] += 1
+        return base
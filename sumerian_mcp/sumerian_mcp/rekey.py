@@ -0,0 +1,324 @@
+"""
+키 교체(재암호화) 모듈
+
+암호문을 이전 키에서 새 키로 다시 암호화한다. 파일은 복호화 스트림을 파이프로 암호화 스트림에 바로 넘겨
+평문을 메모리에 모으거나 디스크에 쓰지 않고, 결과는 임시 파일에 기록해 동기화한 뒤 원본과 원자적으로 교체한다.
+디렉토리는 큰 파일부터 워커 풀에 나눠 처리하며, 끝난 파일을 체크포인트 파일에 기록해
+중단된 뒤 다시 실행하면 남은 파일부터 이어서 처리한다.
+체크포인트에 기록되기 전에 중단된 파일은 헤더의 키 확인 값이 새 키와 맞으므로 건너뛴 것으로 처리한다.
+
+원본을 교체하는 것은 이전 키가 틀리면 확실히 실패하는 형식(키 확인 값이 있거나 AEAD인 버전 2, 컨테이너)뿐이다.
+표식 없는 기존 형식과 키 확인 값 없는 CBC는 인증이 없어 잘못된 키도 약 1/256 확률로 패딩 검사를 통과하므로,
+원본은 그대로 두고 새 암호문을 옆의 REKEY_SUFFIX 파일에 기록한다.
+"""
+import codecs
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from .codec import get_codec
+from .container import MAGIC, encrypt_container, is_container
+from .crypto import _decode_prefix
+from .envelope import DEFAULT_COMPRESSION, DEFAULT_ENCODING, FLAG_KCV, HEADER_SIZE, KCV_SIZE, parse_header, split_marker
+from .files import (
+    _WHITESPACE,
+    ENCRYPTED_SUFFIX,
+    _decrypt_any,
+    _safe_join,
+    _scan_tree,
+    _schedule,
+    _stream_file,
+    encrypt_stream,
+)
+from .kdf import DEFAULT_KDF, check_key, derived_key, encryption_key, kdf_params, key_check_value
+from .modes import DEFAULT_MODE, is_aead
+
+# 디렉토리 키 교체 체크포인트 파일 이름과 저장 간격(초)
+CHECKPOINT_NAME = ".sumerian-rekey.json"
+CHECKPOINT_INTERVAL = 1.0
+
+# 이전 키를 확인할 수 없는 형식의 새 암호문을 원본 옆에 기록할 때 붙이는 확장자
+REKEY_SUFFIX = ".rekeyed"
+
+# 헤더와 키 확인 값을 찾으려고 읽는 파일 앞부분 크기 (쐐기문자는 UTF-8로 4바이트)
+_HEAD_BYTES = 1024
+
+
+def key_fingerprint(key):
+    """
+    체크포인트가 같은 새 키로 이어지는지 확인할 키 지문
+
+    결정적 솔트로 파생한 키의 키 확인 값이므로 키 파생 비용이 그대로 들고 키 자체는 남지 않는다.
+    """
+    kdf_id, params = kdf_params(DEFAULT_KDF)
+    with encryption_key(key, kdf_id, params, deterministic=True) as (_, key_bytes):
+        return key_check_value(key_bytes).hex()
+
+
+class Checkpoint:
+    """처리를 마친 항목 목록을 원자적으로 기록하는 JSON 체크포인트 파일"""
+
+    def __init__(self, path, target, restart=False):
+        """
+        체크포인트 열기
+
+        Args:
+            path: 체크포인트 파일 경로
+            target: 새 키 지문 (key_fingerprint)
+            restart: True이면 기존 체크포인트를 무시하고 처음부터
+
+        Raises:
+            ValueError: 기존 체크포인트가 다른 새 키로 시작된 경우
+        """
+        self.path = path
+        self.target = target
+        self.done = set()
+        self._saved = time.monotonic()
+        if restart or not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("target") != target:
+            raise ValueError(f"체크포인트가 다른 새 키로 시작된 작업입니다 (처음부터 다시 하려면 restart): {path}")
+        self.done = set(data.get("done", []))
+
+    def add(self, items):
+        """끝난 항목 추가 (CHECKPOINT_INTERVAL마다 파일에 기록)"""
+        self.done.update(items)
+        if time.monotonic() - self._saved >= CHECKPOINT_INTERVAL:
+            self.save()
+
+    def save(self):
+        """임시 파일에 기록하고 동기화한 뒤 교체"""
+        tmp_path = self.path + ".part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "target": self.target, "done": sorted(self.done)}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._saved = time.monotonic()
+
+    def finish(self, complete):
+        """모두 끝났으면 체크포인트 삭제, 아니면 저장해 다음 실행이 이어서 처리하게 함"""
+        if not complete:
+            self.save()
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def rekey_stream(src, dst, old_key, new_key, kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING, mode=DEFAULT_MODE,
+                 compression=DEFAULT_COMPRESSION):
+    """
+    암호문 스트림을 새 키로 다시 암호화
+
+    복호화는 별도 스레드에서 파이프에 쓰고 암호화가 그 파이프를 읽으므로 메모리 사용량은 블록 크기에 비례한다.
+    원본 형식(텍스트 또는 컨테이너)을 유지하며 컨테이너에는 encoding과 compression을 사용하지 않는다.
+    압축된 원본은 복호화할 때 압축이 풀리므로 compression에 따라 다시 압축하거나 압축하지 않은 채로 기록된다.
+
+    Returns:
+        평문 바이트 수
+
+    Raises:
+        ValueError: 이전 키가 잘못되었거나 암호문이 손상된 경우 (dst에 쓴 내용은 버려야 함)
+    """
+    container = is_container(src)
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def produce():
+        try:
+            with open(write_fd, "wb") as writer:
+                _decrypt_any(src, writer, old_key)
+        except BaseException as e:  # 암호화 쪽이 실패해 파이프가 닫힌 경우 포함
+            errors.append(e)
+
+    thread = threading.Thread(target=produce, name="rekey-decrypt", daemon=True)
+    with open(read_fd, "rb") as reader:
+        thread.start()
+        try:
+            if container:
+                size = encrypt_container(reader, dst, new_key, kdf=kdf, mode=mode)
+            else:
+                size = encrypt_stream(
+                    reader, dst, new_key, kdf=kdf, encoding=encoding, mode=mode, compression=compression
+                )
+        finally:
+            # 암호화가 먼저 실패하면 읽는 쪽을 닫아 복호화 스레드가 쓰기에서 멈추지 않게 함
+            reader.close()
+            thread.join()
+    if errors:
+        raise errors[0]
+    return size
+
+
+def _read_header(filepath):
+    """
+    암호문 파일 앞부분의 헤더와 키 확인 값
+
+    Returns:
+        (헤더, 키 확인 값 또는 None), 표식이 없는 기존 형식이면 None
+
+    Raises:
+        ValueError: 헤더를 해석할 수 없는 경우
+    """
+    with open(filepath, "rb") as f:
+        head = f.read(_HEAD_BYTES)
+    if head.startswith(MAGIC):
+        data = head[len(MAGIC):]
+    else:
+        text = codecs.getincrementaldecoder("utf-8")().decode(head.translate(None, _WHITESPACE))
+        encoding, body = split_marker(text)
+        if encoding is None:
+            return None
+        data = _decode_prefix(encoding, body, get_codec())
+    header = parse_header(data)
+    if not header.flags & FLAG_KCV:
+        return header, None
+    if len(data) < HEADER_SIZE + KCV_SIZE:
+        raise ValueError("암호문이 너무 짧습니다")
+    return header, bytes(data[HEADER_SIZE:HEADER_SIZE + KCV_SIZE])
+
+
+def verifies_old_key(filepath):
+    """잘못된 이전 키가 본문을 기록하기 전에 확실히 거부되는 형식인지 (키 확인 값이 있거나 AEAD)"""
+    try:
+        parsed = _read_header(filepath)
+    except ValueError:
+        return False
+    return parsed is not None and (parsed[1] is not None or is_aead(parsed[0].mode))
+
+
+def _has_key(filepath, key):
+    """키 확인 값이 있는 암호문이 이 키로 만들어졌는지 (키 확인 값이 없으면 False)"""
+    try:
+        parsed = _read_header(filepath)
+        if parsed is None or parsed[1] is None:
+            return False
+        header, kcv = parsed
+        with derived_key(key, header.salt, header.kdf, header.params) as key_bytes:
+            check_key(key_bytes, kcv)
+    except ValueError:
+        return False
+    return True
+
+
+def rekey_output_path(filepath):
+    """rekey_file이 새 암호문을 기록할 경로 (이전 키를 확인할 수 없는 형식이면 원본 옆의 REKEY_SUFFIX 파일)"""
+    return filepath if verifies_old_key(filepath) else filepath + REKEY_SUFFIX
+
+
+def rekey_file(filepath, old_key, new_key, kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING, mode=DEFAULT_MODE,
+               compression=DEFAULT_COMPRESSION):
+    """
+    암호화된 파일 하나를 새 키로 다시 암호화
+
+    키 확인 값이나 인증 태그로 이전 키를 확인할 수 있는 형식은 원본과 원자적으로 교체하고,
+    그렇지 않은 형식(기존 형식, 키 확인 값 없는 CBC)은 원본을 두고 rekey_output_path()에 기록한다.
+
+    Returns:
+        평문 바이트 수
+    """
+    # _stream_file은 키 하나만 넘기므로 그 키가 이전 키(old_key) 자리에 들어감
+    stream_func = partial(
+        rekey_stream, new_key=new_key, kdf=kdf, encoding=encoding, mode=mode, compression=compression
+    )
+    return _stream_file(stream_func, filepath, rekey_output_path(filepath), old_key, durable=True)
+
+
+def _rekey_group(root, old_key, new_key, group, options):
+    """
+    워커 작업 하나(파일 묶음)의 키 교체
+
+    Returns:
+        파일별 결과 목록 ({"path", "size", "output"}, 이미 새 키면 "skipped", 실패하면 "error" 포함)
+    """
+    results = []
+    for rel, size in group:
+        filepath = _safe_join(root, rel)
+        output = rel if verifies_old_key(filepath) else rel + REKEY_SUFFIX
+        try:
+            results.append({"path": rel, "size": rekey_file(filepath, old_key, new_key, **options), "output": output})
+        except ValueError as e:
+            # 패딩 검사만 통과하는 형식은 이미 교체되었다고 판단하지 않음
+            if _has_key(filepath, new_key):
+                results.append({"path": rel, "size": size, "skipped": True})
+            else:
+                results.append({"path": rel, "size": size, "error": str(e)})
+        except Exception as e:
+            results.append({"path": rel, "size": size, "error": str(e)})
+    return results
+
+
+def rekey_dir(root, old_key, new_key, workers=1, restart=False, kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING,
+              mode=DEFAULT_MODE, compression=DEFAULT_COMPRESSION):
+    """
+    디렉토리 트리의 암호화된 파일(.sumerian)을 모두 새 키로 다시 암호화
+
+    진행 상황은 root/.sumerian-rekey.json에 기록하며, 모든 파일이 끝나면 삭제한다.
+    실패한 파일이 있으면 체크포인트를 남겨 다시 실행할 때 실패한 파일만 처리한다.
+
+    Args:
+        root: 암호화된 디렉토리 (encrypt_dir 출력 등)
+        old_key: 이전 키
+        new_key: 새 키
+        workers: 워커 프로세스 수
+        restart: True이면 기존 체크포인트를 무시하고 처음부터
+        kdf: 새 암호문의 키 파생 함수 이름
+        encoding: 새 암호문의 텍스트 인코딩 ("base64" 또는 "base1024")
+        mode: 새 암호문의 암호화 모드 ("gcm", "chacha20-poly1305", "cbc" 또는 "siv")
+        compression: 새 암호문의 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 텍스트 형식만)
+
+    Returns:
+        처리 요약 (files, skipped, resumed, bytes, seconds, mb_per_s, checkpoint, errors,
+        이전 키를 확인할 수 없어 원본 옆에 기록한 파일 목록 beside)
+
+    Raises:
+        ValueError: 체크포인트가 다른 새 키로 시작된 경우
+    """
+    started = time.perf_counter()
+    checkpoint = Checkpoint(os.path.join(root, CHECKPOINT_NAME), key_fingerprint(new_key), restart)
+    resumed = len(checkpoint.done)
+    entries = [
+        (rel, size) for rel, size in _scan_tree(root)
+        if rel.endswith(ENCRYPTED_SUFFIX) and rel not in checkpoint.done
+    ]
+    # 워커 풀에서는 작업(파일 묶음) 단위로 반영되며, 중단으로 반영되지 못한 파일은 다음 실행에서 건너뜀으로 처리됨
+    tasks = _schedule(entries)
+    options = {"kdf": kdf, "encoding": encoding, "mode": mode, "compression": compression}
+    results = []
+
+    def collect(group_results):
+        results.extend(group_results)
+        checkpoint.add(result["path"] for result in group_results if "error" not in result)
+
+    try:
+        if workers <= 1 or len(tasks) <= 1:
+            # 현재 프로세스에서는 파일마다 체크포인트에 반영
+            for entry in entries:
+                collect(_rekey_group(root, old_key, new_key, [entry], options))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_rekey_group, root, old_key, new_key, group, options) for group in tasks]
+                for future in as_completed(futures):
+                    collect(future.result())
+    finally:
+        errors = [{"path": result["path"], "error": result["error"]} for result in results if "error" in result]
+        checkpoint.finish(complete=len(results) == len(entries) and not errors)
+
+    elapsed = time.perf_counter() - started
+    rekeyed = [result for result in results if "error" not in result and not result.get("skipped")]
+    total_bytes = sum(result["size"] for result in rekeyed)
+    return {
+        "files": len(rekeyed),
+        "skipped": len(results) - len(rekeyed) - len(errors),
+        "resumed": resumed,
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "mb_per_s": total_bytes / (elapsed or float("inf")) / (1024 * 1024),
+        "checkpoint": checkpoint.path if errors else None,
+        "errors": sorted(errors, key=lambda error: error["path"]),
+        "beside": sorted(result["output"] for result in rekeyed if result["output"] != result["path"]),
+    }
@@ -2,46 +2,139 @@
 Sumerian MCP 서버 구현
 MCP 프로토콜을 통해 수메르 암호화 기능을 제공하는 서버
 """
+import base64
+import json
+from functools import partial
+from urllib.parse import quote, unquote
 from mcp.server.fastmcp import FastMCP
 from mcp.types import CallToolResult, TextContent
-from .crypto import encrypt_password, decrypt_password
+from starlette.requests import Request
+from starlette.responses import Response
+from .crypto import (
+    decrypt_batch,
+    decrypt_cache_stats,
+    decrypt_password,
+    decryption_key_ready,
+    encrypt_batch,
+    encrypt_password,
+    encryption_key_ready,
+)
+from .container import decrypt_range
+from .envelope import DEFAULT_COMPRESSION, DEFAULT_ENCODING
+from .kdf import DEFAULT_KDF, key_cache_stats
+from .metrics import PROMETHEUS_CONTENT_TYPE, ToolMetrics
+from .modes import DEFAULT_MODE
+from .offload import Offloader
+from .parallel import ParallelCryptoEngine
+from .profiling import ToolProfiler, invocation_size
+from .rekey import rekey_dir
+from .vault import REKEY_BATCH_SIZE, SecretVault
+from . import files
+
+
+class InstrumentedFastMCP(FastMCP):
+    """
+    도구 호출마다 ToolMetrics에 호출 수, 오류, 바이트 수, 지연 시간을 기록하고
+    ToolProfiler가 켜져 있으면 표본으로 뽑힌 호출을 프로파일하는 FastMCP
+    """
+    
+    def __init__(self, name, metrics, profiler):
+        self.metrics = metrics
+        self.profiler = profiler
+        super().__init__(name)
+    
+    async def call_tool(self, name, arguments):
+        if self.profiler.enabled:
+            with self.profiler.profile(name, invocation_size(arguments)):
+                return await self._call_tool(name, arguments)
+        return await self._call_tool(name, arguments)
+    
+    async def _call_tool(self, name, arguments):
+        if not self.metrics.enabled:
+            return await super().call_tool(name, arguments)
+        # 등록되지 않은 도구 이름은 지표 레이블이 늘어나지 않도록 하나로 묶음
+        label = name if self._tool_manager.get_tool(name) else "unknown"
+        token = self.metrics.begin(label, arguments)
+        try:
+            result = await super().call_tool(name, arguments)
+        except BaseException:
+            self.metrics.end(token, error=True)
+            raise
+        self.metrics.end(token, result, error=bool(getattr(result, "isError", False)))
+        return result
 
 
 class SumerianMCPServer:
     """
     수메르 암호화 MCP 서버
     
-    AES-256 CBC 암호화와 수메르어 변환을 결합한 암호화 기능을 MCP 도구로 제공
+    AES-256 암호화(GCM, ChaCha20-Poly1305, CBC)와 수메르어 변환을 결합한 암호화 기능을 MCP 도구로 제공
+    도구는 비동기로 실행되며 블로킹 작업은 Offloader의 CPU/I/O 실행기로 넘겨 이벤트 루프를 막지 않는다
     """
     
-    def __init__(self, name="Sumerian Encryption"):
+    def __init__(
+        self, name="Sumerian Encryption", workers=1, offload=None, metrics=True, profiler=None, decrypt_cache=False,
+        vault=None,
+    ):
         """
         MCP 서버 초기화
         
         Args:
             name: 서버 이름
+            workers: 일괄 처리 도구에 사용할 워커 프로세스 수 (1이면 현재 프로세스에서 처리)
+            offload: 블로킹 작업용 Offloader (기본값: 스레드 실행기)
+            metrics: False이면 도구 호출 지표를 기록하지 않음
+            profiler: 도구 호출 프로파일러 (기본값: 꺼진 ToolProfiler, profile 도구로 실행 중에 켤 수 있음)
+            decrypt_cache: True이면 decrypt 도구가 복호화 결과 캐시를 사용
+                (크기와 유지 시간은 configure_decrypt_cache(), process 실행기에서는 워커 프로세스마다 따로 캐시)
+            vault: 비밀 저장소 경로 또는 SecretVault (지정하면 vault_* 도구와 vault:// 자원을 등록)
         """
-        self.mcp = FastMCP(name)
+        self.metrics = ToolMetrics(enabled=metrics)
+        self.profiler = profiler or ToolProfiler()
+        self.mcp = InstrumentedFastMCP(name, self.metrics, self.profiler)
+        self.workers = workers
+        self.engine = ParallelCryptoEngine(workers=workers) if workers > 1 else None
+        self.offload = offload or Offloader()
+        self.decrypt_cache = decrypt_cache
+        self.vault = SecretVault(vault) if isinstance(vault, str) else vault
         self._register_tools()
+        if self.vault is not None:
+            self._register_vault()
         
     def _register_tools(self):
         """MCP 서버에 도구 등록"""
         
         # 암호화 도구
         @self.mcp.tool()
-        def encrypt(password: str, key: str) -> str:
+        async def encrypt(
+            password: str,
+            key: str,
+            kdf: str = DEFAULT_KDF,
+            encoding: str = DEFAULT_ENCODING,
+            mode: str = DEFAULT_MODE,
+            compression: str = DEFAULT_COMPRESSION,
+        ) -> CallToolResult:
             """
-            AES-256 CBC로 암호화 후 수메르어로 변환
+            AES-256으로 암호화 후 수메르어로 변환
             
             Args:
                 password: 암호화할 비밀번호
                 key: 암호화 키
+                kdf: 키 파생 함수 ("pbkdf2" 또는 "scrypt")
+                encoding: 텍스트 인코딩 ("base64" 또는 문자 수가 약 40% 적은 "base1024")
+                mode: 암호화 모드 (인증 암호화 "gcm", "chacha20-poly1305", "cbc" 또는
+                    같은 평문이면 같은 결과를 만들어 암호문으로 검색/중복 제거할 수 있는 결정적 "siv")
+                compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 잘 압축되지 않는 입력은 건너뜀,
+                    압축된 길이가 내용을 드러낼 수 있으므로 공격자가 고른 데이터와 비밀을 섞을 때는 "none")
                 
             Returns:
                 암호화 및 수메르어로 변환된 문자열
             """
             try:
-                result = encrypt_password(password, key)
+                result = await self.offload.cpu(
+                    encrypt_password, password, key, kdf=kdf, encoding=encoding, mode=mode, compression=compression,
+                    size=len(password), ready=partial(encryption_key_ready, key, kdf, mode),
+                )
                 return CallToolResult(
                     content=[
                         TextContent(
@@ -63,9 +156,9 @@ class SumerianMCPServer:
         
         # 복호화 도구
         @self.mcp.tool()
-        def decrypt(encrypted_text: str, key: str) -> str:
+        async def decrypt(encrypted_text: str, key: str) -> CallToolResult:
             """
-            수메르어 복호화 후 AES-256 CBC 복호화
+            수메르어 복호화 후 AES-256 복호화 (모드는 암호문 헤더에서 판별)
             
             Args:
                 encrypted_text: 암호화된 수메르어 텍스트
@@ -75,7 +168,10 @@ class SumerianMCPServer:
                 복호화된 원본 텍스트
             """
             try:
-                result = decrypt_password(encrypted_text, key)
+                result = await self.offload.cpu(
+                    decrypt_password, encrypted_text, key, cache=self.decrypt_cache or None, size=len(encrypted_text),
+                    ready=partial(decryption_key_ready, encrypted_text, key),
+                )
                 if result is None:
                     return CallToolResult(
                         isError=True,
@@ -105,10 +201,538 @@ class SumerianMCPServer:
                     ]
                 )
     
+        # 일괄 암호화 도구
+        @self.mcp.tool(name="encrypt_batch")
+        async def encrypt_batch_tool(
+            passwords: list[str],
+            key: str,
+            kdf: str = DEFAULT_KDF,
+            encoding: str = DEFAULT_ENCODING,
+            mode: str = DEFAULT_MODE,
+            compression: str = DEFAULT_COMPRESSION,
+        ) -> CallToolResult:
+            """
+            여러 비밀번호를 같은 키로 일괄 암호화
+            
+            Args:
+                passwords: 암호화할 비밀번호 목록
+                key: 암호화 키
+                kdf: 키 파생 함수 ("pbkdf2" 또는 "scrypt")
+                encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+                mode: 암호화 모드 ("gcm", "chacha20-poly1305", "cbc" 또는 결정적 "siv")
+                compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 잘 압축되지 않는 입력은 건너뜀)
+                
+            Returns:
+                항목별 결과({"ok", "result"/"error"})의 JSON 배열
+            """
+            args = (passwords, key, "sumerian", kdf, encoding, mode, compression)
+            if self.engine:
+                # 워커 프로세스에 분배하고 결과를 기다리는 작업이므로 I/O 실행기에서 대기
+                return await self.offload.io(self._json_result, "일괄 암호화", self.engine.encrypt_batch, *args)
+            size = sum(len(password) for password in passwords)
+            return await self.offload.cpu(self._json_result, "일괄 암호화", encrypt_batch, *args, size=size,
+                                          ready=partial(encryption_key_ready, key, kdf, mode))
+        
+        # 일괄 복호화 도구
+        @self.mcp.tool(name="decrypt_batch")
+        async def decrypt_batch_tool(encrypted_texts: list[str], key: str) -> CallToolResult:
+            """
+            여러 수메르어 암호문을 같은 키로 일괄 복호화
+            
+            Args:
+                encrypted_texts: 암호화된 수메르어 텍스트 목록
+                key: 복호화 키
+                
+            Returns:
+                항목별 결과({"ok", "result"/"error"})의 JSON 배열
+            """
+            if self.engine:
+                return await self.offload.io(self._json_result, "일괄 복호화", self.engine.decrypt_batch, encrypted_texts, key)
+            size = sum(len(text) for text in encrypted_texts)
+            return await self.offload.cpu(
+                self._json_result, "일괄 복호화", decrypt_batch, encrypted_texts, key, size=size,
+                ready=lambda: all(decryption_key_ready(text, key) for text in encrypted_texts if isinstance(text, str)),
+            )
+        
+        # 워커 처리량 조회 도구
+        @self.mcp.tool()
+        def worker_stats() -> CallToolResult:
+            """
+            일괄 처리 워커 프로세스별 처리량 조회
+            
+            Returns:
+                워커별 작업 수, 항목 수, 바이트 수, 초당 처리량, 파생 키/복호화 결과 캐시 및 실행기 상태의 JSON
+            """
+            stats = self.engine.stats() if self.engine else {"workers": 1, "per_worker": {}}
+            stats["key_cache"] = key_cache_stats()
+            stats["decrypt_cache"] = dict(decrypt_cache_stats(), enabled=bool(self.decrypt_cache))
+            stats["offload"] = self.offload.stats()
+            return CallToolResult(
+                content=[
+                    TextContent(
+                        type="text",
+                        text=json.dumps(stats, ensure_ascii=False)
+                    )
+                ]
+            )
+    
+        # 도구 호출 지표 조회 도구
+        @self.mcp.tool()
+        def stats(reset: bool = False) -> CallToolResult:
+            """
+            도구별 호출 수, 오류 수, 처리 중 호출 수, 입력/출력 바이트 수, 입력 크기 구간별 지연 시간 조회
+            
+            Args:
+                reset: True이면 조회 후 지표 초기화
+                
+            Returns:
+                도구별 지표의 JSON (지연 시간 분위수는 히스토그램 구간 상한으로 추정)
+            """
+            snapshot = self.metrics.snapshot()
+            if reset:
+                self.metrics.reset()
+            return CallToolResult(
+                content=[
+                    TextContent(
+                        type="text",
+                        text=json.dumps(snapshot, ensure_ascii=False)
+                    )
+                ]
+            )
+        
+        # 프로파일링 설정 도구
+        @self.mcp.tool()
+        def profile(
+            enabled: bool | None = None,
+            sample_rate: float | None = None,
+            min_duration_ms: float | None = None,
+            directory: str = "",
+        ) -> CallToolResult:
+            """
+            도구 호출 프로파일링(cProfile + tracemalloc)을 실행 중에 켜고 끄거나 설정 변경
+            
+            Args:
+                enabled: True이면 켜고 False이면 끔 (생략하면 유지)
+                sample_rate: 프로파일할 호출 비율 (0~1)
+                min_duration_ms: 이보다 빨리 끝난 호출은 기록하지 않음 (ms)
+                directory: 프로파일 파일을 기록할 디렉토리
+                
+            Returns:
+                변경 후 설정과 표본/기록 수의 JSON
+            """
+            min_duration = None if min_duration_ms is None else min_duration_ms / 1000
+            return self._json_result(
+                "프로파일 설정", self.profiler.configure, enabled, sample_rate, min_duration, directory or None
+            )
+        
+        # Prometheus 수집 경로 (SSE 서버)
+        @self.mcp.custom_route("/metrics", methods=["GET"])
+        async def metrics_route(request: Request) -> Response:
+            return Response(self.metrics.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+    
+        # 파일 암호화 도구
+        @self.mcp.tool()
+        async def encrypt_file(
+            filepath: str,
+            key: str,
+            output: str = "",
+            kdf: str = DEFAULT_KDF,
+            encoding: str = DEFAULT_ENCODING,
+            mode: str = DEFAULT_MODE,
+            container: bool = False,
+            compression: str = DEFAULT_COMPRESSION,
+        ) -> CallToolResult:
+            """
+            파일을 블록 단위 스트리밍으로 암호화
+            
+            Args:
+                filepath: 원본 파일 경로
+                key: 암호화 키
+                output: 출력 경로 (기본값: 원본 경로 + .sumerian)
+                kdf: 키 파생 함수 ("pbkdf2" 또는 "scrypt")
+                encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+                mode: 암호화 모드 ("gcm", "chacha20-poly1305" 또는 "cbc")
+                container: True이면 decrypt_range로 일부만 읽을 수 있는 바이너리 컨테이너로 기록 (AEAD 모드만)
+                compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 컨테이너는 "none"만)
+                
+            Returns:
+                출력 경로와 처리한 바이트 수의 JSON
+            """
+            options = {"kdf": kdf, "encoding": encoding, "mode": mode, "container": container, "compression": compression}
+            return await self.offload.io(
+                self._json_result, "파일 암호화", self._file_summary, files.encrypt_file, filepath, key, output, options
+            )
+        
+        # 파일 복호화 도구
+        @self.mcp.tool()
+        async def decrypt_file(filepath: str, key: str, output: str = "") -> CallToolResult:
+            """
+            암호화된 파일을 블록 단위 스트리밍으로 복호화
+            
+            Args:
+                filepath: 암호화된 파일 경로
+                key: 복호화 키
+                output: 출력 경로 (기본값: .sumerian 확장자 제거)
+                
+            Returns:
+                출력 경로와 처리한 바이트 수의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "파일 복호화", self._file_summary, files.decrypt_file, filepath, key, output
+            )
+        
+        # 컨테이너 범위 복호화 도구
+        @self.mcp.tool()
+        async def decrypt_range(filepath: str, key: str, offset: int = 0, length: int = 4096) -> CallToolResult:
+            """
+            컨테이너 파일에서 필요한 청크만 복호화해 일부 범위를 반환
+            
+            Args:
+                filepath: encrypt_file(container=True)로 만든 컨테이너 파일 경로
+                key: 복호화 키
+                offset: 평문 시작 위치 (음수이면 끝에서부터, 예: -4096은 마지막 4KB)
+                length: 읽을 바이트 수
+                
+            Returns:
+                범위와 데이터의 JSON (UTF-8로 해석되면 "text", 아니면 "base64")
+            """
+            return await self.offload.io(self._json_result, "범위 복호화", self._range_summary, filepath, key, offset, length)
+        
+        # 디렉토리 암호화 도구
+        @self.mcp.tool()
+        async def encrypt_dir(
+            src_dir: str,
+            out_dir: str,
+            key: str,
+            kdf: str = DEFAULT_KDF,
+            encoding: str = DEFAULT_ENCODING,
+            mode: str = DEFAULT_MODE,
+            compression: str = DEFAULT_COMPRESSION,
+        ) -> CallToolResult:
+            """
+            디렉토리 트리를 재귀적으로 암호화하고 매니페스트 기록
+            
+            Args:
+                src_dir: 원본 디렉토리
+                out_dir: 출력 디렉토리 (manifest.json 포함)
+                key: 암호화 키
+                kdf: 키 파생 함수 ("pbkdf2" 또는 "scrypt")
+                encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+                mode: 암호화 모드 ("gcm", "chacha20-poly1305" 또는 "cbc")
+                compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 파일마다 표본 검사)
+                
+            Returns:
+                파일 수, 바이트 수, MB/s, 매니페스트 경로, 오류 목록의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "디렉토리 암호화", files.encrypt_dir, src_dir, out_dir, key, self.workers, kdf, encoding, mode,
+                compression,
+            )
+        
+        # 디렉토리 복호화 도구
+        @self.mcp.tool()
+        async def decrypt_dir(src_dir: str, out_dir: str, key: str) -> CallToolResult:
+            """
+            encrypt_dir로 암호화된 디렉토리를 매니페스트 기준으로 복호화
+            
+            Args:
+                src_dir: 암호화된 디렉토리 (manifest.json 포함)
+                out_dir: 복호화 결과 디렉토리
+                key: 복호화 키
+                
+            Returns:
+                파일 수, 바이트 수, MB/s, 매니페스트 경로, 오류 목록의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "디렉토리 복호화", files.decrypt_dir, src_dir, out_dir, key, self.workers
+            )
+        
+        # 디렉토리 키 교체 도구
+        @self.mcp.tool(name="rekey_dir")
+        async def rekey_dir_tool(
+            src_dir: str,
+            old_key: str,
+            new_key: str,
+            restart: bool = False,
+            kdf: str = DEFAULT_KDF,
+            encoding: str = DEFAULT_ENCODING,
+            mode: str = DEFAULT_MODE,
+            compression: str = DEFAULT_COMPRESSION,
+        ) -> CallToolResult:
+            """
+            디렉토리의 암호화된 파일(.sumerian)을 새 키로 다시 암호화 (원자적 교체, 중단되면 이어서 처리)
+            
+            이전 키를 확인할 수 없는 형식(표식 없는 이전 형식, 키 확인 값 없는 CBC)은 원본을 두고 옆의 .rekeyed 파일에 기록한다.
+            
+            Args:
+                src_dir: 암호화된 디렉토리
+                old_key: 이전 키
+                new_key: 새 키
+                restart: True이면 남아 있는 체크포인트를 무시하고 처음부터
+                kdf: 키 파생 함수 ("pbkdf2" 또는 "scrypt")
+                encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+                mode: 암호화 모드 ("gcm", "chacha20-poly1305", "cbc" 또는 "siv")
+                compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 컨테이너 파일은 압축하지 않음)
+            
+            Returns:
+                교체한 파일 수, 건너뛴 파일 수, 바이트 수, MB/s, 오류 목록, 원본 옆에 기록한 파일 목록(beside)의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "키 교체", rekey_dir, src_dir, old_key, new_key, self.workers, restart,
+                kdf, encoding, mode, compression,
+            )
+    
+    def _register_vault(self):
+        """비밀 저장소 도구와 자원 등록 (이름 조회는 기본 키 색인만 사용하고 다른 항목은 복호화하지 않음)"""
+        vault = self.vault
+        
+        # 저장소 기록 도구
+        @self.mcp.tool()
+        async def vault_put(
+            name: str,
+            secret: str,
+            key: str,
+            tags: list[str] | None = None,
+            overwrite: bool = True,
+            kdf: str = DEFAULT_KDF,
+            encoding: str = DEFAULT_ENCODING,
+            mode: str = DEFAULT_MODE,
+            compression: str = DEFAULT_COMPRESSION,
+        ) -> CallToolResult:
+            """
+            비밀을 암호화해 저장소에 이름으로 저장
+            
+            Args:
+                name: 항목 이름 (예: "db/prod")
+                secret: 저장할 비밀
+                key: 암호화 키
+                tags: 태그 목록
+                overwrite: False이면 같은 이름이 있을 때 오류
+                kdf: 키 파생 함수 ("pbkdf2" 또는 "scrypt")
+                encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+                mode: 암호화 모드 ("gcm", "chacha20-poly1305", "cbc" 또는 "siv")
+                compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 잘 압축되지 않는 입력은 건너뜀)
+                
+            Returns:
+                항목 정보(name, tags, created, updated, size)의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "저장소 기록", vault.put, name, secret, key, tags or (), overwrite,
+                kdf, encoding, mode, compression,
+            )
+        
+        # 저장소 조회 도구
+        @self.mcp.tool()
+        async def vault_get(name: str, key: str) -> CallToolResult:
+            """
+            저장소에서 이름으로 항목 하나를 찾아 복호화
+            
+            Args:
+                name: 항목 이름
+                key: 복호화 키
+                
+            Returns:
+                복호화된 비밀
+            """
+            try:
+                secret = await self.offload.io(vault.get, name, key)
+            except (KeyError, ValueError) as e:
+                message = f"없는 항목입니다: {name}" if isinstance(e, KeyError) else str(e)
+                return CallToolResult(isError=True, content=[TextContent(type="text", text=f"저장소 조회 오류: {message}")])
+            return CallToolResult(content=[TextContent(type="text", text=secret)])
+        
+        # 저장소 목록 도구
+        @self.mcp.tool()
+        async def vault_list(tag: str = "", prefix: str = "") -> CallToolResult:
+            """
+            저장소 항목 정보 목록 (복호화하지 않음)
+            
+            Args:
+                tag: 이 태그가 붙은 항목만
+                prefix: 이름이 이 문자열로 시작하는 항목만
+                
+            Returns:
+                항목 정보 목록의 JSON
+            """
+            return await self.offload.io(self._json_result, "저장소 목록", vault.list, tag or None, prefix or None)
+        
+        # 저장소 삭제 도구
+        @self.mcp.tool()
+        async def vault_delete(name: str) -> CallToolResult:
+            """
+            저장소에서 항목 삭제
+            
+            Args:
+                name: 항목 이름
+                
+            Returns:
+                {"name", "deleted"}의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "저장소 삭제", lambda: {"name": name, "deleted": vault.delete(name)}
+            )
+        
+        # 저장소 가져오기 도구
+        @self.mcp.tool()
+        async def vault_import(path: str, key: str = "", overwrite: bool = True) -> CallToolResult:
+            """
+            JSONL 파일의 항목을 한 트랜잭션으로 가져오기
+            
+            Args:
+                path: JSONL 파일 경로 (줄마다 {"name", "ciphertext" 또는 "secret", "tags"})
+                key: "secret"(평문) 항목을 암호화할 키
+                overwrite: False이면 같은 이름이 있는 항목은 건너뜀
+                
+            Returns:
+                가져온 수, 건너뛴 수, 오류 목록의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "저장소 가져오기", self._vault_import, path, key or None, overwrite
+            )
+        
+        # 저장소 내보내기 도구
+        @self.mcp.tool()
+        async def vault_export(path: str, tag: str = "", prefix: str = "") -> CallToolResult:
+            """
+            항목을 암호문 그대로 JSONL 파일로 내보내기
+            
+            Args:
+                path: 출력 파일 경로
+                tag: 이 태그가 붙은 항목만
+                prefix: 이름이 이 문자열로 시작하는 항목만
+                
+            Returns:
+                {"path", "exported"}의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "저장소 내보내기", self._vault_export, path, tag or None, prefix or None
+            )
+        
+        # 저장소 키 교체 도구
+        @self.mcp.tool()
+        async def vault_rekey(
+            old_key: str,
+            new_key: str,
+            restart: bool = False,
+            kdf: str = DEFAULT_KDF,
+            encoding: str = DEFAULT_ENCODING,
+            mode: str = DEFAULT_MODE,
+            compression: str = DEFAULT_COMPRESSION,
+        ) -> CallToolResult:
+            """
+            저장소의 모든 항목을 새 키로 다시 암호화 (배치마다 진행 위치와 함께 기록, 중단되면 이어서 처리)
+            
+            Args:
+                old_key: 이전 키
+                new_key: 새 키
+                restart: True이면 남아 있는 진행 위치를 무시하고 처음부터
+                kdf: 키 파생 함수 ("pbkdf2" 또는 "scrypt")
+                encoding: 텍스트 인코딩 ("base64" 또는 "base1024")
+                mode: 암호화 모드 ("gcm", "chacha20-poly1305", "cbc" 또는 "siv")
+                compression: 암호화 전 압축 ("none", "zlib", "lzma", "zstd" 또는 "auto", 잘 압축되지 않는 입력은 건너뜀)
+                
+            Returns:
+                교체한 항목 수, 건너뛴 항목 수, 오류 목록의 JSON
+            """
+            return await self.offload.io(
+                self._json_result, "저장소 키 교체", vault.rekey, old_key, new_key, self.workers, REKEY_BATCH_SIZE,
+                restart, kdf, encoding, mode, compression,
+            )
+        
+        # 저장소 자원 (암호문과 정보만 제공, 복호화는 vault_get 도구로)
+        @self.mcp.resource("vault://entries", name="vault_entries", mime_type="application/json")
+        async def vault_entries() -> str:
+            """저장소 항목 정보 목록 (항목마다 vault://entries/{name} 자원 URI 포함)"""
+            return json.dumps(await self.offload.io(self._vault_listing, None), ensure_ascii=False)
+        
+        @self.mcp.resource("vault://entries/{name}", name="vault_entry", mime_type="application/json")
+        async def vault_entry(name: str) -> str:
+            """항목 하나의 암호문과 정보 (이름의 "/" 등은 퍼센트 인코딩)"""
+            return json.dumps(await self.offload.io(vault.record, unquote(name)), ensure_ascii=False)
+        
+        @self.mcp.resource("vault://tags/{tag}", name="vault_tag", mime_type="application/json")
+        async def vault_tag(tag: str) -> str:
+            """태그가 붙은 항목 정보 목록"""
+            return json.dumps(await self.offload.io(self._vault_listing, unquote(tag)), ensure_ascii=False)
+    
+    def _vault_listing(self, tag):
+        """자원 URI를 붙인 저장소 항목 정보 목록"""
+        return [
+            dict(entry, uri=f"vault://entries/{quote(entry['name'], safe='')}") for entry in self.vault.list(tag=tag)
+        ]
+    
+    def _vault_import(self, path, key, overwrite):
+        """JSONL 파일에서 저장소로 가져오기"""
+        with open(path, encoding="utf-8") as f:
+            return self.vault.import_jsonl(f, key, overwrite)
+    
+    def _vault_export(self, path, tag, prefix):
+        """저장소를 JSONL 파일로 내보내기"""
+        with open(path, "w", encoding="utf-8") as f:
+            return {"path": path, "exported": self.vault.export_jsonl(f, tag, prefix)}
+    
+    @staticmethod
+    def _file_summary(file_func, filepath, key, output, options=None):
+        """파일 단위 처리 결과 요약"""
+        output_filepath, size = file_func(filepath, key, output or None, **(options or {}))
+        return {"source_file": filepath, "output_file": output_filepath, "bytes": size}
+    
+    @staticmethod
+    def _range_summary(filepath, key, offset, length):
+        """범위 복호화 결과 요약"""
+        data = decrypt_range(filepath, key, offset, length)
+        try:
+            return {"source_file": filepath, "offset": offset, "bytes": len(data), "text": data.decode("utf-8")}
+        except UnicodeDecodeError:
+            return {
+                "source_file": filepath, "offset": offset, "bytes": len(data),
+                "base64": base64.b64encode(data).decode("ascii"),
+            }
+    
+    @staticmethod
+    def _json_result(label, func, *args):
+        """함수를 실행하고 결과를 JSON 텍스트로 반환"""
+        try:
+            results = func(*args)
+            return CallToolResult(
+                content=[
+                    TextContent(
+                        type="text",
+                        text=json.dumps(results, ensure_ascii=False)
+                    )
+                ]
+            )
+        except Exception as e:
+            return CallToolResult(
+                isError=True,
+                content=[
+                    TextContent(
+                        type="text",
+                        text=f"{label} 오류: {str(e)}"
+                    )
+                ]
+            )
+    
     def run_stdio(self):
         """표준 입출력을 통해 MCP 서버 실행"""
-        self.mcp.run_stdio()
+        try:
+            self.mcp.run(transport="stdio")
+        finally:
+            self.close()
     
     def run_sse(self, host="localhost", port=8000):
         """SSE를 통해 MCP 서버 실행"""
-        self.mcp.run_sse(host=host, port=port) 
\ No newline at end of file
+        self.mcp.settings.host = host
+        self.mcp.settings.port = port
+        try:
+            self.mcp.run(transport="sse")
+        finally:
+            self.close()
+    
+    def close(self):
+        """워커 프로세스 풀과 실행기, 비밀 저장소 정리"""
+        if self.engine:
+            self.engine.close()
+        if self.vault is not None:
+            self.vault.close()
+        self.offload.close() 
\ No newline at end of file
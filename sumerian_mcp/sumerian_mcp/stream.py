@@ -0,0 +1,195 @@
+"""
+레코드 스트림 암호화/복호화 모듈
+
+표준 입력 같은 바이트 스트림에서 구분된 레코드를 읽어 암호화/복호화하고 결과를 입력 순서대로 기록한다
+레코드 하나마다 프로세스를 띄우지 않으므로 비밀번호가 프로세스 목록(argv)에 드러나지 않고, 시작 비용은 한 번만 든다
+
+레코드 형식
+    lines: 줄바꿈(\\n)으로 구분, 실패한 레코드는 빈 줄로 기록
+    nul: NUL(\\0)로 구분 (find -print0, xargs -0과 같은 형식), 실패한 레코드는 빈 레코드로 기록
+    jsonl: 한 줄에 JSON 하나 (문자열 또는 {"text": ..., "id": ...}), 결과는 {"ok", "result"/"error", "id"} 객체
+
+레코드는 batch_size개씩 묶어 배치 단위로 처리하며 (암호화 키 파생은 배치당 한 번),
+워커를 쓰면 최대 workers * PREFETCH개 배치만 처리 중으로 두어 입력이 아무리 커도 메모리 사용량이 일정하다
+"""
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .codec import get_codec
+from .parallel import _run_chunk
+
+FORMATS = ("lines", "nul", "jsonl")
+
+# 배치당 레코드 수
+DEFAULT_BATCH_SIZE = 1024
+
+# 워커당 처리 중으로 둘 배치 수
+PREFETCH = 2
+
+# nul 형식에서 한 번에 읽을 바이트 수
+READ_SIZE = 1024 * 1024
+
+_SEPARATORS = {"lines": b"\n", "nul": b"\0", "jsonl": b"\n"}
+
+
+def read_records(src, fmt="lines"):
+    """
+    바이트 스트림에서 레코드를 하나씩 읽음
+
+    Yields:
+        구분자를 뺀 레코드 바이트열 (마지막 레코드는 구분자로 끝나지 않아도 됨)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"알 수 없는 레코드 형식: {fmt} (사용 가능: {', '.join(FORMATS)})")
+    if fmt != "nul":
+        for line in src:
+            yield line[:-1] if line.endswith(b"\n") else line
+        return
+
+    pending = b""
+    while True:
+        block = src.read(READ_SIZE)
+        if not block:
+            break
+        records = (pending + block).split(b"\0")
+        pending = records.pop()
+        yield from records
+    if pending:
+        yield pending
+
+
+def _decode(fmt, record):
+    """
+    레코드 바이트열을 (처리할 문자열, jsonl id) 쌍으로 변환
+
+    Raises:
+        ValueError: UTF-8이 아니거나 jsonl 레코드가 문자열/text 객체가 아닌 경우
+    """
+    text = record.decode("utf-8")
+    if fmt != "jsonl":
+        return text, None
+    value = json.loads(text)
+    if isinstance(value, str):
+        return value, None
+    if isinstance(value, dict) and isinstance(value.get("text"), str):
+        return value["text"], value.get("id")
+    raise ValueError('jsonl 레코드는 문자열이거나 "text" 문자열 항목이 있는 객체여야 합니다')
+
+
+def _encode(fmt, result, record_id):
+    """결과 하나를 출력 레코드 바이트열로 변환 (구분자 포함)"""
+    if fmt == "jsonl":
+        if record_id is not None:
+            result = dict(result, id=record_id)
+        return json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n"
+    separator = _SEPARATORS[fmt]
+    if not result["ok"]:
+        return separator
+    data = result["result"].encode("utf-8")
+    if separator in data:
+        # 복호화 결과에 구분자가 들어 있으면 레코드 경계가 깨지므로 실패로 처리
+        result.update(ok=False, error="결과에 레코드 구분자가 포함되어 이 형식으로 기록할 수 없습니다 (jsonl 형식 사용)")
+        del result["result"]
+        return separator
+    return data + separator
+
+
+class StreamReport:
+    """스트림 처리 결과 집계"""
+
+    def __init__(self):
+        self.records = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+
+def process_stream(src, dst, operation, key, fmt="lines", workers=1, batch_size=DEFAULT_BATCH_SIZE,
+                   codec="sumerian", on_error=None, **options):
+    """
+    src의 레코드를 암호화/복호화하여 입력 순서대로 dst에 기록
+
+    Args:
+        src: 읽기용 바이너리 스트림 (예: sys.stdin.buffer)
+        dst: 쓰기용 바이너리 스트림 (예: sys.stdout.buffer), 배치마다 flush
+        operation: "encrypt" 또는 "decrypt"
+        key: 암호화 키
+        fmt: 레코드 형식 ("lines", "nul", "jsonl")
+        workers: 워커 프로세스 수 (1이면 현재 프로세스에서 처리)
+        batch_size: 배치당 레코드 수 (대화형 파이프에서는 1로 두면 레코드마다 바로 응답)
+        codec: 코덱 이름
+        on_error: 실패한 레코드마다 (1부터 센 레코드 번호, 오류 메시지)로 호출할 함수
+        **options: 암호화 옵션 (kdf, encoding, mode, compression)
+
+    Returns:
+        StreamReport
+    """
+    if operation not in ("encrypt", "decrypt"):
+        raise ValueError(f"알 수 없는 작업: {operation} (사용 가능: encrypt, decrypt)")
+    if fmt not in FORMATS:
+        raise ValueError(f"알 수 없는 레코드 형식: {fmt} (사용 가능: {', '.join(FORMATS)})")
+    if batch_size < 1:
+        raise ValueError("batch_size는 1 이상이어야 합니다")
+    codec = get_codec(codec)
+    options = options if operation == "encrypt" else None
+    report = StreamReport()
+    records = read_records(src, fmt)
+
+    def batches():
+        """(항목별 디코딩 결과 목록, 처리할 문자열 목록) 배치"""
+        while True:
+            chunk = list(islice(records, batch_size))
+            if not chunk:
+                return
+            decoded = []
+            texts = []
+            for record in chunk:
+                report.bytes_in += len(record)
+                try:
+                    text, record_id = _decode(fmt, record)
+                except ValueError as e:
+                    decoded.append((False, f"입력 오류: {e}", None))
+                    continue
+                decoded.append((True, len(texts), record_id))
+                texts.append(text)
+            yield decoded, texts
+
+    def emit(decoded, results):
+        """배치 결과를 입력 순서대로 기록"""
+        out = []
+        for ok, value, record_id in decoded:
+            result = results[value] if ok else {"ok": False, "error": value}
+            out.append(_encode(fmt, result, record_id))
+            report.records += 1
+            if not result["ok"]:
+                report.failed += 1
+                if on_error is not None:
+                    on_error(report.records, result["error"])
+        dst.write(b"".join(out))
+        dst.flush()
+
+    if workers <= 1:
+        for decoded, texts in batches():
+            emit(decoded, _run_chunk(operation, key, codec, texts, options)[1] if texts else [])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+
+            def drain():
+                decoded, future = pending.popleft()
+                emit(decoded, future.result()[1] if future is not None else [])
+
+            for decoded, texts in batches():
+                future = pool.submit(_run_chunk, operation, key, codec, texts, options) if texts else None
+                pending.append((decoded, future))
+                if len(pending) >= workers * PREFETCH:
+                    drain()
+            while pending:
+                drain()
+
+    report.seconds = time.perf_counter() - report.started
+    return report
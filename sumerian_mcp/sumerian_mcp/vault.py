@@ -0,0 +1,415 @@
+"""
+로컬 암호화 비밀 저장소(vault) 모듈
+
+이름이 붙은 비밀을 기존 암호화 파이프라인(encrypt_password)으로 암호화해 SQLite 파일에 저장한다
+이름은 기본 키이고 태그는 (태그, 이름) 색인에 두므로, 이름/태그/이름 접두사 조회는 관련 없는 항목을 읽거나 복호화하지 않는다
+저장소에는 암호문만 기록되며 키는 호출마다 받는다 (항목마다 다른 키를 써도 됨)
+
+내보내기/가져오기 형식은 한 줄에 항목 하나인 JSONL이다
+    {"name": ..., "ciphertext": ..., "tags": [...], "created": ..., "updated": ...}
+가져올 때 "ciphertext" 대신 "secret"(평문)을 주면 키로 암호화해 저장한다
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from .crypto import decrypt_batch, decrypt_password, encrypt_batch, encrypt_password
+from .envelope import DEFAULT_COMPRESSION, DEFAULT_ENCODING, DEFAULT_MODE
+from .kdf import DEFAULT_KDF
+from .rekey import key_fingerprint
+
+VAULT_ENV = "SUMERIAN_VAULT"
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    ciphertext TEXT NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    name TEXT NOT NULL REFERENCES entries(name) ON DELETE CASCADE,
+    PRIMARY KEY (tag, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_by_name ON tags(name);
+CREATE TABLE IF NOT EXISTS rekey_progress (
+    target TEXT PRIMARY KEY,
+    cursor TEXT NOT NULL
+);
+"""
+
+# 키 교체 때 한 트랜잭션으로 다시 암호화해 기록할 항목 수
+REKEY_BATCH_SIZE = 1024
+
+# 항목 하나 조회 (기본 키 색인)
+_SELECT_ENTRY = "SELECT name, ciphertext, created, updated FROM entries WHERE name = ?"
+
+# 태그 목록은 항목마다 tags_by_name 색인으로 모음
+_ENTRY_TAGS = "(SELECT group_concat(tag, char(0)) FROM tags WHERE tags.name = entries.name)"
+
+
+def default_vault_path():
+    """저장소 경로 (SUMERIAN_VAULT 환경 변수, 없으면 ~/.local/share/sumerian-mcp/vault.db)"""
+    path = os.environ.get(VAULT_ENV)
+    if path:
+        return path
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(data_home, "sumerian-mcp", "vault.db")
+
+
+def _check_name(name):
+    """항목 이름 검사 (비어 있지 않은 문자열)"""
+    if not isinstance(name, str) or not name:
+        raise ValueError("항목 이름은 비어 있지 않은 문자열이어야 합니다")
+    return name
+
+
+def _check_tags(tags):
+    """태그 목록 검사 및 중복 제거 (순서 유지)"""
+    if isinstance(tags, str) or not all(isinstance(tag, str) and tag for tag in tags):
+        raise ValueError("태그는 비어 있지 않은 문자열 목록이어야 합니다")
+    return list(dict.fromkeys(tags))
+
+
+def _prefix_end(prefix):
+    """접두사 범위 검색의 상한 (prefix <= name < 상한)"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SecretVault:
+    """
+    SQLite 기반 암호화 비밀 저장소
+
+    연결 하나를 잠금으로 보호해 여러 스레드(MCP 서버의 I/O 실행기)에서 함께 쓸 수 있다.
+    암호화/복호화는 잠금 밖에서 수행하므로 느린 키 파생이 다른 조회를 막지 않는다.
+    """
+
+    def __init__(self, path=None):
+        """
+        저장소 열기 (없으면 소유자 전용 권한(0600)으로 생성)
+
+        Args:
+            path: SQLite 파일 경로 (기본값: default_vault_path(), ":memory:"이면 메모리에만 저장)
+        """
+        self.path = path or default_vault_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # SQLite가 만드는 -wal/-shm 파일은 데이터베이스 파일의 권한을 따름
+            os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self._conn.close()
+            raise ValueError(f"지원하지 않는 저장소 버전: {version}")
+        with self._transaction() as conn:
+            # executescript()는 진행 중인 트랜잭션을 먼저 커밋하므로 문장별로 실행
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @contextmanager
+    def _transaction(self):
+        """잠금을 잡고 BEGIN IMMEDIATE ... COMMIT (예외가 나면 ROLLBACK)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _write(self, conn, name, ciphertext, tags, overwrite, created=None, updated=None):
+        """항목 하나 기록 (트랜잭션 안에서 호출), 기록했으면 True"""
+        now = time.time()
+        if not overwrite and conn.execute("SELECT 1 FROM entries WHERE name = ?", (name,)).fetchone():
+            return False
+        conn.execute(
+            "INSERT INTO entries (name, ciphertext, created, updated) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET ciphertext = excluded.ciphertext, updated = excluded.updated",
+            (name, ciphertext, created or now, updated or now),
+        )
+        conn.execute("DELETE FROM tags WHERE name = ?", (name,))
+        conn.executemany("INSERT INTO tags (tag, name) VALUES (?, ?)", [(tag, name) for tag in tags])
+        return True
+
+    def put(self, name, secret, key, tags=(), overwrite=True, kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING,
+            mode=DEFAULT_MODE, compression=DEFAULT_COMPRESSION):
+        """
+        비밀을 암호화해 저장 (같은 이름이 있으면 암호문과 태그를 바꾸고 생성 시각은 유지)
+
+        Returns:
+            항목 정보 (name, tags, created, updated, size)
+
+        Raises:
+            ValueError: 이름/태그가 잘못되었거나, overwrite=False인데 같은 이름이 있는 경우
+        """
+        name = _check_name(name)
+        tags = _check_tags(tags)
+        ciphertext = encrypt_password(secret, key, kdf=kdf, encoding=encoding, mode=mode, compression=compression)
+        with self._transaction() as conn:
+            if not self._write(conn, name, ciphertext, tags, overwrite):
+                raise ValueError(f"이미 있는 항목입니다: {name}")
+        return self.info(name)
+
+    def record(self, name):
+        """
+        항목의 암호문과 정보 (복호화하지 않음)
+
+        Raises:
+            KeyError: 항목이 없는 경우
+        """
+        with self._lock:
+            row = self._conn.execute(_SELECT_ENTRY, (name,)).fetchone()
+            if row is None:
+                raise KeyError(name)
+            tags = [tag for (tag,) in self._conn.execute("SELECT tag FROM tags WHERE name = ? ORDER BY tag", (name,))]
+        return {"name": row[0], "ciphertext": row[1], "tags": tags, "created": row[2], "updated": row[3]}
+
+    def info(self, name):
+        """항목 정보 (name, tags, created, updated, size), 암호문 제외"""
+        record = self.record(name)
+        record["size"] = len(record.pop("ciphertext"))
+        return record
+
+    def get(self, name, key):
+        """
+        항목 하나를 복호화 (다른 항목은 읽지 않음)
+
+        Raises:
+            KeyError: 항목이 없는 경우
+            ValueError: 키가 잘못되었거나 암호문이 손상된 경우
+        """
+        secret = decrypt_password(self.record(name)["ciphertext"], key)
+        if secret is None:
+            raise ValueError(f"복호화 실패: 키가 잘못되었거나 항목이 손상되었습니다: {name}")
+        return secret
+
+    def delete(self, name):
+        """항목 삭제 (태그도 함께), 있었으면 True"""
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM entries WHERE name = ?", (name,)).rowcount > 0
+
+    def _select(self, columns, tag=None, prefix=None):
+        """태그/이름 접두사로 고른 항목 행 (이름 순), 조건은 모두 색인으로 처리"""
+        query = f"SELECT {columns}, {_ENTRY_TAGS} FROM entries"
+        conditions = []
+        params = []
+        if tag is not None:
+            conditions.append("name IN (SELECT name FROM tags WHERE tag = ?)")
+            params.append(tag)
+        if prefix:
+            conditions.append("name >= ? AND name < ?")
+            params += [prefix, _prefix_end(prefix)]
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            return self._conn.execute(query + " ORDER BY name", params).fetchall()
+
+    def list(self, tag=None, prefix=None):
+        """
+        항목 정보 목록 (복호화하지 않음)
+
+        Args:
+            tag: 이 태그가 붙은 항목만
+            prefix: 이름이 이 문자열로 시작하는 항목만
+        """
+        return [
+            {"name": name, "tags": sorted(tags.split("\0")) if tags else [], "created": created,
+             "updated": updated, "size": size}
+            for name, created, updated, size, tags in self._select(
+                "name, created, updated, length(ciphertext)", tag, prefix
+            )
+        ]
+
+    def tags(self):
+        """태그별 항목 수"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT tag, count(*) FROM tags GROUP BY tag ORDER BY tag"))
+
+    def export_jsonl(self, dst, tag=None, prefix=None):
+        """
+        항목을 암호문 그대로 JSONL로 기록 (키 없이 옮길 수 있음)
+
+        Args:
+            dst: 쓰기용 텍스트 스트림
+
+        Returns:
+            기록한 항목 수
+        """
+        count = 0
+        for name, ciphertext, created, updated, tags in self._select("name, ciphertext, created, updated", tag, prefix):
+            record = {"name": name, "ciphertext": ciphertext, "tags": sorted(tags.split("\0")) if tags else [],
+                      "created": created, "updated": updated}
+            dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+        return count
+
+    def import_records(self, records, key=None, overwrite=True, kdf=DEFAULT_KDF, encoding=DEFAULT_ENCODING,
+                       mode=DEFAULT_MODE, compression=DEFAULT_COMPRESSION):
+        """
+        항목을 한 트랜잭션으로 가져오기
+
+        Args:
+            records: {"name", "ciphertext" 또는 "secret", "tags"(선택)} 딕셔너리들
+            key: "secret" 항목을 암호화할 키
+            overwrite: False이면 같은 이름이 있는 항목은 건너뜀
+
+        Returns:
+            {"imported", "skipped", "errors": [{"index": 1부터 센 번호, "error"}]}
+        """
+        prepared = []
+        errors = []
+        for index, record in enumerate(records, 1):
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError("항목은 JSON 객체여야 합니다")
+                name = _check_name(record.get("name"))
+                tags = _check_tags(record.get("tags") or [])
+                if isinstance(record.get("ciphertext"), str):
+                    ciphertext = record["ciphertext"]
+                elif isinstance(record.get("secret"), str):
+                    if key is None:
+                        raise ValueError('"secret" 항목을 가져오려면 키가 필요합니다')
+                    ciphertext = encrypt_password(
+                        record["secret"], key, kdf=kdf, encoding=encoding, mode=mode, compression=compression
+                    )
+                else:
+                    raise ValueError('"ciphertext" 또는 "secret" 문자열이 필요합니다')
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            prepared.append((name, ciphertext, tags, record.get("created"), record.get("updated")))
+
+        imported = 0
+        with self._transaction() as conn:
+            for name, ciphertext, tags, created, updated in prepared:
+                imported += self._write(conn, name, ciphertext, tags, overwrite, created, updated)
+        return {"imported": imported, "skipped": len(prepared) - imported, "errors": errors}
+
+    def import_jsonl(self, src, key=None, overwrite=True, **options):
+        """JSONL 텍스트 스트림에서 가져오기 (빈 줄 무시, 줄 번호로 오류 보고)"""
+        records = []
+        errors = []
+        for number, line in enumerate(src, 1):
+            if not line.strip():
+                continue
+            try:
+                records.append((number, json.loads(line)))
+            except ValueError as e:
+                errors.append({"index": number, "error": f"JSON 오류: {e}"})
+        report = self.import_records([record for _, record in records], key, overwrite, **options)
+        # import_records는 넘겨받은 순서로 번호를 매기므로 원래 줄 번호로 바꿈
+        for error in report["errors"]:
+            error["index"] = records[error["index"] - 1][0]
+        report["errors"] = sorted(errors + report["errors"], key=lambda error: error["index"])
+        return report
+
+    def rekey(self, old_key, new_key, workers=1, batch_size=REKEY_BATCH_SIZE, restart=False, kdf=DEFAULT_KDF,
+              encoding=DEFAULT_ENCODING, mode=DEFAULT_MODE, compression=DEFAULT_COMPRESSION):
+        """
+        모든 항목을 새 키로 다시 암호화
+
+        이름 순으로 batch_size개씩 복호화/암호화하고, 배치 결과와 진행 위치(마지막 이름)를 한 트랜잭션으로 기록한다.
+        중단되면 다음 실행이 기록된 위치 다음부터 이어서 처리하며, 끝까지 훑으면 진행 위치를 지운다.
+        배치를 읽은 뒤 다른 호출이 바꾼 항목은 덮어쓰지 않는다.
+
+        Args:
+            old_key: 이전 키
+            new_key: 새 키
+            workers: 워커 프로세스 수 (1이면 현재 프로세스에서 처리)
+            batch_size: 한 트랜잭션에 기록할 항목 수
+            restart: True이면 기록된 진행 위치를 무시하고 처음부터
+
+        Returns:
+            {"entries", "skipped", "resumed_after": 이어서 시작한 위치, "seconds", "errors": [{"name", "error"}]}
+
+        Raises:
+            ValueError: 진행 위치가 다른 새 키로 시작된 작업인 경우
+        """
+        started = time.perf_counter()
+        target = key_fingerprint(new_key)
+        with self._transaction() as conn:
+            if restart:
+                conn.execute("DELETE FROM rekey_progress")
+            elif conn.execute("SELECT 1 FROM rekey_progress WHERE target != ?", (target,)).fetchone():
+                raise ValueError("다른 새 키로 시작된 키 교체가 남아 있습니다 (처음부터 다시 하려면 restart)")
+            row = conn.execute("SELECT cursor FROM rekey_progress WHERE target = ?", (target,)).fetchone()
+        cursor = row[0] if row else ""
+        summary = {"entries": 0, "skipped": 0, "resumed_after": cursor or None, "seconds": 0.0, "errors": []}
+
+        engine = None
+        if workers > 1:
+            from .parallel import ParallelCryptoEngine
+            engine = ParallelCryptoEngine(workers=workers)
+        decrypt = engine.decrypt_batch if engine else decrypt_batch
+        encrypt = engine.encrypt_batch if engine else encrypt_batch
+        try:
+            while True:
+                with self._lock:
+                    rows = self._conn.execute(
+                        "SELECT name, ciphertext FROM entries WHERE name > ? ORDER BY name LIMIT ?", (cursor, batch_size)
+                    ).fetchall()
+                if not rows:
+                    break
+                decrypted = decrypt([ciphertext for _, ciphertext in rows], old_key)
+                opened = [(row, result["result"]) for row, result in zip(rows, decrypted) if result["ok"]]
+                for (name, ciphertext), result in zip(rows, decrypted):
+                    if result["ok"]:
+                        continue
+                    if decrypt_password(ciphertext, new_key) is not None:
+                        summary["skipped"] += 1
+                    else:
+                        summary["errors"].append({"name": name, "error": result["error"]})
+                encrypted = encrypt(
+                    [secret for _, secret in opened], new_key, kdf=kdf, encoding=encoding, mode=mode,
+                    compression=compression,
+                )
+
+                now = time.time()
+                cursor = rows[-1][0]
+                with self._transaction() as conn:
+                    for ((name, ciphertext), _), result in zip(opened, encrypted):
+                        if not result["ok"]:
+                            summary["errors"].append({"name": name, "error": result["error"]})
+                            continue
+                        summary["entries"] += conn.execute(
+                            "UPDATE entries SET ciphertext = ?, updated = ? WHERE name = ? AND ciphertext = ?",
+                            (result["result"], now, name, ciphertext),
+                        ).rowcount
+                    conn.execute("INSERT OR REPLACE INTO rekey_progress (target, cursor) VALUES (?, ?)", (target, cursor))
+        finally:
+            if engine:
+                engine.close()
+
+        # 실패한 항목은 다시 실행할 때 처음부터 훑으며 재시도 (이미 새 키인 항목은 건너뜀)
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM rekey_progress")
+        summary["seconds"] = time.perf_counter() - started
+        return summary
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        """연결 닫기"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,70 @@
+"""
+Base1024 쐐기문자 인코딩 테스트
+"""
+import io
+import os
+import unittest
+from sumerian_mcp import base1024
+from sumerian_mcp.crypto import decrypt_batch, decrypt_password, encrypt_batch, encrypt_password
+from sumerian_mcp.envelope import BASE1024_MARKER
+from sumerian_mcp.files import decrypt_stream, encrypt_stream
+
+
+class TestBase1024(unittest.TestCase):
+    """Base1024 인코딩 테스트 케이스"""
+
+    def test_alphabet(self):
+        """알파벳이 서로 다른 1024개의 쐐기문자로 구성되는지 테스트"""
+        self.assertEqual(1024, len(set(base1024.ALPHABET)))
+        self.assertNotIn(base1024.PAD_SIGN, base1024.ALPHABET)
+        self.assertNotIn(BASE1024_MARKER, base1024.ALPHABET)
+
+    def test_roundtrip_all_tail_lengths(self):
+        """마지막 묶음 길이(0~4바이트)와 관계없이 복원되는지 테스트"""
+        for size in list(range(0, 41)) + [4096, 4099]:
+            data = os.urandom(size)
+            encoded = base1024.encode(data)
+            self.assertEqual(data, base1024.decode(encoded))
+            self.assertEqual(4 * (size // 5) + size % 5 + (size % 5 == 4), len(encoded))
+
+    def test_bit_order(self):
+        """10비트 단위 인덱스를 큰 자리부터 차례대로 변환하는지 테스트"""
+        data = bytes(range(256)) * 5
+        bits = "".join(f"{byte:08b}" for byte in data)
+        expected = "".join(base1024.ALPHABET[int(bits[i:i + 10], 2)] for i in range(0, len(bits), 10))
+        self.assertEqual(expected, base1024.encode(data))
+
+    def test_rejects_invalid_text(self):
+        """알파벳 밖의 문자, 잘못된 채움 문자, 비정규 인코딩을 거부하는지 테스트"""
+        last = base1024.ALPHABET[-1]
+        for text in ("A", "𒀀𒀀𒀀𒀀𒌃A", base1024.PAD_SIGN, last + base1024.PAD_SIGN, last):
+            with self.assertRaises(ValueError):
+                base1024.decode(text)
+
+    def test_password_roundtrip(self):
+        """표식으로 인코딩을 자동 판별해 복호화하고 출력이 짧아지는지 테스트"""
+        password = "compact payload " * 8
+        encrypted = encrypt_password(password, "b1024_key", encoding="base1024")
+        self.assertTrue(encrypted.startswith(BASE1024_MARKER))
+        self.assertEqual(password, decrypt_password(encrypted, "b1024_key"))
+        self.assertIsNone(decrypt_password(encrypted, "wrong_key"))
+        self.assertLess(len(encrypted), 0.65 * len(encrypt_password(password, "b1024_key")))
+
+        results = encrypt_batch(["a", "b"], "b1024_key", encoding="base1024")
+        decrypted = decrypt_batch([item["result"] for item in results], "b1024_key")
+        self.assertEqual(["a", "b"], [item["result"] for item in decrypted])
+
+    def test_stream_roundtrip(self):
+        """블록 경계와 채움 문자 위치에 관계없이 스트림이 복원되는지 테스트"""
+        for size in (0, 3, 16, 79, 80, 81, 1000):
+            data = os.urandom(size)
+            encrypted = io.BytesIO()
+            encrypt_stream(io.BytesIO(data), encrypted, "b1024_key", chunk_size=48, encoding="base1024")
+            for chunk_size in (7, 48, 4096):
+                decrypted = io.BytesIO()
+                decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, "b1024_key", chunk_size=chunk_size)
+                self.assertEqual(data, decrypted.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+바이트 버퍼 암호화 API 테스트
+"""
+import array
+import mmap
+import os
+import tempfile
+import unittest
+from sumerian_mcp.crypto import (
+    decrypt_bytes,
+    decrypted_size,
+    encrypt_bytes,
+    encrypted_size,
+    pad,
+    unpad,
+)
+from sumerian_mcp.modes import MODES
+
+
+class TestBytes(unittest.TestCase):
+    """encrypt_bytes/decrypt_bytes 테스트 케이스"""
+
+    def test_buffer_types(self):
+        """bytes, bytearray, memoryview, array, mmap 입력을 모두 처리하는지 테스트"""
+        data = os.urandom(1000)
+        buffers = [data, bytearray(data), memoryview(data)[100:900], array.array("H", data)]
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                buffers.append(mapped)
+                for buffer in buffers:
+                    expected = bytes(memoryview(buffer).cast("B"))
+                    self.assertEqual(expected, decrypt_bytes(encrypt_bytes(buffer, "bytes_key"), "bytes_key"))
+
+    def test_output_buffer(self):
+        """호출자가 준 출력 버퍼에 기록하고 기록한 길이를 반환하는지 테스트"""
+        for mode in MODES:
+            for size in (0, 1, 15, 16, 17, 4096):
+                data = os.urandom(size)
+                out = bytearray(encrypted_size(size, mode))
+                written = encrypt_bytes(data, "bytes_key", mode=mode, out=out)
+                self.assertEqual(len(out), written)
+
+                plain = bytearray(decrypted_size(out))
+                n = decrypt_bytes(memoryview(out), "bytes_key", out=plain)
+                self.assertEqual(data, plain[:n])
+
+        with self.assertRaises(ValueError):
+            encrypt_bytes(b"x" * 100, "bytes_key", out=bytearray(10))
+
+    def test_rejects_wrong_key_and_tampering(self):
+        """잘못된 키와 변조를 ValueError로 거부하고 출력 버퍼를 지우는지 테스트"""
+        sealed = encrypt_bytes(b"secret payload", "bytes_key")
+        with self.assertRaisesRegex(ValueError, "키가 일치하지 않습니다"):
+            decrypt_bytes(sealed, "wrong_key")
+
+        sealed[-1] ^= 1
+        out = bytearray(decrypted_size(sealed))
+        with self.assertRaises(ValueError):
+            decrypt_bytes(sealed, "bytes_key", out=out)
+        self.assertEqual(bytes(len(out)), out)
+
+    def test_byte_padding(self):
+        """PKCS7 패딩이 문자 수가 아닌 UTF-8 바이트 수 기준인지 테스트"""
+        for text in ("", "ascii", "한글 비밀번호", "𒀀" * 5):
+            padded = pad(text)
+            self.assertEqual(0, len(padded.encode("utf-8")) % 16)
+            self.assertEqual(text, unpad(padded))
+            encrypted = encrypt_bytes(text.encode("utf-8"), "bytes_key", mode="cbc")
+            self.assertEqual(text, decrypt_bytes(encrypted, "bytes_key").decode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+압축 단계 테스트
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from sumerian_mcp import base1024
+from sumerian_mcp.compression import (
+    COMPRESSION_LZMA,
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    STREAM_MAX_OUTPUT,
+    available_compressions,
+    compress,
+    decompress,
+    decompressor,
+    header_compression,
+    worth_compressing,
+)
+from sumerian_mcp.crypto import decrypt_bytes, decrypt_password, encrypt_batch, encrypt_password
+from sumerian_mcp.envelope import COMPRESSIONS, parse_header, split_marker
+from sumerian_mcp.files import decrypt_file, decrypt_stream, encrypt_dir, encrypt_file, encrypt_stream
+from sumerian_mcp.modes import MODES
+
+# 잘 압축되는 JSON 레코드
+RECORDS = json.dumps([{"id": i, "user": f"user{i}", "active": i % 3 == 0} for i in range(5000)])
+
+
+def envelope_compression(encrypted):
+    """base1024 암호문 헤더에 기록된 압축 식별자"""
+    _, body = split_marker(encrypted)
+    return header_compression(parse_header(base1024.decode(body)).flags)
+
+
+class TestCompression(unittest.TestCase):
+    """압축 단계 테스트 케이스"""
+
+    def setUp(self):
+        self.compressions = [name for name in available_compressions() if name != "none"]
+
+    def test_password_roundtrip(self):
+        """알고리즘마다 압축해 암호화하고 헤더에 기록하며, 결과가 훨씬 짧은지 테스트"""
+        plain = encrypt_password(RECORDS, "k", encoding="base1024")
+        for name in self.compressions:
+            encrypted = encrypt_password(RECORDS, "k", encoding="base1024", compression=name)
+            self.assertEqual(COMPRESSIONS[name], envelope_compression(encrypted))
+            self.assertLess(len(encrypted) * 5, len(plain))
+            self.assertEqual(RECORDS, decrypt_password(encrypted, "k"))
+        self.assertEqual(COMPRESSION_NONE, envelope_compression(plain))
+        auto = encrypt_password(RECORDS, "k", encoding="base1024", compression="auto")
+        self.assertNotEqual(COMPRESSION_NONE, envelope_compression(auto))
+
+    def test_incompressible_input_is_stored(self):
+        """무작위 데이터와 짧은 입력은 압축하지 않는지 테스트"""
+        self.assertFalse(worth_compressing(os.urandom(4000)))
+        self.assertFalse(worth_compressing(os.urandom(100000)))
+        self.assertFalse(worth_compressing(b"short"))
+        self.assertTrue(worth_compressing(RECORDS.encode()))
+        encrypted = encrypt_password("short", "k", encoding="base1024", compression="zlib")
+        self.assertEqual(COMPRESSION_NONE, envelope_compression(encrypted))
+        self.assertEqual("short", decrypt_password(encrypted, "k"))
+
+    def test_batch_and_modes(self):
+        """일괄 암호화와 모든 모드에서 항목마다 압축 여부를 정하고 복호화되는지 테스트"""
+        for mode in MODES:
+            results = encrypt_batch([RECORDS, "short", ""], "k", encoding="base1024", mode=mode, compression="zlib")
+            flags = [envelope_compression(result["result"]) for result in results]
+            self.assertEqual([COMPRESSION_ZLIB, COMPRESSION_NONE, COMPRESSION_NONE], flags, mode)
+            self.assertEqual([RECORDS, "short", ""], [decrypt_password(result["result"], "k") for result in results])
+
+    def test_stream_roundtrip(self):
+        """블록 경계를 넘는 스트림을 모든 모드와 알고리즘에서 압축해 암호화하고 복호화하는지 테스트"""
+        data = RECORDS.encode() * 3
+        for mode in MODES:
+            for name in self.compressions:
+                for encoding in ("base64", "base1024"):
+                    encrypted = io.BytesIO()
+                    size = encrypt_stream(io.BytesIO(data), encrypted, "k", chunk_size=4800, mode=mode,
+                                          encoding=encoding, compression=name)
+                    self.assertEqual(len(data), size)
+                    self.assertLess(len(encrypted.getvalue()), len(data))
+                    decrypted = io.BytesIO()
+                    self.assertEqual(len(data), decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, "k"))
+                    self.assertEqual(data, decrypted.getvalue(), (mode, name, encoding))
+
+        # 첫 블록이 잘 압축되지 않으면 스트림 전체를 압축하지 않음
+        noise = os.urandom(10000)
+        encrypted = io.BytesIO()
+        encrypt_stream(io.BytesIO(noise), encrypted, "k", encoding="base1024", compression="zlib")
+        self.assertEqual(COMPRESSION_NONE, envelope_compression(encrypted.getvalue().decode()))
+
+    def test_files(self):
+        """파일/디렉토리 도구가 압축을 전달하고 컨테이너에는 압축을 거부하는지 테스트"""
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, "src")
+            os.makedirs(src)
+            path = os.path.join(src, "records.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(RECORDS)
+            output, size = encrypt_file(path, "k", os.path.join(root, "a.sumerian"), compression="zlib")
+            self.assertLess(os.path.getsize(output), size)
+            restored, _ = decrypt_file(output, "k", os.path.join(root, "a.json"))
+            with open(restored, encoding="utf-8") as f:
+                self.assertEqual(RECORDS, f.read())
+            with self.assertRaises(ValueError):
+                encrypt_file(path, "k", container=True, compression="zlib")
+
+            report = encrypt_dir(src, os.path.join(root, "out"), "k", compression="auto")
+            self.assertEqual((1, []), (report["files"], report["errors"]))
+            with self.assertRaises(ValueError):
+                encrypt_dir(src, os.path.join(root, "out"), "k", compression="brotli")
+
+    def test_corrupt_compressed_data(self):
+        """잘렸거나 제한보다 크게 풀리는 압축 데이터는 ValueError인지 테스트"""
+        packed = compress(COMPRESSION_ZLIB, RECORDS.encode())
+        self.assertEqual(RECORDS.encode(), decompress(COMPRESSION_ZLIB, packed))
+        with self.assertRaises(ValueError):
+            decompress(COMPRESSION_ZLIB, packed[:-10])
+        with self.assertRaises(ValueError):
+            decompress(COMPRESSION_ZLIB, packed, max_size=1000)
+        with self.assertRaises(ValueError):
+            decompress(COMPRESSION_ZLIB, b"not zlib")
+
+        # decrypt_bytes에 출력 버퍼를 주면 압축을 푼 길이가 들어가야 함
+        encrypted = encrypt_password(RECORDS, "k", encoding="base1024", compression="zlib")
+        envelope = base1024.decode(split_marker(encrypted)[1])
+        out = bytearray(len(RECORDS))
+        self.assertEqual(len(RECORDS), decrypt_bytes(envelope, "k", out=out))
+        self.assertEqual(RECORDS.encode(), bytes(out))
+        with self.assertRaises(ValueError):
+            decrypt_bytes(envelope, "k", out=bytearray(100))
+
+    def test_stream_decompression_bomb(self):
+        """작은 블록이 크게 풀려도 스트림 해제는 STREAM_MAX_OUTPUT 이하 조각으로 나눠 기록하는지 테스트"""
+        size = 20 * STREAM_MAX_OUTPUT
+        for cid in (COMPRESSION_ZLIB, COMPRESSION_LZMA):
+            bomb = compress(cid, bytes(size))
+            self.assertLess(len(bomb), 100000)
+            unpacker = decompressor(cid)
+            pieces = [len(piece) for piece in unpacker.chunks(bomb)]
+            self.assertTrue(unpacker.eof)
+            self.assertEqual(size, sum(pieces))
+            self.assertLessEqual(max(pieces), STREAM_MAX_OUTPUT)
+            with self.assertRaises(ValueError):
+                list(decompressor(cid).chunks(bomb + b"trailing"))
+
+        class Recorder(io.RawIOBase):
+            """기록 호출마다 크기만 남기는 출력 스트림"""
+
+            def __init__(self):
+                self.sizes = []
+
+            def writable(self):
+                return True
+
+            def write(self, data):
+                self.sizes.append(len(data))
+                return len(data)
+
+        encrypted = io.BytesIO()
+        encrypt_stream(io.BytesIO(bytes(size)), encrypted, "k", encoding="base1024", compression="zlib")
+        self.assertLess(len(encrypted.getvalue()), size // 100)
+        recorder = Recorder()
+        self.assertEqual(size, decrypt_stream(io.BytesIO(encrypted.getvalue()), recorder, "k"))
+        self.assertLessEqual(max(recorder.sizes), STREAM_MAX_OUTPUT)
+
+    def test_unknown_compression(self):
+        """알 수 없는 압축 이름은 ValueError인지 테스트"""
+        with self.assertRaises(ValueError):
+            encrypt_password("x", "k", compression="brotli")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+임의 접근 컨테이너 테스트
+"""
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sumerian_mcp import container
+from sumerian_mcp.container import ContainerReader, decrypt_range, encrypt_container
+from sumerian_mcp.files import decrypt_file, encrypt_file
+from sumerian_mcp.modes import unseal_into
+
+
+class TestContainer(unittest.TestCase):
+    """컨테이너 형식 테스트 케이스"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, data, chunk_size=1000, mode="gcm"):
+        """데이터를 컨테이너 파일로 암호화한 경로"""
+        path = os.path.join(self.root, "data.sumerian")
+        with open(path, "wb") as dst:
+            encrypt_container(io.BytesIO(data), dst, "range_key", chunk_size=chunk_size, mode=mode)
+        return path
+
+    def test_ranges(self):
+        """청크 경계를 걸치는 범위, 음수 오프셋, 범위 밖 요청 테스트"""
+        data = os.urandom(10500)
+        for mode in ("gcm", "chacha20-poly1305"):
+            path = self._write(data, mode=mode)
+            for offset, length in ((0, 10), (995, 10), (999, 1), (1000, 1000), (0, 10500), (10400, 500), (20000, 5)):
+                self.assertEqual(data[offset:offset + length], decrypt_range(path, "range_key", offset, length))
+            self.assertEqual(data[-300:], decrypt_range(path, "range_key", -300))
+            self.assertEqual(data, decrypt_range(path, "range_key", 0))
+
+    def test_reads_only_needed_chunks(self):
+        """범위에 걸친 청크만 복호화하는지 테스트"""
+        path = self._write(os.urandom(50000))
+        calls = []
+
+        def counting_unseal_into(*args, **kwargs):
+            calls.append(None)
+            return unseal_into(*args, **kwargs)
+
+        with mock.patch.object(container, "unseal_into", counting_unseal_into):
+            decrypt_range(path, "range_key", 12990, 20)
+        self.assertEqual(2, len(calls))
+
+    def test_empty_and_exact_chunks(self):
+        """빈 파일과 청크 크기의 배수인 파일 테스트"""
+        for size in (0, 1000, 3000):
+            data = os.urandom(size)
+            path = self._write(data)
+            with open(path, "rb") as src, ContainerReader(src, "range_key") as reader:
+                self.assertEqual(max(1, size // 1000), reader.chunk_count)
+                self.assertEqual(data, reader.read(0))
+
+    def test_rejects_wrong_key_and_tampering(self):
+        """잘못된 키, 청크 변조, 청크 잘라내기를 거부하는지 테스트"""
+        path = self._write(os.urandom(5000))
+        with self.assertRaisesRegex(ValueError, "키가 일치하지 않습니다"):
+            decrypt_range(path, "wrong_key", 0, 10)
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        tampered = bytearray(raw)
+        tampered[2000] ^= 1
+        with open(path, "wb") as f:
+            f.write(tampered)
+        # 변조되지 않은 청크는 계속 읽을 수 있음
+        self.assertEqual(10, len(decrypt_range(path, "range_key", 0, 10)))
+        with self.assertRaises(ValueError):
+            decrypt_range(path, "range_key", 1500, 10)
+
+        with self.assertRaises(ValueError):
+            encrypt_container(io.BytesIO(b"x"), io.BytesIO(), "range_key", mode="cbc")
+
+    def test_rejects_forged_layout(self):
+        """범위 밖 청크 크기, 파일과 맞지 않는 꼬리, 파일 밖을 가리키는 색인을 거부하는지 테스트"""
+        data = os.urandom(5000)
+        path = self._write(data)
+        with open(path, "rb") as f:
+            raw = f.read()
+        chunk_size_at = container.PREFIX_SIZE - 4
+        index_at = len(raw) - 20 - 8 * 5
+
+        def forged(position, value):
+            tampered = bytearray(raw)
+            tampered[position:position + len(value)] = value
+            with open(path, "wb") as f:
+                f.write(tampered)
+
+        for value in (b"\xff\xff\xff\xff", bytes(4), (container.MAX_CONTAINER_CHUNK_SIZE + 1).to_bytes(4, "big")):
+            forged(chunk_size_at, value)
+            with self.assertRaisesRegex(ValueError, "청크 크기"):
+                decrypt_range(path, "range_key", 0, 10)
+        # 범위 안의 청크 크기나 평문 크기라도 실제 파일 크기와 맞지 않으면 거부
+        forged(chunk_size_at, (5000).to_bytes(4, "big"))
+        with self.assertRaisesRegex(ValueError, "색인"):
+            decrypt_range(path, "range_key", 0, 10)
+        forged(len(raw) - 20, (50_000_000).to_bytes(8, "big"))
+        with self.assertRaisesRegex(ValueError, "색인"):
+            decrypt_range(path, "range_key", 0, 10)
+
+        for offset in (0, len(raw) * 2, 2 ** 63):
+            forged(index_at + 16, offset.to_bytes(8, "big"))
+            self.assertEqual(data[:10], decrypt_range(path, "range_key", 0, 10))
+            with self.assertRaisesRegex(ValueError, "색인"):
+                decrypt_range(path, "range_key", 2000, 10)
+        forged(0, b"")
+        with open(path, "rb") as src, ContainerReader(src, "range_key") as reader:
+            for number in (-1, 5):
+                with self.assertRaisesRegex(ValueError, "청크 번호"):
+                    reader.chunk(number)
+
+        with self.assertRaises(ValueError):
+            encrypt_container(io.BytesIO(b"x"), io.BytesIO(), "range_key", chunk_size=container.MAX_CONTAINER_CHUNK_SIZE + 1)
+
+    def test_file_tools(self):
+        """encrypt_file(container=True) 결과를 decrypt_file이 자동으로 처리하는지 테스트"""
+        source = os.path.join(self.root, "log.txt")
+        data = b"line\n" * 100000
+        with open(source, "wb") as f:
+            f.write(data)
+        encrypted_path, size = encrypt_file(source, "range_key", container=True)
+        self.assertEqual(len(data), size)
+        self.assertEqual(b"line\n" * 3, decrypt_range(encrypted_path, "range_key", -15))
+
+        output = os.path.join(self.root, "log.out")
+        self.assertEqual((output, len(data)), decrypt_file(encrypted_path, "range_key", output))
+        with open(output, "rb") as f:
+            self.assertEqual(data, f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,20 @@ from sumerian_mcp.crypto import (
     decrypt_sumerian,
     encrypt_aes,
     decrypt_aes,
+    encrypt_batch,
+    decrypt_batch,
+    clear_decrypt_cache,
+    configure_decrypt_cache,
+    decrypt_cache_stats,
 )
+from sumerian_mcp.codec import (
+    SumerianCodec,
+    BASE64_ALPHABET,
+    register_codec,
+    get_codec,
+    sumerian_cipher_map,
+)
+from sumerian_mcp.envelope import ENVELOPE_MARKER
 
 
 class TestCrypto(unittest.TestCase):
@@ -72,5 +85,92 @@ class TestCrypto(unittest.TestCase):
         self.assertIsNone(decrypted)
 
 
+    def test_codec_strict_decoding(self):
+        """strict 모드에서 허용되지 않는 문자 거부 테스트"""
+        codec = get_codec("sumerian")
+        encoded = codec.encode("QUJD+/==")
+        self.assertEqual("QUJD+/==", codec.decode(encoded, strict=True))
+
+        # 매핑되지 않은 소문자가 섞이면 거부
+        with self.assertRaises(ValueError):
+            codec.decode(encoded + "a", strict=True)
+        self.assertIsNone(decrypt_password("not a ciphertext", "key"))
+
+    def test_codec_tables_are_bijective(self):
+        """정방향/역방향 테이블 일관성 테스트"""
+        codec = get_codec("sumerian")
+        for source, sign in sumerian_cipher_map.items():
+            self.assertEqual(sign, codec.encode(source))
+            self.assertEqual(source, codec.decode(sign))
+
+        with self.assertRaises(ValueError):
+            SumerianCodec("broken", {"a": "𒀀", "b": "𒀀"})
+        with self.assertRaises(ValueError):
+            SumerianCodec("clash", {"a": "B"})
+
+    def test_register_custom_codec(self):
+        """다른 문자 체계 코덱 등록 테스트"""
+        # 이집트 상형문자 블록(U+13000)으로 Base64 전체 매핑
+        mapping = {c: chr(0x13000 + i) for i, c in enumerate(BASE64_ALPHABET)}
+        register_codec("egyptian", mapping, replace=True)
+
+        encrypted = encrypt_password("hieroglyph", "key", codec="egyptian")
+        self.assertTrue(encrypted.startswith(ENVELOPE_MARKER))
+        self.assertTrue(all(0x13000 <= ord(c) < 0x13100 for c in encrypted[len(ENVELOPE_MARKER):]))
+        self.assertEqual("hieroglyph", decrypt_password(encrypted, "key", codec="egyptian"))
+
+        with self.assertRaises(ValueError):
+            register_codec("egyptian", mapping)
+        with self.assertRaises(ValueError):
+            SumerianCodec("marker", {"a": ENVELOPE_MARKER})
+        with self.assertRaises(ValueError):
+            get_codec("unknown")
+
+
+    def test_batch_encryption_decryption(self):
+        """일괄 암호화 및 항목별 복호화 결과 테스트"""
+        passwords = ["alpha", "beta", "gamma"]
+        key = "batch_key"
+
+        encrypted = encrypt_batch(passwords, key)
+        self.assertTrue(all(item["ok"] for item in encrypted))
+
+        texts = [item["result"] for item in encrypted] + ["손상된 데이터"]
+        decrypted = decrypt_batch(texts, key)
+        self.assertEqual(passwords, [item["result"] for item in decrypted[:3]])
+        self.assertFalse(decrypted[3]["ok"])
+        self.assertIn("error", decrypted[3])
+
+        # 배치 결과는 단건 API와 호환
+        self.assertEqual("beta", decrypt_password(texts[1], key))
+
+    def test_decrypt_cache(self):
+        """복호화 결과 캐시가 같은 암호문/키에만 적중하고, 설정으로 켜고 끌 수 있는지 테스트"""
+        clear_decrypt_cache()
+        encrypted = encrypt_password("cached 𒀀", "cache_key")
+        before = decrypt_cache_stats()
+
+        self.assertEqual("cached 𒀀", decrypt_password(encrypted, "cache_key", cache=True))
+        self.assertEqual("cached 𒀀", decrypt_password(encrypted + "\n", "cache_key", cache=True))
+        self.assertIsNone(decrypt_password(encrypted, "wrong_key", cache=True))
+        self.assertIsNone(decrypt_password(encrypted, "wrong_key", cache=True))
+        stats = decrypt_cache_stats()
+        self.assertEqual((2, 2), (stats["hits"] - before["hits"], stats["misses"] - before["misses"]))
+        self.assertEqual(2, stats["size"])
+
+        # 기본값은 꺼짐, configure_decrypt_cache(enabled=True)이면 cache 인자 없이 사용
+        self.assertFalse(stats["enabled"])
+        decrypt_password(encrypted, "cache_key")
+        self.assertEqual(stats["hits"], decrypt_cache_stats()["hits"])
+        configure_decrypt_cache(enabled=True)
+        try:
+            decrypt_password(encrypted, "cache_key")
+            self.assertEqual(stats["hits"] + 1, decrypt_cache_stats()["hits"])
+        finally:
+            configure_decrypt_cache(enabled=False)
+        clear_decrypt_cache()
+        self.assertEqual(0, decrypt_cache_stats()["size"])
+
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
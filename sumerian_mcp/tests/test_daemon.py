@@ -0,0 +1,191 @@
+"""
+로컬 암호화 데몬 테스트
+"""
+import json
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from sumerian_mcp import daemon
+from sumerian_mcp.crypto import decrypt_password, encrypt_password
+from sumerian_mcp.daemon import DaemonClient, DaemonUnavailable, SumerianDaemon, request
+from tests.test_startup import HEAVY_MODULES, _run_cli
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "유닉스 도메인 소켓 필요")
+class TestDaemon(unittest.TestCase):
+    """SumerianDaemon과 CLI 연동 테스트 케이스"""
+
+    def setUp(self):
+        # AF_UNIX 경로 길이 제한(약 100바이트) 때문에 짧은 임시 디렉토리 사용
+        self.tmpdir = tempfile.mkdtemp(prefix="sd", dir="/tmp" if os.path.isdir("/tmp") else None)
+        self.path = os.path.join(self.tmpdir, "d.sock")
+        self.daemon = SumerianDaemon(self.path)
+        self.daemon.bind()
+        self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.daemon.shutdown()
+        self.thread.join(5)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_roundtrip_and_key_cache(self):
+        """데몬의 암호화 결과가 직접 복호화되고, 같은 키의 반복 요청은 키 캐시를 쓰는지 테스트"""
+        with DaemonClient(self.path) as client:
+            encrypted = client.request("encrypt", password="비밀번호 𒀀", key="daemon_key", mode="cbc")["result"]
+            self.assertEqual("비밀번호 𒀀", decrypt_password(encrypted, "daemon_key"))
+            for _ in range(3):
+                response = client.request("decrypt", encrypted_text=encrypted, key="daemon_key")
+                self.assertEqual({"ok": True, "result": "비밀번호 𒀀"}, response)
+            self.assertIsNone(client.request("decrypt", encrypted_text=encrypted, key="wrong")["result"])
+            stats = client.request("stats")["result"]
+        self.assertEqual(6, stats["requests"])
+        self.assertEqual(1, stats["connections"])
+        self.assertGreaterEqual(stats["key_cache"]["hits"], 3)
+
+        encrypted = encrypt_password("direct", "daemon_key")
+        self.assertEqual("direct", request("decrypt", self.path, encrypted_text=encrypted, key="daemon_key")["result"])
+
+    def test_bad_requests(self):
+        """알 수 없는 요청, 빠진 항목, JSON이 아닌 줄은 연결을 유지한 채 오류 응답"""
+        with DaemonClient(self.path) as client:
+            self.assertFalse(client.request("sign")["ok"])
+            self.assertIn("잘못된 요청", client.request("encrypt", key="k")["error"])
+            self.assertFalse(client.request("encrypt", password="x", key="k", mode="ecb")["ok"])
+            client._sock.sendall(b"not json\n")
+            self.assertFalse(json.loads(client._reader.readline())["ok"])
+            self.assertTrue(client.request("ping")["ok"])
+            self.assertEqual(4, client.request("stats")["result"]["errors"])
+
+    def test_socket_permissions_and_single_instance(self):
+        """소켓은 소유자 전용(0600)이고, 같은 경로에 두 번째 데몬을 띄울 수 없는지 테스트"""
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+        with self.assertRaises(RuntimeError):
+            SumerianDaemon(self.path).bind()
+
+    def test_bind_keeps_non_socket_files(self):
+        """소켓 경로에 일반 파일이나 심볼릭 링크가 있으면 지우지 않고 RuntimeError인지 테스트"""
+        notes = os.path.join(self.tmpdir, "notes.txt")
+        with open(notes, "w", encoding="utf-8") as f:
+            f.write("keep me")
+        with self.assertRaises(RuntimeError):
+            SumerianDaemon(notes).bind()
+        with open(notes, encoding="utf-8") as f:
+            self.assertEqual("keep me", f.read())
+
+        link = os.path.join(self.tmpdir, "link.sock")
+        os.symlink(notes, link)
+        with self.assertRaises(RuntimeError):
+            SumerianDaemon(link).bind()
+        self.assertTrue(os.path.islink(link))
+
+        # 다른 사용자 소유의 소켓도 지우지 않음
+        stale = os.path.join(self.tmpdir, "s.sock")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(stale)
+        sock.close()
+        with mock.patch.object(daemon.os, "getuid", return_value=os.getuid() + 1):
+            with self.assertRaises(RuntimeError):
+                SumerianDaemon(stale).bind()
+        self.assertTrue(os.path.exists(stale))
+
+    def test_client_refuses_unsafe_socket(self):
+        """소켓에 그룹/다른 사용자 권한이 있거나 데몬이 다른 사용자 프로세스이면 연결하지 않는지 테스트"""
+        os.chmod(self.path, 0o666)
+        with self.assertRaisesRegex(DaemonUnavailable, "권한"):
+            DaemonClient(self.path)
+        os.chmod(self.path, 0o600)
+        self.assertTrue(request("ping", self.path)["ok"])
+
+        with mock.patch.object(daemon, "_peer_uid", return_value=os.getuid() + 1):
+            with self.assertRaisesRegex(DaemonUnavailable, "다른 사용자"):
+                DaemonClient(self.path)
+
+        # 데몬을 쓸 수 없으면 CLI는 현재 프로세스에서 처리
+        os.chmod(self.path, 0o660)
+        encrypted = encrypt_password("hello", "cli_daemon_key")
+        env = {daemon.SOCKET_ENV: self.path, daemon.DISABLE_ENV: ""}
+        lines, modules = _run_cli("decrypt", encrypted, "cli_daemon_key", env=env)
+        self.assertIn("hello", lines[0])
+        self.assertIn("Crypto", modules)
+        os.chmod(self.path, 0o600)
+        # ping, stats (CLI 요청은 데몬에 도달하지 않음)
+        self.assertEqual(2, request("stats", self.path)["result"]["requests"])
+
+    def test_fallback_socket_dir(self):
+        """XDG_RUNTIME_DIR이 없으면 임시 디렉토리 안의 0700 디렉토리에 소켓을 두고 그 디렉토리를 확인하는지 테스트"""
+        env = {key: value for key, value in os.environ.items() if key not in (daemon.SOCKET_ENV, "XDG_RUNTIME_DIR")}
+        with mock.patch.dict(os.environ, env, clear=True), \
+                mock.patch.object(daemon.tempfile, "gettempdir", return_value=self.tmpdir):
+            path = daemon.default_socket_path()
+            directory = os.path.dirname(path)
+            self.assertEqual(os.path.join(self.tmpdir, f"sumerian-mcp-{os.getuid()}"), directory)
+            second = SumerianDaemon()
+            second.bind()
+            try:
+                self.assertEqual(0o700, stat.S_IMODE(os.stat(directory).st_mode))
+                thread = threading.Thread(target=second.serve_forever, daemon=True)
+                thread.start()
+                self.assertTrue(request("ping")["ok"])
+                os.chmod(directory, 0o755)
+                with self.assertRaisesRegex(DaemonUnavailable, "디렉토리"):
+                    DaemonClient()
+                os.chmod(directory, 0o700)
+            finally:
+                second.shutdown()
+                thread.join(5)
+
+            # 미리 만들어진 디렉토리에 다른 사용자 권한이 있으면 데몬을 시작하지 않음
+            os.chmod(directory, 0o777)
+            with self.assertRaises(RuntimeError):
+                SumerianDaemon().bind()
+
+    def test_shutdown_and_stale_socket(self):
+        """shutdown 요청으로 종료하면 소켓을 지우고, 남은 소켓 파일은 다음 시작 때 정리하는지 테스트"""
+        self.assertEqual("shutdown", request("shutdown", self.path)["result"])
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.path))
+        with self.assertRaises(DaemonUnavailable):
+            request("ping", self.path)
+
+        # 비정상 종료로 남은 소켓 파일
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        self.daemon = SumerianDaemon(self.path)
+        self.daemon.bind()
+        self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.thread.start()
+        self.assertTrue(request("ping", self.path)["ok"])
+
+    def test_cli_uses_daemon(self):
+        """CLI는 데몬이 있으면 요청만 보내 암호 라이브러리를 가져오지 않고, 없으면 직접 처리하는지 테스트"""
+        env = {daemon.SOCKET_ENV: self.path, daemon.DISABLE_ENV: ""}
+        lines, modules = _run_cli("encrypt", "hello", "cli_daemon_key", env=env)
+        encrypted = lines[0].split(": ", 1)[1]
+        self.assertNotIn("Crypto", modules)
+        self.assertEqual([], sorted(modules.intersection(HEAVY_MODULES)))
+
+        lines, modules = _run_cli("decrypt", encrypted, "cli_daemon_key", env=env)
+        self.assertIn("hello", lines[0])
+        self.assertNotIn("Crypto", modules)
+        # encrypt, decrypt, stats
+        self.assertEqual(3, request("stats", self.path)["result"]["requests"])
+
+        # --no-daemon이거나 데몬이 없으면 현재 프로세스에서 처리
+        lines, modules = _run_cli("--no-daemon", "decrypt", encrypted, "cli_daemon_key", env=env)
+        self.assertIn("hello", lines[0])
+        self.assertIn("Crypto", modules)
+        missing = dict(env, **{daemon.SOCKET_ENV: os.path.join(self.tmpdir, "missing.sock")})
+        lines, _ = _run_cli("decrypt", encrypted, "cli_daemon_key", env=missing)
+        self.assertIn("hello", lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+파일/디렉토리 암호화 테스트
+"""
+import json
+import os
+import tempfile
+import unittest
+from sumerian_mcp.crypto import decrypt_password
+from sumerian_mcp.files import MANIFEST_NAME, TASK_MAX_FILES, decrypt_dir, decrypt_file, encrypt_dir, encrypt_file
+
+
+class TestFileEncryption(unittest.TestCase):
+    """파일/디렉토리 암호화 테스트 케이스"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.key = "file_key"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rel, data):
+        path = os.path.join(self.root, "src", *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def test_file_roundtrip(self):
+        """스트리밍 파일 암호화 결과가 기존 암호문 형식과 호환되는지 테스트"""
+        self._write("plain.txt", b"stream me")
+        path = os.path.join(self.root, "src", "plain.txt")
+
+        encrypted_path, size = encrypt_file(path, self.key)
+        self.assertEqual((path + ".sumerian", 9), (encrypted_path, size))
+        with open(encrypted_path, encoding="utf-8") as f:
+            self.assertEqual("stream me", decrypt_password(f.read(), self.key))
+
+        os.remove(path)
+        self.assertEqual((path, 9), decrypt_file(encrypted_path, self.key))
+        with open(path, "rb") as f:
+            self.assertEqual(b"stream me", f.read())
+
+    def _dir_roundtrip(self, workers):
+        files = {"a.txt": b"alpha", "sub/b.bin": os.urandom(5000), "sub/deep/empty": b""}
+        files.update({f"many/f{i}.txt": os.urandom(i) for i in range(TASK_MAX_FILES)})
+        for rel, data in files.items():
+            self._write(rel, data)
+        src = os.path.join(self.root, "src")
+        enc = os.path.join(self.root, "enc")
+        dec = os.path.join(self.root, "dec")
+
+        report = encrypt_dir(src, enc, self.key, workers=workers)
+        self.assertEqual(len(files), report["files"])
+        self.assertEqual([], report["errors"])
+        with open(os.path.join(enc, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.assertEqual({rel: len(data) for rel, data in files.items()},
+                         {item["path"]: item["size"] for item in manifest["files"]})
+
+        report = decrypt_dir(enc, dec, self.key, workers=workers)
+        self.assertEqual(len(files), report["files"])
+        self.assertEqual([], report["errors"])
+        for rel, data in files.items():
+            with open(os.path.join(dec, *rel.split("/")), "rb") as f:
+                self.assertEqual(data, f.read())
+
+    def test_dir_roundtrip(self):
+        """디렉토리 재귀 암호화/복호화 및 매니페스트 테스트"""
+        self._dir_roundtrip(workers=1)
+
+    def test_dir_roundtrip_parallel(self):
+        """워커 프로세스로 나누어 처리해도 결과가 같은지 테스트"""
+        self._dir_roundtrip(workers=2)
+
+    def test_manifest_path_traversal(self):
+        """매니페스트가 출력 디렉토리 밖의 경로를 가리키면 거부하는지 테스트"""
+        self._write("a.txt", b"alpha")
+        enc = os.path.join(self.root, "enc")
+        encrypt_dir(os.path.join(self.root, "src"), enc, self.key)
+
+        manifest_path = os.path.join(enc, MANIFEST_NAME)
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["files"][0]["path"] = "../escape.txt"
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        report = decrypt_dir(enc, os.path.join(self.root, "dec"), self.key)
+        self.assertEqual(0, report["files"])
+        self.assertEqual("../escape.txt", report["errors"][0]["path"])
+        self.assertFalse(os.path.exists(os.path.join(self.root, "escape.txt")))
+
+    def test_manifest_output_names(self):
+        """복호화할 때 매니페스트에 기록된 암호문 이름(output)을 쓰는지 테스트"""
+        self._write("a.txt", b"alpha")
+        enc = os.path.join(self.root, "enc")
+        encrypt_dir(os.path.join(self.root, "src"), enc, self.key)
+        os.rename(os.path.join(enc, "a.txt.sumerian"), os.path.join(enc, "renamed.bin"))
+
+        manifest_path = os.path.join(enc, MANIFEST_NAME)
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["files"][0]["output"] = "renamed.bin"
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        dec = os.path.join(self.root, "dec")
+        report = decrypt_dir(enc, dec, self.key)
+        self.assertEqual((1, []), (report["files"], report["errors"]))
+        with open(os.path.join(dec, "a.txt"), "rb") as f:
+            self.assertEqual(b"alpha", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
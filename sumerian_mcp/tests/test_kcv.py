@@ -0,0 +1,84 @@
+"""
+키 확인 값(KCV) 테스트
+"""
+import base64
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sumerian_mcp import crypto
+from sumerian_mcp.crypto import decrypt_aes, decrypt_password, encrypt_aes, encrypt_password
+from sumerian_mcp.envelope import FLAG_KCV, VERSION, Header, pack_header, parse_header
+from sumerian_mcp.files import decrypt_file, decrypt_stream, encrypt_file, encrypt_stream
+from sumerian_mcp.kdf import encryption_key, kdf_params
+from sumerian_mcp.modes import MODES, seal
+
+
+class CountingReader(io.BytesIO):
+    """읽은 바이트 수를 기록하는 스트림"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+class TestKeyCheckValue(unittest.TestCase):
+    """키 확인 값 테스트 케이스"""
+
+    def test_header_flag(self):
+        """새 암호문은 키 확인 플래그가 설정되고 모든 모드에서 복호화되는지 테스트"""
+        for mode in MODES:
+            encrypted = encrypt_aes("checked", "kcv_key", mode=mode)
+            self.assertTrue(parse_header(base64.b64decode(encrypted)).flags & FLAG_KCV)
+            self.assertEqual("checked", decrypt_aes(encrypted, "kcv_key"))
+            self.assertIsNone(decrypt_aes(encrypted, "wrong_key"))
+
+    def test_without_kcv(self):
+        """키 확인 값이 없는 버전 2 암호문도 계속 복호화되는지 테스트"""
+        kdf_id, params = kdf_params()
+        with encryption_key("kcv_key", kdf_id, params) as (salt, key_bytes):
+            header = pack_header(Header(VERSION, 0, kdf_id, MODES["gcm"], params, salt))
+            data = header + seal(MODES["gcm"], key_bytes, b"no kcv", aad=header)
+        self.assertEqual("no kcv", decrypt_aes(base64.b64encode(data).decode(), "kcv_key"))
+        self.assertIsNone(decrypt_aes(base64.b64encode(data).decode(), "wrong_key"))
+
+    def test_wrong_key_skips_body(self):
+        """잘못된 키는 본문을 디코딩/복호화하지 않고 거부하는지 테스트"""
+        password = "x" * 100000
+        for encoding in ("base64", "base1024"):
+            encrypted = encrypt_password(password, "kcv_key", encoding=encoding)
+            with mock.patch.object(crypto, "unseal") as unseal, \
+                    mock.patch.object(crypto.base1024, "decode", wraps=crypto.base1024.decode) as decode:
+                self.assertIsNone(decrypt_password(encrypted, "wrong_key"))
+            unseal.assert_not_called()
+            self.assertTrue(all(len(call.args[0]) < 100 for call in decode.call_args_list))
+            self.assertEqual(password, decrypt_password(encrypted, "kcv_key"))
+
+    def test_stream_rejects_wrong_key_early(self):
+        """파일 스트림은 첫 블록만 읽고 잘못된 키를 거부하는지 테스트"""
+        encrypted = io.BytesIO()
+        encrypt_stream(io.BytesIO(os.urandom(1 << 20)), encrypted, "kcv_key")
+        src = CountingReader(encrypted.getvalue())
+        with self.assertRaisesRegex(ValueError, "키가 일치하지 않습니다"):
+            decrypt_stream(src, io.BytesIO(), "wrong_key", chunk_size=4096)
+        self.assertEqual(4096, src.consumed)
+
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "plain.txt")
+            with open(path, "w") as f:
+                f.write("file body")
+            encrypted_path, _ = encrypt_file(path, "kcv_key")
+            os.remove(path)
+            with self.assertRaisesRegex(ValueError, "키가 일치하지 않습니다"):
+                decrypt_file(encrypted_path, "wrong_key")
+            self.assertEqual(["plain.txt.sumerian"], os.listdir(root))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+키 파생 및 파생 키 캐시 테스트
+"""
+import base64
+import os
+import threading
+import time
+import unittest
+from Crypto.Cipher import AES
+from sumerian_mcp.cache import SecureLRUCache
+from sumerian_mcp.crypto import decrypt_aes, decrypt_bytes, decrypt_password, encrypt_aes, encrypt_password, pad, prepare_key
+from sumerian_mcp.codec import get_codec
+from sumerian_mcp.envelope import ENVELOPE_MARKER, HEADER_SIZE, parse_header
+from sumerian_mcp.kdf import (
+    KDF_PBKDF2,
+    KDF_SCRYPT,
+    MAX_PBKDF2_ITERATIONS,
+    PBKDF2_ITERATIONS,
+    clear_key_cache,
+    derived_key,
+    key_cache_stats,
+)
+
+
+def legacy_encrypt(password, key):
+    """KDF 도입 이전 형식의 암호문 생성"""
+    iv = os.urandom(16)
+    encrypted = AES.new(prepare_key(key), AES.MODE_CBC, iv).encrypt(pad(password).encode())
+    return base64.b64encode(iv + encrypted).decode()
+
+
+class TestKeyDerivation(unittest.TestCase):
+    """키 파생 테스트 케이스"""
+
+    def setUp(self):
+        clear_key_cache()
+
+    def test_header_records_kdf_and_salt(self):
+        """헤더에 KDF 식별자, 파라미터, 솔트가 기록되는지 테스트"""
+        for kdf, kdf_id in (("pbkdf2", KDF_PBKDF2), ("scrypt", KDF_SCRYPT)):
+            encrypted = encrypt_password("derived", "kdf_key", kdf=kdf)
+            self.assertTrue(encrypted.startswith(ENVELOPE_MARKER))
+            self.assertEqual("derived", decrypt_password(encrypted, "kdf_key"))
+            self.assertIsNone(decrypt_password(encrypted, "wrong_key"))
+
+            header = parse_header(base64.b64decode(encrypt_aes("derived", "kdf_key", kdf=kdf)))
+            self.assertEqual(kdf_id, header.kdf)
+            self.assertEqual(16, len(header.salt))
+            if kdf == "pbkdf2":
+                self.assertEqual(PBKDF2_ITERATIONS, int.from_bytes(header.params, "big"))
+
+    def test_forged_kdf_params_rejected(self):
+        """헤더의 KDF 파라미터를 범위 밖으로 조작하면 파생하지 않고 바로 ValueError인지 테스트"""
+        forged = [
+            (KDF_PBKDF2, (MAX_PBKDF2_ITERATIONS + 1).to_bytes(4, "big")),
+            (KDF_PBKDF2, (0xFFFFFFFF).to_bytes(4, "big")),
+            (KDF_PBKDF2, bytes(4)),
+            (KDF_SCRYPT, bytes((40, 8, 1, 0))),
+            (KDF_SCRYPT, bytes((20, 255, 1, 0))),
+            (KDF_SCRYPT, bytes((14, 8, 255, 0))),
+            (KDF_SCRYPT, bytes((14, 0, 1, 0))),
+        ]
+        for kdf, kdf_id in (("pbkdf2", KDF_PBKDF2), ("scrypt", KDF_SCRYPT)):
+            envelope = bytearray(base64.b64decode(encrypt_aes("derived", "kdf_key", kdf=kdf)))
+            cached = key_cache_stats()["size"]
+            for forged_id, params in forged:
+                envelope[2], envelope[4:8] = forged_id, params
+                started = time.perf_counter()
+                with self.assertRaises(ValueError):
+                    decrypt_bytes(envelope, "kdf_key")
+                self.assertIsNone(decrypt_aes(base64.b64encode(envelope).decode(), "kdf_key"))
+                self.assertLess(time.perf_counter() - started, 1.0, (forged_id, params))
+                self.assertEqual(cached, key_cache_stats()["size"])
+
+        with self.assertRaises(ValueError):
+            with derived_key("kdf_key", bytes(16), KDF_PBKDF2, (MAX_PBKDF2_ITERATIONS + 1).to_bytes(4, "big")):
+                pass
+
+    def test_legacy_ciphertext(self):
+        """표식/헤더가 없는 기존 암호문도 복호화되는지 테스트"""
+        legacy = legacy_encrypt("old secret", "legacy_key")
+        self.assertEqual("old secret", decrypt_aes(legacy, "legacy_key"))
+        self.assertEqual("old secret", decrypt_password(get_codec().encode(legacy), "legacy_key"))
+
+    def test_derived_key_cached(self):
+        """같은 키로 반복 암호화/복호화하면 키를 한 번만 파생하는지 테스트"""
+        misses = key_cache_stats()["misses"]
+        encrypted = [encrypt_password(f"item-{i}", "hot_key") for i in range(20)]
+        self.assertEqual([f"item-{i}" for i in range(20)], [decrypt_password(e, "hot_key") for e in encrypted])
+
+        # 솔트 1회 + 파생 키 1회 생성, 나머지는 모두 캐시 적중
+        self.assertEqual(misses + 2, key_cache_stats()["misses"])
+
+        # 솔트는 재사용되지만 IV가 달라 암호문은 매번 다름
+        first, second = (base64.b64decode(encrypt_aes("same", "hot_key")) for _ in range(2))
+        self.assertEqual(first[:HEADER_SIZE], second[:HEADER_SIZE])
+        self.assertNotEqual(first, second)
+
+
+class TestSecureLRUCache(unittest.TestCase):
+    """보안 캐시 테스트 케이스"""
+
+    def test_lru_eviction_zeroizes(self):
+        """최대 항목 수를 넘으면 가장 오래된 항목을 0으로 덮어쓰고 제거하는지 테스트"""
+        cache = SecureLRUCache(maxsize=2)
+        values = {}
+        for name in ("a", "b", "c"):
+            with cache.lease(name, lambda: bytearray(b"\xaa" * 8)) as value:
+                values[name] = value
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(bytearray(8), values["a"])
+        self.assertEqual(bytearray(b"\xaa" * 8), values["c"])
+        self.assertEqual(1, cache.stats()["evictions"])
+
+    def test_ttl_expiry(self):
+        """유지 시간이 지난 항목은 다시 생성되는지 테스트"""
+        cache = SecureLRUCache(maxsize=4, ttl=0.05)
+        with cache.lease("k", lambda: bytearray(b"first")) as first:
+            pass
+        time.sleep(0.1)
+        with cache.lease("k", lambda: bytearray(b"second")) as second:
+            self.assertEqual(bytearray(b"second"), second)
+        self.assertEqual(bytearray(5), first)
+        self.assertEqual(2, cache.stats()["misses"])
+
+    def test_leased_value_not_zeroized(self):
+        """사용 중인 값은 제거되더라도 lease가 끝날 때까지 유지되는지 테스트"""
+        cache = SecureLRUCache(maxsize=1)
+        with cache.lease("a", lambda: bytearray(b"\x01" * 4)) as value:
+            with cache.lease("b", lambda: bytearray(b"\x02" * 4)):
+                pass
+            self.assertEqual(bytearray(b"\x01" * 4), value)
+        self.assertEqual(bytearray(4), value)
+
+    def test_single_flight(self):
+        """같은 키의 동시 요청은 factory를 한 번만 호출하고, 모든 lease가 끝난 뒤에 zeroize하는지 테스트"""
+        cache = SecureLRUCache(maxsize=1)
+        release = threading.Event()
+        calls = []
+        values = []
+
+        def factory():
+            calls.append(1)
+            release.wait(5)
+            return bytearray(b"\x07" * 4)
+
+        def worker():
+            with cache.lease("k", factory) as value:
+                values.append(bytes(value))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while cache.stats()["coalesced"] < 3:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual([b"\x07" * 4] * 4, values)
+        self.assertEqual((1, 3), (cache.stats()["misses"], cache.stats()["coalesced"]))
+        with cache.lease("k", factory) as value:
+            pass
+        cache.clear()
+        self.assertEqual(bytearray(4), value)
+
+    def test_single_flight_error(self):
+        """생성 작업이 실패하면 기다리던 요청에도 같은 예외가 전달되고 다음 요청은 다시 생성하는지 테스트"""
+        cache = SecureLRUCache()
+        release = threading.Event()
+        errors = []
+
+        def factory():
+            release.wait(5)
+            raise ValueError("파생 실패")
+
+        def worker():
+            try:
+                with cache.lease("k", factory):
+                    pass
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while cache.stats()["coalesced"] < 2:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(["파생 실패"] * 3, errors)
+        with cache.lease("k", lambda: bytearray(b"ok")) as value:
+            self.assertEqual(bytearray(b"ok"), value)
+
+
+if __name__ == "__main__":
+    unittest.main()
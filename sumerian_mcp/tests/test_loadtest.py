@@ -0,0 +1,99 @@
+"""
+부하 테스트 모듈 테스트
+"""
+import asyncio
+import tempfile
+import unittest
+from sumerian_mcp.loadtest import (
+    LatencyHistogram,
+    LevelStats,
+    LoadGenerator,
+    format_report,
+    parse_mix,
+    run_loadtest,
+)
+
+
+class FakeTarget:
+    """호출마다 정해진 시간만큼 기다리는 가짜 대상 (decrypt는 항상 실패)"""
+
+    def __init__(self, delay=0.005):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @staticmethod
+    def arguments(operation, context, output=None):
+        return {"operation": operation}
+
+    async def call(self, tool, arguments):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return "ok", "실패" if tool == "decrypt" else None
+
+
+class TestLoadtest(unittest.IsolatedAsyncioTestCase):
+    """부하 생성기 테스트 케이스"""
+
+    def test_parse_mix(self):
+        """호출 비율 해석과 잘못된 입력 거부 테스트"""
+        self.assertEqual({"encrypt": 3.0, "decrypt_file": 1.0}, parse_mix("encrypt=3, decrypt_file, decrypt=0"))
+        for text in ("encrypt=x", "sign=1", "encrypt=0", "encrypt=-1"):
+            with self.assertRaises(ValueError):
+                parse_mix(text)
+
+    def test_histogram(self):
+        """분위수와 구간별 분포 테스트"""
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+        self.assertAlmostEqual(50, histogram.percentile(50))
+        self.assertAlmostEqual(99, histogram.percentile(99))
+        buckets = dict(histogram.buckets())
+        self.assertEqual((1, 1, 3, 5, 10, 30, 50, 0), tuple(buckets[bound] for bound in (1, 2, 5, 10, 20, 50, 100, 200)))
+        self.assertEqual(100, sum(buckets.values()))
+
+    async def test_concurrency_and_errors(self):
+        """동시 실행 수를 지키고 연산별 오류율을 집계하는지 테스트"""
+        target = FakeTarget()
+        generator = LoadGenerator(target, parse_mix("encrypt=1,decrypt=1"), tempfile.gettempdir(), seed=1)
+        stats = LevelStats()
+        elapsed = await generator.run_concurrency(3, 0.2, stats)
+        report = stats.report("concurrency", 3, elapsed)
+
+        self.assertEqual(3, target.max_in_flight)
+        self.assertEqual(report["calls"], report["operations"]["encrypt"]["calls"] + report["operations"]["decrypt"]["calls"])
+        self.assertEqual(1.0, report["operations"]["decrypt"]["error_rate"])
+        self.assertEqual(0, report["operations"]["encrypt"]["errors"])
+        self.assertEqual(["실패"], report["operations"]["decrypt"]["error_samples"])
+
+    async def test_rate_and_dropped(self):
+        """요청률 모드가 목표 횟수만큼 보내고 처리 중 상한을 넘으면 미전송으로 세는지 테스트"""
+        generator = LoadGenerator(FakeTarget(delay=0.05), {"encrypt": 1}, tempfile.gettempdir())
+        stats = LevelStats()
+        await generator.run_rate(200, 0.25, stats)
+        self.assertEqual(50, stats.report("rate", 200, 0.25)["calls"])
+
+        stats = LevelStats()
+        await generator.run_rate(200, 0.25, stats, max_in_flight=2)
+        self.assertGreater(stats.dropped, 0)
+        self.assertEqual(50, stats.dropped + sum(stats.calls.values()))
+
+    async def test_local_sse_server(self):
+        """로컬 SSE 서버를 띄워 모든 도구 호출이 성공하는지 테스트"""
+        report = await run_loadtest(
+            mix="encrypt,decrypt,encrypt_file,decrypt_file", concurrency=(1, 2), duration=0.3, warmup=0,
+            sessions=1, file_size=1024, seed=0,
+        )
+        self.assertEqual([1, 2], [level["concurrency"] for level in report["levels"]])
+        for level in report["levels"]:
+            self.assertGreater(level["calls"], 0)
+            self.assertEqual(0, level["errors"], level["operations"])
+        self.assertIn("포화 곡선", format_report(report))
+
+
+if __name__ == "__main__":
+    unittest.main()
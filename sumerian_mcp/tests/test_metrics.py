@@ -0,0 +1,82 @@
+"""
+도구 호출 지표 테스트
+"""
+import json
+import unittest
+from starlette.testclient import TestClient
+from sumerian_mcp.metrics import ToolMetrics, payload_size, size_class
+from sumerian_mcp.server import SumerianMCPServer
+
+
+class TestMetrics(unittest.IsolatedAsyncioTestCase):
+    """ToolMetrics와 서버 계측 테스트 케이스"""
+
+    def test_payload_size(self):
+        """문자열은 UTF-8 바이트 수로, 중첩 구조는 합산해 세는지 테스트"""
+        self.assertEqual(5 + 8 + 3, payload_size({"password": "hello", "key": "𒀀𒀀", "items": ["a", "bc"], "n": 1}))
+        self.assertEqual(4, payload_size(bytearray(4)))
+        self.assertEqual(("le_1k", "le_64k", "gt_1m"), (size_class(1024), size_class(1025), size_class(2 ** 21)))
+
+    def test_histogram_and_prometheus(self):
+        """지연 시간 구간, 분위수 추정, Prometheus 누적 구간 출력 테스트"""
+        metrics = ToolMetrics(buckets=(0.001, 1.0))
+        for _ in range(3):
+            metrics.end(metrics.begin("encrypt", {"password": "x"}), "result")
+        token = metrics.begin("encrypt", {"password": "x" * 2000})
+        metrics.end((token[0], token[1], token[2] - 2), error=True)
+
+        stats = metrics.snapshot()["tools"]["encrypt"]
+        self.assertEqual((4, 1, 0, 2003, 18), tuple(stats[name] for name in
+                         ("calls", "errors", "in_flight", "input_bytes", "output_bytes")))
+        self.assertEqual(1.0, stats["latency"]["le_1k"]["p99_ms"])
+        self.assertEqual(1, stats["latency"]["le_64k"]["buckets"]["+Inf"])
+        self.assertIsNone(stats["latency"]["le_64k"]["p50_ms"])
+
+        text = metrics.render_prometheus()
+        self.assertIn('sumerian_tool_errors_total{tool="encrypt"} 1', text)
+        self.assertIn('sumerian_tool_duration_seconds_bucket{tool="encrypt",size="le_1k",le="1.0"} 3', text)
+        self.assertIn('sumerian_tool_duration_seconds_bucket{tool="encrypt",size="le_64k",le="+Inf"} 1', text)
+        self.assertIn("# TYPE sumerian_tool_in_flight gauge", text)
+
+    def test_disabled(self):
+        """비활성화 상태에서는 아무것도 기록하지 않는지 테스트"""
+        metrics = ToolMetrics(enabled=False)
+        token = metrics.begin("encrypt", {"password": "x"})
+        self.assertIsNone(token)
+        metrics.end(token, "result")
+        self.assertEqual({}, metrics.snapshot()["tools"])
+
+    async def test_server_tools(self):
+        """도구 호출 지표가 stats 도구와 SSE 앱의 /metrics에 나타나는지 테스트"""
+        server = SumerianMCPServer()
+        try:
+            await server.mcp.call_tool("encrypt", {"password": "hello", "key": "metrics_key"})
+            await server.mcp.call_tool("decrypt", {"encrypted_text": "garbage", "key": "metrics_key"})
+            with self.assertRaises(Exception):
+                await server.mcp.call_tool("no_such_tool", {})
+
+            result = await server.mcp.call_tool("stats", {"reset": True})
+            tools = json.loads(result.content[0].text)["tools"]
+            self.assertEqual({"encrypt", "decrypt", "unknown", "stats"}, set(tools))
+            self.assertEqual((1, 0), (tools["encrypt"]["calls"], tools["encrypt"]["errors"]))
+            self.assertEqual(1, tools["decrypt"]["errors"])
+            self.assertEqual(1, tools["unknown"]["errors"])
+
+            await server.mcp.call_tool("encrypt", {"password": "hello", "key": "metrics_key"})
+            with TestClient(server.mcp.sse_app()) as client:
+                response = client.get("/metrics")
+            self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+            self.assertIn('sumerian_tool_calls_total{tool="encrypt"} 1', response.text)
+        finally:
+            server.close()
+
+        server = SumerianMCPServer(metrics=False)
+        try:
+            await server.mcp.call_tool("encrypt", {"password": "hello", "key": "metrics_key"})
+            self.assertEqual({}, server.metrics.snapshot()["tools"])
+        finally:
+            server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+암호화 모드(CBC, AES-GCM, ChaCha20-Poly1305, AES-SIV) 테스트
+"""
+import base64
+import io
+import os
+import tempfile
+import unittest
+from sumerian_mcp.crypto import decrypt_aes, decrypt_password, encrypt_aes, encrypt_batch, encrypt_password
+from sumerian_mcp.envelope import HEADER_SIZE, parse_header
+from sumerian_mcp.files import decrypt_file, decrypt_stream, encrypt_file, encrypt_stream
+from sumerian_mcp.kdf import clear_key_cache
+from sumerian_mcp.modes import MODES
+
+
+def flip(data, index):
+    """지정한 위치의 비트 하나를 뒤집은 바이트열"""
+    data = bytearray(data)
+    data[index] ^= 1
+    return bytes(data)
+
+
+class TestModes(unittest.TestCase):
+    """암호화 모드 테스트 케이스"""
+
+    def test_roundtrip_all_modes(self):
+        """모든 모드에서 암호화/복호화 및 헤더의 모드 기록 테스트"""
+        for mode, mode_id in MODES.items():
+            for password in ("", "ascii only", "한글과 𒀀 쐐기문자"):
+                encrypted = encrypt_password(password, "mode_key", mode=mode)
+                self.assertEqual(password, decrypt_password(encrypted, "mode_key"))
+            header = parse_header(base64.b64decode(encrypt_aes("x", "mode_key", mode=mode)))
+            self.assertEqual(mode_id, header.mode)
+
+        with self.assertRaises(ValueError):
+            encrypt_password("x", "mode_key", mode="ecb")
+
+    def test_aead_rejects_tampering(self):
+        """AEAD 모드는 잘못된 키, 암호문/태그/헤더 변조를 태그 검증으로 거부하는지 테스트"""
+        for mode in ("gcm", "chacha20-poly1305", "siv"):
+            data = base64.b64decode(encrypt_aes("authenticated", "mode_key", mode=mode))
+            self.assertIsNone(decrypt_aes(base64.b64encode(data).decode(), "wrong_key"))
+            for index in (1, HEADER_SIZE - 1, HEADER_SIZE + 12, len(data) - 1):
+                tampered = base64.b64encode(flip(data, index)).decode()
+                self.assertIsNone(decrypt_aes(tampered, "mode_key"), (mode, index))
+
+    def test_deterministic_mode(self):
+        """siv 모드는 같은 키와 평문이면 캐시, 인코딩, API와 관계없이 같은 암호문을 만드는지 테스트"""
+        for encoding in ("base64", "base1024"):
+            first = encrypt_password("중복 비밀번호", "siv_key", mode="siv", encoding=encoding)
+            clear_key_cache()
+            self.assertEqual(first, encrypt_password("중복 비밀번호", "siv_key", mode="siv", encoding=encoding))
+            self.assertEqual("중복 비밀번호", decrypt_password(first, "siv_key"))
+            self.assertIsNone(decrypt_password(first, "other_key"))
+            self.assertNotEqual(first, encrypt_password("중복 비밀번호", "other_key", mode="siv", encoding=encoding))
+            self.assertNotEqual(first, encrypt_password("다른 비밀번호", "siv_key", mode="siv", encoding=encoding))
+
+        # 일괄 암호화와 스트림 암호화 결과도 같은 값이므로 어느 경로로 만든 암호문이든 색인을 공유할 수 있음
+        single = encrypt_password("record", "siv_key", mode="siv")
+        batch = encrypt_batch(["record", "record"], "siv_key", mode="siv")
+        self.assertEqual([single, single], [item["result"] for item in batch])
+        stream = io.BytesIO()
+        encrypt_stream(io.BytesIO(b"record"), stream, "siv_key", chunk_size=48, mode="siv")
+        self.assertEqual(single, stream.getvalue().decode("utf-8"))
+
+        # 무작위 nonce를 쓰는 모드는 매번 다름
+        self.assertNotEqual(encrypt_password("record", "siv_key"), encrypt_password("record", "siv_key"))
+
+    def test_stream_modes(self):
+        """모든 모드에서 스트리밍 암호화/복호화 테스트"""
+        for mode in MODES:
+            for size in (0, 15, 16, 100, 1000):
+                data = os.urandom(size)
+                encrypted = io.BytesIO()
+                encrypt_stream(io.BytesIO(data), encrypted, "mode_key", chunk_size=48, mode=mode)
+                decrypted = io.BytesIO()
+                decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, "mode_key", chunk_size=7)
+                self.assertEqual(data, decrypted.getvalue())
+
+    def test_tampered_file_not_written(self):
+        """변조된 AEAD 파일은 태그 검증 실패 후 출력 파일을 남기지 않는지 테스트"""
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "plain.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(200000))
+            encrypted_path, _ = encrypt_file(path, "mode_key", mode="gcm", encoding="base1024")
+            os.remove(path)
+
+            # 본문 중간의 쐐기문자 하나를 알파벳 안의 다른 문자로 교체
+            with open(encrypted_path, encoding="utf-8") as f:
+                text = f.read()
+            middle = len(text) // 2
+            replacement = chr(ord(text[middle]) ^ 1)
+            with open(encrypted_path, "w", encoding="utf-8") as f:
+                f.write(text[:middle] + replacement + text[middle + 1:])
+
+            with self.assertRaises(ValueError):
+                decrypt_file(encrypted_path, "mode_key")
+            self.assertEqual(["plain.bin.sumerian"], os.listdir(root))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+비동기 작업 분리(offload) 테스트
+"""
+import asyncio
+import json
+import threading
+import time
+import unittest
+from sumerian_mcp.crypto import decrypt_password, encrypt_password
+from sumerian_mcp.kdf import clear_key_cache
+from sumerian_mcp.offload import Offloader
+from sumerian_mcp.server import SumerianMCPServer
+
+
+class TestOffload(unittest.IsolatedAsyncioTestCase):
+    """실행기 분리 테스트 케이스"""
+
+    async def test_concurrency_limit(self):
+        """실행기에 동시에 넘기는 작업 수가 상한을 넘지 않는지 테스트"""
+        offload = Offloader(io_workers=8, io_limit=2)
+        lock = threading.Lock()
+        running = [0, 0]  # 현재, 최대
+
+        def job():
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+        try:
+            await asyncio.gather(*(offload.io(job) for _ in range(8)))
+            self.assertEqual(2, running[1])
+            stats = offload.stats()["io"]
+            self.assertEqual((8, 8, 0, 0), (stats["submitted"], stats["completed"], stats["in_flight"], stats["waiting"]))
+        finally:
+            offload.close()
+
+    async def test_small_requests_not_blocked(self):
+        """키 파생은 실행기로 넘겨 이벤트 루프가 멈추지 않고, 파생 키가 캐시된 작은 요청은 바로 처리되는지 테스트"""
+        clear_key_cache()
+        server = SumerianMCPServer(offload=Offloader(cpu_workers=1, io_workers=1))
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        try:
+            big = asyncio.ensure_future(server.offload.io(time.sleep, 0.5))
+            ticking = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0.01)
+
+            # 처음 쓰는 키: 키 파생이 실행기에서 돌아가는 동안에도 루프가 계속 돈다
+            encrypted = (await server.mcp.call_tool("encrypt", {"password": "small", "key": "offload_key"})).content[0].text
+            self.assertLess(max(gaps), 0.05)
+            self.assertEqual((0, 1), (server.offload.stats()["cpu"]["inline"], server.offload.stats()["cpu"]["completed"]))
+
+            # 파생 키가 캐시된 작은 요청은 이벤트 루프에서 바로 처리
+            started = time.perf_counter()
+            await server.mcp.call_tool("encrypt", {"password": "small", "key": "offload_key"})
+            result = await server.mcp.call_tool("decrypt", {"encrypted_text": encrypted, "key": "offload_key"})
+            self.assertLess(time.perf_counter() - started, 0.05)
+            self.assertEqual("small", result.content[0].text)
+            self.assertEqual(2, server.offload.stats()["cpu"]["inline"])
+            self.assertFalse(big.done())
+            ticking.cancel()
+            await big
+        finally:
+            server.close()
+
+    async def test_decrypt_cache(self):
+        """decrypt_cache=True인 서버는 동시에 들어온 같은 복호화 요청을 한 번만 처리하는지 테스트"""
+        encrypted = encrypt_password("cached", "offload_key")
+        server = SumerianMCPServer(decrypt_cache=True)
+        try:
+            before = json.loads((await server.mcp.call_tool("worker_stats", {})).content[0].text)["decrypt_cache"]
+            arguments = {"encrypted_text": encrypted, "key": "offload_key"}
+            results = await asyncio.gather(*(server.mcp.call_tool("decrypt", arguments) for _ in range(8)))
+            self.assertEqual(["cached"] * 8, [result.content[0].text for result in results])
+
+            stats = json.loads((await server.mcp.call_tool("worker_stats", {})).content[0].text)["decrypt_cache"]
+            self.assertTrue(stats["enabled"])
+            self.assertEqual(1, stats["misses"] - before["misses"])
+            self.assertEqual(7, stats["hits"] + stats["coalesced"] - before["hits"] - before["coalesced"])
+        finally:
+            server.close()
+
+    async def test_process_executor(self):
+        """프로세스 실행기로 큰 CPU 작업을 처리하는지 테스트"""
+        offload = Offloader(cpu_kind="process", cpu_workers=1, inline_max_bytes=1024)
+        try:
+            password = "p" * 4096
+            encrypted = await offload.cpu(encrypt_password, password, "offload_key", size=len(password))
+            self.assertEqual(password, decrypt_password(encrypted, "offload_key"))
+            self.assertEqual(1, offload.stats()["cpu"]["completed"])
+        finally:
+            offload.close()
+
+        with self.assertRaises(ValueError):
+            Offloader(cpu_kind="fiber")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+병렬 암호화 엔진 테스트
+"""
+import unittest
+from sumerian_mcp.crypto import decrypt_password
+from sumerian_mcp.parallel import ParallelCryptoEngine
+
+
+class TestParallelCryptoEngine(unittest.TestCase):
+    """병렬 암호화 엔진 테스트 케이스"""
+
+    def setUp(self):
+        self.passwords = [f"credential-{i}" for i in range(50)]
+        self.key = "parallel_key"
+
+    def _roundtrip(self, engine):
+        encrypted = engine.encrypt_batch(self.passwords, self.key)
+        self.assertTrue(all(item["ok"] for item in encrypted))
+        self.assertEqual(self.passwords[7], decrypt_password(encrypted[7]["result"], self.key))
+
+        texts = [item["result"] for item in encrypted]
+        decrypted = engine.decrypt_batch(texts, self.key)
+        self.assertEqual(self.passwords, [item["result"] for item in decrypted])
+
+    def test_pool_roundtrip(self):
+        """프로세스 풀 분배 후 입력 순서대로 결과 반환 테스트"""
+        with ParallelCryptoEngine(workers=2, chunk_size=8) as engine:
+            self._roundtrip(engine)
+            stats = engine.stats()
+
+        self.assertEqual(2, stats["workers"])
+        self.assertEqual(100, stats["total"]["items"])
+        self.assertEqual(14, stats["total"]["tasks"])
+
+    def test_shared_memory_roundtrip(self):
+        """공유 메모리 전달 경로 테스트"""
+        with ParallelCryptoEngine(workers=2, chunk_size=8, shm_threshold=0) as engine:
+            self._roundtrip(engine)
+
+    def test_per_item_errors(self):
+        """워커에서 처리된 항목별 오류 결과 테스트"""
+        with ParallelCryptoEngine(workers=2, chunk_size=2) as engine:
+            results = engine.decrypt_batch(["잘못된", "데이터", "입니다"], self.key)
+        self.assertEqual([False, False, False], [item["ok"] for item in results])
+
+    def test_non_string_items(self):
+        """문자열이 아닌 항목은 배치 크기와 공유 메모리 사용 여부와 관계없이 항목별 오류인지 테스트"""
+        items = ["first", 42, None, "second"]
+        for options in ({"workers": 1}, {"workers": 2, "chunk_size": 1}, {"workers": 2, "chunk_size": 1, "shm_threshold": 0}):
+            with ParallelCryptoEngine(**options) as engine:
+                results = engine.encrypt_batch(items, self.key)
+                self.assertEqual([True, False, False, True], [item["ok"] for item in results], options)
+                self.assertEqual("second", decrypt_password(results[3]["result"], self.key))
+                decrypted = engine.decrypt_batch([results[0]["result"], b"bytes"], self.key)
+                self.assertEqual([True, False], [item["ok"] for item in decrypted], options)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+도구 호출 프로파일링 테스트
+"""
+import glob
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from sumerian_mcp.offload import Offloader
+from sumerian_mcp.profiling import ToolProfiler
+from sumerian_mcp.server import SumerianMCPServer
+
+
+def _summaries(directory):
+    """기록된 요약 JSON 목록 (파일 이름 순)"""
+    summaries = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            summaries.append(json.load(f))
+    return summaries
+
+
+class TestProfiling(unittest.IsolatedAsyncioTestCase):
+    """ToolProfiler와 서버 profile 도구 테스트 케이스"""
+
+    def test_session_run(self):
+        """CLI처럼 세션 안에서 함수를 직접 실행하면 .prof/.tracemalloc/.json이 기록되는지 테스트"""
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = ToolProfiler(directory, enabled=True)
+            with profiler.profile("encrypt", 5) as session:
+                self.assertEqual(45, session.run(sum, range(10)))
+
+            (summary,) = _summaries(directory)
+            self.assertEqual(("encrypt", 5, 1), (summary["tool"], summary["size"], summary["profiled_calls"]))
+            self.assertIn("peak_bytes", summary["memory"])
+            (prof,) = glob.glob(os.path.join(directory, "*-encrypt-5B-*.prof"))
+            self.assertTrue(pstats.Stats(prof).total_calls > 0)
+            self.assertEqual(1, len(glob.glob(os.path.join(directory, "*.tracemalloc"))))
+
+    def test_sampling_and_min_duration(self):
+        """표본 비율 0이면 세션이 없고, min_duration보다 빠른 호출은 기록하지 않는지 테스트"""
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = ToolProfiler(directory, enabled=True, sample_rate=0.0)
+            with profiler.profile("encrypt", 5) as session:
+                self.assertIsNone(session)
+
+            profiler.configure(sample_rate=1.0, min_duration=60.0)
+            with profiler.profile("encrypt", 5) as session:
+                session.run(sum, range(10))
+            settings = profiler.settings()
+            self.assertEqual((1, 0, 1), (settings["sampled"], settings["written"], settings["skipped_fast"]))
+            self.assertEqual([], os.listdir(directory))
+
+            with self.assertRaises(ValueError):
+                profiler.configure(sample_rate=1.5)
+            with self.assertRaises(ValueError):
+                profiler.configure(min_duration=-1)
+
+    async def test_server_profile_tool(self):
+        """profile 도구로 켜면 스레드/프로세스 실행기로 넘긴 작업이 프로파일되는지 테스트"""
+        for cpu_kind in ("thread", "process"):
+            with self.subTest(cpu_kind=cpu_kind), tempfile.TemporaryDirectory() as directory:
+                server = SumerianMCPServer(offload=Offloader(cpu_kind=cpu_kind, cpu_workers=1, inline_max_bytes=0))
+                try:
+                    await server.mcp.call_tool("encrypt", {"password": "hello", "key": "profile_key"})
+                    self.assertEqual([], os.listdir(directory))
+
+                    result = await server.mcp.call_tool("profile", {"enabled": True, "directory": directory})
+                    self.assertTrue(json.loads(result.content[0].text)["enabled"])
+                    await server.mcp.call_tool("encrypt", {"password": "hello", "key": "profile_key"})
+                    await server.mcp.call_tool("profile", {"enabled": False})
+                    await server.mcp.call_tool("encrypt", {"password": "hello", "key": "profile_key"})
+
+                    summaries = {summary["tool"]: summary for summary in _summaries(directory)}
+                    self.assertEqual({"encrypt", "profile"}, set(summaries))
+                    self.assertEqual(len("hello") + len("profile_key"), summaries["encrypt"]["size"])
+                    self.assertGreaterEqual(summaries["encrypt"]["profiled_calls"], 1)
+                    self.assertTrue(summaries["encrypt"]["top_cumulative"])
+                    self.assertEqual(2, server.profiler.settings()["written"])
+                finally:
+                    server.close()
+
+    async def test_file_tool_size(self):
+        """파일 도구는 파일 크기가 입력 크기로 기록되는지 테스트"""
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "data.txt")
+            with open(filepath, "wb") as f:
+                f.write(b"x" * 3000)
+            profile_dir = os.path.join(directory, "profiles")
+            server = SumerianMCPServer(profiler=ToolProfiler(profile_dir, enabled=True))
+            try:
+                await server.mcp.call_tool("encrypt_file", {"filepath": filepath, "key": "profile_key"})
+            finally:
+                server.close()
+            (summary,) = _summaries(profile_dir)
+            self.assertEqual(("encrypt_file", 3000), (summary["tool"], summary["size"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
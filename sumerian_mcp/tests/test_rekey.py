@@ -0,0 +1,237 @@
+"""
+키 교체(재암호화) 테스트
+"""
+import base64
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sumerian_mcp import rekey as rekey_module
+from sumerian_mcp import vault as vault_module
+from Crypto.Cipher import AES
+from sumerian_mcp.codec import get_codec
+from sumerian_mcp.container import is_container
+from sumerian_mcp.crypto import pad, prepare_key
+from sumerian_mcp.files import decrypt_file, decrypt_stream, encrypt_dir, encrypt_file
+from sumerian_mcp.rekey import CHECKPOINT_NAME, REKEY_SUFFIX, rekey_dir, rekey_file
+from sumerian_mcp.server import SumerianMCPServer
+from sumerian_mcp.vault import SecretVault
+
+
+class TestRekeyFiles(unittest.TestCase):
+    """파일/디렉토리 키 교체 테스트 케이스"""
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.root.name, "src")
+        self.out = os.path.join(self.root.name, "out")
+        self.plain = {}
+        for index, size in enumerate((0, 1000, 70000, 200000, 5)):
+            rel = f"sub{index % 2}/file{index}.bin"
+            self.plain[rel] = os.urandom(size)
+            os.makedirs(os.path.dirname(os.path.join(self.src, rel)), exist_ok=True)
+            with open(os.path.join(self.src, rel), "wb") as f:
+                f.write(self.plain[rel])
+        encrypt_dir(self.src, self.out, "old_key")
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def assert_opens(self, key):
+        """모든 암호문이 key로 복호화되어 원본과 같은지 확인"""
+        for rel, data in self.plain.items():
+            output, _ = decrypt_file(os.path.join(self.out, rel + ".sumerian"), key, os.path.join(self.root.name, "x"))
+            with open(output, "rb") as f:
+                self.assertEqual(data, f.read(), rel)
+
+    def test_rekey_dir(self):
+        """병렬 키 교체 후 새 키로만 열리고, 다시 실행하면 모두 건너뛰며 임시 파일을 남기지 않는지 테스트"""
+        report = rekey_dir(self.out, "old_key", "new_key", workers=2, encoding="base1024")
+        self.assertEqual((5, 0, []), (report["files"], report["skipped"], report["errors"]))
+        self.assertEqual(sum(len(data) for data in self.plain.values()), report["bytes"])
+        self.assert_opens("new_key")
+        with self.assertRaises(ValueError):
+            decrypt_file(os.path.join(self.out, "sub1/file1.bin.sumerian"), "old_key", os.path.join(self.root.name, "x"))
+
+        report = rekey_dir(self.out, "old_key", "new_key")
+        self.assertEqual((0, 5), (report["files"], report["skipped"]))
+        names = [name for _, _, filenames in os.walk(self.out) for name in filenames]
+        self.assertFalse([name for name in names if name.endswith(".part") or name == CHECKPOINT_NAME])
+
+    def test_resume_after_interruption(self):
+        """중단되면 체크포인트를 남기고, 다시 실행하면 남은 파일만 처리하는지 테스트"""
+        calls = []
+
+        def interrupted(*args, **kwargs):
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            calls.append(args[0])
+            return rekey_file(*args, **kwargs)
+
+        with mock.patch.object(rekey_module, "rekey_file", side_effect=interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                rekey_dir(self.out, "old_key", "new_key")
+        with open(os.path.join(self.out, CHECKPOINT_NAME), encoding="utf-8") as f:
+            self.assertEqual(2, len(json.load(f)["done"]))
+
+        # 체크포인트는 같은 새 키로만 이어짐
+        with self.assertRaises(ValueError):
+            rekey_dir(self.out, "old_key", "other_key")
+
+        with mock.patch.object(rekey_module, "rekey_file", wraps=rekey_file) as wrapped:
+            report = rekey_dir(self.out, "old_key", "new_key")
+        self.assertEqual(3, wrapped.call_count)
+        self.assertEqual((2, 3, 0), (report["resumed"], report["files"], report["skipped"]))
+        self.assertFalse(os.path.exists(os.path.join(self.out, CHECKPOINT_NAME)))
+        self.assert_opens("new_key")
+
+    def test_failure_keeps_original(self):
+        """이전 키가 틀리면 원본을 그대로 두고 오류를 보고하며, 컨테이너는 형식을 유지하는지 테스트"""
+        path = os.path.join(self.out, "sub1/file3.bin.sumerian")
+        with open(path, "rb") as f:
+            original = f.read()
+        report = rekey_dir(self.out, "wrong_key", "new_key")
+        self.assertEqual(5, len(report["errors"]))
+        self.assertEqual(os.path.join(self.out, CHECKPOINT_NAME), report["checkpoint"])
+        with open(path, "rb") as f:
+            self.assertEqual(original, f.read())
+        self.assert_opens("old_key")
+
+        container, _ = encrypt_file(os.path.join(self.src, "sub1/file3.bin"), "old_key", container=True)
+        self.assertEqual(200000, rekey_file(container, "old_key", "new_key", mode="chacha20-poly1305"))
+        with open(container, "rb") as f:
+            self.assertTrue(is_container(f))
+        output, _ = decrypt_file(container, "new_key", os.path.join(self.root.name, "c"))
+        with open(output, "rb") as f:
+            self.assertEqual(self.plain["sub1/file3.bin"], f.read())
+
+    def _write_legacy(self, rel, text, key):
+        """KDF 도입 이전 형식(표식 없는 CBC, 키 확인 값 없음)의 암호문 파일"""
+        iv = os.urandom(16)
+        encrypted = AES.new(prepare_key(key), AES.MODE_CBC, iv).encrypt(pad(text).encode())
+        path = os.path.join(self.out, rel)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(get_codec().encode(base64.b64encode(iv + encrypted).decode()))
+        return path
+
+    @staticmethod
+    def _padding_passes(path, key):
+        """인증 없는 암호문이 이 키로 패딩 검사를 통과하는지"""
+        try:
+            with open(path, "rb") as src:
+                decrypt_stream(src, io.BytesIO(), key)
+        except ValueError:
+            return False
+        return True
+
+    def test_legacy_wrong_key_keeps_original(self):
+        """패딩 검사를 통과하는 잘못된 이전 키로 기존 형식을 교체해도 원본이 남고, 새 키로 열린다고 건너뛰지 않는지 테스트"""
+        path = self._write_legacy("legacy.sumerian", "legacy secret", "old_key")
+        with open(path, "rb") as f:
+            original = f.read()
+        wrong = next(f"wrong{i}" for i in range(20000) if self._padding_passes(path, f"wrong{i}"))
+
+        rekey_file(path, wrong, "new_key")
+        with open(path, "rb") as f:
+            self.assertEqual(original, f.read())
+        self.assertTrue(self._padding_passes(path, "old_key"))
+        os.remove(path + REKEY_SUFFIX)
+
+        # 올바른 이전 키도 기존 형식은 원본 옆에 기록
+        self.assertEqual(13, rekey_file(path, "old_key", "new_key"))
+        output, _ = decrypt_file(path + REKEY_SUFFIX, "new_key", os.path.join(self.root.name, "legacy"))
+        with open(output, "rb") as f:
+            self.assertEqual(b"legacy secret", f.read())
+        with open(path, "rb") as f:
+            self.assertEqual(original, f.read())
+        os.remove(path + REKEY_SUFFIX)
+
+        # 잘못된 이전 키로 실패했는데 새 키로 패딩 검사만 통과하는 파일은 오류로 보고
+        os.remove(path)
+        encrypt_dir(self.src, self.out, "other_key")
+        path = self._write_legacy("legacy.sumerian", "legacy secret", "old_key")
+        lucky = next(f"new{i}" for i in range(20000) if self._padding_passes(path, f"new{i}"))
+        report = rekey_dir(self.out, "other_key", lucky)
+        self.assertEqual((5, 0, ["legacy.sumerian"]), (report["files"], report["skipped"],
+                                                       [error["path"] for error in report["errors"]]))
+
+        report = rekey_dir(self.out, "old_key", "new_key", restart=True)
+        self.assertEqual(["legacy.sumerian" + REKEY_SUFFIX], report["beside"])
+
+
+class TestRekeyVault(unittest.TestCase):
+    """저장소 키 교체 테스트 케이스"""
+
+    def setUp(self):
+        self.vault = SecretVault(":memory:")
+        for index in range(25):
+            self.vault.put(f"entry{index:02}", f"secret{index}", "old_key", tags=["bulk"])
+
+    def tearDown(self):
+        self.vault.close()
+
+    def test_rekey(self):
+        """모든 항목을 새 키로 바꾸고 이미 새 키인 항목은 건너뛰는지 테스트"""
+        self.vault.put("fresh", "already", "new_key")
+        report = self.vault.rekey("old_key", "new_key", batch_size=10)
+        self.assertEqual((25, 1, []), (report["entries"], report["skipped"], report["errors"]))
+        self.assertEqual("secret7", self.vault.get("entry07", "new_key"))
+        self.assertEqual(["bulk"], self.vault.info("entry07")["tags"])
+
+        self.vault.put("stray", "x", "third_key")
+        report = self.vault.rekey("new_key", "final_key", workers=2)
+        self.assertEqual(26, report["entries"])
+        self.assertEqual(["stray"], [error["name"] for error in report["errors"]])
+
+    def test_resume(self):
+        """배치 중간에 중단되면 기록된 위치 다음부터 이어서 처리하는지 테스트"""
+        original = vault_module.encrypt_batch
+        calls = []
+
+        def interrupted(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return original(*args, **kwargs)
+
+        with mock.patch.object(vault_module, "encrypt_batch", side_effect=interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                self.vault.rekey("old_key", "new_key", batch_size=10)
+        self.assertEqual("secret9", self.vault.get("entry09", "new_key"))
+        self.assertEqual("secret10", self.vault.get("entry10", "old_key"))
+
+        with self.assertRaises(ValueError):
+            self.vault.rekey("old_key", "other_key")
+        report = self.vault.rekey("old_key", "new_key", batch_size=10)
+        self.assertEqual(("entry09", 15, 0), (report["resumed_after"], report["entries"], report["skipped"]))
+        self.assertEqual("secret24", self.vault.get("entry24", "new_key"))
+
+
+class TestRekeyServer(unittest.IsolatedAsyncioTestCase):
+    """키 교체 MCP 도구 테스트 케이스"""
+
+    async def test_tools(self):
+        """rekey_dir, vault_rekey 도구 테스트"""
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "a.txt")
+            with open(path, "w") as f:
+                f.write("rotate me")
+            encrypt_file(path, "old_key")
+            server = SumerianMCPServer(vault=os.path.join(root, "vault.db"))
+            try:
+                await server.mcp.call_tool("vault_put", {"name": "a", "secret": "s", "key": "old_key"})
+                result = await server.mcp.call_tool("rekey_dir", {"src_dir": root, "old_key": "old_key", "new_key": "new_key"})
+                self.assertEqual(1, json.loads(result.content[0].text)["files"])
+                result = await server.mcp.call_tool("vault_rekey", {"old_key": "old_key", "new_key": "new_key"})
+                self.assertEqual(1, json.loads(result.content[0].text)["entries"])
+                self.assertEqual("s", server.vault.get("a", "new_key"))
+                result = await server.mcp.call_tool("decrypt_file", {"filepath": path + ".sumerian", "key": "new_key"})
+                self.assertFalse(result.isError)
+            finally:
+                server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+CLI 시작 비용 테스트
+
+암호화 명령이 MCP 서버 의존성을 가져오지 않는지 새 인터프리터에서 확인한다
+(시간 상한은 benchmarks/bench_startup.py에서 잰다)
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 암호화 명령에서 가져오면 안 되는 최상위 모듈
+HEAVY_MODULES = ("mcp", "starlette", "pydantic", "httpx", "anyio", "uvicorn", "asyncio", "cProfile")
+
+_SCRIPT = """
+import json, sys
+sys.argv = ["sumerian-mcp"] + json.loads(sys.argv[1])
+from sumerian_mcp.cli import main
+main()
+print(json.dumps(sorted({name.split(".")[0] for name in sys.modules})))
+"""
+
+
+def _run_cli(*argv, env=None):
+    """새 인터프리터에서 CLI를 실행하고 (출력 줄 목록, 가져온 최상위 모듈 집합) 반환 (기본은 데몬 사용 안 함)"""
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, json.dumps(argv)],
+        capture_output=True, text=True, check=True, cwd=PACKAGE_DIR,
+        env={**os.environ, "PYTHONPATH": PACKAGE_DIR, "SUMERIAN_NO_DAEMON": "1", **(env or {})},
+    ).stdout.splitlines()
+    return output[:-1], set(json.loads(output[-1]))
+
+
+class TestStartup(unittest.TestCase):
+    """CLI 지연 가져오기 테스트 케이스"""
+
+    def test_crypto_commands_skip_server_stack(self):
+        """encrypt/decrypt 명령은 mcp/starlette/asyncio를 가져오지 않는지 테스트"""
+        lines, modules = _run_cli("encrypt", "hello", "startup_key")
+        self.assertEqual([], sorted(modules.intersection(HEAVY_MODULES)))
+        encrypted = lines[0].split(": ", 1)[1]
+
+        lines, modules = _run_cli("decrypt", encrypted, "startup_key")
+        self.assertIn("hello", lines[0])
+        self.assertEqual([], sorted(modules.intersection(HEAVY_MODULES)))
+
+    def test_server_export_is_lazy(self):
+        """패키지 가져오기는 server를 불러오지 않고, SumerianMCPServer에 접근하면 불러오는지 테스트"""
+        script = (
+            "import sys, sumerian_mcp; print('mcp' in sys.modules); "
+            "from sumerian_mcp import SumerianMCPServer; print(SumerianMCPServer.__module__)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONPATH=PACKAGE_DIR),
+        ).stdout.split()
+        self.assertEqual(["False", "sumerian_mcp.server"], output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+레코드 스트림 암호화/복호화 테스트
+"""
+import io
+import json
+import unittest
+from sumerian_mcp.stream import process_stream, read_records
+
+
+def _run(data, operation, key="stream_key", **kwargs):
+    """바이트열 입력을 처리하고 (출력 바이트열, 보고서, 오류 목록) 반환"""
+    dst = io.BytesIO()
+    errors = []
+    report = process_stream(
+        io.BytesIO(data), dst, operation, key, on_error=lambda index, message: errors.append(index), **kwargs
+    )
+    return dst.getvalue(), report, errors
+
+
+class TestStream(unittest.TestCase):
+    """process_stream 테스트 케이스"""
+
+    def test_read_records(self):
+        """마지막 구분자가 없어도 레코드를 읽고, 빈 레코드를 보존하는지 테스트"""
+        self.assertEqual([b"a", b"", b"b"], list(read_records(io.BytesIO(b"a\n\nb"), "lines")))
+        self.assertEqual([b"a\nb", b"c"], list(read_records(io.BytesIO(b"a\nb\0c\0"), "nul")))
+        with self.assertRaises(ValueError):
+            list(read_records(io.BytesIO(b""), "csv"))
+
+    def test_lines_roundtrip(self):
+        """줄 단위로 암호화/복호화하면 순서대로 원문이 나오는지 테스트 (여러 배치)"""
+        texts = [f"password-{i}" for i in range(25)] + ["", "비밀번호 𒀀"]
+        encrypted, report, errors = _run("\n".join(texts).encode("utf-8"), "encrypt", batch_size=4)
+        self.assertEqual((27, 0, []), (report.records, report.failed, errors))
+        self.assertEqual(27, encrypted.count(b"\n"))
+
+        decrypted, report, errors = _run(encrypted, "decrypt", batch_size=4)
+        self.assertEqual(texts, decrypted.decode("utf-8").split("\n")[:-1])
+
+    def test_nul_with_workers(self):
+        """NUL 구분 레코드를 여러 워커로 처리해도 순서가 유지되는지 테스트"""
+        texts = [f"line one\nline two {i}" for i in range(40)]
+        encrypted, report, _ = _run(b"\0".join(t.encode() for t in texts), "encrypt", fmt="nul",
+                                    workers=2, batch_size=3, mode="cbc")
+        self.assertEqual(40, report.records)
+
+        decrypted, report, _ = _run(encrypted, "decrypt", fmt="nul", workers=2, batch_size=3)
+        self.assertEqual(texts, decrypted.decode().split("\0")[:-1])
+
+    def test_failures_keep_alignment(self):
+        """실패한 레코드는 빈 레코드로 기록되어 다음 레코드의 위치가 밀리지 않는지 테스트"""
+        encrypted, _, _ = _run(b"first\nmulti", "encrypt")
+        good = encrypted.split(b"\n")
+        data = b"\n".join([good[0], b"garbage", b"\xff\xfe", good[1]])
+        decrypted, report, errors = _run(data, "decrypt")
+        self.assertEqual([b"first", b"", b"", b"multi", b""], decrypted.split(b"\n"))
+        self.assertEqual((2, [2, 3]), (report.failed, errors))
+
+        # 복호화 결과에 구분자가 들어 있으면 lines 형식으로 기록할 수 없음
+        encrypted, _, _ = _run(b"a\nb", "encrypt", fmt="nul")
+        decrypted, report, _ = _run(encrypted, "decrypt")
+        self.assertEqual((b"\n", 1), (decrypted, report.failed))
+
+    def test_jsonl(self):
+        """jsonl 형식은 문자열과 {"text", "id"} 객체를 받고 id를 결과에 되돌려 주는지 테스트"""
+        data = b'"plain"\n{"text": "with id", "id": 7}\n[1, 2]\n'
+        encrypted, report, errors = _run(data, "encrypt", fmt="jsonl")
+        results = [json.loads(line) for line in encrypted.splitlines()]
+        self.assertEqual([True, True, False], [result["ok"] for result in results])
+        self.assertEqual(7, results[1]["id"])
+        self.assertEqual([3], errors)
+
+        data = "\n".join(json.dumps({"text": result["result"], "id": i}) for i, result in enumerate(results[:2]))
+        decrypted, _, _ = _run(data.encode(), "decrypt", fmt="jsonl")
+        self.assertEqual(
+            [{"ok": True, "result": "plain", "id": 0}, {"ok": True, "result": "with id", "id": 1}],
+            [json.loads(line) for line in decrypted.splitlines()],
+        )
+
+    def test_invalid_arguments(self):
+        """알 수 없는 작업, 형식, 배치 크기는 ValueError"""
+        for kwargs in ({"operation": "sign"}, {"fmt": "csv"}, {"batch_size": 0}):
+            arguments = dict({"operation": "encrypt"}, **kwargs)
+            with self.assertRaises(ValueError):
+                process_stream(io.BytesIO(b"x"), io.BytesIO(), key="k", **arguments)
+
+
+if __name__ == "__main__":
+    unittest.main()
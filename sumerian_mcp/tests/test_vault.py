@@ -0,0 +1,191 @@
+"""
+비밀 저장소(vault) 테스트
+"""
+import io
+import json
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+from sumerian_mcp import vault as vault_module
+from sumerian_mcp.crypto import decrypt_password
+from sumerian_mcp.server import SumerianMCPServer
+from sumerian_mcp.vault import _SELECT_ENTRY, SecretVault
+
+
+class TestVault(unittest.TestCase):
+    """저장소 테스트 케이스"""
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.root.name, "data", "vault.db")
+        self.vault = SecretVault(self.path)
+
+    def tearDown(self):
+        self.vault.close()
+        self.root.cleanup()
+
+    def test_put_get(self):
+        """저장한 비밀을 이름으로 복호화하고, 덮어쓰면 생성 시각과 새 태그가 유지되는지 테스트"""
+        info = self.vault.put("db/prod", "비밀 𒀀", "vault_key", tags=["db", "prod", "db"])
+        self.assertEqual(["db", "prod"], info["tags"])
+        self.assertEqual("비밀 𒀀", self.vault.get("db/prod", "vault_key"))
+        record = self.vault.record("db/prod")
+        self.assertEqual("비밀 𒀀", decrypt_password(record["ciphertext"], "vault_key"))
+
+        updated = self.vault.put("db/prod", "새 비밀", "vault_key", tags=["rotated"], mode="siv")
+        self.assertEqual(info["created"], updated["created"])
+        self.assertGreaterEqual(updated["updated"], info["updated"])
+        self.assertEqual(["rotated"], updated["tags"])
+        self.assertEqual({"rotated": 1}, self.vault.tags())
+        self.assertEqual("새 비밀", self.vault.get("db/prod", "vault_key"))
+
+        with self.assertRaises(ValueError):
+            self.vault.put("db/prod", "x", "vault_key", overwrite=False)
+        with self.assertRaises(ValueError):
+            self.vault.get("db/prod", "wrong_key")
+        with self.assertRaises(KeyError):
+            self.vault.get("missing", "vault_key")
+        with self.assertRaises(ValueError):
+            self.vault.put("", "x", "vault_key")
+        with self.assertRaises(ValueError):
+            self.vault.put("name", "x", "vault_key", tags="db")
+
+        self.assertTrue(self.vault.delete("db/prod"))
+        self.assertFalse(self.vault.delete("db/prod"))
+        self.assertEqual({}, self.vault.tags())
+        self.assertEqual(0, len(self.vault))
+
+    def test_list_by_tag_and_prefix(self):
+        """태그와 이름 접두사로 항목 정보를 고르고 암호문은 포함하지 않는지 테스트"""
+        for name, tags in (("db/dev", ["db"]), ("db/prod", ["db", "prod"]), ("dbx", []), ("api/prod", ["prod"])):
+            self.vault.put(name, name, "vault_key", tags=tags)
+
+        names = lambda entries: [entry["name"] for entry in entries]
+        self.assertEqual(["api/prod", "db/dev", "db/prod", "dbx"], names(self.vault.list()))
+        self.assertEqual(["api/prod", "db/prod"], names(self.vault.list(tag="prod")))
+        self.assertEqual(["db/dev", "db/prod"], names(self.vault.list(prefix="db/")))
+        self.assertEqual(["db/prod"], names(self.vault.list(tag="prod", prefix="db")))
+        self.assertEqual([], self.vault.list(tag="none"))
+        self.assertEqual({"db": 2, "prod": 2}, self.vault.tags())
+        self.assertNotIn("ciphertext", self.vault.list()[0])
+
+    def test_lookup_does_not_touch_other_entries(self):
+        """이름 조회는 기본 키 색인을 쓰고 해당 항목 하나만 복호화하는지 테스트"""
+        for index in range(20):
+            self.vault.put(f"entry{index}", f"secret{index}", "vault_key", tags=["bulk"])
+
+        plan = " ".join(row[-1] for row in self.vault._conn.execute("EXPLAIN QUERY PLAN " + _SELECT_ENTRY, ("x",)))
+        self.assertIn("SEARCH", plan)
+        self.assertNotIn("SCAN", plan)
+        query = "SELECT name FROM entries WHERE name IN (SELECT name FROM tags WHERE tag = ?)"
+        plan = " ".join(row[-1] for row in self.vault._conn.execute("EXPLAIN QUERY PLAN " + query, ("bulk",)))
+        self.assertNotIn("SCAN", plan)
+
+        with mock.patch.object(vault_module, "decrypt_password", wraps=decrypt_password) as decrypt:
+            self.assertEqual("secret7", self.vault.get("entry7", "vault_key"))
+            self.vault.list(tag="bulk")
+        self.assertEqual(1, decrypt.call_count)
+
+    def test_import_export(self):
+        """암호문 그대로 내보내고 가져오며, 평문 항목은 키로 암호화하고 잘못된 줄은 줄 번호로 보고하는지 테스트"""
+        self.vault.put("a", "first", "vault_key", tags=["t"])
+        self.vault.put("b", "second", "vault_key")
+        exported = io.StringIO()
+        self.assertEqual(1, self.vault.export_jsonl(exported, tag="t"))
+        self.assertEqual(2, self.vault.export_jsonl(exported))
+
+        lines = exported.getvalue().splitlines()[1:]
+        lines += ["", json.dumps({"name": "c", "secret": "third", "tags": ["new"]}), "not json", json.dumps({"name": "d"})]
+        with SecretVault(":memory:") as other:
+            other.put("a", "old", "vault_key")
+            report = other.import_jsonl(io.StringIO("\n".join(lines)), "vault_key", overwrite=False)
+            self.assertEqual(2, report["imported"])
+            self.assertEqual(1, report["skipped"])
+            self.assertEqual([5, 6], [error["index"] for error in report["errors"]])
+            self.assertEqual("old", other.get("a", "vault_key"))
+            self.assertEqual("second", other.get("b", "vault_key"))
+            self.assertEqual("third", other.get("c", "vault_key"))
+            self.assertEqual(self.vault.record("b"), other.record("b"))
+
+            # 키 없이 평문 항목은 가져올 수 없음
+            report = other.import_records([{"name": "e", "secret": "x"}])
+            self.assertEqual((0, 1), (report["imported"], len(report["errors"])))
+
+    def test_file_permissions(self):
+        """저장소 파일이 소유자 전용 권한으로 만들어지고 다시 열어도 내용이 유지되는지 테스트"""
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+        self.vault.put("kept", "value", "vault_key")
+        self.vault.close()
+        self.vault = SecretVault(self.path)
+        self.assertEqual("value", self.vault.get("kept", "vault_key"))
+
+
+class TestVaultServer(unittest.IsolatedAsyncioTestCase):
+    """저장소 MCP 도구와 자원 테스트 케이스"""
+
+    async def asyncSetUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.server = SumerianMCPServer(vault=os.path.join(self.root.name, "vault.db"))
+
+    async def asyncTearDown(self):
+        self.server.close()
+        self.root.cleanup()
+
+    async def call(self, name, arguments):
+        result = await self.server.mcp.call_tool(name, arguments)
+        return result.isError, result.content[0].text
+
+    async def test_tools(self):
+        """vault_* 도구로 저장, 조회, 목록, 내보내기/가져오기, 삭제가 되는지 테스트"""
+        error, text = await self.call("vault_put", {"name": "db/prod", "secret": "pw", "key": "k", "tags": ["db"]})
+        self.assertFalse(error)
+        self.assertEqual("db/prod", json.loads(text)["name"])
+        self.assertEqual((False, "pw"), await self.call("vault_get", {"name": "db/prod", "key": "k"}))
+        error, text = await self.call("vault_get", {"name": "db/prod", "key": "wrong"})
+        self.assertTrue(error)
+        error, text = await self.call("vault_get", {"name": "missing", "key": "k"})
+        self.assertEqual((True, "저장소 조회 오류: 없는 항목입니다: missing"), (error, text))
+        error, text = await self.call("vault_list", {"tag": "db"})
+        self.assertEqual(["db/prod"], [entry["name"] for entry in json.loads(text)])
+
+        path = os.path.join(self.root.name, "export.jsonl")
+        error, text = await self.call("vault_export", {"path": path})
+        self.assertEqual(1, json.loads(text)["exported"])
+        deleted = await self.call("vault_delete", {"name": "db/prod"})
+        self.assertEqual((False, {"name": "db/prod", "deleted": True}), (deleted[0], json.loads(deleted[1])))
+        error, text = await self.call("vault_import", {"path": path})
+        self.assertEqual(1, json.loads(text)["imported"])
+        self.assertEqual((False, "pw"), await self.call("vault_get", {"name": "db/prod", "key": "k"}))
+        error, text = await self.call("vault_import", {"path": os.path.join(self.root.name, "missing.jsonl")})
+        self.assertTrue(error)
+
+    async def test_resources(self):
+        """vault:// 자원이 항목 정보와 암호문을 제공하는지 테스트"""
+        await self.call("vault_put", {"name": "db/prod", "secret": "pw", "key": "k", "tags": ["db"]})
+        uris = [str(resource.uri) for resource in await self.server.mcp.list_resources()]
+        self.assertEqual(["vault://entries"], uris)
+        templates = [template.uriTemplate for template in await self.server.mcp.list_resource_templates()]
+        self.assertEqual(["vault://entries/{name}", "vault://tags/{tag}"], sorted(templates))
+
+        entries = json.loads((await self.server.mcp.read_resource("vault://entries"))[0].content)
+        self.assertEqual("vault://entries/db%2Fprod", entries[0]["uri"])
+        record = json.loads((await self.server.mcp.read_resource(entries[0]["uri"]))[0].content)
+        self.assertEqual("pw", decrypt_password(record["ciphertext"], "k"))
+        tagged = json.loads((await self.server.mcp.read_resource("vault://tags/db"))[0].content)
+        self.assertEqual(["db/prod"], [entry["name"] for entry in tagged])
+
+    async def test_disabled_without_vault(self):
+        """vault를 지정하지 않으면 저장소 도구와 자원을 등록하지 않는지 테스트"""
+        server = SumerianMCPServer()
+        try:
+            names = [tool.name for tool in await server.mcp.list_tools()]
+            self.assertNotIn("vault_get", names)
+            self.assertEqual([], await server.mcp.list_resources())
+        finally:
+            server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,9 +5,25 @@ A single script that handles encryption/decryption and provides a simple interfa
 """
 from Crypto.Cipher import AES
 import base64
+import codecs
+import hashlib
+import hmac
 import os
+import random
+import re
 import json
 import asyncio
+import time
+import contextvars
+import cProfile
+import pstats
+import tempfile
+import threading
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import argparse
@@ -15,29 +31,38 @@ import argparse
 # ----- Encryption/Decryption Functions -----
 
 def pad(s):
-    """AES 블록 크기(16바이트)에 맞게 패딩 추가"""
-    return s + (16 - len(s) % 16) * chr(16 - len(s) % 16)
+    """AES 블록 크기(16바이트)에 맞게 패딩 추가 (문자 수가 아닌 UTF-8 바이트 수 기준)"""
+    n = 16 - len(s.encode("utf-8")) % 16
+    return s + n * chr(n)
 
 def unpad(s):
-    """AES 패딩 제거"""
+    """AES 패딩 제거 (패딩 문자는 모두 1바이트이므로 문자 수 = 바이트 수)"""
     return s[: -ord(s[-1])]
 
+def prepare_key(key):
+    """암호화 키 문자열을 AES-256 키 바이트로 변환"""
+    return key.ljust(32)[:32].encode()
+
 def encrypt_aes(password, key):
     """AES-256 CBC 암호화"""
-    key = key.ljust(32)[:32].encode()
+    return _encrypt_aes_with_key(password, prepare_key(key))
+
+def decrypt_aes(encrypted_password, key):
+    """AES-256 CBC 복호화"""
+    return _decrypt_aes_with_key(encrypted_password, prepare_key(key))
+
+def _encrypt_aes_with_key(password, key):
+    """준비된 키 바이트로 AES-256 CBC 암호화"""
     iv = os.urandom(16)  # 랜덤 IV 생성 (CBC 모드)
     cipher = AES.new(key, AES.MODE_CBC, iv)
     encrypted = cipher.encrypt(pad(password).encode())  # PKCS7 패딩 적용
     return base64.b64encode(iv + encrypted).decode()  # Base64 변환
 
-def decrypt_aes(encrypted_password, key):
-    """AES-256 CBC 복호화"""
-    key = key.ljust(32)[:32].encode()
-
+def _decrypt_aes_with_key(encrypted_password, key):
+    """준비된 키 바이트로 AES-256 CBC 복호화"""
     try:
         encrypted_password = base64.b64decode(encrypted_password)
-    except Exception as e:
-        print(f"[ERROR] Base64 디코딩 실패: {e}")
+    except Exception:  # 실패는 None으로만 알림 (표준 출력은 결과 스트림일 수 있으므로 쓰지 않음)
         return None
 
     iv = encrypted_password[:16]  # CBC 모드에서 IV 추출
@@ -48,8 +73,7 @@ def decrypt_aes(encrypted_password, key):
 
     try:
         decrypted_text = unpad(decrypted_bytes.decode())  # UTF-8 디코딩 및 패딩 제거
-    except UnicodeDecodeError as e:
-        print(f"[ERROR] 복호화된 데이터 UTF-8 디코딩 실패: {e}")
+    except UnicodeDecodeError:
         return None
 
     return decrypted_text
@@ -77,14 +101,67 @@ sumerian_cipher_map = {
     "'": "𒋫", "<": "𒉺", ">": "𒊒", "`": "𒋛", "~": "𒀊",
 }
 
-def encrypt_sumerian(text):
+# Base64 알파벳 (매핑되지 않은 문자는 그대로 통과)
+BASE64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+class SumerianCodec:
+    """변환 테이블을 한 번만 만들어 두고 str.translate로 변환하는 문자 매핑 코덱"""
+
+    def __init__(self, name, mapping):
+        for source, sign in mapping.items():
+            if len(source) != 1 or len(sign) != 1:
+                raise ValueError(f"코덱 매핑은 한 글자 단위여야 합니다: {source!r} → {sign!r}")
+        if len(set(mapping.values())) != len(mapping):
+            raise ValueError(f"코덱 '{name}'의 매핑에 중복된 변환 문자가 있습니다")
+        passthrough = set(BASE64_ALPHABET) - set(mapping)
+        if passthrough & set(mapping.values()):
+            raise ValueError(f"코덱 '{name}'의 변환 문자가 Base64 문자와 겹칩니다")
+
+        self.name = name
+        self.mapping = dict(mapping)
+        self._encode_table = str.maketrans(self.mapping)
+        self._decode_table = str.maketrans({sign: source for source, sign in self.mapping.items()})
+        allowed = set(self.mapping.values()) | passthrough
+        self._invalid_signs = re.compile("[^" + "".join(re.escape(c) for c in sorted(allowed)) + "]")
+
+    def encode(self, text):
+        """원본 문자열을 변환 문자로 인코딩"""
+        return text.translate(self._encode_table)
+
+    def decode(self, text, strict=False):
+        """변환 문자를 원본 문자열로 디코딩 (strict 모드에서는 허용되지 않는 문자 거부)"""
+        if strict:
+            match = self._invalid_signs.search(text)
+            if match:
+                raise ValueError(f"'{self.name}' 코덱에서 허용되지 않는 문자 {match.group()!r} (위치 {match.start()})")
+        return text.translate(self._decode_table)
+
+# 등록된 코덱 (이름 → 코덱)
+_codecs = {}
+
+def register_codec(name, mapping, replace=False):
+    """새로운 문자 체계를 이름 있는 코덱으로 등록"""
+    if name in _codecs and not replace:
+        raise ValueError(f"이미 등록된 코덱입니다: {name}")
+    _codecs[name] = SumerianCodec(name, mapping)
+    return _codecs[name]
+
+def get_codec(name="sumerian"):
+    """이름으로 코덱 조회"""
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 코덱: {name}") from None
+
+register_codec("sumerian", sumerian_cipher_map)
+
+def encrypt_sumerian(text, codec="sumerian"):
     """ASCII 텍스트를 수메르 문자로 변환"""
-    return "".join(sumerian_cipher_map.get(char.lower(), char) if char.lower() in sumerian_cipher_map else char for char in text)
+    return get_codec(codec).encode(text)
 
-def decrypt_sumerian(text):
+def decrypt_sumerian(text, codec="sumerian", strict=False):
     """수메르 문자에서 원래 ASCII로 복원"""
-    reverse_map = {v: k for k, v in sumerian_cipher_map.items()}
-    return "".join(reverse_map.get(char, char) for char in text)
+    return get_codec(codec).decode(text, strict=strict)
 
 def encrypt_password(password, key):
     """AES-256 + CBC로 암호화 후 수메르어 변환"""
@@ -93,8 +170,765 @@ def encrypt_password(password, key):
 
 def decrypt_password(encrypted_password, key):
     """수메르어 복호화 후 AES-256 + CBC 복호화"""
-    decrypted_sumerian = decrypt_sumerian(encrypted_password)
-    return decrypt_aes(decrypted_sumerian, key)
+    return _decrypt_password_with_key(encrypted_password, prepare_key(key))
+
+def _decrypt_password_with_key(encrypted_password, key):
+    """준비된 키 바이트로 수메르어 복호화 후 AES 복호화"""
+    try:
+        decrypted_sumerian = decrypt_sumerian(encrypted_password.strip(), strict=True)
+    except ValueError:
+        return None
+    return _decrypt_aes_with_key(decrypted_sumerian, key)
+
+def encrypt_batch(texts, key):
+    """
+    여러 문자열을 같은 키로 일괄 암호화 (키 준비는 배치당 한 번)
+
+    항목별 결과 목록({"ok": True, "result": ...} 또는 {"ok": False, "error": ...})을 반환
+    """
+    key = prepare_key(key)
+    results = []
+    for text in texts:
+        try:
+            results.append({"ok": True, "result": encrypt_sumerian(_encrypt_aes_with_key(text, key))})
+        except Exception as e:
+            results.append({"ok": False, "error": str(e)})
+    return results
+
+def decrypt_batch(texts, key):
+    """
+    여러 암호문을 같은 키로 일괄 복호화 (키 준비는 배치당 한 번)
+
+    항목별 결과 목록({"ok": True, "result": ...} 또는 {"ok": False, "error": ...})을 반환
+    """
+    key = prepare_key(key)
+    results = []
+    for text in texts:
+        try:
+            decrypted = _decrypt_password_with_key(text, key)
+        except Exception as e:
+            results.append({"ok": False, "error": str(e)})
+            continue
+        if decrypted is None:
+            results.append({"ok": False, "error": "Decryption failed"})
+        else:
+            results.append({"ok": True, "result": decrypted})
+    return results
+
+# ----- Streaming File Encryption -----
+
+# 스트리밍 블록 크기: AES 블록(16)과 Base64 그룹(3)의 공배수
+STREAM_CHUNK_SIZE = 48 * 1365  # 65520 bytes
+
+# 암호문 파일에서 무시할 공백 바이트 (UTF-8 연속 바이트와 겹치지 않음)
+_WHITESPACE = b" \t\r\n"
+
+def pad_bytes(data):
+    """바이트 단위 PKCS7 패딩 추가"""
+    n = 16 - len(data) % 16
+    return data + bytes([n]) * n
+
+def unpad_bytes(data):
+    """바이트 단위 PKCS7 패딩 검증 및 제거"""
+    n = data[-1] if data else 0
+    if not 1 <= n <= 16 or data[-n:] != bytes([n]) * n:
+        raise ValueError("Invalid padding")
+    return data[:-n]
+
+def encrypt_stream(src, dst, key, chunk_size=STREAM_CHUNK_SIZE, codec="sumerian"):
+    """
+    바이너리 스트림을 고정 크기 블록 단위로 암호화하여 수메르어로 기록
+
+    출력 형식은 encrypt_password와 동일(Base64(IV + CBC 암호문)의 수메르어 변환)하며,
+    메모리 사용량은 chunk_size에 비례한다. 읽은 평문 바이트 수를 반환한다.
+    """
+    if chunk_size % 48:
+        raise ValueError("chunk_size must be a multiple of 48")
+    sumerian = get_codec(codec)
+    iv = os.urandom(16)
+    cipher = AES.new(key.ljust(32)[:32].encode(), AES.MODE_CBC, iv)
+    pending = iv  # Base64 3바이트 경계에 맞지 않아 남은 바이트
+    total = 0
+
+    while True:
+        chunk = src.read(chunk_size)
+        total += len(chunk)
+        final = len(chunk) < chunk_size
+        data = pending + cipher.encrypt(pad_bytes(chunk) if final else chunk)
+        cut = len(data) if final else len(data) - len(data) % 3
+        pending = data[cut:]
+        dst.write(sumerian.encode(base64.b64encode(data[:cut]).decode("ascii")).encode("utf-8"))
+        if final:
+            return total
+
+def decrypt_stream(src, dst, key, chunk_size=STREAM_CHUNK_SIZE, codec="sumerian"):
+    """
+    수메르어 암호문 스트림을 블록 단위로 복호화하여 바이너리로 기록
+
+    블록 경계에 걸친 UTF-8 코드 포인트는 증분 디코더가 이어 붙인다.
+    키가 잘못되었거나 데이터가 손상되면 ValueError를 발생시킨다.
+    쓰여진 평문 바이트 수를 반환한다.
+    """
+    sumerian = get_codec(codec)
+    key = key.ljust(32)[:32].encode()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    cipher = None
+    b64_pending = ""
+    raw = b""
+    total = 0
+
+    while True:
+        block = src.read(chunk_size)
+        final = not block
+        text = decoder.decode(block.translate(None, _WHITESPACE), final=final)
+        b64 = b64_pending + sumerian.decode(text, strict=True)
+        cut = len(b64) if final else len(b64) - len(b64) % 4
+        b64_pending = b64[cut:]
+        raw += base64.b64decode(b64[:cut], validate=True)
+
+        if cipher is None:
+            if len(raw) < 16:
+                if final:
+                    raise ValueError("Ciphertext too short")
+                continue
+            cipher = AES.new(key, AES.MODE_CBC, raw[:16])
+            raw = raw[16:]
+
+        if final:
+            if not raw or len(raw) % 16:
+                raise ValueError("Ciphertext is not a multiple of the block size")
+            plain = unpad_bytes(cipher.decrypt(raw))
+            dst.write(plain)
+            return total + len(plain)
+
+        # 패딩 검증을 위해 마지막 블록은 최종 단계까지 남겨 둔다
+        n = (len(raw) // 16 - 1) * 16
+        if n > 0:
+            plain = cipher.decrypt(raw[:n])
+            raw = raw[n:]
+            dst.write(plain)
+            total += len(plain)
+
+def stream_file(stream_func, filepath, output_filepath, key):
+    """
+    파일 단위 스트리밍 처리
+
+    결과를 임시 파일에 기록한 뒤 성공 시에만 출력 경로로 교체한다.
+    """
+    tmp_filepath = output_filepath + ".part"
+    try:
+        with open(filepath, "rb") as src, open(tmp_filepath, "wb") as dst:
+            size = stream_func(src, dst, key)
+        os.replace(tmp_filepath, output_filepath)
+        return size
+    except BaseException:
+        if os.path.exists(tmp_filepath):
+            os.remove(tmp_filepath)
+        raise
+
+# ----- Parallel Batch Workers -----
+
+# 워커 프로세스 작업 하나에 담을 항목 수
+BATCH_CHUNK_SIZE = 256
+
+def run_batch_chunk(operation, texts, key):
+    """
+    배치 청크 하나를 처리 (워커 프로세스 진입점)
+
+    (워커 PID, 항목별 결과, 처리한 바이트 수, 소요 시간)을 반환
+    """
+    started = time.perf_counter()
+    batch_func = encrypt_batch if operation == "encrypt" else decrypt_batch
+    results = batch_func(texts, key)
+    nbytes = sum(len(text.encode("utf-8")) for text in texts)
+    return os.getpid(), results, nbytes, time.perf_counter() - started
+
+# ----- Directory Encryption -----
+
+MANIFEST_NAME = "manifest.json"
+
+def scan_tree(root, exclude=None):
+    """Collect (relative path, size) for regular files under root, skipping the exclude directory"""
+    exclude = os.path.abspath(exclude) if exclude else None
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if os.path.abspath(os.path.join(dirpath, d)) != exclude)
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if os.path.isfile(path) and not os.path.islink(path):
+                entries.append((os.path.relpath(path, root).replace(os.sep, "/"), os.path.getsize(path)))
+    return entries
+
+def read_manifest(path):
+    """Load a directory manifest written by encrypt_dir"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def process_dir_group(operation, src_root, dst_root, key, group):
+    """
+    디렉토리 작업의 파일 묶음 하나를 처리 (워커 프로세스 진입점)
+
+    복호화 항목에는 매니페스트에 기록된 암호문 이름이 세 번째 값으로 들어 있다.
+    파일별 결과({"path", "size", "output"} 또는 "error" 포함) 목록을 반환
+    """
+    results = []
+    for entry in group:
+        rel, size = entry[:2]
+        if operation == "encrypt":
+            source, output, stream_func = rel, rel + ".sumerian", encrypt_stream
+        else:
+            source, output, stream_func = entry[2], rel, decrypt_stream
+        try:
+            for path in (source, output):
+                if path.startswith("/") or any(part in ("", ".", "..") for part in path.split("/")):
+                    raise ValueError(f"Invalid path: {path}")
+            output_path = os.path.join(dst_root, *output.split("/"))
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            written = stream_file(stream_func, os.path.join(src_root, *source.split("/")), output_path, key)
+            if operation == "decrypt" and written != size:
+                raise ValueError(f"Size mismatch: manifest {size}, decrypted {written}")
+            results.append({"path": rel, "size": written, "output": output})
+        except Exception as e:
+            results.append({"path": rel, "size": size, "output": output, "error": str(e)})
+    return results
+
+# ----- Key Rotation -----
+
+REKEY_CHECKPOINT_NAME = ".sumerian-rekey.json"
+
+# Rekeyed ciphertext is written beside the original under this suffix. The format is unauthenticated CBC, so a
+# wrong old key passes the padding check about once in 256 files; the original is never overwritten
+REKEY_SUFFIX = ".rekeyed"
+
+# Files per rekey job; small so the checkpoint advances often
+REKEY_GROUP_SIZE = 16
+
+def rekey_stream(src, dst, old_key, new_key):
+    """
+    암호문 스트림을 새 키로 다시 암호화
+
+    복호화 스레드가 파이프에 쓰고 암호화가 그 파이프를 읽으므로 평문 전체를 메모리나 디스크에 두지 않는다.
+    평문 바이트 수를 반환하며, 이전 키로 복호화할 수 없으면 ValueError를 발생시킨다.
+    """
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def produce():
+        try:
+            with open(write_fd, "wb") as writer:
+                decrypt_stream(src, writer, old_key)
+        except BaseException as e:  # includes BrokenPipeError when the encrypt side gave up
+            errors.append(e)
+
+    thread = threading.Thread(target=produce, name="rekey-decrypt", daemon=True)
+    with open(read_fd, "rb") as reader:
+        thread.start()
+        try:
+            size = encrypt_stream(reader, dst, new_key)
+        finally:
+            reader.close()
+            thread.join()
+    if errors:
+        raise errors[0]
+    return size
+
+def rekey_file(filepath, old_key, new_key, output_filepath=None):
+    """
+    Re-encrypt one file beside the original (default: filepath + REKEY_SUFFIX), leaving the original untouched
+
+    The output is written and fsynced as a temp file, then atomically moved into place. Returns the plaintext size.
+    """
+    output_filepath = output_filepath or filepath + REKEY_SUFFIX
+    if os.path.abspath(output_filepath) == os.path.abspath(filepath):
+        raise ValueError("Rekey output must not overwrite the original ciphertext")
+    tmp_filepath = output_filepath + ".part"
+    try:
+        with open(filepath, "rb") as src, open(tmp_filepath, "wb") as dst:
+            size = rekey_stream(src, dst, old_key, new_key)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_filepath, output_filepath)
+        return size
+    except BaseException:
+        if os.path.exists(tmp_filepath):
+            os.remove(tmp_filepath)
+        raise
+
+def rekey_group(root, old_key, new_key, group):
+    """
+    키 교체 작업의 파일 묶음 하나를 처리 (워커 프로세스 진입점)
+
+    새 암호문은 원본 옆의 REKEY_SUFFIX 파일에 기록하고 원본은 그대로 둔다.
+    파일별 결과({"path", "size", "output"} 또는 "error" 포함) 목록을 반환
+    """
+    results = []
+    for rel, size in group:
+        path = os.path.join(root, *rel.split("/"))
+        output = rel + REKEY_SUFFIX
+        try:
+            results.append({"path": rel, "size": rekey_file(path, old_key, new_key), "output": output})
+        except Exception as e:
+            results.append({"path": rel, "size": size, "output": output, "error": str(e)})
+    return results
+
+def key_fingerprint(key):
+    """Slow-hash fingerprint tying a checkpoint to its new key without storing the key"""
+    return hashlib.pbkdf2_hmac("sha256", key.encode("utf-8"), b"sumerian-mcp rekey checkpoint", 100000)[:8].hex()
+
+def read_rekey_checkpoint(path, target, restart=False):
+    """Paths already rekeyed by an interrupted run toward the same new key"""
+    if restart or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("target") != target:
+        raise ValueError("Checkpoint belongs to a different new key (pass restart to start over)")
+    return set(checkpoint.get("done", []))
+
+def write_rekey_checkpoint(path, target, done):
+    """Atomically replace the checkpoint file"""
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "target": target, "done": sorted(done)}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".part", path)
+
+# ----- Offload Executors -----
+
+# Payloads smaller than this run inline on the event loop; the executor hop costs more than the work
+INLINE_MAX_BYTES = 16 * 1024
+
+class OffloadExecutor:
+    """A thread or process executor that caps how many jobs are submitted to it at once"""
+    
+    def __init__(self, name: str, kind: str = "thread", workers: Optional[int] = None, limit: Optional[int] = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.limit = limit or self.workers
+        self.executor = None
+        self.semaphores = {}
+        self.stats = {"submitted": 0, "completed": 0, "inline": 0, "in_flight": 0, "waiting": 0}
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semaphores bind to the loop that first uses them, so keep one per running loop"""
+        loop = asyncio.get_running_loop()
+        for closed in [other for other in self.semaphores if other.is_closed()]:
+            del self.semaphores[closed]
+        if loop not in self.semaphores:
+            self.semaphores[loop] = asyncio.Semaphore(self.limit)
+        return self.semaphores[loop]
+    
+    async def run(self, func, *args, inline: bool = False):
+        """Run func(*args) on the executor, waiting for a free slot first; inline=True runs it right here"""
+        session = PROFILE_SESSION.get()
+        if inline:
+            self.stats["inline"] += 1
+            if session is not None:
+                return session.merge(profiled_call(func, args))
+            return func(*args)
+        
+        if self.executor is None:
+            if self.kind == "process":
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"sumerian-{self.name}")
+        
+        semaphore = self._semaphore()
+        self.stats["waiting"] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.stats["waiting"] -= 1
+        self.stats["submitted"] += 1
+        self.stats["in_flight"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if session is None:
+                return await loop.run_in_executor(self.executor, partial(func, *args))
+            # Profile where the work runs, so concurrent calls on the event loop don't leak into the stats
+            return session.merge(await loop.run_in_executor(self.executor, partial(profiled_call, func, args)))
+        finally:
+            self.stats["in_flight"] -= 1
+            self.stats["completed"] += 1
+            semaphore.release()
+    
+    def report(self) -> Dict[str, Any]:
+        return dict(self.stats, kind=self.kind, workers=self.workers, limit=self.limit)
+    
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+# ----- Decrypt Cache -----
+
+DECRYPT_CACHE_SIZE = 256
+DECRYPT_CACHE_TTL = 300.0
+
+class DecryptCache:
+    """LRU + TTL cache of decrypt results, keyed by ciphertext digest and key fingerprint
+    
+    Lives on the event loop, so it works with either CPU executor. Plaintexts are held as UTF-8 bytearrays
+    and zeroed on eviction, and the key fingerprint is an HMAC under a per-process secret so no key is stored.
+    Concurrent misses for the same entry await one computation instead of each decrypting.
+    """
+    
+    def __init__(self, maxsize: int = DECRYPT_CACHE_SIZE, ttl: Optional[float] = DECRYPT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._secret = os.urandom(32)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+    
+    def _cache_key(self, text: str, key: str):
+        digest = hashlib.sha256(text.strip().encode("utf-8")).digest()
+        return digest, hmac.new(self._secret, key.encode("utf-8"), "sha256").digest()
+    
+    def _evict(self, cache_key):
+        plaintext, _ = self._entries.pop(cache_key)
+        self.evictions += 1
+        if plaintext is not None:
+            plaintext[:] = bytes(len(plaintext))
+    
+    async def get_or_compute(self, text: str, key: str, compute):
+        """Return the cached result for (text, key), or await compute() once and cache it (failures too)"""
+        cache_key = self._cache_key(text, key)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            if self.ttl is None or entry[1] > time.monotonic():
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return None if entry[0] is None else entry[0].decode("utf-8")
+            self._evict(cache_key)
+        
+        pending = self._pending.get(cache_key)
+        if pending is not None:
+            self.coalesced += 1
+            # shield: a cancelled waiter must not cancel the computation the others are awaiting
+            return await asyncio.shield(pending)
+        
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[cache_key] = future
+        try:
+            result = await compute()
+            future.set_result(result)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._pending[cache_key]
+            if not future.done():
+                future.cancel()
+        
+        if cache_key in self._entries:
+            self._evict(cache_key)
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[cache_key] = (None if result is None else bytearray(result.encode("utf-8")), expires)
+        while len(self._entries) > self.maxsize:
+            self._evict(next(iter(self._entries)))
+        return result
+    
+    def clear(self):
+        """Drop and zero every cached plaintext"""
+        for cache_key in list(self._entries):
+            self._evict(cache_key)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
+
+# ----- Tool Metrics -----
+
+# Latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Input size classes used to split latency, so slow payload sizes stand out
+SIZE_CLASSES = ((1024, "le_1k"), (64 * 1024, "le_64k"), (1024 * 1024, "le_1m"))
+
+def payload_size(value) -> int:
+    """UTF-8 byte count of the strings in tool params or results (ASCII strings skip the encode)"""
+    if isinstance(value, str):
+        return len(value) if value.isascii() else len(value.encode("utf-8", "surrogatepass"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(payload_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    return 0
+
+def size_class(size: int) -> str:
+    for limit, label in SIZE_CLASSES:
+        if size <= limit:
+            return label
+    return "gt_1m"
+
+class ToolMetrics:
+    """Per-tool call, error, in-flight, byte and latency counters, updated on the event loop only"""
+    
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.tools = {}
+        self.started = time.time()
+    
+    def begin(self, tool: str, params: Dict[str, Any]):
+        """Record a call start; returns a token for end(), or None when disabled"""
+        if not self.enabled:
+            return None
+        stats = self.tools.get(tool)
+        if stats is None:
+            stats = self.tools[tool] = {"calls": 0, "errors": 0, "in_flight": 0, "input_bytes": 0,
+                                        "output_bytes": 0, "latency": {}}
+        size = payload_size(params)
+        stats["calls"] += 1
+        stats["in_flight"] += 1
+        stats["input_bytes"] += size
+        return stats, size, time.perf_counter()
+    
+    def end(self, token, result: Any = None, error: bool = False):
+        if token is None:
+            return
+        stats, size, started = token
+        elapsed = time.perf_counter() - started
+        stats["in_flight"] -= 1
+        stats["errors"] += bool(error)
+        stats["output_bytes"] += payload_size(result)
+        histogram = stats["latency"].setdefault(size_class(size), {"counts": [0] * (len(LATENCY_BUCKETS) + 1),
+                                                                  "sum": 0.0, "count": 0})
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS) if elapsed <= bound), len(LATENCY_BUCKETS))
+        histogram["counts"][index] += 1
+        histogram["sum"] += elapsed
+        histogram["count"] += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-tool metrics for the stats tool; percentiles are bucket upper-bound estimates"""
+        def quantile(histogram, q):
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, histogram["counts"]):
+                cumulative += n
+                if n and cumulative >= q * histogram["count"]:
+                    return bound * 1000
+            return None
+        
+        tools = {}
+        for name, stats in sorted(self.tools.items()):
+            tools[name] = dict(stats, latency={
+                label: {
+                    "count": histogram["count"],
+                    "mean_ms": histogram["sum"] / histogram["count"] * 1000,
+                    "p50_ms": quantile(histogram, 0.5),
+                    "p99_ms": quantile(histogram, 0.99),
+                }
+                for label, histogram in sorted(stats["latency"].items())
+            })
+        return {"enabled": self.enabled, "uptime_seconds": time.time() - self.started, "tools": tools}
+    
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format for the /metrics route"""
+        lines = []
+        tools = sorted(self.tools.items())
+        for name, field, kind, help_text in (
+            ("tool_calls_total", "calls", "counter", "Tool calls started"),
+            ("tool_errors_total", "errors", "counter", "Tool calls that failed"),
+            ("tool_in_flight", "in_flight", "gauge", "Tool calls currently running"),
+            ("tool_input_bytes_total", "input_bytes", "counter", "UTF-8 bytes of tool arguments"),
+            ("tool_output_bytes_total", "output_bytes", "counter", "UTF-8 bytes of tool results"),
+        ):
+            lines += [f"# HELP sumerian_{name} {help_text}", f"# TYPE sumerian_{name} {kind}"]
+            lines += [f'sumerian_{name}{{tool="{tool}"}} {stats[field]}' for tool, stats in tools]
+        
+        lines += ["# HELP sumerian_tool_duration_seconds Tool call latency by input size class",
+                  "# TYPE sumerian_tool_duration_seconds histogram"]
+        for tool, stats in tools:
+            for label, histogram in sorted(stats["latency"].items()):
+                labels = f'tool="{tool}",size="{label}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, histogram["counts"]):
+                    cumulative += n
+                    lines.append(f'sumerian_tool_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'sumerian_tool_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+                lines.append(f"sumerian_tool_duration_seconds_sum{{{labels}}} {histogram['sum']}")
+                lines.append(f"sumerian_tool_duration_seconds_count{{{labels}}} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+    
+    def reset(self):
+        self.tools = {}
+        self.started = time.time()
+
+# ----- Profiling -----
+
+DEFAULT_PROFILE_DIR = os.path.join(tempfile.gettempdir(), "sumerian-profiles")
+
+# The profile session of the tool call running in the current context, picked up by OffloadExecutor.run
+PROFILE_SESSION = contextvars.ContextVar("sumerian_profile_session", default=None)
+
+# tracemalloc is process-wide, so only one session traces memory at a time
+_MEMORY_LOCK = threading.Lock()
+
+class _StatsHolder:
+    """Wraps a raw cProfile stats dict so pstats.Stats can load it"""
+    
+    def __init__(self, stats):
+        self.stats = stats
+    
+    def create_stats(self):
+        pass
+
+def profiled_call(func, args):
+    """Run func(*args) under cProfile in an executor worker; returns (result, error, stats)"""
+    profile = cProfile.Profile()
+    result = error = None
+    try:
+        result = profile.runcall(func, *args)
+    except BaseException as e:
+        error = e
+    profile.create_stats()
+    return result, error, profile.stats
+
+class ProfileSession:
+    """cProfile stats and a tracemalloc snapshot collected for one tool call"""
+    
+    def __init__(self, tool: str, size: int, memory: bool = True):
+        self.tool = tool
+        self.size = size
+        self.created = time.time()
+        self.duration = None
+        self.calls = 0
+        self.stats = None
+        self.memory = None
+        self.tracing = memory and _MEMORY_LOCK.acquire(blocking=False)
+        self.was_tracing = tracemalloc.is_tracing()
+        if self.tracing and not self.was_tracing:
+            tracemalloc.start()
+        self.started = time.perf_counter()
+    
+    def merge(self, outcome):
+        """Fold a profiled_call() outcome into the session and return (or raise) the original result"""
+        result, error, stats = outcome
+        self.calls += 1
+        if self.stats is None:
+            self.stats = pstats.Stats(_StatsHolder(stats))
+        else:
+            self.stats.add(_StatsHolder(stats))
+        if error is not None:
+            raise error
+        return result
+    
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+        if self.tracing:
+            self.memory = (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1])
+            if not self.was_tracing:
+                tracemalloc.stop()
+            _MEMORY_LOCK.release()
+            self.tracing = False
+
+class ToolProfiler:
+    """Profiles a sample of tool calls and writes .prof, .tracemalloc and .json files per call"""
+    
+    def __init__(self, directory: str = DEFAULT_PROFILE_DIR, enabled: bool = False, sample_rate: float = 1.0,
+                 min_duration: float = 0.0):
+        self.directory = directory
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.min_duration = min_duration
+        self.sequence = 0
+        self.counts = {"sampled": 0, "written": 0, "skipped_fast": 0}
+    
+    def configure(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Update enabled, sample_rate, min_duration_ms and directory from tool params; returns the settings"""
+        if params.get("sample_rate") is not None:
+            sample_rate = float(params["sample_rate"])
+            if not 0 <= sample_rate <= 1:
+                raise ValueError("sample_rate must be between 0 and 1")
+            self.sample_rate = sample_rate
+        if params.get("min_duration_ms") is not None:
+            min_duration = float(params["min_duration_ms"]) / 1000
+            if min_duration < 0:
+                raise ValueError("min_duration_ms must not be negative")
+            self.min_duration = min_duration
+        if params.get("directory"):
+            self.directory = params["directory"]
+        if params.get("enabled") is not None:
+            enabled = params["enabled"]
+            self.enabled = enabled.lower() in ("1", "true", "yes", "on") if isinstance(enabled, str) else bool(enabled)
+        return self.settings()
+    
+    def settings(self) -> Dict[str, Any]:
+        return dict(self.counts, enabled=self.enabled, directory=self.directory, sample_rate=self.sample_rate,
+                    min_duration_ms=self.min_duration * 1000)
+    
+    @contextmanager
+    def profile(self, tool: str, size: int):
+        """Wrap one tool call; yields the session, or None when the call is not sampled"""
+        if not self.enabled or random.random() >= self.sample_rate:
+            yield None
+            return
+        self.counts["sampled"] += 1
+        session = ProfileSession(tool, size)
+        token = PROFILE_SESSION.set(session)
+        try:
+            yield session
+        finally:
+            PROFILE_SESSION.reset(token)
+            session.finish()
+            self.write(session)
+    
+    def write(self, session: ProfileSession) -> Optional[str]:
+        """Write the session files, named by time, tool, input size and duration; returns the path prefix"""
+        if session.duration < self.min_duration:
+            self.counts["skipped_fast"] += 1
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        self.sequence += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(session.created))
+        tool = re.sub(r"[^\w-]", "_", session.tool)
+        base = os.path.join(self.directory, f"{stamp}-{self.sequence:05d}-{tool}-{session.size}B-"
+                                            f"{round(session.duration * 1000)}ms")
+        
+        summary = {"tool": session.tool, "size": session.size, "duration_ms": session.duration * 1000,
+                   "started": session.created, "profiled_calls": session.calls}
+        if session.stats is not None:
+            session.stats.dump_stats(base + ".prof")
+            entries = sorted(session.stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:20]
+            summary["top_cumulative"] = [
+                {"function": f"{filename}:{line}({name})", "ncalls": ncalls, "tottime": tottime, "cumtime": cumtime}
+                for (filename, line, name), (_, ncalls, tottime, cumtime, _) in entries
+            ]
+        if session.memory is not None:
+            snapshot, peak = session.memory
+            snapshot.dump(base + ".tracemalloc")
+            summary["memory"] = {"peak_bytes": peak, "top_allocations": [
+                {"location": str(stat.traceback), "size": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:20]
+            ]}
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        self.counts["written"] += 1
+        return base
+
+def invocation_size(params: Dict[str, Any]) -> int:
+    """Input size for profile file names: the file size for file tools, otherwise the params' UTF-8 bytes"""
+    filepath = params.get("filepath")
+    if isinstance(filepath, str) and os.path.isfile(filepath):
+        return os.path.getsize(filepath)
+    return payload_size(params)
 
 # ----- MCP Interface -----
 
@@ -114,10 +948,47 @@ class Tool:
         }
 
 class MCP:
-    def __init__(self):
+    def __init__(self, workers: int = 1, cpu_executor: str = "thread", cpu_workers: Optional[int] = None,
+                 io_workers: int = 4, cpu_limit: Optional[int] = None, io_limit: Optional[int] = None,
+                 echo_original: bool = True, metrics: bool = True, profile_dir: Optional[str] = None,
+                 profile_sample: float = 1.0, profile_min_ms: float = 0.0, decrypt_cache: bool = False,
+                 decrypt_cache_size: Optional[int] = None, decrypt_cache_ttl: Optional[float] = None):
         self.tools = {}
         self.master_key = os.environ.get("MASTER_KEY", "sumerian_default_key")
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        self.worker_stats = {}
+        # Echoing the plaintext back roughly doubles encrypt response size; callers already have it
+        self.echo_original = echo_original
+        # AES work goes to the CPU executor and file streaming to the I/O executor, keeping the event loop free
+        self.cpu = OffloadExecutor("cpu", cpu_executor, cpu_workers, cpu_limit)
+        self.io = OffloadExecutor("io", "thread", io_workers, io_limit)
+        # Per-tool counters for the stats tool and the HTTP /metrics route
+        self.metrics = ToolMetrics(enabled=metrics)
+        # cProfile/tracemalloc per tool call, on from the start with profile_dir or toggled with the profile tool
+        self.profiler = ToolProfiler(profile_dir or DEFAULT_PROFILE_DIR, enabled=bool(profile_dir),
+                                     sample_rate=profile_sample, min_duration=profile_min_ms / 1000)
+        # Opt-in: agents tend to decrypt the same few credentials over and over
+        self.decrypt_cache = DecryptCache(
+            decrypt_cache_size or DECRYPT_CACHE_SIZE,
+            DECRYPT_CACHE_TTL if decrypt_cache_ttl is None else decrypt_cache_ttl,
+        ) if decrypt_cache else None
         self.initialize_tools()
+    
+    async def run_cpu(self, func, *args, size: int = 0):
+        """Run CPU-bound work off the event loop unless the payload is small"""
+        return await self.cpu.run(func, *args, inline=size < INLINE_MAX_BYTES)
+    
+    async def run_io(self, func, *args):
+        """Run blocking file I/O on the I/O executor"""
+        return await self.io.run(func, *args)
+    
+    def close(self):
+        """Shut down the worker pool and offload executors"""
+        if self.pool:
+            self.pool.shutdown()
+        self.cpu.close()
+        self.io.close()
         
     def initialize_tools(self):
         # Register encryption tools
@@ -135,6 +1006,63 @@ class MCP:
             self.handle_decrypt
         )
         
+        self.register_tool(
+            "encrypt_dir", 
+            "Encrypt Directory", 
+            "Recursively encrypt a directory tree and write a manifest", 
+            self.handle_encrypt_dir
+        )
+        
+        self.register_tool(
+            "decrypt_dir", 
+            "Decrypt Directory", 
+            "Decrypt a directory tree produced by encrypt_dir using its manifest", 
+            self.handle_decrypt_dir
+        )
+        
+        self.register_tool(
+            "rekey", 
+            "Rotate Key", 
+            "Re-encrypt a .sumerian file, or every one under src_dir, from old_key to new_key into a .rekeyed file "
+            "beside each original (originals are kept); resumes after a crash", 
+            self.handle_rekey
+        )
+        
+        self.register_tool(
+            "encrypt_batch", 
+            "Encrypt Batch", 
+            "Encrypt a list of texts under one key, with a result per item", 
+            self.handle_encrypt_batch
+        )
+        
+        self.register_tool(
+            "decrypt_batch", 
+            "Decrypt Batch", 
+            "Decrypt a list of Sumerian cuneiform texts under one key, with a result per item", 
+            self.handle_decrypt_batch
+        )
+        
+        self.register_tool(
+            "worker_stats", 
+            "Worker Statistics", 
+            "Show per-worker batch throughput", 
+            self.handle_worker_stats
+        )
+        
+        self.register_tool(
+            "stats", 
+            "Tool Metrics", 
+            "Show per-tool call counts, errors, in-flight calls, bytes and latency by input size", 
+            self.handle_stats
+        )
+        
+        self.register_tool(
+            "profile", 
+            "Tool Profiling", 
+            "Turn per-call cProfile/tracemalloc profiling on or off, or change its sample rate and directory", 
+            self.handle_profile
+        )
+        
         self.register_tool(
             "list_tools", 
             "List Available Tools", 
@@ -168,11 +1096,22 @@ class MCP:
         if tool_id not in self.tools:
             return {"error": f"Tool not found: {tool_id}"}
         
+        if self.profiler.enabled:
+            with self.profiler.profile(tool_id, invocation_size(params)):
+                return await self._call_tool(tool_id, params)
+        return await self._call_tool(tool_id, params)
+    
+    async def _call_tool(self, tool_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        token = self.metrics.begin(tool_id, params)
         try:
             result = await self.tools[tool_id].handler(params)
-            return result
         except Exception as e:
-            return {"error": str(e)}
+            result = {"error": str(e)}
+        except BaseException:
+            self.metrics.end(token, error=True)
+            raise
+        self.metrics.end(token, result, error="error" in result)
+        return result
     
     async def handle_encrypt(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle encrypt command"""
@@ -182,12 +1121,14 @@ class MCP:
         if not text:
             return {"error": "Missing text parameter"}
         
-        encrypted = encrypt_password(text, key)
-        return {
-            "original": text,
+        encrypted = await self.run_cpu(encrypt_password, text, key, size=len(text))
+        result = {
             "encrypted": encrypted,
             "timestamp": datetime.now().isoformat()
         }
+        if params.get("echo_original", self.echo_original):
+            result["original"] = text
+        return result
     
     async def handle_decrypt(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle decrypt command"""
@@ -197,7 +1138,12 @@ class MCP:
         if not text:
             return {"error": "Missing text parameter"}
         
-        decrypted = decrypt_password(text, key)
+        if self.decrypt_cache:
+            decrypted = await self.decrypt_cache.get_or_compute(
+                text, key, lambda: self.run_cpu(decrypt_password, text, key, size=len(text))
+            )
+        else:
+            decrypted = await self.run_cpu(decrypt_password, text, key, size=len(text))
         if decrypted is None:
             return {"error": "Decryption failed"}
         
@@ -207,6 +1153,78 @@ class MCP:
             "timestamp": datetime.now().isoformat()
         }
     
+    async def handle_encrypt_batch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle encrypt_batch command"""
+        return await self._batch_response("encrypt", params)
+    
+    async def handle_decrypt_batch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle decrypt_batch command"""
+        return await self._batch_response("decrypt", params)
+    
+    async def _batch_response(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a batch over params["texts"], fanning chunks out to the worker pool if enabled"""
+        texts = params.get("texts")
+        key = params.get("key", self.master_key)
+        
+        if not isinstance(texts, list) or not texts:
+            return {"error": "Missing texts parameter (non-empty list)"}
+        
+        if self.pool and len(texts) > BATCH_CHUNK_SIZE:
+            chunks = [texts[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(texts), BATCH_CHUNK_SIZE)]
+            outputs = await asyncio.gather(*(
+                asyncio.wrap_future(self.pool.submit(run_batch_chunk, operation, chunk, key))
+                for chunk in chunks
+            ))
+        else:
+            size = sum(len(text) for text in texts if isinstance(text, str))
+            outputs = [await self.run_cpu(run_batch_chunk, operation, texts, key, size=size)]
+        
+        results = []
+        for pid, chunk_results, nbytes, elapsed in outputs:
+            stats = self.worker_stats.setdefault(pid, {"tasks": 0, "items": 0, "bytes": 0, "seconds": 0.0})
+            stats["tasks"] += 1
+            stats["items"] += len(chunk_results)
+            stats["bytes"] += nbytes
+            stats["seconds"] += elapsed
+            results.extend(chunk_results)
+        
+        succeeded = sum(1 for result in results if result["ok"])
+        return {
+            "results": results,
+            "count": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def handle_worker_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle worker_stats command"""
+        per_worker = {}
+        for pid, stats in self.worker_stats.items():
+            seconds = stats["seconds"] or float("inf")
+            per_worker[str(pid)] = dict(
+                stats,
+                items_per_s=stats["items"] / seconds,
+                mb_per_s=stats["bytes"] / seconds / (1024 * 1024)
+            )
+        return {
+            "workers": self.workers,
+            "per_worker": per_worker,
+            "executors": {"cpu": self.cpu.report(), "io": self.io.report()},
+            "decrypt_cache": self.decrypt_cache.stats() if self.decrypt_cache else None
+        }
+    
+    async def handle_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle stats command; pass "reset": true to clear the counters after reading"""
+        snapshot = self.metrics.snapshot()
+        if params.get("reset"):
+            self.metrics.reset()
+        return snapshot
+    
+    async def handle_profile(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle profile command; params enabled, sample_rate, min_duration_ms and directory are all optional"""
+        return self.profiler.configure(params)
+    
     async def handle_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle list_tools command"""
         return {
@@ -224,17 +1242,12 @@ class MCP:
             return {"error": "Missing filepath parameter"}
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            encrypted = encrypt_password(content, key)
-            
-            with open(output_filepath, 'w', encoding='utf-8') as f:
-                f.write(encrypted)
+            size = await self.run_io(stream_file, encrypt_stream, filepath, output_filepath, key)
             
             return {
                 "source_file": filepath,
                 "output_file": output_filepath,
+                "bytes": size,
                 "status": "success",
                 "timestamp": datetime.now().isoformat()
             }
@@ -257,59 +1270,332 @@ class MCP:
                 output_filepath = filepath + ".decrypted"
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            decrypted = decrypt_password(content, key)
-            if decrypted is None:
+            size = await self.run_io(stream_file, decrypt_stream, filepath, output_filepath, key)
+        except (ValueError, UnicodeDecodeError):
+            return {"error": "Decryption failed"}
+        except Exception as e:
+            return {"error": str(e)}
+        
+        return {
+            "source_file": filepath,
+            "output_file": output_filepath,
+            "bytes": size,
+            "status": "success",
+            "timestamp": datetime.now().isoformat()
+        }
+
+    async def handle_encrypt_dir(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle encrypt_dir command"""
+        src_dir = params.get("src_dir", "")
+        out_dir = params.get("out_dir", "")
+        key = params.get("key", self.master_key)
+        
+        if not src_dir or not out_dir:
+            return {"error": "Missing src_dir or out_dir parameter"}
+        
+        started = time.perf_counter()
+        entries = await self.run_io(scan_tree, src_dir, out_dir)
+        results = await self._run_dir("encrypt", src_dir, out_dir, key, entries)
+        
+        os.makedirs(out_dir, exist_ok=True)
+        manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        manifest = {
+            "version": 1,
+            "created": datetime.now().isoformat(),
+            "source_root": os.path.abspath(src_dir),
+            "files": sorted(
+                ({"path": r["path"], "size": r["size"], "output": r["output"]} for r in results if "error" not in r),
+                key=lambda item: item["path"]
+            )
+        }
+        with open(manifest_path + ".part", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(manifest_path + ".part", manifest_path)
+        
+        return self._dir_report(results, started, manifest_path)
+    
+    async def handle_decrypt_dir(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle decrypt_dir command"""
+        src_dir = params.get("src_dir", "")
+        out_dir = params.get("out_dir", "")
+        key = params.get("key", self.master_key)
+        
+        if not src_dir or not out_dir:
+            return {"error": "Missing src_dir or out_dir parameter"}
+        
+        started = time.perf_counter()
+        manifest_path = os.path.join(src_dir, MANIFEST_NAME)
+        try:
+            manifest = await self.run_io(read_manifest, manifest_path)
+            entries = [
+                (item["path"], item["size"], item.get("output") or item["path"] + ".sumerian")
+                for item in manifest["files"]
+            ]
+        except Exception as e:
+            return {"error": f"Cannot read manifest {manifest_path}: {e}"}
+        
+        results = await self._run_dir("decrypt", src_dir, out_dir, key, entries)
+        return self._dir_report(results, started, manifest_path)
+    
+    async def _run_dir(self, operation: str, src_dir: str, out_dir: str, key: str, entries: List) -> List[Dict[str, Any]]:
+        """Process files largest-first, in groups of BATCH_CHUNK_SIZE, on the worker pool if enabled"""
+        entries = sorted(entries, key=lambda entry: entry[1], reverse=True)
+        groups = [entries[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(entries), BATCH_CHUNK_SIZE)]
+        if self.pool and len(groups) > 1:
+            outputs = await asyncio.gather(*(
+                asyncio.wrap_future(self.pool.submit(process_dir_group, operation, src_dir, out_dir, key, group))
+                for group in groups
+            ))
+        else:
+            outputs = await asyncio.gather(*(
+                self.run_io(process_dir_group, operation, src_dir, out_dir, key, group) for group in groups
+            ))
+        return [result for output in outputs for result in output]
+    
+    async def handle_rekey(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle rekey command; old_key defaults to the master key, restart ignores a leftover checkpoint"""
+        src_dir = params.get("src_dir", "")
+        filepath = params.get("filepath", "")
+        old_key = params.get("old_key", self.master_key)
+        new_key = params.get("new_key", "")
+        
+        if not new_key:
+            return {"error": "Missing new_key parameter"}
+        if not src_dir and not filepath:
+            return {"error": "Missing src_dir or filepath parameter"}
+        
+        if filepath:
+            try:
+                size = await self.run_io(rekey_file, filepath, old_key, new_key)
+            except ValueError:
                 return {"error": "Decryption failed"}
-            
-            with open(output_filepath, 'w', encoding='utf-8') as f:
-                f.write(decrypted)
-            
+            except Exception as e:
+                return {"error": str(e)}
             return {
                 "source_file": filepath,
-                "output_file": output_filepath,
+                "output_file": filepath + REKEY_SUFFIX,
+                "bytes": size,
                 "status": "success",
                 "timestamp": datetime.now().isoformat()
             }
-        except Exception as e:
+        
+        started = time.perf_counter()
+        checkpoint_path = os.path.join(src_dir, REKEY_CHECKPOINT_NAME)
+        target = await self.run_cpu(key_fingerprint, new_key, size=INLINE_MAX_BYTES)
+        try:
+            done = await self.run_io(read_rekey_checkpoint, checkpoint_path, target, params.get("restart") in (True, "true", "1"))
+        except ValueError as e:
             return {"error": str(e)}
+        resumed = len(done)
+        entries = [
+            (rel, size) for rel, size in await self.run_io(scan_tree, src_dir)
+            if rel.endswith(".sumerian") and rel not in done
+        ]
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+        groups = [entries[i:i + REKEY_GROUP_SIZE] for i in range(0, len(entries), REKEY_GROUP_SIZE)]
+        if self.pool:
+            jobs = [asyncio.wrap_future(self.pool.submit(rekey_group, src_dir, old_key, new_key, group)) for group in groups]
+        else:
+            jobs = [self.run_io(rekey_group, src_dir, old_key, new_key, group) for group in groups]
+        
+        # Record each finished group so a crash restarts from the files that are left
+        results = []
+        try:
+            for job in asyncio.as_completed(jobs):
+                output = await job
+                results.extend(output)
+                done.update(r["path"] for r in output if "error" not in r)
+                await self.run_io(write_rekey_checkpoint, checkpoint_path, target, done)
+        finally:
+            errors = [r for r in results if "error" in r]
+            if len(results) == len(entries) and not errors:
+                if os.path.exists(checkpoint_path):
+                    os.remove(checkpoint_path)
+            else:
+                write_rekey_checkpoint(checkpoint_path, target, done)
+        
+        rekeyed = [r for r in results if "error" not in r]
+        total_bytes = sum(r["size"] for r in rekeyed)
+        elapsed = time.perf_counter() - started
+        return {
+            "files": len(rekeyed),
+            "suffix": REKEY_SUFFIX,
+            "resumed": resumed,
+            "bytes": total_bytes,
+            "seconds": elapsed,
+            "mb_per_s": total_bytes / (elapsed or float("inf")) / (1024 * 1024),
+            "errors": [{"path": r["path"], "error": r["error"]} for r in errors],
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _dir_report(self, results: List[Dict[str, Any]], started: float, manifest_path: str) -> Dict[str, Any]:
+        """Summarize a directory run with aggregate MB/s"""
+        elapsed = time.perf_counter() - started
+        total_bytes = sum(r["size"] for r in results if "error" not in r)
+        return {
+            "files": sum(1 for r in results if "error" not in r),
+            "bytes": total_bytes,
+            "seconds": elapsed,
+            "mb_per_s": total_bytes / (elapsed or float("inf")) / (1024 * 1024),
+            "manifest": manifest_path,
+            "errors": [{"path": r["path"], "error": r["error"]} for r in results if "error" in r],
+            "timestamp": datetime.now().isoformat()
+        }
+
+# ----- HTTP Server -----
+
+# uvicorn worker processes re-import this module, so they read their MCP settings from here
+SERVER_CONFIG_ENV = "SUMERIAN_MCP_SERVER_CONFIG"
+
+try:
+    import orjson
+    
+    def dumps_json(data: Any) -> bytes:
+        return orjson.dumps(data)
+    
+    loads_json = orjson.loads
+except ImportError:  # orjson is optional; fall back to the standard library
+    def dumps_json(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+    
+    loads_json = json.loads
+
+def create_app(mcp: Optional[MCP] = None):
+    """Build the FastAPI app; without an MCP, one is created from the SERVER_CONFIG_ENV settings"""
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI, Request
+    from fastapi.responses import Response
+    
+    if mcp is None:
+        mcp = MCP(**json.loads(os.environ.get(SERVER_CONFIG_ENV, "{}")))
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        mcp.close()
+    
+    app = FastAPI(title="Sumerian MCP", lifespan=lifespan)
+    
+    def respond(result: Dict[str, Any], status_code: int = 200) -> Response:
+        # Serialize directly instead of going through FastAPI's jsonable_encoder
+        return Response(dumps_json(result), status_code=status_code, media_type="application/json")
+    
+    @app.post("/tools/{tool_id}")
+    async def tool_endpoint(tool_id: str, request: Request):
+        body = await request.body()
+        try:
+            params = loads_json(body) if body else {}
+        except ValueError:
+            return respond({"error": "Invalid JSON body"}, 400)
+        if not isinstance(params, dict):
+            return respond({"error": "JSON body must be an object"}, 400)
+        return respond(await mcp.call_tool(tool_id, params))
+    
+    @app.get("/tools")
+    async def list_tools_endpoint():
+        return respond(await mcp.call_tool("list_tools"))
+    
+    @app.get("/metrics")
+    async def metrics_endpoint():
+        # Counters are per process; with --http-workers > 1 each scrape reaches one worker
+        return Response(mcp.metrics.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+    
+    return app
+
+def run_server(args, config: Dict[str, Any]):
+    """Serve the HTTP API with uvicorn, forking --http-workers processes when more than one"""
+    import uvicorn
+    
+    options = {
+        "host": args.host,
+        "port": args.port,
+        "backlog": args.backlog,
+        "timeout_keep_alive": args.keep_alive,
+        "access_log": not args.no_access_log,
+    }
+    print(f"Starting Sumerian MCP server on http://{args.host}:{args.port} "
+          f"({args.http_workers} HTTP worker(s), {args.workers} batch worker(s))")
+    if args.http_workers > 1:
+        os.environ[SERVER_CONFIG_ENV] = json.dumps(config)
+        uvicorn.run(
+            "sumerian_mcp:create_app", factory=True, workers=args.http_workers,
+            app_dir=os.path.dirname(os.path.abspath(__file__)), **options
+        )
+    else:
+        uvicorn.run(create_app(MCP(**config)), **options)
 
 # ----- Command Line Interface -----
 
-async def main():
+def main():
     parser = argparse.ArgumentParser(description="Sumerian MCP - Master Control Program")
     parser.add_argument("tool", nargs="?", help="Tool to execute")
     parser.add_argument("--text", help="Text to process")
     parser.add_argument("--key", help="Encryption/decryption key")
+    parser.add_argument("--old-key", help="Current key for rekey (default: MASTER_KEY)")
+    parser.add_argument("--new-key", help="New key for rekey")
+    parser.add_argument("--restart", action="store_true", help="Ignore a leftover rekey checkpoint and start over")
     parser.add_argument("--file", help="File to process")
     parser.add_argument("--output", help="Output file path")
+    parser.add_argument("--src-dir", help="Source directory for encrypt_dir/decrypt_dir")
+    parser.add_argument("--out-dir", help="Output directory for encrypt_dir/decrypt_dir")
     parser.add_argument("--interactive", action="store_true", help="Run in interactive mode")
     parser.add_argument("--server", action="store_true", help="Run as a server")
+    parser.add_argument("--host", default="0.0.0.0", help="Server bind address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8000, help="Server port (default: 8000)")
+    parser.add_argument("--http-workers", type=int, default=1, help="Server worker processes (default: 1)")
+    parser.add_argument("--keep-alive", type=int, default=5, help="Keep-alive timeout in seconds (default: 5)")
+    parser.add_argument("--backlog", type=int, default=2048, help="Listen socket backlog (default: 2048)")
+    parser.add_argument("--no-access-log", action="store_true", help="Disable per-request access logging")
+    parser.add_argument("--no-echo-original", action="store_true",
+                        help="Leave the plaintext 'original' field out of encrypt responses")
+    parser.add_argument("--no-metrics", action="store_true", help="Disable per-tool metrics (stats tool, /metrics)")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="Write cProfile/tracemalloc profiles of tool calls to DIR (server: toggle with the profile tool)")
+    parser.add_argument("--profile-sample", type=float, default=1.0,
+                        help="Fraction of tool calls to profile (default: 1.0)")
+    parser.add_argument("--profile-min-ms", type=float, default=0.0,
+                        help="Skip writing profiles of calls faster than this (default: 0)")
+    parser.add_argument("--decrypt-cache", action="store_true",
+                        help="Cache decrypt results and coalesce identical concurrent decrypt calls")
+    parser.add_argument("--decrypt-cache-size", type=int, default=DECRYPT_CACHE_SIZE,
+                        help=f"Max cached decrypt results (default: {DECRYPT_CACHE_SIZE})")
+    parser.add_argument("--decrypt-cache-ttl", type=float, default=DECRYPT_CACHE_TTL,
+                        help=f"Seconds a decrypt result stays cached (default: {DECRYPT_CACHE_TTL:g})")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for batch tools (default: 1)")
+    parser.add_argument("--cpu-executor", choices=["thread", "process"], default="thread",
+                        help="Executor for encryption work (default: thread)")
+    parser.add_argument("--cpu-workers", type=int, help="CPU executor size (default: CPU count)")
+    parser.add_argument("--io-workers", type=int, default=4, help="File I/O threads (default: 4)")
+    parser.add_argument("--cpu-limit", type=int, help="Max concurrent CPU jobs (default: --cpu-workers)")
+    parser.add_argument("--io-limit", type=int, help="Max concurrent file jobs (default: --io-workers)")
     args = parser.parse_args()
     
-    mcp = MCP()
+    config = {
+        "workers": args.workers,
+        "cpu_executor": args.cpu_executor,
+        "cpu_workers": args.cpu_workers,
+        "io_workers": args.io_workers,
+        "cpu_limit": args.cpu_limit,
+        "io_limit": args.io_limit,
+        "echo_original": not args.no_echo_original,
+        "metrics": not args.no_metrics,
+        "profile_dir": args.profile,
+        "profile_sample": args.profile_sample,
+        "profile_min_ms": args.profile_min_ms,
+        "decrypt_cache": args.decrypt_cache,
+        "decrypt_cache_size": args.decrypt_cache_size,
+        "decrypt_cache_ttl": args.decrypt_cache_ttl,
+    }
     
     if args.server:
-        # Start as a server
-        import uvicorn
-        from fastapi import FastAPI, Body
-        
-        app = FastAPI(title="Sumerian MCP")
-        
-        @app.post("/tools/{tool_id}")
-        async def tool_endpoint(tool_id: str, params: Dict[str, Any] = Body(...)):
-            return await mcp.call_tool(tool_id, params)
-        
-        @app.get("/tools")
-        async def list_tools_endpoint():
-            return await mcp.call_tool("list_tools")
-        
-        print("Starting Sumerian MCP server on http://localhost:8000")
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        # uvicorn runs its own event loop (and worker processes), so start it outside asyncio.run()
+        run_server(args, config)
         return
     
+    asyncio.run(run_cli(args, parser, MCP(**config)))
+
+async def run_cli(args, parser, mcp: MCP):
+    """Run the interactive prompt or a single tool call"""
     if args.interactive:
         print("Sumerian MCP Interactive Mode")
         print("Type 'exit' to quit, 'help' for available commands")
@@ -365,8 +1651,23 @@ async def main():
     if args.output:
         params["output"] = args.output
     
+    if args.src_dir:
+        params["src_dir"] = args.src_dir
+    
+    if args.out_dir:
+        params["out_dir"] = args.out_dir
+    
+    if args.old_key:
+        params["old_key"] = args.old_key
+    
+    if args.new_key:
+        params["new_key"] = args.new_key
+    
+    if args.restart:
+        params["restart"] = True
+    
     result = await mcp.call_tool(args.tool, params)
     print(json.dumps(result, indent=2))
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    main() 
\ No newline at end of file
@@ -2,16 +2,19 @@
 """
 Tests for Sumerian MCP
 """
+import io
 import os
 import pytest
 import json
-from unittest.mock import patch, mock_open
 import asyncio
+import threading
+import time
 
 # Make sure we're using a test key
 os.environ["MASTER_KEY"] = "TEST_KEY"
 
-from sumerian_mcp import decrypt_password, encrypt_password, MCP
+from sumerian_mcp import decrypt_password, encrypt_password, encrypt_stream, decrypt_stream, BATCH_CHUNK_SIZE, MCP
+from sumerian_mcp import REKEY_CHECKPOINT_NAME, REKEY_SUFFIX, key_fingerprint, rekey_file, write_rekey_checkpoint
 
 @pytest.fixture
 def mcp():
@@ -35,6 +38,17 @@ async def test_encrypt_decrypt_text():
     # Check if decryption worked
     assert decrypted == original_text
 
+@pytest.mark.parametrize("text", ["한글 비밀번호", "𒀀𒀁 cuneiform", "é" * 15])
+def test_encrypt_decrypt_non_ascii(text):
+    """Padding is counted in UTF-8 bytes, so non-ASCII text round-trips"""
+    assert decrypt_password(encrypt_password(text, "test_key"), "test_key") == text
+
+def test_decrypt_failure_is_silent(capsys):
+    """Decode failures return None without writing to stdout (which may be a piped result stream)"""
+    assert decrypt_password("not cuneiform", "test_key") is None
+    assert decrypt_password(encrypt_password("x", "test_key")[:-3], "test_key") is None
+    assert capsys.readouterr().out == ""
+
 @pytest.mark.asyncio
 async def test_encrypt_tool(mcp):
     """Test the encrypt tool"""
@@ -89,58 +103,396 @@ async def test_list_tools(mcp):
     assert "list_tools" in tool_ids
 
 @pytest.mark.asyncio
-async def test_encrypt_file(mcp):
-    """Test file encryption"""
-    test_content = "This is test file content"
+async def test_batch_tools(mcp):
+    """Test batch encryption and per-item decryption results"""
+    texts = ["first", "second", "third"]
     
-    # Mock the file operations
-    with patch("builtins.open", mock_open(read_data=test_content)) as m:
-        params = {
-            "filepath": "test.txt",
-            "key": "test_key"
-        }
-        
-        result = await mcp.call_tool("encrypt_file", params)
-        
-        # Check the result
-        assert result["status"] == "success"
-        assert result["source_file"] == "test.txt"
-        assert result["output_file"] == "test.txt.sumerian"
+    result = await mcp.call_tool("encrypt_batch", {"texts": texts, "key": "test_key"})
+    assert result["count"] == 3
+    assert result["succeeded"] == 3
+    encrypted = [item["result"] for item in result["results"]]
+    
+    result = await mcp.call_tool("decrypt_batch", {"texts": encrypted + ["garbage"], "key": "test_key"})
+    assert result["succeeded"] == 3
+    assert result["failed"] == 1
+    assert [item["result"] for item in result["results"][:3]] == texts
+    assert result["results"][3] == {"ok": False, "error": "Decryption failed"}
+
+@pytest.mark.asyncio
+async def test_batch_tools_with_workers():
+    """Test that batches larger than one chunk are fanned out to worker processes"""
+    mcp = MCP(workers=2)
+    try:
+        texts = [f"credential-{i}" for i in range(BATCH_CHUNK_SIZE * 2 + 1)]
+        result = await mcp.call_tool("encrypt_batch", {"texts": texts, "key": "test_key"})
+        assert result["succeeded"] == len(texts)
         
-        # Check that file was written with encrypted content
-        # Get the write calls
-        write_calls = [call.args[0] for call in m().write.call_args_list]
-        assert len(write_calls) == 1
+        encrypted = [item["result"] for item in result["results"]]
+        result = await mcp.call_tool("decrypt_batch", {"texts": encrypted, "key": "test_key"})
+        assert [item["result"] for item in result["results"]] == texts
         
-        # The written content should be the encrypted version
-        written_content = write_calls[0]
-        decrypted = decrypt_password(written_content, "test_key")
-        assert decrypted == test_content
+        stats = await mcp.call_tool("worker_stats")
+        assert stats["workers"] == 2
+        assert sum(worker["items"] for worker in stats["per_worker"].values()) == 2 * len(texts)
+    finally:
+        mcp.pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_encrypt_file(mcp, tmp_path):
+    """Test file encryption"""
+    test_content = "This is test file content"
+    source = tmp_path / "test.txt"
+    source.write_text(test_content, encoding="utf-8")
+    
+    params = {
+        "filepath": str(source),
+        "key": "test_key"
+    }
+    
+    result = await mcp.call_tool("encrypt_file", params)
+    
+    # Check the result
+    assert result["status"] == "success"
+    assert result["source_file"] == str(source)
+    assert result["output_file"] == str(source) + ".sumerian"
+    
+    # The written content should be the encrypted version
+    written_content = (tmp_path / "test.txt.sumerian").read_text(encoding="utf-8")
+    decrypted = decrypt_password(written_content, "test_key")
+    assert decrypted == test_content
 
 @pytest.mark.asyncio
-async def test_decrypt_file(mcp):
+async def test_decrypt_file(mcp, tmp_path):
     """Test file decryption"""
     test_content = "Original test content"
     encrypted_content = encrypt_password(test_content, "test_key")
+    source = tmp_path / "test.txt.sumerian"
+    source.write_text(encrypted_content, encoding="utf-8")
+    
+    params = {
+        "filepath": str(source),
+        "key": "test_key"
+    }
+    
+    result = await mcp.call_tool("decrypt_file", params)
+    
+    # Check the result
+    assert result["status"] == "success"
+    assert result["source_file"] == str(source)
+    assert result["output_file"] == str(tmp_path / "test.txt")
+    
+    # Check that file was written with decrypted content
+    assert (tmp_path / "test.txt").read_text(encoding="utf-8") == test_content
+
+@pytest.mark.parametrize("size", [0, 15, 16, 48 * 3, 48 * 3 + 1, 10000])
+def test_stream_roundtrip_across_chunks(size):
+    """Test streaming with chunk boundaries inside cuneiform code points"""
+    data = os.urandom(size)
+    encrypted = io.BytesIO()
+    assert encrypt_stream(io.BytesIO(data), encrypted, "test_key", chunk_size=48) == size
+    
+    # 7-byte reads split the 4-byte UTF-8 cuneiform signs
+    decrypted = io.BytesIO()
+    assert decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, "test_key", chunk_size=7) == size
+    assert decrypted.getvalue() == data
+
+@pytest.mark.asyncio
+async def test_decrypt_file_corrupted(mcp, tmp_path):
+    """Test that a failed decryption leaves no output file behind"""
+    source = tmp_path / "secret.txt"
+    source.write_bytes(b"x" * 100000)
+    await mcp.call_tool("encrypt_file", {"filepath": str(source), "key": "test_key"})
+    source.unlink()
+    
+    # Drop the last cuneiform sign (4 UTF-8 bytes)
+    encrypted = tmp_path / "secret.txt.sumerian"
+    encrypted.write_bytes(encrypted.read_bytes()[:-4])
+    
+    result = await mcp.call_tool("decrypt_file", {"filepath": str(encrypted), "key": "test_key"})
+    
+    assert result == {"error": "Decryption failed"}
+    assert list(tmp_path.iterdir()) == [tmp_path / "secret.txt.sumerian"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [1, 2])
+async def test_dir_tools(tmp_path, workers):
+    """Test recursive directory encryption and manifest-driven decryption"""
+    src = tmp_path / "src"
+    (src / "nested" / "deep").mkdir(parents=True)
+    files = {"a.txt": b"alpha", "nested/b.bin": os.urandom(3000), "nested/deep/empty": b""}
+    files.update({f"nested/deep/f{i}.txt": os.urandom(i * 37) for i in range(BATCH_CHUNK_SIZE)})
+    for rel, data in files.items():
+        (src / rel).write_bytes(data)
+    
+    server = MCP(workers=workers)
+    try:
+        result = await server.call_tool("encrypt_dir", {"src_dir": str(src), "out_dir": str(tmp_path / "enc"), "key": "test_key"})
+        assert result["files"] == len(files) and result["errors"] == []
+        manifest = json.loads((tmp_path / "enc" / "manifest.json").read_text(encoding="utf-8"))
+        assert {item["path"]: item["size"] for item in manifest["files"]} == {rel: len(data) for rel, data in files.items()}
+        
+        result = await server.call_tool("decrypt_dir", {"src_dir": str(tmp_path / "enc"), "out_dir": str(tmp_path / "dec"), "key": "test_key"})
+        assert result["files"] == len(files) and result["errors"] == []
+    finally:
+        if server.pool:
+            server.pool.shutdown()
+    
+    for rel, data in files.items():
+        assert (tmp_path / "dec" / rel).read_bytes() == data
+
+@pytest.mark.asyncio
+async def test_decrypt_dir_uses_manifest_outputs(mcp, tmp_path):
+    """decrypt_dir reads ciphertext names from the manifest and reports a missing manifest as an error"""
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_bytes(b"alpha")
+    enc = tmp_path / "enc"
+    await mcp.call_tool("encrypt_dir", {"src_dir": str(src), "out_dir": str(enc), "key": "test_key"})
+    manifest = json.loads((enc / "manifest.json").read_text(encoding="utf-8"))
+    (enc / "a.txt.sumerian").rename(enc / "renamed.bin")
+    manifest["files"][0]["output"] = "renamed.bin"
+    (enc / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    
+    result = await mcp.call_tool("decrypt_dir", {"src_dir": str(enc), "out_dir": str(tmp_path / "dec"), "key": "test_key"})
+    assert result["files"] == 1 and result["errors"] == []
+    assert (tmp_path / "dec" / "a.txt").read_bytes() == b"alpha"
     
-    # Mock the file operations
-    with patch("builtins.open", mock_open(read_data=encrypted_content)) as m:
-        params = {
-            "filepath": "test.txt.sumerian",
-            "key": "test_key"
-        }
+    result = await mcp.call_tool("decrypt_dir", {"src_dir": str(src), "out_dir": str(tmp_path / "dec2"), "key": "test_key"})
+    assert result["error"].startswith("Cannot read manifest")
+
+@pytest.mark.asyncio
+async def test_offload_keeps_loop_responsive(tmp_path):
+    """Small requests complete while a large file job holds the I/O executor"""
+    mcp = MCP(io_workers=1)
+    try:
+        big = asyncio.ensure_future(mcp.run_io(time.sleep, 0.5))
+        await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        result = await mcp.call_tool("encrypt", {"text": "small", "key": "test_key"})
+        assert time.perf_counter() - started < 0.25
+        assert "encrypted" in result and not big.done()
+        await big
         
-        result = await mcp.call_tool("decrypt_file", params)
+        source = tmp_path / "big.bin"
+        source.write_bytes(os.urandom(200000))
+        assert (await mcp.call_tool("encrypt_file", {"filepath": str(source)}))["bytes"] == 200000
+        stats = (await mcp.call_tool("worker_stats"))["executors"]
+        assert stats["cpu"]["inline"] == 1
+        assert stats["io"]["submitted"] == 2 and stats["io"]["in_flight"] == 0
+    finally:
+        mcp.close()
+
+@pytest.mark.asyncio
+async def test_offload_concurrency_limit():
+    """No more than `limit` jobs run on an executor at once"""
+    mcp = MCP(io_workers=8, io_limit=2)
+    lock = threading.Lock()
+    running = [0, 0]
+    
+    def job():
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+    
+    try:
+        await asyncio.gather(*(mcp.run_io(job) for _ in range(6)))
+        assert running[1] <= 2
+    finally:
+        mcp.close()
+
+def test_http_app_response_options():
+    """The HTTP app serializes tool results and can omit the echoed plaintext"""
+    from fastapi.testclient import TestClient
+    from sumerian_mcp import create_app
+    
+    with TestClient(create_app(MCP(echo_original=False))) as client:
+        result = client.post("/tools/encrypt", json={"text": "hello", "key": "test_key"}).json()
+        assert "original" not in result
+        assert decrypt_password(result["encrypted"], "test_key") == "hello"
         
-        # Check the result
-        assert result["status"] == "success"
-        assert result["source_file"] == "test.txt.sumerian"
-        assert result["output_file"] == "test.txt"
+        result = client.post("/tools/encrypt", json={"text": "hello", "echo_original": True}).json()
+        assert result["original"] == "hello"
         
-        # Check that file was written with decrypted content
-        write_calls = [call.args[0] for call in m().write.call_args_list]
-        assert len(write_calls) == 1
-        assert write_calls[0] == test_content
+        response = client.post("/tools/encrypt", content=b"not json")
+        assert response.status_code == 400
+        assert client.get("/tools").json()["count"] == len(MCP().tools)
+
+@pytest.mark.asyncio
+async def test_tool_metrics():
+    """Tool calls are counted per tool with errors, bytes and latency, and exposed on /metrics"""
+    from fastapi.testclient import TestClient
+    from sumerian_mcp import create_app
+    
+    mcp = MCP()
+    await mcp.call_tool("encrypt", {"text": "hello", "key": "test_key"})
+    await mcp.call_tool("decrypt", {"text": "garbage", "key": "test_key"})
+    await mcp.call_tool("no_such_tool")
+    
+    stats = await mcp.call_tool("stats", {"reset": True})
+    assert set(stats["tools"]) == {"encrypt", "decrypt", "stats"}
+    assert stats["tools"]["encrypt"]["calls"] == 1
+    assert stats["tools"]["encrypt"]["errors"] == 0
+    assert stats["tools"]["encrypt"]["input_bytes"] == len("hello") + len("test_key")
+    assert stats["tools"]["encrypt"]["output_bytes"] > 0
+    assert stats["tools"]["encrypt"]["latency"]["le_1k"]["count"] == 1
+    assert stats["tools"]["decrypt"]["errors"] == 1
+    assert stats["tools"]["decrypt"]["in_flight"] == 0
+    assert set((await mcp.call_tool("stats"))["tools"]) == {"stats"}
+    
+    with TestClient(create_app(mcp)) as client:
+        client.post("/tools/encrypt", json={"text": "x" * 2000, "key": "test_key"})
+        text = client.get("/metrics").text
+    assert 'sumerian_tool_calls_total{tool="encrypt"} 1' in text
+    assert 'sumerian_tool_duration_seconds_count{tool="encrypt",size="le_64k"} 1' in text
+    
+    disabled = MCP(metrics=False)
+    await disabled.call_tool("encrypt", {"text": "hello"})
+    assert (await disabled.call_tool("stats"))["tools"] == {}
+
+@pytest.mark.asyncio
+async def test_tool_profiling(tmp_path):
+    """The profile tool toggles per-call cProfile/tracemalloc files named by tool, size and duration"""
+    mcp = MCP(cpu_executor="process", cpu_workers=1)
+    try:
+        await mcp.call_tool("encrypt", {"text": "hello", "key": "test_key"})
+        settings = await mcp.call_tool("profile", {"enabled": "true", "directory": str(tmp_path)})
+        assert settings["enabled"] is True
+        await mcp.call_tool("encrypt", {"text": "x" * 20000, "key": "test_key"})
+        await mcp.call_tool("profile", {"enabled": False})
+        await mcp.call_tool("encrypt", {"text": "hello", "key": "test_key"})
+        assert "error" in await mcp.call_tool("profile", {"sample_rate": 2})
+    finally:
+        mcp.close()
+    
+    summaries = {}
+    for path in tmp_path.glob("*.json"):
+        summary = json.loads(path.read_text())
+        summaries[summary["tool"]] = summary
+    assert set(summaries) == {"encrypt", "profile"}
+    assert summaries["encrypt"]["size"] == 20000 + len("test_key")
+    assert summaries["encrypt"]["profiled_calls"] >= 1
+    assert summaries["encrypt"]["top_cumulative"]
+    assert len(list(tmp_path.glob("*-encrypt-20008B-*ms.prof"))) == 1
+    
+    sampled_out = MCP(profile_dir=str(tmp_path / "none"), profile_sample=0.0)
+    await sampled_out.call_tool("encrypt", {"text": "hello", "key": "test_key"})
+    assert not (tmp_path / "none").exists()
 
 if __name__ == "__main__":
-    asyncio.run(pytest.main(["-xvs", __file__])) 
\ No newline at end of file
+    asyncio.run(pytest.main(["-xvs", __file__])) 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cpu_executor", ["thread", "process"])
+async def test_decrypt_cache(cpu_executor):
+    """Repeated and concurrent identical decrypts are served from one computation; evicted plaintexts are zeroed"""
+    mcp = MCP(cpu_executor=cpu_executor, cpu_workers=1, decrypt_cache=True, decrypt_cache_size=1)
+    try:
+        encrypted = encrypt_password("cached secret", "test_key")
+        responses = await asyncio.gather(*(
+            mcp.call_tool("decrypt", {"text": encrypted, "key": "test_key"}) for _ in range(8)
+        ))
+        assert [response["decrypted"] for response in responses] == ["cached secret"] * 8
+        assert (await mcp.call_tool("decrypt", {"text": encrypted, "key": "wrong_key"}))["error"]
+        
+        stats = (await mcp.call_tool("worker_stats"))["decrypt_cache"]
+        assert stats["misses"] == 2
+        assert stats["hits"] + stats["coalesced"] == 7
+        assert stats["evictions"] == 1
+        
+        cached, _ = next(iter(mcp.decrypt_cache._entries.values()))
+        assert cached is None  # failures are cached too
+        await mcp.call_tool("decrypt", {"text": encrypted, "key": "test_key"})
+        plaintext, _ = next(iter(mcp.decrypt_cache._entries.values()))
+        mcp.decrypt_cache.clear()
+        assert plaintext == bytearray(len("cached secret"))
+    finally:
+        mcp.close()
+    
+    assert (await MCP().call_tool("worker_stats"))["decrypt_cache"] is None
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [1, 2])
+async def test_rekey(tmp_path, workers):
+    """Test key rotation over a directory, including resuming an interrupted run"""
+    src = tmp_path / "src"
+    src.mkdir()
+    files = {f"f{i}.bin": os.urandom(i * 4099) for i in range(40)}
+    for rel, data in files.items():
+        (src / rel).write_bytes(data)
+    
+    server = MCP(workers=workers)
+    try:
+        enc = tmp_path / "enc"
+        await server.call_tool("encrypt_dir", {"src_dir": str(src), "out_dir": str(enc), "key": "old_key"})
+        
+        # Simulate a crash: two files recorded in the checkpoint, a third rekeyed but not yet recorded
+        target = key_fingerprint("new_key")
+        for rel in ("f1.bin.sumerian", "f2.bin.sumerian", "f3.bin.sumerian"):
+            rekey_file(str(enc / rel), "old_key", "new_key")
+        write_rekey_checkpoint(str(enc / REKEY_CHECKPOINT_NAME), target, {"f1.bin.sumerian", "f2.bin.sumerian"})
+        
+        result = await server.call_tool("rekey", {"src_dir": str(enc), "old_key": "other", "new_key": "other_new"})
+        assert "different new key" in result["error"]
+        
+        result = await server.call_tool("rekey", {"src_dir": str(enc), "old_key": "old_key", "new_key": "new_key"})
+        assert (result["resumed"], result["files"], result["suffix"], result["errors"]) == (2, 38, REKEY_SUFFIX, [])
+        assert not (enc / REKEY_CHECKPOINT_NAME).exists()
+        
+        # Originals are untouched; the rekeyed copies open under the new key
+        result = await server.call_tool("decrypt_dir", {"src_dir": str(enc), "out_dir": str(tmp_path / "dec"), "key": "old_key"})
+        assert result["files"] == len(files) and result["errors"] == []
+    finally:
+        server.close()
+    
+    for rel, data in files.items():
+        assert (tmp_path / "dec" / rel).read_bytes() == data
+        decrypted = io.BytesIO()
+        decrypt_stream(io.BytesIO((enc / (rel + ".sumerian" + REKEY_SUFFIX)).read_bytes()), decrypted, "new_key")
+        assert decrypted.getvalue() == data
+
+@pytest.mark.asyncio
+async def test_rekey_file_keeps_original_on_failure(mcp, tmp_path):
+    """Test that a failed rekey leaves the original ciphertext untouched"""
+    encrypted = tmp_path / "secret.sumerian"
+    with open(encrypted, "wb") as dst:
+        encrypt_stream(io.BytesIO(b"rotate me" * 1000), dst, "old_key")
+    original = encrypted.read_bytes()
+    
+    result = await mcp.call_tool("rekey", {"filepath": str(encrypted), "old_key": "old_key"})
+    assert result == {"error": "Missing new_key parameter"}
+    encrypted.write_bytes(original[:-4])
+    result = await mcp.call_tool("rekey", {"filepath": str(encrypted), "old_key": "old_key", "new_key": "new_key"})
+    assert result == {"error": "Decryption failed"}
+    assert list(tmp_path.iterdir()) == [encrypted]
+    
+    encrypted.write_bytes(original)
+    result = await mcp.call_tool("rekey", {"filepath": str(encrypted), "new_key": "new_key", "old_key": "old_key"})
+    assert (result["bytes"], result["output_file"]) == (9000, str(encrypted) + REKEY_SUFFIX)
+    assert encrypted.read_bytes() == original
+    decrypted = io.BytesIO()
+    decrypt_stream(io.BytesIO((tmp_path / ("secret.sumerian" + REKEY_SUFFIX)).read_bytes()), decrypted, "new_key")
+    assert decrypted.getvalue() == b"rotate me" * 1000
+    with pytest.raises(ValueError):
+        rekey_file(str(encrypted), "old_key", "new_key", str(encrypted))
+
+def test_rekey_wrong_key_passing_padding_keeps_original(tmp_path):
+    """A wrong old key that happens to pass the CBC padding check must not destroy the original"""
+    encrypted = tmp_path / "secret.sumerian"
+    with open(encrypted, "wb") as dst:
+        encrypt_stream(io.BytesIO(b"rotate me"), dst, "old_key")
+    original = encrypted.read_bytes()
+    
+    for i in range(20000):
+        try:
+            rekey_file(str(encrypted), f"wrong{i}", "new_key")
+            break
+        except ValueError:
+            continue
+    else:
+        pytest.skip("no wrong key passed the padding check")
+    assert encrypted.read_bytes() == original
+    decrypted = io.BytesIO()
+    decrypt_stream(io.BytesIO(original), decrypted, "old_key")
+    assert decrypted.getvalue() == b"rotate me"